@@ -3,6 +3,8 @@ class CleanedEarthquake:
 
     # 1. class and constructor for earthquake, with cleaned version of data
 
+    __slots__ = ('id', 'event_type', 'timestamp', 'location', 'magnitude')
+
     def __init__(self, id, event_type, timestamp, magnitude, location):
         self.id = id
         self.event_type = event_type
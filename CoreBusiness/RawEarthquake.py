@@ -2,6 +2,8 @@ class RawEarthquake:
 
     # 2. class and constructor for earthquake, with parameters in the original dictionary called event
 
+    __slots__ = ('type', 'source', 'location', 'magnitude', 'time', 'latitude', 'longitude')
+
     def __init__(self, type, source, location, magnitude, time, latitude, longitude):
         self.type = type
         self.source = source
@@ -1,5 +1,7 @@
 class Weather:
 
+    __slots__ = ('type', 'source', 'location', 'temperature', 'wind_speed', 'time')
+
     def __init__(self, type, source, location, temperature, wind_speed, time):
         self.type = type
         self.source = source
@@ -0,0 +1,4 @@
+# SDEWS benchmark paketi
+# generators: sentetik USGS / EONET / OpenWeather / Open-Meteo yanıtları
+# micro: tek tek pipeline adımları, macro: uçtan uca RuntimeSystem, report: JSON rapor
+# Çalıştırma: python -m benchmarks --help
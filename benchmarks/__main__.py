@@ -0,0 +1,75 @@
+# python -m benchmarks [--sizes 10,1k,100k] [--macro] [--baseline eski.json]
+
+import argparse
+import sys
+
+from benchmarks.generators import parse_size
+from benchmarks.micro import MICRO_BENCHMARKS, DEFAULT_REPEAT, run_micro
+from benchmarks.report import REGRESSION_THRESHOLD, build_report, compare, format_result, load_report, save_report
+
+DEFAULT_SIZES = "10,1k,100k"
+DEFAULT_MACRO_SIZES = "1k,10k"
+
+
+def _sizes(text):
+    return [parse_size(part) for part in text.split(',') if part.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="SDEWS benchmark suite")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"micro benchmark sizes, e.g. 10,1k,100k,1M,10M (default: {DEFAULT_SIZES})")
+    parser.add_argument("--only", default="",
+                        help=f"comma separated micro benchmarks ({', '.join(MICRO_BENCHMARKS)})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    parser.add_argument("--no-micro", action="store_true", help="skip micro benchmarks")
+    parser.add_argument("--macro", action="store_true",
+                        help="also run RuntimeSystem end to end (writes pipeline output to data/)")
+    parser.add_argument("--macro-sizes", default=DEFAULT_MACRO_SIZES,
+                        help=f"earthquakes per macro cycle (default: {DEFAULT_MACRO_SIZES})")
+    parser.add_argument("--no-wal", action="store_true", help="macro runs without WAL and replay")
+    parser.add_argument("--output", default=None, help="report path (default: benchmarks/results/bench-<time>.json)")
+    parser.add_argument("--baseline", default=None, help="previous report to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="allowed slowdown ratio before a result counts as regression")
+    args = parser.parse_args(argv)
+
+    def progress(result):
+        print(format_result(result), flush=True)
+
+    results = []
+    if not args.no_micro:
+        names = [name.strip() for name in args.only.split(',') if name.strip()] or None
+        results.extend(run_micro(_sizes(args.sizes), names=names, repeat=args.repeat, seed=args.seed,
+                                 progress=progress))
+    if args.macro:
+        # RuntimeSystem importu pipeline'ı yükler; yalnızca istendiğinde
+        from benchmarks.macro import run_macro
+        results.extend(run_macro(_sizes(args.macro_sizes), seed=args.seed, use_wal=not args.no_wal,
+                                 progress=progress))
+
+    report = build_report(results, {
+        'sizes': _sizes(args.sizes) if not args.no_micro else [],
+        'macro_sizes': _sizes(args.macro_sizes) if args.macro else [],
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'wal': not args.no_wal
+    })
+
+    regressions = []
+    if args.baseline:
+        report['comparison'] = compare(report, load_report(args.baseline), threshold=args.threshold)
+        report['baseline'] = args.baseline
+        regressions = [c for c in report['comparison'] if c['regression']]
+        for change in regressions:
+            print(f"REGRESSION {change['name']} ({change['size']}): {change['baseline_seconds']:.4f}s -> "
+                  f"{change['seconds']:.4f}s ({change['change']:+.0%})")
+
+    path = save_report(report, args.output)
+    print(f"Report written to {path}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+# Sentetik kaynak yanıtları
+# Her üreteç ilgili API'nin döndürdüğü JSON ile aynı biçimde dict üretir, böylece gerçek
+# DataSource.parse() metotları ve pipeline değişmeden ölçülebilir. Aynı seed aynı veriyi üretir.
+#
+# Büyüklükler 10'dan 10M olaya kadar ölçeklenir. iter_* fonksiyonları özellikleri tek tek
+# üretir (akış halinde tüketmek için); generate_* fonksiyonları tam yanıtı bellekte kurar.
+# 10M USGS özelliği tam yanıt olarak birkaç GB bellek tutar.
+
+from __future__ import annotations
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# [minLon, minLat, maxLon, maxLat] - main_runtime.py'deki Amerika kutusu
+AMERICAS_BBOX = (-180.0, -60.0, -30.0, 85.0)
+
+# Gutenberg-Richter (b=1) dağılımının alt sınırı; USGS feed'i M2.5 altını içermez
+MIN_MAGNITUDE = 2.5
+MAX_MAGNITUDE = 8.5
+# Depremlerin bu oranı birkaç sürü merkezinin etrafına yığılır (sürü tespiti için)
+SWARM_FRACTION = 0.1
+SWARM_CENTERS = 8
+SWARM_SPREAD_DEG = 0.3
+
+EONET_CATEGORIES = {
+    'wildfires': 'Wildfires',
+    'severeStorms': 'Severe Storms',
+    'volcanoes': 'Volcanoes',
+    'floods': 'Floods',
+}
+
+WEATHER_CONDITIONS = [
+    ('Clear', 'clear sky', '01d'),
+    ('Clouds', 'broken clouds', '04d'),
+    ('Rain', 'moderate rain', '10d'),
+    ('Thunderstorm', 'thunderstorm', '11d'),
+    ('Snow', 'light snow', '13d'),
+    ('Mist', 'mist', '50d'),
+]
+
+FORECAST_POINTS = 40
+FORECAST_STEP_SECONDS = 3 * 3600
+
+_SIZE_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+
+def parse_size(value) -> int:
+    """'10', '1k', '100K', '10M' -> olay sayısı"""
+    text = str(value).strip().lower().replace('_', '')
+    if text and text[-1] in _SIZE_SUFFIXES:
+        return int(float(text[:-1]) * _SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def format_size(n: int) -> str:
+    for suffix, factor in (('M', 1_000_000), ('k', 1_000)):
+        if n >= factor and n % factor == 0:
+            return f"{n // factor}{suffix}"
+    return str(n)
+
+
+def _magnitude(rng: random.Random) -> float:
+    # Ters dönüşümle G-R: P(M >= m) = 10^-(m - MIN)
+    return round(min(MAX_MAGNITUDE, MIN_MAGNITUDE - math.log10(1.0 - rng.random())), 1)
+
+
+def _random_point(rng: random.Random, bbox=AMERICAS_BBOX) -> Tuple[float, float]:
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return round(rng.uniform(min_lon, max_lon), 4), round(rng.uniform(min_lat, max_lat), 4)
+
+
+def iter_usgs_features(n: int, seed: int = 0, end_time: Optional[float] = None, span_hours: float = 24.0,
+                       bbox=AMERICAS_BBOX) -> Iterator[Dict[str, Any]]:
+    """USGS GeoJSON feature'ları; zamanlar end_time'dan önceki span_hours içine dağılır."""
+    rng = random.Random(seed)
+    end_ms = int((end_time if end_time is not None else time.time()) * 1000)
+    span_ms = int(span_hours * 3600 * 1000)
+    centers = [_random_point(rng, bbox) for _ in range(SWARM_CENTERS)]
+
+    for i in range(n):
+        if rng.random() < SWARM_FRACTION:
+            lon, lat = rng.choice(centers)
+            lon = round(lon + rng.uniform(-SWARM_SPREAD_DEG, SWARM_SPREAD_DEG), 4)
+            lat = round(lat + rng.uniform(-SWARM_SPREAD_DEG, SWARM_SPREAD_DEG), 4)
+            mag = round(rng.uniform(MIN_MAGNITUDE, 4.0), 1)
+        else:
+            lon, lat = _random_point(rng, bbox)
+            mag = _magnitude(rng)
+        event_ms = end_ms - rng.randrange(span_ms)
+        depth = round(rng.uniform(0.5, 70.0), 2)
+        yield {
+            "type": "Feature",
+            "properties": {
+                "mag": mag,
+                "place": f"{rng.randrange(1, 120)} km of Synthetic Region {i % 997}",
+                "time": event_ms,
+                "updated": event_ms + 60_000,
+                "url": f"https://earthquake.usgs.gov/earthquakes/eventpage/bench{i:08d}",
+                "status": "reviewed" if rng.random() < 0.7 else "automatic",
+                "tsunami": 0,
+                "sig": int(mag * 100),
+                "net": "us",
+                "code": f"bench{i:08d}",
+                "magType": "ml",
+                "type": "earthquake",
+                "title": f"M {mag} - Synthetic Region {i % 997}",
+            },
+            "geometry": {"type": "Point", "coordinates": [lon, lat, depth]},
+            "id": f"bench{i:08d}",
+        }
+
+
+def generate_usgs_geojson(n: int, seed: int = 0, end_time: Optional[float] = None,
+                          span_hours: float = 24.0, bbox=AMERICAS_BBOX) -> Dict[str, Any]:
+    features = list(iter_usgs_features(n, seed=seed, end_time=end_time, span_hours=span_hours, bbox=bbox))
+    return {
+        "type": "FeatureCollection",
+        "metadata": {
+            "generated": int((end_time if end_time is not None else time.time()) * 1000),
+            "title": "Synthetic USGS Earthquakes",
+            "status": 200,
+            "count": len(features),
+        },
+        "features": features,
+    }
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def iter_eonet_events(n: int, category: str = 'wildfires', seed: int = 0, end_time: Optional[float] = None,
+                      span_days: float = 14.0, bbox=AMERICAS_BBOX) -> Iterator[Dict[str, Any]]:
+    """EONET v3 events; her olayın 1-3 geometrisi vardır, bir kısmı kapanmıştır."""
+    rng = random.Random(seed)
+    end = datetime.fromtimestamp(end_time if end_time is not None else time.time(), tz=timezone.utc)
+    title = EONET_CATEGORIES.get(category, category)
+
+    for i in range(n):
+        lon, lat = _random_point(rng, bbox)
+        started = end - timedelta(seconds=rng.uniform(0, span_days * 86400))
+        geometries = []
+        for step in range(rng.randint(1, 3)):
+            geometries.append({
+                "magnitudeValue": None,
+                "magnitudeUnit": None,
+                "date": _iso(min(end, started + timedelta(hours=6 * step))),
+                "type": "Point",
+                "coordinates": [round(lon + 0.05 * step, 4), round(lat + 0.05 * step, 4)],
+            })
+        closed = _iso(end) if rng.random() < 0.2 else None
+        yield {
+            "id": f"EONET_BENCH_{category}_{i}",
+            "title": f"Synthetic {title} {i}",
+            "description": None,
+            "link": f"https://eonet.gsfc.nasa.gov/api/v3/events/EONET_BENCH_{category}_{i}",
+            "closed": closed,
+            "categories": [{"id": category, "title": title}],
+            "sources": [{"id": "BENCH", "url": "https://example.invalid/bench"}],
+            "geometry": geometries,
+        }
+
+
+def generate_eonet_events(n: int, category: str = 'wildfires', seed: int = 0, end_time: Optional[float] = None,
+                          span_days: float = 14.0, bbox=AMERICAS_BBOX) -> Dict[str, Any]:
+    return {
+        "title": "EONET Events",
+        "description": "Synthetic natural events",
+        "link": "https://eonet.gsfc.nasa.gov/api/v3/events",
+        "events": list(iter_eonet_events(n, category=category, seed=seed, end_time=end_time,
+                                         span_days=span_days, bbox=bbox)),
+    }
+
+
+def generate_openweather(city: str, seed: int = 0, forecast_points: int = FORECAST_POINTS,
+                         end_time: Optional[float] = None, bbox=AMERICAS_BBOX) -> Dict[str, Any]:
+    """OpenWeatherSource.fetch_raw() biçimi: {"current": ..., "forecast": {"list": [...]}}"""
+    rng = random.Random(f"{seed}:{city}")
+    now = int(end_time if end_time is not None else time.time())
+    lon, lat = _random_point(rng, bbox)
+
+    def _reading():
+        temp = round(rng.uniform(-15.0, 40.0), 2)
+        main, description, icon = rng.choice(WEATHER_CONDITIONS)
+        reading = {
+            "weather": [{"id": 800, "main": main, "description": description, "icon": icon}],
+            "main": {
+                "temp": temp,
+                "feels_like": round(temp - rng.uniform(0, 4), 2),
+                "temp_min": round(temp - rng.uniform(0, 3), 2),
+                "temp_max": round(temp + rng.uniform(0, 3), 2),
+                "pressure": rng.randint(975, 1040),
+                "humidity": rng.randint(20, 100),
+            },
+            "wind": {"speed": round(rng.uniform(0, 25), 2), "deg": rng.randrange(360),
+                     "gust": round(rng.uniform(0, 35), 2)},
+            "clouds": {"all": rng.randrange(101)},
+        }
+        if main == 'Rain':
+            reading["rain"] = {"1h": round(rng.uniform(0.1, 20), 2), "3h": round(rng.uniform(0.3, 40), 2)}
+        elif main == 'Snow':
+            reading["snow"] = {"1h": round(rng.uniform(0.1, 5), 2), "3h": round(rng.uniform(0.3, 10), 2)}
+        return reading
+
+    current = _reading()
+    current.update({
+        "coord": {"lon": lon, "lat": lat},
+        "visibility": rng.choice([10000, 8000, 3000, 800]),
+        "dt": now,
+        "sys": {"country": "US", "sunrise": now - 6 * 3600, "sunset": now + 6 * 3600},
+        "name": city,
+    })
+
+    forecast_list = []
+    for step in range(forecast_points):
+        item = _reading()
+        item["dt"] = now + (step + 1) * FORECAST_STEP_SECONDS
+        item["dt_txt"] = datetime.fromtimestamp(item["dt"]).strftime('%Y-%m-%d %H:%M:%S')
+        forecast_list.append(item)
+
+    return {
+        "current": current,
+        "forecast": {"cod": "200", "cnt": len(forecast_list), "list": forecast_list,
+                     "city": {"name": city, "coord": {"lat": lat, "lon": lon}}},
+    }
+
+
+def generate_openmeteo_flood(latitude: float, longitude: float, days: int = 10, seed: int = 0,
+                             start_date: Optional[datetime] = None) -> Dict[str, Any]:
+    """Open-Meteo flood API yanıtı (günlük river_discharge serisi)."""
+    rng = random.Random(f"{seed}:{latitude}:{longitude}")
+    start = (start_date or datetime.now() - timedelta(days=3)).date()
+    base = rng.uniform(5, 400)
+    discharge = []
+    for day in range(days):
+        # Ara sıra taşkın tepesi
+        peak = rng.uniform(2.0, 6.0) if rng.random() < 0.1 else 1.0
+        discharge.append(round(base * rng.uniform(0.7, 1.3) * peak, 2))
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "generationtime_ms": 0.5,
+        "utc_offset_seconds": 0,
+        "timezone": "GMT",
+        "daily_units": {"time": "iso8601", "river_discharge": "m³/s"},
+        "daily": {
+            "time": [(start + timedelta(days=day)).isoformat() for day in range(days)],
+            "river_discharge": discharge,
+        },
+    }
+
+
+def weather_cities(n_events: int, forecast_points: int = FORECAST_POINTS) -> List[str]:
+    # Şehir başına 1 anlık + forecast_points tahmin kaydı
+    count = max(1, math.ceil(n_events / (1 + forecast_points)))
+    return [f"Bench City {i:05d}" for i in range(count)]
+
+
+def flood_locations(n_events: int, days: int = 10, seed: int = 0,
+                    bbox=AMERICAS_BBOX) -> List[Tuple[str, float, float]]:
+    rng = random.Random(seed)
+    count = max(1, math.ceil(n_events / days))
+    locations = []
+    for i in range(count):
+        lon, lat = _random_point(rng, bbox)
+        locations.append((f"Bench River {i:05d}", lat, lon))
+    return locations
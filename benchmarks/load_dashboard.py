@@ -0,0 +1,523 @@
+# Dashboard yük testi
+# templates/dashboard.html'in tarayıcıdaki istek düzenini N sanal istemciyle tekrarlar:
+# sayfa açılışı, 30 saniyelik toplu yenileme (deprem, hava, EONET, yangın, fırtına, sel,
+# volkan, uyarılar, haberler), fay listesi ve her fay için iki risk sorgusu (harita + kenar
+# çubuğu), sürü sorgusu ve ara sıra simülasyon POST'u. Tarayıcı gibi her istemci aynı anda
+# en fazla BROWSER_CONNECTIONS istek açar.
+#
+# Rapor: route başına gecikme yüzdelikleri, hata oranları ve sunucu sürecinin /proc'tan
+# okunan CPU/bellek kullanımı (JSON, benchmarks/results/load-<zaman>.json).
+#
+# Varsayılan fixture modu çevrimdışı çalışır: sentetik kaynaklar gerçek pipeline'dan
+# geçirilip geçici bir veri klasörüne yazılır, dashboard bu klasörle (SDEWS_DATA_DIR)
+# yerel bir portta başlatılır. --url ile çalışan bir sunucu da test edilebilir.
+#
+#   python -m benchmarks.load_dashboard --clients 50 --duration 120 --interval 5
+#   python -m benchmarks.load_dashboard --url http://host:5000 --server-pid 1234
+#   python -m benchmarks.load_dashboard --make-fixture /tmp/sdews-fixture --fixture-size 5k
+
+from __future__ import annotations
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from benchmarks.generators import AMERICAS_BBOX, parse_size
+from benchmarks.report import RESULTS_DIR, environment, save_report
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+REFRESH_INTERVAL = 30.0
+BROWSER_CONNECTIONS = 6
+REQUEST_TIMEOUT = 30.0
+SERVER_START_TIMEOUT = 60.0
+SAMPLE_INTERVAL = 1.0
+DEFAULT_FIXTURE_SIZE = "2k"
+
+# dashboard.html'deki setInterval(..., 30000) bloğunun istekleri
+REFRESH_ROUTES = [
+    '/api/earthquakes',
+    '/api/weather',
+    '/api/eonet?status=open&days=30&limit=100',
+    '/api/wildfires',
+    '/api/storms',
+    '/api/floods',
+    '/api/volcanoes',
+    '/api/alerts/current',
+    '/api/alerts/forecast',
+]
+NEWS_ROUTE = '/api/news'
+SWARM_ROUTE = '/api/seismic-risk/swarms?min_count=3&max_magnitude=5.0&cluster_radius=100&min_days=0&max_days=1'
+FAULTS_ROUTE = '/api/seismic-risk/faults'
+FAULT_ROUTE = '/api/seismic-risk/fault/{}'
+SIMULATION_ROUTE = '/api/seismic-simulation/trigger'
+
+# Pipeline processor'ı dosyayı yazamazsa fixture'da parse çıktısı aynı biçimde yazılır
+FIXTURE_FALLBACK_FILES = {
+    'EONETWildfireSource': 'wildfires.json',
+    'EONETStormSource': 'storms.json',
+}
+
+
+def _route_label(method: str, path: str) -> str:
+    path = path.split('?', 1)[0]
+    if path.startswith('/api/seismic-risk/fault/'):
+        path = '/api/seismic-risk/fault/<fault_id>'
+    return f"{method} {path}"
+
+
+def _percentile(ordered: List[float], q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 6)
+
+
+class LoadRecorder:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, label: str, seconds: float, status: Optional[int], size: int, error: Optional[str] = None):
+        with self.lock:
+            route = self.routes.setdefault(label, {'latencies': [], 'errors': 0, 'status': {}, 'bytes': 0,
+                                                   'last_error': None})
+            route['latencies'].append(seconds)
+            route['bytes'] += size
+            key = str(status) if status is not None else 'exception'
+            route['status'][key] = route['status'].get(key, 0) + 1
+            if error or status is None or status >= 400:
+                route['errors'] += 1
+                route['last_error'] = error or f"HTTP {status}"
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        with self.lock:
+            routes = []
+            total = errors = 0
+            for label, route in sorted(self.routes.items()):
+                ordered = sorted(route['latencies'])
+                count = len(ordered)
+                total += count
+                errors += route['errors']
+                routes.append({
+                    'route': label,
+                    'count': count,
+                    'errors': route['errors'],
+                    'error_rate': round(route['errors'] / count, 4) if count else 0.0,
+                    'status': route['status'],
+                    'mean_seconds': round(sum(ordered) / count, 6) if count else None,
+                    'p50': _percentile(ordered, 0.50),
+                    'p95': _percentile(ordered, 0.95),
+                    'p99': _percentile(ordered, 0.99),
+                    'max_seconds': round(ordered[-1], 6) if ordered else None,
+                    'requests_per_second': round(count / elapsed, 3) if elapsed > 0 else None,
+                    'bytes': route['bytes'],
+                    'last_error': route['last_error']
+                })
+        return {
+            'requests': total,
+            'errors': errors,
+            'error_rate': round(errors / total, 4) if total else 0.0,
+            'requests_per_second': round(total / elapsed, 3) if elapsed > 0 else None,
+            'routes': routes
+        }
+
+
+class ResourceSampler:
+    """Sunucu sürecinin (ve worker çocuklarının) CPU ve RSS kullanımını /proc üzerinden örnekler (yalnızca Linux)."""
+
+    def __init__(self, pid: int, interval: float = SAMPLE_INTERVAL):
+        self.pid = pid
+        self.interval = interval
+        self.ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self.samples: List[Dict[str, float]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _read_pid(self, pid: int) -> Optional[Dict[str, float]]:
+        try:
+            with open(f"/proc/{pid}/stat", "r") as f:
+                # comm alanı boşluk içerebilir; ')' sonrasından itibaren alanlar sabit sıradadır
+                fields = f.read().rsplit(')', 1)[1].split()
+            cpu_seconds = (int(fields[11]) + int(fields[12])) / self.ticks
+            threads = int(fields[17])
+            rss_kb = 0
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        rss_kb = int(line.split()[1])
+                        break
+            return {'cpu_seconds': cpu_seconds, 'rss_mb': rss_kb / 1024, 'threads': threads}
+        except (OSError, IndexError, ValueError):
+            return None
+
+    def _children(self) -> List[int]:
+        # Çok süreçli sunucularda (serve.py, gunicorn) worker'lar ana sürecin çocuklarıdır
+        children = []
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "r") as f:
+                    ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            if ppid == self.pid:
+                children.append(int(entry))
+        return children
+
+    def _read(self) -> Optional[Dict[str, float]]:
+        total = self._read_pid(self.pid)
+        if total is None:
+            return None
+        total['processes'] = 1
+        for child in self._children():
+            usage = self._read_pid(child)
+            if usage is None:
+                continue
+            for key in ('cpu_seconds', 'rss_mb', 'threads'):
+                total[key] += usage[key]
+            total['processes'] += 1
+        total['at'] = time.time()
+        return total
+
+    def _loop(self):
+        previous = self._read()
+        while previous is not None and not self._stop.wait(self.interval):
+            current = self._read()
+            if current is None:
+                break
+            wall = current['at'] - previous['at']
+            # Worker kapanırsa toplam süre azalabilir; negatif örnek sıfırlanır
+            used = max(0.0, current['cpu_seconds'] - previous['cpu_seconds'])
+            current['cpu_percent'] = 100.0 * used / wall if wall > 0 else 0.0
+            self.samples.append(current)
+            previous = current
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="Load-ResourceSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Optional[Dict[str, Any]]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+        if not self.samples:
+            return None
+        cpu = [s['cpu_percent'] for s in self.samples]
+        return {
+            'pid': self.pid,
+            'samples': len(self.samples),
+            'cpu_percent_avg': round(sum(cpu) / len(cpu), 2),
+            'cpu_percent_max': round(max(cpu), 2),
+            'cpu_seconds_total': round(self.samples[-1]['cpu_seconds'], 3),
+            'rss_mb_max': round(max(s['rss_mb'] for s in self.samples), 2),
+            'rss_mb_last': round(self.samples[-1]['rss_mb'], 2),
+            'threads_max': max(s['threads'] for s in self.samples),
+            'processes_max': max(s['processes'] for s in self.samples)
+        }
+
+
+class VirtualClient:
+    """Tek bir tarayıcı sekmesi: açılışta sayfayı yükler, sonra her interval'de yeniler."""
+
+    def __init__(self, client_id: int, base_url: str, recorder: LoadRecorder, interval: float,
+                 include_news: bool, simulation_rate: float, seed: int = 0):
+        self.client_id = client_id
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.interval = interval
+        self.include_news = include_news
+        self.simulation_rate = simulation_rate
+        self.rng = random.Random(seed * 100003 + client_id)
+        self.cycles = 0
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        # Tarayıcı gibi bağlantı başına keep-alive; her havuz thread'i kendi oturumunu kullanır
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def request(self, path: str, method: str = 'GET', payload: Optional[Dict[str, Any]] = None):
+        label = _route_label(method, path)
+        started = time.perf_counter()
+        try:
+            response = self._session().request(method, self.base_url + path, json=payload, timeout=REQUEST_TIMEOUT)
+            body = response.content
+            self.recorder.record(label, time.perf_counter() - started, response.status_code, len(body))
+            return response
+        except requests.RequestException as e:
+            self.recorder.record(label, time.perf_counter() - started, None, 0, error=type(e).__name__)
+            return None
+
+    def _fault_ids(self, response) -> List[str]:
+        if response is None or response.status_code != 200:
+            return []
+        try:
+            return [fault['fault_id'] for fault in response.json().get('fault_lines', []) if 'fault_id' in fault]
+        except (ValueError, AttributeError, TypeError):
+            return []
+
+    def _simulation_payload(self) -> Dict[str, float]:
+        min_lon, min_lat, max_lon, max_lat = AMERICAS_BBOX
+        user_lat = self.rng.uniform(max(min_lat, 10), min(max_lat, 55))
+        user_lon = self.rng.uniform(max(min_lon, -125), min(max_lon, -65))
+        return {
+            'user_latitude': user_lat,
+            'user_longitude': user_lon,
+            'epicenter_latitude': user_lat + self.rng.uniform(-3, 3),
+            'epicenter_longitude': user_lon + self.rng.uniform(-3, 3)
+        }
+
+    def refresh(self, pool: ThreadPoolExecutor, page_load: bool = False):
+        futures = []
+        if page_load:
+            futures.append(pool.submit(self.request, '/'))
+        routes = list(REFRESH_ROUTES) + [SWARM_ROUTE]
+        if self.include_news:
+            routes.append(NEWS_ROUTE)
+        faults = pool.submit(self.request, FAULTS_ROUTE)
+        futures.extend(pool.submit(self.request, path) for path in routes)
+
+        # Fay listesi gelince her fay için harita ve kenar çubuğu ayrı ayrı sorgular
+        for fault_id in self._fault_ids(faults.result()):
+            futures.append(pool.submit(self.request, FAULT_ROUTE.format(fault_id)))
+            futures.append(pool.submit(self.request, FAULT_ROUTE.format(fault_id)))
+
+        if self.simulation_rate and self.rng.random() < self.simulation_rate:
+            futures.append(pool.submit(self.request, SIMULATION_ROUTE, 'POST', self._simulation_payload()))
+
+        for future in futures:
+            future.result()
+        self.cycles += 1
+
+    def run(self, start_at: float, deadline: float, stop: threading.Event):
+        if stop.wait(max(0.0, start_at - time.time())):
+            return
+        with ThreadPoolExecutor(max_workers=BROWSER_CONNECTIONS,
+                                thread_name_prefix=f"Client-{self.client_id}") as pool:
+            next_cycle = time.time()
+            page_load = True
+            while time.time() < deadline and not stop.is_set():
+                self.refresh(pool, page_load=page_load)
+                page_load = False
+                next_cycle += self.interval
+                if stop.wait(max(0.0, min(next_cycle, deadline) - time.time())):
+                    break
+
+
+def run_load(base_url: str, clients: int, duration: float, interval: float = REFRESH_INTERVAL,
+             ramp_up: Optional[float] = None, include_news: bool = False, simulation_rate: float = 0.0,
+             server_pid: Optional[int] = None, seed: int = 0) -> Dict[str, Any]:
+    recorder = LoadRecorder()
+    sampler = ResourceSampler(server_pid) if server_pid else None
+    stop = threading.Event()
+    # İzleyiciler ilk yenileme aralığına yayılarak bağlanır
+    ramp_up = min(interval, duration / 2) if ramp_up is None else ramp_up
+    started = time.time()
+    deadline = started + duration
+
+    virtual_clients = [VirtualClient(i, base_url, recorder, interval, include_news, simulation_rate, seed=seed)
+                       for i in range(clients)]
+    threads = [threading.Thread(target=client.run, name=f"VirtualClient-{client.client_id}", daemon=True,
+                                args=(started + ramp_up * client.client_id / max(1, clients), deadline, stop))
+               for client in virtual_clients]
+    if sampler:
+        sampler.start()
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=REQUEST_TIMEOUT)
+    elapsed = time.time() - started
+
+    result = recorder.summary(elapsed)
+    result.update({
+        'elapsed_seconds': round(elapsed, 3),
+        'cycles': sum(client.cycles for client in virtual_clients),
+        'resources': sampler.stop() if sampler else None
+    })
+    return result
+
+
+def make_fixture(size: int, seed: int = 0) -> Dict[str, Any]:
+    """Sentetik kaynakları gerçek pipeline'dan geçirip veri klasörüne (SDEWS_DATA_DIR) yazar."""
+    from benchmarks.macro import build_sources
+    from pipeline import RuntimeSystem
+    from processing.storage import save_events_to_json, veri_klasoru
+
+    sources = build_sources(size, seed=seed)
+    RuntimeSystem(data_sources=sources, use_wal=False, autoscale=True).start()
+
+    for source in sources:
+        filename = FIXTURE_FALLBACK_FILES.get(source.__class__.__name__)
+        if filename and not (veri_klasoru / filename).exists():
+            save_events_to_json(source.parse(source.fetch_raw()), filename)
+
+    return {'directory': str(veri_klasoru), 'size': size, 'files': sorted(p.name for p in veri_klasoru.glob('*.json'))}
+
+
+def build_fixture_dir(directory: Path, size: int, seed: int = 0):
+    # veri_klasoru import sırasında belirlendiği için fixture ayrı bir süreçte üretilir
+    env = dict(os.environ, SDEWS_DATA_DIR=str(directory))
+    subprocess.run([sys.executable, '-m', 'benchmarks.load_dashboard', '--make-fixture', str(directory),
+                    '--fixture-size', str(size), '--seed', str(seed)],
+                   cwd=PROJECT_ROOT, env=env, check=True)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_dashboard(data_dir: Path, port: int, workers: Optional[int] = None,
+                    threads: Optional[int] = None) -> subprocess.Popen:
+    env = dict(os.environ, SDEWS_DATA_DIR=str(data_dir))
+    if workers:
+        # Üretim modu (serve.py): preload + çok worker, paylaşılan önbellek
+        command = [sys.executable, 'serve.py', '--host', '127.0.0.1', '--port', str(port),
+                   '--workers', str(workers)]
+        if threads:
+            command += ['--threads', str(threads)]
+    else:
+        # dashboard.py'nin __main__ bloğu debug reloader ile ikinci süreç açar; burada tek süreç çalışır
+        command = [sys.executable, '-c',
+                   f"import dashboard; dashboard.app.run(host='127.0.0.1', port={port}, threaded=True)"]
+    return subprocess.Popen(command, cwd=PROJECT_ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_ready(base_url: str, process: Optional[subprocess.Popen] = None,
+                     timeout: float = SERVER_START_TIMEOUT):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Dashboard exited with code {process.returncode}")
+        try:
+            if requests.get(base_url + FAULTS_ROUTE, timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Dashboard did not respond within {timeout:.0f}s")
+
+
+def _print_summary(result: Dict[str, Any]):
+    print(f"\n{'route':48} {'count':>7} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for route in result['routes']:
+        print(f"{route['route']:48} {route['count']:>7} {route['error_rate'] * 100:>5.1f}% "
+              f"{route['p50'] or 0:>8.4f} {route['p95'] or 0:>8.4f} {route['p99'] or 0:>8.4f}")
+    print(f"\n{result['requests']} requests, {result['requests_per_second']} req/s, "
+          f"error rate {result['error_rate'] * 100:.2f}%")
+    resources = result.get('resources')
+    if resources:
+        print(f"server cpu avg {resources['cpu_percent_avg']}% max {resources['cpu_percent_max']}%, "
+              f"rss max {resources['rss_mb_max']} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_dashboard",
+                                     description="Load test the dashboard with the browser polling pattern")
+    parser.add_argument("--clients", type=int, default=10, help="virtual dashboard viewers")
+    parser.add_argument("--duration", type=float, default=60.0, help="test length in seconds")
+    parser.add_argument("--interval", type=float, default=REFRESH_INTERVAL,
+                        help="refresh interval per client (browser: 30s; lower it to compress time)")
+    parser.add_argument("--ramp-up", type=float, default=None, help="seconds over which clients connect")
+    parser.add_argument("--simulation-rate", type=float, default=0.05,
+                        help="probability per refresh that a client posts a seismic simulation")
+    parser.add_argument("--include-news", action="store_true", help="also poll /api/news (scrapes the web)")
+    parser.add_argument("--url", default=None, help="test a running dashboard instead of starting one")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="start the production server (serve.py) with N workers instead of the dev server")
+    parser.add_argument("--threads", type=int, default=None, help="threads per worker with --workers")
+    parser.add_argument("--server-pid", type=int, default=None, help="pid to sample CPU/memory with --url")
+    parser.add_argument("--data-dir", default=None, help="serve an existing data directory instead of a fixture")
+    parser.add_argument("--fixture-size", default=DEFAULT_FIXTURE_SIZE, help="earthquakes in the generated fixture")
+    parser.add_argument("--make-fixture", default=None, metavar="DIR", help="only build a fixture data directory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="report path (default: benchmarks/results/load-<time>.json)")
+    args = parser.parse_args(argv)
+
+    if args.make_fixture:
+        if os.environ.get("SDEWS_DATA_DIR") != str(args.make_fixture):
+            build_fixture_dir(Path(args.make_fixture), parse_size(args.fixture_size), seed=args.seed)
+        else:
+            print(make_fixture(parse_size(args.fixture_size), seed=args.seed))
+        return 0
+
+    process = None
+    temp_dir = None
+    mode = 'external'
+    base_url = args.url
+    try:
+        if base_url is None:
+            if args.data_dir:
+                data_dir, mode = Path(args.data_dir).resolve(), 'data-dir'
+            else:
+                temp_dir = tempfile.TemporaryDirectory(prefix='sdews-load-fixture-')
+                data_dir, mode = Path(temp_dir.name), 'fixture'
+                print(f"Building fixture ({args.fixture_size} earthquakes) in {data_dir}...", flush=True)
+                build_fixture_dir(data_dir, parse_size(args.fixture_size), seed=args.seed)
+            port = _free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            process = start_dashboard(data_dir, port, workers=args.workers, threads=args.threads)
+        wait_until_ready(base_url, process)
+
+        print(f"Running {args.clients} clients for {args.duration:.0f}s against {base_url} "
+              f"(refresh every {args.interval:g}s)", flush=True)
+        result = run_load(base_url, args.clients, args.duration, interval=args.interval, ramp_up=args.ramp_up,
+                          include_news=args.include_news, simulation_rate=args.simulation_rate,
+                          server_pid=process.pid if process is not None else args.server_pid, seed=args.seed)
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    report = {
+        'schema': 1,
+        'kind': 'load',
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': environment(),
+        'parameters': {
+            'clients': args.clients,
+            'duration': args.duration,
+            'interval': args.interval,
+            'simulation_rate': args.simulation_rate,
+            'include_news': args.include_news,
+            'fixture_size': parse_size(args.fixture_size) if mode == 'fixture' else None,
+            'seed': args.seed
+        },
+        'server': {'url': base_url, 'mode': mode, 'workers': args.workers, 'threads': args.threads},
+        'result': result
+    }
+    _print_summary(result)
+    path = save_report(report, Path(args.output) if args.output else
+                       RESULTS_DIR / f"load-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    print(f"Report written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+# Makro benchmark'lar
+# RuntimeSystem uçtan uca çalıştırılır: gerçek DataSource sınıflarının fetch_raw'ı sentetik
+# yanıt döndürecek şekilde değiştirilir (sınıf adları aynı kaldığı için pipeline doğru
+# processor'ı seçer), ardından bir döngü start() ile işlenir. WAL açıksa aynı batch'ler
+# replay() ile veri çekmeden tekrar işlenir; bu ölçüm ağ/parse maliyetini dışarıda bırakır.
+#
+# Not: pipeline çıktıları normal bir çalışmadaki gibi data/ altına yazılır (earthquakes.json,
+# stats, alerts...). WAL ise geçici bir dizinde tutulur, data/wal'a dokunulmaz.
+
+from __future__ import annotations
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks import generators
+from datasources.usgs_earthquake import USGSEarthquakeSource
+from datasources.eonet_source import EONETSource
+from datasources.eonet_wildfire_source import EONETWildfireSource
+from datasources.eonet_storm_source import EONETStormSource
+from datasources.eonet_volcano_source import EONETVolcanoSource
+from datasources.openweather_source import OpenWeatherSource
+from datasources.flood_openmeteo_source import OpenMeteoFloodSource
+from pipeline import RuntimeSystem
+from pipeline.metrics import METRICS
+
+# size deprem başına diğer kaynakların payı
+EONET_SHARE = 0.1
+WEATHER_SHARE = 0.25
+FLOOD_SHARE = 0.1
+FLOOD_DAYS = 10
+# Her kaynak bir fetch thread'i açtığı için şehir/nehir sayısı sınırlanır
+MAX_SOURCES_PER_KIND = 100
+
+
+def _serve(source, payload):
+    # fetch_raw ağa çıkmadan hazır yanıtı döndürür; parse gerçek koddur
+    source.fetch_raw = lambda: payload
+    source.last_response_bytes = 0
+    return source
+
+
+def build_sources(size: int, seed: int = 0, end_time: Optional[float] = None) -> List[Any]:
+    end_time = end_time if end_time is not None else time.time()
+    bbox = list(generators.AMERICAS_BBOX)
+    eonet_count = max(1, int(size * EONET_SHARE))
+
+    sources = [
+        _serve(USGSEarthquakeSource(bbox=bbox),
+               generators.generate_usgs_geojson(size, seed=seed, end_time=end_time)),
+        _serve(EONETSource(bbox=bbox),
+               generators.generate_eonet_events(eonet_count, category='floods', seed=seed, end_time=end_time)),
+        _serve(EONETWildfireSource(),
+               generators.generate_eonet_events(eonet_count, category='wildfires', seed=seed + 1, end_time=end_time)),
+        _serve(EONETStormSource(),
+               generators.generate_eonet_events(eonet_count, category='severeStorms', seed=seed + 2, end_time=end_time)),
+        _serve(EONETVolcanoSource(),
+               generators.generate_eonet_events(eonet_count, category='volcanoes', seed=seed + 3, end_time=end_time)),
+    ]
+
+    cities = generators.weather_cities(max(1, int(size * WEATHER_SHARE)))[:MAX_SOURCES_PER_KIND]
+    for city in cities:
+        sources.append(_serve(OpenWeatherSource(city=city, include_forecast=True),
+                              generators.generate_openweather(city, seed=seed, end_time=end_time)))
+
+    locations = generators.flood_locations(max(1, int(size * FLOOD_SHARE)), days=FLOOD_DAYS,
+                                           seed=seed)[:MAX_SOURCES_PER_KIND]
+    for name, lat, lon in locations:
+        sources.append(_serve(OpenMeteoFloodSource(latitude=lat, longitude=lon, location_name=name),
+                              generators.generate_openmeteo_flood(lat, lon, days=FLOOD_DAYS, seed=seed)))
+    return sources
+
+
+def _stage_summary(snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    stages = []
+    for histogram in snapshot.get('histograms', []):
+        if histogram['name'] != 'stage_seconds':
+            continue
+        labels = {k: v for k, v in histogram['labels'].items() if k != 'process'}
+        stages.append({
+            'labels': labels,
+            'count': histogram['count'],
+            'sum_seconds': histogram['sum'],
+            'p50': histogram['p50'],
+            'p95': histogram['p95'],
+            'p99': histogram['p99']
+        })
+    return sorted(stages, key=lambda s: -s['sum_seconds'])
+
+
+def _counter_total(snapshot: Dict[str, Any], name: str) -> float:
+    return sum(c['value'] for c in snapshot.get('counters', []) if c['name'] == name)
+
+
+def _pipeline_summary(runtime: RuntimeSystem) -> Dict[str, Any]:
+    stats = runtime.pipeline.get_statistics()
+    return {
+        'processed_batches': stats['processed_count'],
+        'errors': stats['error_count'],
+        'coalesced_batches': stats['coalesced_batch_count'],
+        'cpu_dispatched': stats['cpu_dispatched_count'],
+        'cpu_inline': stats['cpu_inline_count'],
+        'left_in_queue': stats['input_queue_size'],
+        'latency': stats['priority_queue'].get('latency')
+    }
+
+
+def run_cycle(size: int, seed: int = 0, use_wal: bool = True, autoscale: bool = True,
+              num_consumers: int = 3) -> List[Dict[str, Any]]:
+    """Sentetik kaynaklarla tek RuntimeSystem döngüsü; WAL açıksa ardından replay ölçülür."""
+    started = time.perf_counter()
+    sources = build_sources(size, seed=seed)
+    setup_seconds = time.perf_counter() - started
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='sdews-bench-wal-') as wal_dir:
+        METRICS.reset()
+        runtime = RuntimeSystem(data_sources=sources, num_consumers=num_consumers, use_wal=use_wal,
+                                autoscale=autoscale, wal_dir=wal_dir)
+        started = time.perf_counter()
+        runtime.start()
+        elapsed = time.perf_counter() - started
+        snapshot = METRICS.snapshot()
+        items = int(_counter_total(snapshot, 'fetched_items_total'))
+        results.append({
+            'kind': 'macro', 'name': 'runtime_cycle', 'size': size,
+            'sources': len(sources),
+            'setup_seconds': round(setup_seconds, 6),
+            'seconds': round(elapsed, 6),
+            'items': items,
+            'items_per_second': round(items / elapsed, 2) if elapsed > 0 else None,
+            'pipeline': _pipeline_summary(runtime),
+            'stages': _stage_summary(snapshot)
+        })
+
+        if use_wal:
+            METRICS.reset()
+            replay_runtime = RuntimeSystem(data_sources=[], num_consumers=num_consumers, use_wal=True,
+                                           autoscale=autoscale, wal_dir=wal_dir)
+            started = time.perf_counter()
+            summary = replay_runtime.replay(include_processed=True)
+            elapsed = time.perf_counter() - started
+            results.append({
+                'kind': 'macro', 'name': 'wal_replay', 'size': size,
+                'seconds': round(elapsed, 6),
+                'batches': summary.get('batches', 0),
+                'items': summary.get('items', 0),
+                'items_per_second': round(summary.get('items', 0) / elapsed, 2) if elapsed > 0 else None,
+                'pipeline': _pipeline_summary(replay_runtime),
+                'stages': _stage_summary(METRICS.snapshot())
+            })
+    return results
+
+
+def run_macro(sizes: List[int], seed: int = 0, use_wal: bool = True, autoscale: bool = True,
+              progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    results = []
+    for size in sizes:
+        for result in run_cycle(size, seed=seed, use_wal=use_wal, autoscale=autoscale):
+            results.append(result)
+            if progress:
+                progress(result)
+    return results
@@ -0,0 +1,263 @@
+# Mikro benchmark'lar
+# Pipeline'ın tek tek adımları sentetik veriyle ölçülür: kaynak parse'ları, USGS temizleme,
+# temel istatistik, sürü tespiti, dashboard'un son 1 hafta filtresi, uyarı kuralları, JSON
+# kalıcılığı, sütunsal model tablosu, pipeline'ın EventBatch'i (temizleme, pickle) ve Monte Carlo
+# deprem erken uyarı simülasyonu. Girdi (fixture) her büyüklük için bir kez kurulur ve
+# ölçüme dahil edilmez.
+
+from __future__ import annotations
+import os
+import pickle
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks import generators
+from datasources.usgs_earthquake import USGSEarthquakeSource
+from datasources.eonet_source import EONETSource
+from datasources.openweather_source import OpenWeatherSource
+from datasources.flood_openmeteo_source import OpenMeteoFloodSource
+from processing.earthquake_processing import clean_usgs_earthquake_events, clean_usgs_earthquake_batch
+from processing.analytics import compute_basic_stats
+from processing.swarm_tracker import SwarmTracker
+from processing.alert_rules import AlertRuleEngine, select_current_weather, group_forecasts
+from processing.seismic_simulation import simulate_earthquake_batch
+from pipeline.cpu_stages import encode_events_json
+from models import CleanedEarthquake
+from models.columnar import ColumnarTable
+
+DEFAULT_REPEAT = 3
+FLOOD_DAYS = 10
+
+
+class Fixtures:
+    """Bir büyüklük için sentetik girdiler; her parça ilk kullanıldığında üretilir."""
+
+    def __init__(self, size: int, seed: int = 0, end_time: Optional[float] = None, work_dir: Optional[Path] = None):
+        self.size = size
+        self.seed = seed
+        self.end_time = end_time if end_time is not None else time.time()
+        self.work_dir = work_dir or Path(tempfile.gettempdir())
+        self._cache: Dict[str, Any] = {}
+
+    def _get(self, key: str, build: Callable[[], Any]):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    @property
+    def usgs_geojson(self):
+        return self._get('usgs_geojson', lambda: generators.generate_usgs_geojson(
+            self.size, seed=self.seed, end_time=self.end_time))
+
+    @property
+    def raw_earthquakes(self):
+        return self._get('raw_earthquakes', lambda: USGSEarthquakeSource().parse(self.usgs_geojson))
+
+    @property
+    def raw_earthquake_batch(self):
+        return self._get('raw_earthquake_batch', lambda: USGSEarthquakeSource().parse_batch(self.usgs_geojson))
+
+    @property
+    def cleaned_earthquakes(self):
+        return self._get('cleaned_earthquakes', lambda: [
+            ev.toDictionary() for ev in clean_usgs_earthquake_events(self.raw_earthquakes)])
+
+    @property
+    def eonet_payload(self):
+        return self._get('eonet_payload', lambda: generators.generate_eonet_events(
+            self.size, seed=self.seed, end_time=self.end_time))
+
+    @property
+    def eonet_events(self):
+        return self._get('eonet_events', lambda: EONETSource().parse(self.eonet_payload))
+
+    @property
+    def weather_payloads(self) -> List[Tuple[str, Dict[str, Any]]]:
+        return self._get('weather_payloads', lambda: [
+            (city, generators.generate_openweather(city, seed=self.seed, end_time=self.end_time))
+            for city in generators.weather_cities(self.size)])
+
+    @property
+    def weather_records(self):
+        def build():
+            records = []
+            for city, payload in self.weather_payloads:
+                records.extend(ev.toDictionary() for ev in OpenWeatherSource(city=city).parse(payload))
+            return records
+        return self._get('weather_records', build)
+
+    @property
+    def dashboard_filter(self):
+        # dashboard Flask uygulamasını yükler; import süresi ölçüme girmesin diye burada
+        def build():
+            from dashboard import filter_last_one_week
+            return filter_last_one_week
+        return self._get('dashboard_filter', build)
+
+    @property
+    def flood_payloads(self):
+        return self._get('flood_payloads', lambda: [
+            (name, lat, lon, generators.generate_openmeteo_flood(lat, lon, days=FLOOD_DAYS, seed=self.seed))
+            for name, lat, lon in generators.flood_locations(self.size, days=FLOOD_DAYS, seed=self.seed)])
+
+
+# --- Ölçülen adımlar: her biri işlenen öğe sayısını döndürür ---
+
+def bench_usgs_parse(fx: Fixtures) -> int:
+    return len(USGSEarthquakeSource().parse(fx.usgs_geojson))
+
+
+def bench_eonet_parse(fx: Fixtures) -> int:
+    return len(EONETSource().parse(fx.eonet_payload))
+
+
+def bench_openweather_parse(fx: Fixtures) -> int:
+    count = 0
+    for city, payload in fx.weather_payloads:
+        count += len(OpenWeatherSource(city=city).parse(payload))
+    return count
+
+
+def bench_flood_parse(fx: Fixtures) -> int:
+    count = 0
+    for name, lat, lon, payload in fx.flood_payloads:
+        count += len(OpenMeteoFloodSource(latitude=lat, longitude=lon, location_name=name).parse(payload))
+    return count
+
+
+def bench_clean_usgs(fx: Fixtures) -> int:
+    return len(clean_usgs_earthquake_events(fx.raw_earthquakes))
+
+
+def bench_clean_usgs_batch(fx: Fixtures) -> int:
+    return len(clean_usgs_earthquake_batch(fx.raw_earthquake_batch))
+
+
+def bench_basic_stats(fx: Fixtures) -> int:
+    compute_basic_stats(fx.cleaned_earthquakes)
+    return len(fx.cleaned_earthquakes)
+
+
+def bench_swarm_detection(fx: Fixtures) -> int:
+    # Her tekrar boş bir tracker'la başlar; durum dosyası yazılmaz
+    tracker = SwarmTracker(state_file=fx.work_dir / 'bench_swarms.json')
+    tracker.add_earthquakes(fx.cleaned_earthquakes, now=fx.end_time)
+    return len(fx.cleaned_earthquakes)
+
+
+def bench_filter_last_one_week(fx: Fixtures) -> int:
+    fx.dashboard_filter(fx.eonet_events)
+    return len(fx.eonet_events)
+
+
+def bench_alerts_earthquake(fx: Fixtures) -> int:
+    AlertRuleEngine().evaluate('earthquake', fx.cleaned_earthquakes)
+    return len(fx.cleaned_earthquakes)
+
+
+def bench_alerts_weather(fx: Fixtures) -> int:
+    engine = AlertRuleEngine()
+    records = fx.weather_records
+    engine.evaluate('weather', select_current_weather(records))
+    engine.evaluate('forecast', [f for forecasts in group_forecasts(records).values() for f in forecasts])
+    return len(records)
+
+
+def bench_json_persistence(fx: Fixtures) -> int:
+    # EventPipeline'ın earthquakes.json yazımıyla aynı: serileştir + atomik değiştir
+    path = fx.work_dir / 'bench_earthquakes.json'
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_bytes(encode_events_json(fx.cleaned_earthquakes))
+    os.replace(tmp_path, path)
+    return len(fx.cleaned_earthquakes)
+
+
+def bench_columnar_roundtrip(fx: Fixtures) -> int:
+    # Temizlenmiş depremler sütunsal tabloya paketlenir ve satır sözlüklerine geri açılır
+    table = ColumnarTable.for_model(CleanedEarthquake, fx.cleaned_earthquakes)
+    table.to_dicts()
+    return len(table)
+
+
+def bench_event_batch_pickle(fx: Fixtures) -> int:
+    # WAL kaydı ve süreç havuzu gidiş-dönüşü: ham deprem batch'i pickle edilip geri açılır
+    batch = pickle.loads(pickle.dumps(fx.raw_earthquake_batch, protocol=pickle.HIGHEST_PROTOCOL))
+    return len(batch)
+
+
+def bench_seismic_monte_carlo(fx: Fixtures) -> int:
+    # Büyüklük kadar senaryo; süreç havuzu olmadan (tek süreçteki sütun döngüleri ölçülür)
+    return simulate_earthquake_batch(fx.size, seed=fx.seed, max_workers=1)['scenario_count']
+
+
+# Ad -> (ölçülen fonksiyon, ölçümden önce hazırlanacak fixture'lar)
+MICRO_BENCHMARKS: Dict[str, Tuple[Callable[[Fixtures], int], Tuple[str, ...]]] = {
+    'usgs_parse': (bench_usgs_parse, ('usgs_geojson',)),
+    'eonet_parse': (bench_eonet_parse, ('eonet_payload',)),
+    'openweather_parse': (bench_openweather_parse, ('weather_payloads',)),
+    'flood_parse': (bench_flood_parse, ('flood_payloads',)),
+    'clean_usgs_earthquake_events': (bench_clean_usgs, ('raw_earthquakes',)),
+    'clean_usgs_earthquake_batch': (bench_clean_usgs_batch, ('raw_earthquake_batch',)),
+    'compute_basic_stats': (bench_basic_stats, ('cleaned_earthquakes',)),
+    'swarm_detection': (bench_swarm_detection, ('cleaned_earthquakes',)),
+    'filter_last_one_week': (bench_filter_last_one_week, ('dashboard_filter', 'eonet_events')),
+    'alerts_earthquake': (bench_alerts_earthquake, ('cleaned_earthquakes',)),
+    'alerts_weather': (bench_alerts_weather, ('weather_records',)),
+    'json_persistence': (bench_json_persistence, ('cleaned_earthquakes',)),
+    'columnar_roundtrip': (bench_columnar_roundtrip, ('cleaned_earthquakes',)),
+    'event_batch_pickle': (bench_event_batch_pickle, ('raw_earthquake_batch',)),
+    'seismic_monte_carlo': (bench_seismic_monte_carlo, ()),
+}
+
+
+def measure(func: Callable[[], int], repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    timings = []
+    items = 0
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        items = func()
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    return {
+        'items': items,
+        'repeat': len(timings),
+        'min_seconds': round(min(timings), 6),
+        'median_seconds': round(median, 6),
+        'mean_seconds': round(statistics.mean(timings), 6),
+        'max_seconds': round(max(timings), 6),
+        'items_per_second': round(items / median, 2) if median > 0 else None
+    }
+
+
+def run_micro(sizes: List[int], names: Optional[List[str]] = None, repeat: int = DEFAULT_REPEAT,
+              seed: int = 0, progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    selected = names or list(MICRO_BENCHMARKS)
+    unknown = [name for name in selected if name not in MICRO_BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Bilinmeyen benchmark: {', '.join(unknown)}")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='sdews-bench-') as work_dir:
+        for size in sizes:
+            fx = Fixtures(size, seed=seed, work_dir=Path(work_dir))
+            for name in selected:
+                func, requires = MICRO_BENCHMARKS[name]
+                result: Dict[str, Any] = {'kind': 'micro', 'name': name, 'size': size}
+                try:
+                    started = time.perf_counter()
+                    for attr in requires:
+                        getattr(fx, attr)
+                    result['setup_seconds'] = round(time.perf_counter() - started, 6)
+                    result.update(measure(lambda: func(fx), repeat=repeat))
+                except ImportError as e:
+                    # dashboard Flask gerektirir; eksikse ölçüm atlanır
+                    result.update({'skipped': True, 'error': str(e)})
+                except Exception as e:
+                    result.update({'failed': True, 'error': f"{type(e).__name__}: {e}"})
+                results.append(result)
+                if progress:
+                    progress(result)
+    return results
@@ -0,0 +1,104 @@
+# Benchmark raporu
+# Sonuçlar makine tarafından okunabilir tek bir JSON dosyasına yazılır (ortam bilgisi +
+# parametreler + her ölçüm). Önceki bir raporla karşılaştırıldığında, (ad, büyüklük)
+# eşleşen ölçümlerde süre eşikten fazla uzamışsa regresyon olarak işaretlenir.
+
+from __future__ import annotations
+import json
+import os
+import platform
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPORT_SCHEMA = 1
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+# Median süresi bu orandan fazla artarsa regresyon
+REGRESSION_THRESHOLD = 0.2
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=Path(__file__).resolve().parent,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': _git_commit()
+    }
+
+
+def build_report(results: List[Dict[str, Any]], parameters: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'schema': REPORT_SCHEMA,
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': environment(),
+        'parameters': parameters,
+        'results': results
+    }
+
+
+def default_report_path() -> Path:
+    return RESULTS_DIR / f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json"
+
+
+def save_report(report: Dict[str, Any], path: Optional[Path] = None) -> Path:
+    path = Path(path) if path else default_report_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    with Path(path).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _seconds(result: Dict[str, Any]) -> Optional[float]:
+    return result.get('median_seconds', result.get('seconds'))
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """Baseline'a göre süre değişimleri; regression=True olanlar eşiği aşanlardır."""
+    previous = {(r.get('kind'), r['name'], r['size']): r for r in baseline.get('results', [])}
+    changes = []
+    for result in report.get('results', []):
+        before = previous.get((result.get('kind'), result['name'], result['size']))
+        if not before:
+            continue
+        old, new = _seconds(before), _seconds(result)
+        if not old or new is None:
+            continue
+        ratio = new / old
+        changes.append({
+            'kind': result.get('kind'),
+            'name': result['name'],
+            'size': result['size'],
+            'baseline_seconds': old,
+            'seconds': new,
+            'change': round(ratio - 1.0, 4),
+            'regression': ratio - 1.0 > threshold
+        })
+    return changes
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    label = f"{result.get('kind', ''):5} {result['name']:30} {result['size']:>10}"
+    if result.get('skipped') or result.get('failed'):
+        return f"{label}  {'SKIPPED' if result.get('skipped') else 'FAILED'}: {result.get('error')}"
+    seconds = _seconds(result)
+    rate = result.get('items_per_second')
+    return f"{label}  {seconds:10.4f}s  {rate if rate is not None else '-':>14} items/s"
@@ -3,14 +3,30 @@ SDEWS Web Dashboard
 Tarayıcıda görsel deprem takip sistemi
 """
 
-from flask import Flask, render_template, jsonify, request
-import json
+from flask import Flask, render_template, jsonify, request, Response, g
+from flask.json.provider import DefaultJSONProvider
 import os
 import glob
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from processing.storage import eski_dosyalari_temizle
-from processing.seismic_risk_analyzer import SeismicRiskAnalyzer, analyze_seismic_risk
+from processing.storage import eski_dosyalari_temizle, log_message, veri_klasoru
+from processing.seismic_risk_analyzer import SeismicRiskAnalyzer, FAULT_LINE_DATA, analyze_seismic_risk
+from processing.swarm_tracker import SwarmTracker, SWARM_STATE_FILE, load_swarm_state
+from processing.aftershock_forecast import AFTERSHOCK_STATE_FILE, FORECAST_REFRESH_SECONDS
+from processing.streaming_stats import RunningStats, STATS_STATE_FILE, classify_region, load_stats_state
+from processing.magnitude_frequency import get_magnitude_frequency_analyzer, MIN_EVENTS_FOR_B
+from processing.flood_analytics import get_flood_analytics
+from processing.alert_rules import AlertRuleEngine, ALERTS_FILE, load_alert_state, select_current_weather, group_forecasts
+from processing.alert_lifecycle import assign_alert_ids, get_alert_lifecycle
+from processing.shared_cache import SharedCache, data_version
+from processing.map_clustering import ClusterIndex, MAX_CLUSTER_ZOOM, MAX_FEATURES, MIN_ZOOM, parse_bbox
+from processing.serialization import RawJSON, dumps, loads, read_json
+from processing.timeutils import event_epoch, to_datetime
+from processing.event_index import EventIndex, parse_query as parse_event_query
+from processing.vector_tiles import MVT_MIMETYPE, TILE_BUFFER, TILE_EXTENT, TileCache, encode_tile, valid_tile
+from processing import seismic_simulation
+from pipeline.metrics import MetricsRegistry, METRICS_FILE, load_metrics_snapshot, render_prometheus
 
 # Scraping modülü - artık BeautifulSoup4 ile de çalışır
 try:
@@ -28,11 +44,114 @@ try:
 except ImportError as e:
     EONET_AVAILABLE = False
 
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify yanıtları processing.serialization ile (orjson varsa) kodlanır; datetime, Decimal,
+    UUID ve dataclass'lar Flask'ın varsayılan kurallarıyla çevrilir"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj, default=self.default, indent=bool(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(dumps(obj, default=self.default, indent=indent) + b'\n',
+                                        mimetype=self.mimetype)
+
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 
-# Dashboard'un çalıştığı dizini bul
+# Dashboard'un çalıştığı dizini bul; veri klasörü pipeline ile aynı (SDEWS_DATA_DIR ile değiştirilebilir)
 BASE_DIR = Path(__file__).resolve().parent
-veri_klasoru = BASE_DIR / "data"
+
+# Uyarı kuralları uygulama açılışında bir kez derlenir
+ALERT_ENGINE = AlertRuleEngine()
+
+# Dashboard sürecinin kendi metrikleri (istek süreleri, yanıt boyutları, önbellek isabetleri);
+# pipeline metrikleri data/metrics.json'dan okunur, /metrics ikisini birlikte sunar
+DASHBOARD_METRICS = MetricsRegistry(process='dashboard')
+_last_cached = {}
+
+def cached_load(cache_name, loader):
+    """mtime önbellekli yükleyiciyi çağırır; aynı nesne dönerse isabet sayılır"""
+    result = loader()
+    hit = result is not None and result is _last_cached.get(cache_name)
+    _last_cached[cache_name] = result
+    DASHBOARD_METRICS.inc('cache_requests_total', cache=cache_name, result='hit' if hit else 'miss')
+    return result
+
+def _collect_cache_ratios(registry):
+    totals = {}
+    with registry.lock:
+        for (name, labels), value in registry.counters.items():
+            if name == 'cache_requests_total':
+                label_map = dict(labels)
+                entry = totals.setdefault(label_map['cache'], [0, 0])
+                entry[0 if label_map['result'] == 'hit' else 1] += value
+    for cache_name, (hits, misses) in totals.items():
+        registry.set_gauge('cache_hit_ratio', round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                           cache=cache_name)
+
+DASHBOARD_METRICS.register_collector('cache_ratios', _collect_cache_ratios)
+
+# Worker'lar arası paylaşılan önbellek (serve.py ile çok süreçli çalışırken data/ her worker'da
+# ayrı ayrı okunup işlenmez); anahtarlar kaynak dosyaların sürümüne bağlıdır
+SHARED_CACHE = SharedCache()
+# Şimdiki zamana bağlı sonuçların (son 1 hafta filtresi, risk süreleri) yenilenme aralığı
+SHARED_CACHE_TTL = 60
+# Monte Carlo sonuçları istemcinin gönderdiği sensör/şehir yapılandırmasıyla anahtarlanır; sınırlı tutulur
+MONTE_CARLO_CACHE_ENTRIES = 16
+
+def shared_load(cache_name, paths, loader, ttl=None):
+    """Kaynak dosyalar değişmediyse önceden üretilmiş sonucu döndürür (önce bellek, sonra data/.cache)"""
+    value, source = SHARED_CACHE.get(cache_name, paths, loader, ttl=ttl)
+    DASHBOARD_METRICS.inc('cache_requests_total', cache=cache_name, result='miss' if source == 'build' else 'hit')
+    DASHBOARD_METRICS.inc('shared_cache_lookups_total', cache=cache_name, tier=source)
+    return value
+
+def encoded_load(cache_name, paths, value, ttl=None):
+    """Veri sürümü başına JSON'a kodlanmış baytlar; yanıtta RawJSON olarak yeniden kodlanmadan
+    yerleştirilir (value: liste ya da onu döndüren fonksiyon, yalnızca önbellek kaçağında kodlanır)"""
+    return RawJSON(shared_load(f'{cache_name}_json', paths,
+                               lambda: dumps(value() if callable(value) else value), ttl=ttl))
+
+def event_page(layer, list_key, **extra):
+    """bbox/since/until/min_magnitude/limit/cursor/order parametreleri varsa olay listesini
+    uzamsal-zamansal indeksten sayfalı döndürür; parametre yoksa None (tam liste davranışı)"""
+    try:
+        query = parse_event_query(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if query is None:
+        return None
+    paths, loader, _, _, ttl = MAP_LAYERS[layer]
+    index = shared_load(f'event_index_{layer}', paths(), lambda: EventIndex(loader()), ttl=ttl)
+    page = index.query(**query)
+    return jsonify(dict({
+        list_key: page['events'],
+        'count': page['count'],
+        'has_more': page['has_more'],
+        'next_cursor': page['next_cursor'],
+        'order': page['order'],
+        'timestamp': datetime.now().isoformat()
+    }, **extra))
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def _record_request_metrics(response):
+    started = getattr(g, 'request_started', None)
+    endpoint = request.endpoint or 'unknown'
+    if started is not None:
+        DASHBOARD_METRICS.observe('http_request_seconds', time.perf_counter() - started, endpoint=endpoint)
+    DASHBOARD_METRICS.inc('http_requests_total', endpoint=endpoint, status=response.status_code)
+    if not response.is_streamed:
+        DASHBOARD_METRICS.inc('http_response_bytes_total', response.calculate_content_length() or 0, endpoint=endpoint)
+    return response
 
 def get_latest_earthquake_file():
     """En son oluşturulan deprem dosyasını bul"""
@@ -62,11 +181,13 @@ def load_earthquake_data():
     if not file_path:
         return []
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return []
+    def read():
+        try:
+            with open(file_path, 'rb') as f:
+                return loads(f.read())
+        except:
+            return []
+    return shared_load('earthquakes', [file_path], read)
 
 def load_weather_data():
     """Hava durumu verilerini yükle"""
@@ -74,78 +195,30 @@ def load_weather_data():
     if not file_path:
         return []
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Eğer liste değilse listeye çevir
-            if not isinstance(data, list):
-                return [data]
-            # Boş liste kontrolü
-            if not data:
-                return []
-            return data
-    except Exception as e:
-        print(f"Error loading weather data from {file_path}: {e}")
-        return []
+    def read():
+        try:
+            with open(file_path, 'rb') as f:
+                data = loads(f.read())
+                # Eğer liste değilse listeye çevir
+                if not isinstance(data, list):
+                    return [data]
+                # Boş liste kontrolü
+                if not data:
+                    return []
+                return data
+        except Exception as e:
+            print(f"Error loading weather data from {file_path}: {e}")
+            return []
+    return shared_load('weather', [file_path], read)
 
 def load_forecast_data():
-    """Forecast (tahmin) verilerini yükle - Sadece Amerika kıtaları"""
-    weather_data = load_weather_data()
-    # Sadece forecast tipindeki verileri filtrele
-    forecasts = [item for item in weather_data if item.get('type') == 'weather_forecast']
-    
-    # Amerika kıtaları filtresi: [minLon, minLat, maxLon, maxLat] = [-180, -60, -30, 85]
-    americas_bbox = {'min_lon': -180, 'min_lat': -60, 'max_lon': -30, 'max_lat': 85}
-    filtered_forecasts = []
-    
-    for forecast in forecasts:
-        lat = forecast.get('latitude')
-        lon = forecast.get('longitude')
-        
-        # Koordinat varsa ve Amerika kıtaları içindeyse ekle
-        if lat is not None and lon is not None:
-            if (americas_bbox['min_lat'] <= lat <= americas_bbox['max_lat'] and
-                americas_bbox['min_lon'] <= lon <= americas_bbox['max_lon']):
-                filtered_forecasts.append(forecast)
-    
-    # Şehirlere göre grupla
-    forecasts_by_city = {}
-    for forecast in filtered_forecasts:
-        city = forecast.get('location', 'Unknown')
-        if city not in forecasts_by_city:
-            forecasts_by_city[city] = []
-        forecasts_by_city[city].append(forecast)
-    
-    # Her şehir için tarihe göre sırala
-    for city in forecasts_by_city:
-        forecasts_by_city[city].sort(key=lambda x: x.get('forecast_time', ''))
-    
-    return forecasts_by_city
+    """Forecast (tahmin) verilerini yükle - Sadece Amerika kıtaları, şehirlere göre gruplu"""
+    return shared_load('forecasts', [get_latest_weather_file()], lambda: group_forecasts(load_weather_data()))
 
 def get_current_weather_data():
     """Sadece anlık hava durumu verilerini yükle (forecast hariç) - Sadece Amerika kıtaları"""
-    weather_data = load_weather_data()
-    # Sadece current weather tipindeki verileri filtrele
-    current_weather = [item for item in weather_data if item.get('type') == 'weather']
-    
-    # Amerika kıtaları filtresi: [minLon, minLat, maxLon, maxLat] = [-180, -60, -30, 85]
-    americas_bbox = {'min_lon': -180, 'min_lat': -60, 'max_lon': -30, 'max_lat': 85}
-    filtered_weather = []
-    
-    for item in current_weather:
-        lat = item.get('latitude')
-        lon = item.get('longitude')
-        
-        # Koordinat varsa ve Amerika kıtaları içindeyse ekle
-        if lat is not None and lon is not None:
-            if (americas_bbox['min_lat'] <= lat <= americas_bbox['max_lat'] and
-                americas_bbox['min_lon'] <= lon <= americas_bbox['max_lon']):
-                filtered_weather.append(item)
-        else:
-            # Koordinat yoksa atla (sadece Amerika kıtalarına odaklandığımız için)
-            pass
-    
-    return filtered_weather
+    return shared_load('weather_current', [get_latest_weather_file()],
+                       lambda: select_current_weather(load_weather_data()))
 
 def calculate_statistics(earthquakes):
     """İstatistikleri hesapla"""
@@ -158,38 +231,28 @@ def calculate_statistics(earthquakes):
             'regions': {}
         }
     
-    magnitudes = [eq['magnitude'] for eq in earthquakes]
-    
-    # Bölgelere göre grupla
+    # Tek geçişte min/max/ortalama ve bölge sayımı (bölge eşlemesi önbellekli)
+    running = RunningStats()
     regions = {}
     for eq in earthquakes:
-        location = eq['location']
-        # Basit bölge çıkarımı
-        if 'Alaska' in location:
-            region = 'Alaska'
-        elif 'California' in location or 'CA' in location:
-            region = 'California'
-        elif 'Japan' in location:
-            region = 'Japan'
-        elif 'Chile' in location:
-            region = 'Chile'
-        elif 'Indonesia' in location:
-            region = 'Indonesia'
-        elif 'Puerto Rico' in location:
-            region = 'Puerto Rico'
-        else:
-            region = 'Other'
-        
+        running.add(eq['magnitude'])
+        region = classify_region(eq['location'])
         regions[region] = regions.get(region, 0) + 1
     
     return {
         'total': len(earthquakes),
-        'max_mag': round(max(magnitudes), 2),
-        'min_mag': round(min(magnitudes), 2),
-        'avg_mag': round(sum(magnitudes) / len(magnitudes), 2),
+        'max_mag': round(running.max, 2),
+        'min_mag': round(running.min, 2),
+        'avg_mag': round(running.mean, 2),
         'regions': regions
     }
 
+def load_window_statistics(event_type):
+    """Pipeline'ın tuttuğu 1h/24h/7d pencere istatistiklerini oku"""
+    snapshot = shared_load('window_statistics', [veri_klasoru / STATS_STATE_FILE],
+                           lambda: (load_stats_state() or {}).get('snapshot', {}))
+    return snapshot.get(event_type, {})
+
 @app.route('/')
 def dashboard():
     """Ana dashboard sayfası"""
@@ -199,11 +262,17 @@ def dashboard():
 def api_earthquakes():
     """Deprem verilerini JSON olarak döndür"""
     earthquakes = load_earthquake_data()
-    stats = calculate_statistics(earthquakes)
+    stats = shared_load('earthquake_statistics', [get_latest_earthquake_file()],
+                        lambda: calculate_statistics(earthquakes))
+    page = event_page('earthquakes', 'earthquakes', statistics=stats,
+                      window_statistics=load_window_statistics('earthquake'))
+    if page is not None:
+        return page
     
     return jsonify({
-        'earthquakes': earthquakes,
+        'earthquakes': encoded_load('earthquakes', [get_latest_earthquake_file()], earthquakes),
         'statistics': stats,
+        'window_statistics': load_window_statistics('earthquake'),
         'timestamp': datetime.now().isoformat()
     })
 
@@ -213,8 +282,9 @@ def api_weather():
     weather_data = get_current_weather_data()
     
     return jsonify({
-        'weather': weather_data,
+        'weather': encoded_load('weather_current', [get_latest_weather_file()], weather_data),
         'count': len(weather_data),
+        'window_statistics': load_window_statistics('weather'),
         'timestamp': datetime.now().isoformat()
     })
 
@@ -224,7 +294,7 @@ def api_forecast():
     forecasts = load_forecast_data()
     
     return jsonify({
-        'forecasts': forecasts,
+        'forecasts': encoded_load('forecasts', [get_latest_weather_file()], forecasts),
         'cities': list(forecasts.keys()),
         'count': sum(len(v) for v in forecasts.values()),
         'timestamp': datetime.now().isoformat()
@@ -249,53 +319,27 @@ def api_news():
             'timestamp': datetime.now().isoformat()
         })
 
+def _matches_event_type(event, event_type):
+    """storm/volcano kategori kontrolü (event_type yoksa tüm event'ler)"""
+    if not event_type:
+        return True
+    categories = event.get('categories', [])
+    cat_str = ' '.join([str(c) for c in categories]).lower() if isinstance(categories, list) else str(categories).lower()
+    if event_type == 'storm':
+        return 'storm' in cat_str or 'severe' in cat_str
+    if event_type == 'volcano':
+        return 'volcano' in cat_str
+    return True
+
+def _latest_event_epoch(events, event_type=None):
+    epochs = [event_epoch(event) for event in events if _matches_event_type(event, event_type)]
+    return max((e for e in epochs if e is not None), default=None)
+
 def get_latest_event_date(events, event_type=None):
     """Belirli bir event tipinin en yakın tarihini bul"""
     if not events:
         return None
-    
-    latest_date = None
-    for event in events:
-        # Event tipi kontrolü (storm, volcano için)
-        if event_type:
-            if event_type == 'storm':
-                # Storm kontrolü
-                categories = event.get('categories', [])
-                cat_str = ' '.join([str(c) for c in categories]).lower() if isinstance(categories, list) else str(categories).lower()
-                if 'storm' not in cat_str and 'severe' not in cat_str:
-                    continue
-            elif event_type == 'volcano':
-                # Volcano kontrolü
-                categories = event.get('categories', [])
-                cat_str = ' '.join([str(c) for c in categories]).lower() if isinstance(categories, list) else str(categories).lower()
-                if 'volcano' not in cat_str:
-                    continue
-        
-        time_str = event.get('event_time') or event.get('time') or event.get('timestamp')
-        if not time_str:
-            continue
-        
-        try:
-            if 'T' in str(time_str):
-                time_str_clean = str(time_str).replace('Z', '+00:00')
-                event_time = datetime.fromisoformat(time_str_clean)
-            elif ' ' in str(time_str) and 'T' not in str(time_str):
-                try:
-                    event_time = datetime.strptime(str(time_str), '%Y-%m-%d T%H:%M:%S')
-                except:
-                    event_time = datetime.strptime(str(time_str), '%Y-%m-%d %H:%M:%S')
-            else:
-                event_time = datetime.fromtimestamp(float(time_str))
-            
-            if event_time.tzinfo:
-                event_time = event_time.astimezone().replace(tzinfo=None)
-            
-            if latest_date is None or event_time > latest_date:
-                latest_date = event_time
-        except:
-            continue
-    
-    return latest_date
+    return to_datetime(_latest_event_epoch(events, event_type))
 
 def filter_events_from_latest(events, event_type=None):
     """En yakın event tarihinden itibaren tüm event'leri filtrele"""
@@ -303,53 +347,20 @@ def filter_events_from_latest(events, event_type=None):
         return []
     
     # En yakın event tarihini bul
-    latest_date = get_latest_event_date(events, event_type)
+    latest_epoch = _latest_event_epoch(events, event_type)
     
-    if latest_date is None:
+    if latest_epoch is None:
         # Eğer en yakın tarih bulunamazsa, son 1 hafta filtresi uygula
         return filter_last_one_week(events)
     
+    # Tarihler ingest'te epoch alanına çevrildi (eski dosyalarda önbellekli ayrıştırıcı)
     filtered = []
-    
     for event in events:
-        # Event tipi kontrolü
-        if event_type:
-            if event_type == 'storm':
-                categories = event.get('categories', [])
-                cat_str = ' '.join([str(c) for c in categories]).lower() if isinstance(categories, list) else str(categories).lower()
-                if 'storm' not in cat_str and 'severe' not in cat_str:
-                    continue
-            elif event_type == 'volcano':
-                categories = event.get('categories', [])
-                cat_str = ' '.join([str(c) for c in categories]).lower() if isinstance(categories, list) else str(categories).lower()
-                if 'volcano' not in cat_str:
-                    continue
-        
-        time_str = event.get('event_time') or event.get('time') or event.get('timestamp')
-        if not time_str:
-            continue
-        
-        try:
-            if 'T' in str(time_str):
-                time_str_clean = str(time_str).replace('Z', '+00:00')
-                event_time = datetime.fromisoformat(time_str_clean)
-            elif ' ' in str(time_str) and 'T' not in str(time_str):
-                try:
-                    event_time = datetime.strptime(str(time_str), '%Y-%m-%d T%H:%M:%S')
-                except:
-                    event_time = datetime.strptime(str(time_str), '%Y-%m-%d %H:%M:%S')
-            else:
-                event_time = datetime.fromtimestamp(float(time_str))
-            
-            if event_time.tzinfo:
-                event_time = event_time.astimezone().replace(tzinfo=None)
-            
-            # En yakın tarihten itibaren tüm event'leri ekle
-            if event_time >= latest_date:
-                filtered.append(event)
-        except Exception as e:
+        if not _matches_event_type(event, event_type):
             continue
-    
+        epoch = event_epoch(event)
+        if epoch is not None and epoch >= latest_epoch:
+            filtered.append(event)
     return filtered
 
 def filter_last_one_week(events):
@@ -357,66 +368,14 @@ def filter_last_one_week(events):
     if not events:
         return []
     
-    one_week_ago = datetime.now() - timedelta(days=7)
+    one_week_ago = (datetime.now() - timedelta(days=7)).timestamp()
+    # Öncelik sırası: event_time > time > timestamp (processing/timeutils.TIME_FIELDS);
+    # tarihi olmayan ya da okunamayan event'ler atlanır
     filtered = []
-    
     for event in events:
-        # Tarih field'ını bul (time, timestamp, event_time, etc.)
-        # Öncelik sırası: event_time > time > timestamp
-        # EONET verilerinde event_time gerçek event zamanı, time ise güncelleme zamanı olabilir
-        event_time = None
-        time_str = event.get('event_time') or event.get('time') or event.get('timestamp')
-        
-        # Eğer time field'ı yoksa, event'i atla (filtreleme yapamayız)
-        if not time_str:
-            continue
-        
-        try:
-            # Farklı tarih formatlarını parse et
-            if 'T' in str(time_str):
-                # ISO format: "2025-12-26T19:00:00+00:00" veya "2025-12-26T19:00:00Z"
-                time_str_clean = str(time_str).replace('Z', '+00:00')
-                try:
-                    event_time = datetime.fromisoformat(time_str_clean)
-                except ValueError:
-                    # ISO format parse edilemezse, basit format dene
-                    try:
-                        event_time = datetime.strptime(str(time_str).split('T')[0], '%Y-%m-%d')
-                    except:
-                        event_time = None
-            elif ' ' in str(time_str) and 'T' not in str(time_str):
-                # Space format: "2025-12-30 T00:00:00" veya "2025-12-30 00:00:00"
-                try:
-                    event_time = datetime.strptime(str(time_str), '%Y-%m-%d T%H:%M:%S')
-                except:
-                    try:
-                        event_time = datetime.strptime(str(time_str), '%Y-%m-%d %H:%M:%S')
-                    except:
-                        event_time = None
-            else:
-                # Unix timestamp veya diğer formatlar
-                try:
-                    event_time = datetime.fromtimestamp(float(time_str))
-                except:
-                    event_time = None
-            
-            # Eğer tarih parse edilemediyse, event'i atla
-            if not event_time:
-                continue
-            
-            # UTC'den local time'a çevir (eğer timezone bilgisi varsa)
-            if event_time.tzinfo:
-                # Timezone-aware datetime'ı local time'a çevir, sonra naive yap
-                event_time = event_time.astimezone().replace(tzinfo=None)
-            
-            # Son 1 hafta içindeyse ekle
-            if event_time >= one_week_ago:
-                filtered.append(event)
-        except Exception as e:
-            # Parse edilemezse event'i atla
-            print(f"Tarih parse hatası: {time_str}, {e}")
-            continue
-    
+        epoch = event_epoch(event)
+        if epoch is not None and epoch >= one_week_ago:
+            filtered.append(event)
     return filtered
 
 def load_eonet_data():
@@ -427,9 +386,9 @@ def load_eonet_data():
     # Önce pipeline'dan oluşturulan JSON dosyasını kontrol et
     eonet_file = veri_klasoru / "eonet_events.json"
     if eonet_file.exists():
-        try:
-            with open(eonet_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        def read():
+            with open(eonet_file, 'rb') as f:
+                data = loads(f.read())
                 # Eğer liste değilse listeye çevir
                 if not isinstance(data, list):
                     data = [data] if data else []
@@ -441,6 +400,8 @@ def load_eonet_data():
                 
                 # Birleştir
                 return volcano_data + other_data
+        try:
+            return shared_load('eonet', [eonet_file], read, ttl=SHARED_CACHE_TTL)
         except Exception as e:
             print(f"EONET JSON dosyası okuma hatası: {e}")
     
@@ -450,8 +411,7 @@ def load_eonet_data():
         # Pipeline'da bbox filtresi zaten uygulanıyor, burada da uygulayalım
         americas_bbox = [-180, -60, -30, 85]
         src = EONETSource(status="open", days=30, limit=100, bbox=americas_bbox)
-        events = src.fetch_and_parse()
-        events_dict = [e.toDictionary() for e in events]
+        events_dict = src.fetch_batch().to_dicts()
         # Volkan verilerini ayrı filtrele
         volcano_data = filter_events_from_latest(events_dict, event_type='volcano')
         # Diğer veriler için son 1 hafta filtresi
@@ -461,412 +421,47 @@ def load_eonet_data():
         print(f"EONET veri yükleme hatası: {e}")
         return []
 
-def generate_current_alerts(earthquakes, current_weather_data, eonet_events=None):
-    """Mevcut durumdan kaynaklanan alert'ler oluştur (current weather + EONET)"""
-    alerts = []
-    
-    # EONET verileri yoksa yükle
-    if eonet_events is None:
-        eonet_events = load_eonet_data()
-    
-    # Deprem alert'leri (magnitude >= 5.0)
-    for eq in earthquakes:
-        if eq.get('magnitude', 0) >= 5.0:
-            alerts.append({
-                'type': 'earthquake',
-                'category': 'current',
-                'severity': 'high' if eq.get('magnitude', 0) >= 6.0 else 'medium',
-                'title': f"Yüksek Büyüklükte Deprem: {eq.get('magnitude', 0):.1f}",
-                'message': f"{eq.get('location', 'Bilinmeyen')} bölgesinde {eq.get('magnitude', 0):.1f} büyüklüğünde deprem",
-                'location': eq.get('location', 'Bilinmeyen'),
-                'timestamp': eq.get('timestamp', datetime.now().isoformat()),
-                'data': eq
-            })
-    
-    # Mevcut hava durumu alert'leri
-    for weather in current_weather_data:
-        temp = weather.get('temperature', 0)
-        feels_like = weather.get('feels_like', temp)
-        temp_max = weather.get('temp_max', temp)
-        wind = weather.get('wind_speed', 0)
-        wind_gust = weather.get('wind_gust', 0)
-        humidity = weather.get('humidity', 0)
-        pressure = weather.get('pressure', 0)
-        visibility = weather.get('visibility', 0)
-        clouds = weather.get('clouds', 0)
-        weather_main = weather.get('weather_main', '').lower()
-        location = weather.get('location', 'Bilinmeyen')
-        
-        # Aşırı sıcak (>= 35°C)
-        if temp >= 35:
-            alerts.append({
-                'type': 'weather',
-                'category': 'current',
-                'severity': 'high',
-                'title': f'Aşırı Sıcak Uyarısı: {location}',
-                'message': f'{location} şehrinde sıcaklık {temp:.1f}°C (hissedilen: {feels_like:.1f}°C) - Aşırı sıcak hava uyarısı',
-                'location': location,
-                'timestamp': weather.get('time', datetime.now().isoformat()),
-                'data': weather
-            })
-        
-        # Çok sıcak (30-35°C arası)
-        elif temp >= 30:
-            alerts.append({
-                'type': 'weather',
-                'category': 'current',
-                'severity': 'medium',
-                'title': f'Yüksek Sıcaklık Uyarısı: {location}',
-                'message': f'{location} şehrinde sıcaklık {temp:.1f}°C - Yüksek sıcaklık uyarısı',
-                'location': location,
-                'timestamp': weather.get('time', datetime.now().isoformat()),
-                'data': weather
-            })
-        
-        # Aşırı soğuk (<= -5°C)
-        if temp <= -5:
-            alerts.append({
-                'type': 'weather',
-                'category': 'current',
-                'severity': 'high',
-                'title': f'Aşırı Soğuk Uyarısı: {location}',
-                'message': f'{location} şehrinde sıcaklık {temp:.1f}°C (hissedilen: {feels_like:.1f}°C) - Aşırı soğuk hava uyarısı',
-                'location': location,
-                'timestamp': weather.get('time', datetime.now().isoformat()),
-                'data': weather
-            })
-        
-        # Çok soğuk (0 ile -5°C arası)
-        elif temp <= 0:
-            alerts.append({
-                'type': 'weather',
-                'category': 'current',
-                'severity': 'medium',
-                'title': f'Düşük Sıcaklık Uyarısı: {location}',
-                'message': f'{location} şehrinde sıcaklık {temp:.1f}°C - Düşük sıcaklık uyarısı',
-                'location': location,
-                'timestamp': weather.get('time', datetime.now().isoformat()),
-                'data': weather
-            })
-        
-        # Yüksek rüzgar (>= 15 m/s)
-        if wind >= 15:
-            alerts.append({
-                'type': 'weather',
-                'severity': 'high' if wind >= 20 else 'medium',
-                'title': f'Yüksek Rüzgar Uyarısı: {location}',
-                'message': f'{location} şehrinde rüzgar hızı {wind:.1f} m/s' + 
-                          (f' (rüzgar fırtınası: {wind_gust:.1f} m/s)' if wind_gust and wind_gust > wind else '') + 
-                          ' - Yüksek rüzgar uyarısı',
-                'location': location,
-                'timestamp': weather.get('time', datetime.now().isoformat()),
-                'data': weather
-            })
-        
-        # Güçlü rüzgar (10-15 m/s arası)
-        elif wind >= 10:
-            alerts.append({
-                'type': 'weather',
-                'category': 'current',
-                'severity': 'medium',
-                'title': f'Güçlü Rüzgar Uyarısı: {location}',
-                'message': f'{location} şehrinde rüzgar hızı {wind:.1f} m/s - Güçlü rüzgar uyarısı',
-                'location': location,
-                'timestamp': weather.get('time', datetime.now().isoformat()),
-                'data': weather
-            })
-        
-        # Yüksek nem (>= 90%)
-        if humidity >= 90:
-            alerts.append({
-                'type': 'weather',
-                'category': 'current',
-                'severity': 'medium',
-                'title': f'Yüksek Nem Uyarısı: {location}',
-                'message': f'{location} şehrinde nem oranı %{humidity:.0f} - Yüksek nem uyarısı (yağış riski)',
-                'location': location,
-                'timestamp': weather.get('time', datetime.now().isoformat()),
-                'data': weather
-            })
-        
-        # Düşük basınç (<= 1000 hPa) - fırtına işareti
-        if pressure and pressure <= 1000:
-            alerts.append({
-                'type': 'weather',
-                'category': 'current',
-                'severity': 'high',
-                'title': f'Düşük Basınç Uyarısı: {location}',
-                'message': f'{location} şehrinde atmosfer basıncı {pressure:.0f} hPa - Düşük basınç uyarısı (fırtına riski)',
-                'location': location,
-                'timestamp': weather.get('time', datetime.now().isoformat()),
-                'data': weather
-            })
-        
-        # Düşük görüş mesafesi (<= 1000m) - sis uyarısı
-        if visibility and visibility <= 1000:
-            alerts.append({
-                'type': 'weather',
-                'severity': 'high' if visibility <= 500 else 'medium',
-                'title': f'Düşük Görüş Mesafesi Uyarısı: {location}',
-                'message': f'{location} şehrinde görüş mesafesi {visibility/1000:.1f} km - Düşük görüş uyarısı (sis riski)',
-                'location': location,
-                'timestamp': weather.get('time', datetime.now().isoformat()),
-                'data': weather
-            })
-        
-        # Yağış uyarıları (weather condition'a göre)
-        if weather_main in ['rain', 'drizzle', 'thunderstorm']:
-            alerts.append({
-                'type': 'weather',
-                'severity': 'high' if weather_main == 'thunderstorm' else 'medium',
-                'title': f'Yağış Uyarısı: {location}',
-                'message': f'{location} şehrinde {weather.get("weather_description", "yağış")} bekleniyor - Yağış uyarısı',
-                'location': location,
-                'timestamp': weather.get('time', datetime.now().isoformat()),
-                'data': weather
-            })
-        
-        # Kar uyarısı
-        if weather_main == 'snow':
-            alerts.append({
-                'type': 'weather',
-                'category': 'current',
-                'severity': 'high',
-                'title': f'Kar Uyarısı: {location}',
-                'message': f'{location} şehrinde kar yağışı bekleniyor - Kar uyarısı',
-                'location': location,
-                'timestamp': weather.get('time', datetime.now().isoformat()),
-                'data': weather
-            })
-        
-        # Yoğun bulutluluk (>= 80%)
-        if clouds >= 80:
-            alerts.append({
-                'type': 'weather',
-                'category': 'current',
-                'severity': 'medium',
-                'title': f'Yoğun Bulutluluk: {location}',
-                'message': f'{location} şehrinde bulutluluk %{clouds:.0f} - Yoğun bulutluluk (yağış riski)',
-                'location': location,
-                'timestamp': weather.get('time', datetime.now().isoformat()),
-                'data': weather
-            })
-    
-    # EONET doğal afet alert'leri (sadece açık olanlar)
-    for event in eonet_events:
-        if event.get('status') == 'open':
-            categories = event.get('categories', [])
-            title = event.get('title', 'Doğal Afet')
-            event_time = event.get('event_time', event.get('time', datetime.now().isoformat()))
-            
-            # Kategoriye göre severity belirle
-            severity = 'high'  # Varsayılan olarak yüksek öncelik
-            category_str = ','.join(categories).lower() if categories else ''
-            
-            # Yangın ve volkan için yüksek öncelik
-            if 'wildfire' in category_str or 'fire' in category_str or 'yangın' in category_str:
-                severity = 'high'
-            elif 'volcano' in category_str or 'volkan' in category_str:
-                severity = 'high'
-            elif 'storm' in category_str or 'fırtına' in category_str or 'severe' in category_str:
-                severity = 'high'
-            elif 'flood' in category_str or 'sel' in category_str:
-                severity = 'high'
-            else:
-                severity = 'medium'
-            
-            # Konum bilgisi
-            location = 'Bilinmeyen Konum'
-            if event.get('latitude') and event.get('longitude'):
-                location = f"Koordinat: {event.get('latitude'):.4f}, {event.get('longitude'):.4f}"
-            
-            # Kategori metni
-            category_text = ', '.join(categories) if categories else 'Doğal Afet'
-            
-            alerts.append({
-                'type': 'natural_event',
-                'category': 'current',
-                'severity': severity,
-                'title': f'Doğal Afet Uyarısı: {title}',
-                'message': f'{category_text} - {title}. Durum: AÇIK. {location}',
-                'location': location,
-                'timestamp': event_time,
-                'data': event
-            })
-    
-    # Tarihe göre sırala (en yeni önce)
-    alerts.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+def load_section_alerts(state, section, source_file, loader):
+    """Pipeline'ın veri değiştiğinde ürettiği uyarı bölümünü döndür.
+    Bölüm yoksa veya kaynak veri dosyası uyarılardan daha yeniyse kurallar yeniden değerlendirilir."""
+    if state:
+        sections = state.get('sections', {})
+        updated_at = state.get('updated_at', {}).get(section)
+        if section in sections and updated_at:
+            if not source_file or not os.path.exists(source_file) or os.path.getmtime(source_file) <= updated_at:
+                return sections[section]
+    return assign_alert_ids(ALERT_ENGINE.evaluate(section, loader()))
+
+def alert_sources(*paths):
+    """Uyarı sonuçlarının bağlı olduğu dosyalar (pipeline uyarı durumu + kaynak veriler)"""
+    return [veri_klasoru / ALERTS_FILE] + [p for p in paths if p]
+
+def load_current_alerts(state=None):
+    """Mevcut uyarılar: deprem, sürü ve hava durumu pipeline'dan, EONET istek anında (son 1 hafta filtresiyle)"""
+    state = state if state is not None else load_alert_state()
+    swarms = lambda: (load_swarm_state() or {}).get('swarms', [])
+    alerts = (load_section_alerts(state, 'earthquake', get_latest_earthquake_file(), load_earthquake_data) +
+              load_section_alerts(state, 'swarm', str(veri_klasoru / SWARM_STATE_FILE), swarms) +
+              load_section_alerts(state, 'weather', get_latest_weather_file(), get_current_weather_data) +
+              assign_alert_ids(ALERT_ENGINE.evaluate('eonet', load_eonet_data())))
+    alerts.sort(key=lambda x: str(x.get('timestamp', '')), reverse=True)
     return alerts
 
-def generate_forecast_alerts(forecasts_by_city):
-    """Forecast verilerinden alert'ler oluştur (ileriye dönük uyarılar)
-    
-    Aynı şehir için aynı tip uyarıları birleştirir (tekrar eden uyarıları önler).
-    """
-    alerts = []
-    
-    for city, forecast_list in forecasts_by_city.items():
-        if not forecast_list:
-            continue
-        
-        # Şehir için kritik durumları tespit et
-        low_temps = []
-        high_temps = []
-        high_winds = []
-        snow_forecasts = []
-        rain_forecasts = []
-        high_humidity = []
-        low_pressure = []
-        
-        for forecast in forecast_list:
-            temp = forecast.get('temperature', 0)
-            wind = forecast.get('wind_speed', 0)
-            humidity = forecast.get('humidity', 0)
-            pressure = forecast.get('pressure', 0)
-            weather_main = forecast.get('weather_main', '').lower()
-            forecast_time = forecast.get('forecast_time', '')
-            
-            # Düşük sıcaklık (<= 0°C)
-            if temp <= 0:
-                low_temps.append({'temp': temp, 'time': forecast_time})
-            
-            # Yüksek sıcaklık (>= 30°C)
-            if temp >= 30:
-                high_temps.append({'temp': temp, 'time': forecast_time})
-            
-            # Yüksek rüzgar (>= 15 m/s)
-            if wind >= 15:
-                high_winds.append({'wind': wind, 'time': forecast_time})
-            
-            # Kar yağışı
-            if weather_main == 'snow':
-                snow_forecasts.append({'time': forecast_time})
-            
-            # Yağış
-            if weather_main in ['rain', 'drizzle', 'thunderstorm']:
-                rain_forecasts.append({'type': weather_main, 'time': forecast_time})
-            
-            # Yüksek nem (>= 90%)
-            if humidity >= 90:
-                high_humidity.append({'humidity': humidity, 'time': forecast_time})
-            
-            # Düşük basınç (<= 1000 hPa)
-            if pressure and pressure <= 1000:
-                low_pressure.append({'pressure': pressure, 'time': forecast_time})
-        
-        # Birleştirilmiş uyarılar oluştur
-        if low_temps:
-            min_temp = min(t['temp'] for t in low_temps)
-            max_temp = max(t['temp'] for t in low_temps)
-            count = len(low_temps)
-            alerts.append({
-                'type': 'weather',
-                'category': 'forecast',
-                'severity': 'high' if min_temp <= -5 else 'medium',
-                'title': f'Düşük Sıcaklık Tahmini: {city}',
-                'message': f'{city} şehrinde önümüzdeki 5 günde {count} tahmin noktasında düşük sıcaklık bekleniyor ({min_temp:.1f}°C ile {max_temp:.1f}°C arası)',
-                'location': city,
-                'timestamp': low_temps[0]['time'],
-                'data': {'forecast_count': count, 'min_temp': min_temp, 'max_temp': max_temp}
-            })
-        
-        if high_temps:
-            min_temp = min(t['temp'] for t in high_temps)
-            max_temp = max(t['temp'] for t in high_temps)
-            count = len(high_temps)
-            alerts.append({
-                'type': 'weather',
-                'category': 'forecast',
-                'severity': 'high' if max_temp >= 35 else 'medium',
-                'title': f'Yüksek Sıcaklık Tahmini: {city}',
-                'message': f'{city} şehrinde önümüzdeki 5 günde {count} tahmin noktasında yüksek sıcaklık bekleniyor ({min_temp:.1f}°C ile {max_temp:.1f}°C arası)',
-                'location': city,
-                'timestamp': high_temps[0]['time'],
-                'data': {'forecast_count': count, 'min_temp': min_temp, 'max_temp': max_temp}
-            })
-        
-        if high_winds:
-            max_wind = max(w['wind'] for w in high_winds)
-            count = len(high_winds)
-            alerts.append({
-                'type': 'weather',
-                'category': 'forecast',
-                'severity': 'high' if max_wind >= 20 else 'medium',
-                'title': f'Yüksek Rüzgar Tahmini: {city}',
-                'message': f'{city} şehrinde önümüzdeki 5 günde {count} tahmin noktasında yüksek rüzgar bekleniyor (maksimum: {max_wind:.1f} m/s)',
-                'location': city,
-                'timestamp': high_winds[0]['time'],
-                'data': {'forecast_count': count, 'max_wind': max_wind}
-            })
-        
-        if snow_forecasts:
-            alerts.append({
-                'type': 'weather',
-                'category': 'forecast',
-                'severity': 'high',
-                'title': f'Kar Yağışı Tahmini: {city}',
-                'message': f'{city} şehrinde önümüzdeki 5 günde kar yağışı bekleniyor',
-                'location': city,
-                'timestamp': snow_forecasts[0]['time'],
-                'data': {'forecast_count': len(snow_forecasts)}
-            })
-        
-        if rain_forecasts:
-            thunderstorm_count = sum(1 for r in rain_forecasts if r['type'] == 'thunderstorm')
-            severity = 'high' if thunderstorm_count > 0 else 'medium'
-            alert_type = 'Fırtına' if thunderstorm_count > 0 else 'Yağış'
-            alerts.append({
-                'type': 'weather',
-                'category': 'forecast',
-                'severity': severity,
-                'title': f'{alert_type} Tahmini: {city}',
-                'message': f'{city} şehrinde önümüzdeki 5 günde {len(rain_forecasts)} tahmin noktasında yağış bekleniyor' + 
-                          (f' ({thunderstorm_count} fırtına tahmini)' if thunderstorm_count > 0 else ''),
-                'location': city,
-                'timestamp': rain_forecasts[0]['time'],
-                'data': {'forecast_count': len(rain_forecasts), 'thunderstorm_count': thunderstorm_count}
-            })
-        
-        if high_humidity:
-            max_humidity = max(h['humidity'] for h in high_humidity)
-            alerts.append({
-                'type': 'weather',
-                'category': 'forecast',
-                'severity': 'medium',
-                'title': f'Yüksek Nem Tahmini: {city}',
-                'message': f'{city} şehrinde önümüzdeki 5 günde {len(high_humidity)} tahmin noktasında yüksek nem bekleniyor (maksimum: %{max_humidity:.0f})',
-                'location': city,
-                'timestamp': high_humidity[0]['time'],
-                'data': {'forecast_count': len(high_humidity), 'max_humidity': max_humidity}
-            })
-        
-        if low_pressure:
-            min_pressure = min(p['pressure'] for p in low_pressure)
-            alerts.append({
-                'type': 'weather',
-                'category': 'forecast',
-                'severity': 'high',
-                'title': f'Düşük Basınç Tahmini: {city}',
-                'message': f'{city} şehrinde önümüzdeki 5 günde {len(low_pressure)} tahmin noktasında düşük basınç bekleniyor (minimum: {min_pressure:.0f} hPa) - Fırtına riski',
-                'location': city,
-                'timestamp': low_pressure[0]['time'],
-                'data': {'forecast_count': len(low_pressure), 'min_pressure': min_pressure}
-            })
-    
-    # Tarihe göre sırala (en yeni önce)
-    alerts.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+def load_forecast_alerts(state=None):
+    """Tahmin uyarıları: hava durumu tahmini + sel riski"""
+    state = state if state is not None else load_alert_state()
+    forecasts = lambda: [f for forecast_list in load_forecast_data().values() for f in forecast_list]
+    alerts = (load_section_alerts(state, 'forecast', get_latest_weather_file(), forecasts) +
+              load_section_alerts(state, 'flood', str(veri_klasoru / "flood_risk.json"), load_flood_data))
+    alerts.sort(key=lambda x: str(x.get('timestamp', '')), reverse=True)
     return alerts
 
 @app.route('/api/alerts')
 def api_alerts():
     """Tüm alert'leri JSON olarak döndür (current + forecast)"""
-    earthquakes = load_earthquake_data()
-    current_weather = get_current_weather_data()
-    eonet_events = load_eonet_data()
-    forecasts = load_forecast_data()
-    
-    current_alerts = generate_current_alerts(earthquakes, current_weather, eonet_events)
-    forecast_alerts = generate_forecast_alerts(forecasts)
+    state = load_alert_state()
+    current_alerts = load_current_alerts(state)
+    forecast_alerts = load_forecast_alerts(state)
     
     all_alerts = current_alerts + forecast_alerts
     
@@ -884,10 +479,10 @@ def api_alerts():
 @app.route('/api/alerts/current')
 def api_alerts_current():
     """Sadece mevcut durumdan kaynaklanan alert'leri döndür"""
-    earthquakes = load_earthquake_data()
-    current_weather = get_current_weather_data()
-    eonet_events = load_eonet_data()
-    alerts = generate_current_alerts(earthquakes, current_weather, eonet_events)
+    alerts = shared_load('alerts_current',
+                         alert_sources(get_latest_earthquake_file(), get_latest_weather_file(),
+                                       veri_klasoru / "eonet_events.json", veri_klasoru / SWARM_STATE_FILE),
+                         load_current_alerts, ttl=SHARED_CACHE_TTL)
     
     return jsonify({
         'alerts': alerts,
@@ -899,8 +494,9 @@ def api_alerts_current():
 @app.route('/api/alerts/forecast')
 def api_alerts_forecast():
     """Sadece forecast'ten kaynaklanan alert'leri döndür"""
-    forecasts = load_forecast_data()
-    alerts = generate_forecast_alerts(forecasts)
+    alerts = shared_load('alerts_forecast',
+                         alert_sources(get_latest_weather_file(), veri_klasoru / "flood_risk.json"),
+                         load_forecast_alerts, ttl=SHARED_CACHE_TTL)
     
     return jsonify({
         'alerts': alerts,
@@ -909,24 +505,41 @@ def api_alerts_forecast():
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/alerts/changes')
+def api_alerts_changes():
+    """cursor'dan sonra açılan/güncellenen/kapanan alert'leri döndür (pipeline yaşam döngüsü durumu)
+    İlk istekte cursor=0 ile tüm aktif alert'ler gelir, sonraki isteklerde dönen cursor kullanılır"""
+    cursor = request.args.get('cursor', default=0, type=int)
+    result = cached_load('alert_lifecycle', get_alert_lifecycle).changes_since(cursor)
+    
+    return jsonify({
+        'changes': result['changes'],
+        'count': len(result['changes']),
+        'cursor': result['cursor'],
+        'full': result['full'],
+        'timestamp': datetime.now().isoformat()
+    })
+
 def load_wildfire_data():
     """Wildfire verilerini yükle - Son 1 hafta filtresi uygula"""
     wildfire_file = veri_klasoru / "wildfires.json"
     if not wildfire_file.exists():
         return []
     
-    try:
-        with open(wildfire_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Eğer liste değilse listeye çevir
-            if not isinstance(data, list):
-                data = [data] if data else []
-            
-            # Son 1 hafta filtresi uygula
-            return filter_last_one_week(data)
-    except Exception as e:
-        print(f"Error loading wildfire data: {e}")
-        return []
+    def read():
+        try:
+            with open(wildfire_file, 'rb') as f:
+                data = loads(f.read())
+                # Eğer liste değilse listeye çevir
+                if not isinstance(data, list):
+                    data = [data] if data else []
+                
+                # Son 1 hafta filtresi uygula
+                return filter_last_one_week(data)
+        except Exception as e:
+            print(f"Error loading wildfire data: {e}")
+            return []
+    return shared_load('wildfires', [wildfire_file], read, ttl=SHARED_CACHE_TTL)
 
 def load_storm_data():
     """Storm verilerini yükle - En yakın fırtına tarihinden itibaren filtrele"""
@@ -934,18 +547,20 @@ def load_storm_data():
     if not storm_file.exists():
         return []
     
-    try:
-        with open(storm_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Eğer liste değilse listeye çevir
-            if not isinstance(data, list):
-                data = [data] if data else []
-            
-            # En yakın fırtına tarihinden itibaren filtrele
-            return filter_events_from_latest(data, event_type='storm')
-    except Exception as e:
-        print(f"Error loading storm data: {e}")
-        return []
+    def read():
+        try:
+            with open(storm_file, 'rb') as f:
+                data = loads(f.read())
+                # Eğer liste değilse listeye çevir
+                if not isinstance(data, list):
+                    data = [data] if data else []
+                
+                # En yakın fırtına tarihinden itibaren filtrele
+                return filter_events_from_latest(data, event_type='storm')
+        except Exception as e:
+            print(f"Error loading storm data: {e}")
+            return []
+    return shared_load('storms', [storm_file], read, ttl=SHARED_CACHE_TTL)
 
 def load_volcano_data():
     """Volcano verilerini yükle - En yakın volkan tarihinden itibaren filtrele"""
@@ -953,20 +568,26 @@ def load_volcano_data():
     if not volcano_file.exists():
         return []
     
-    try:
-        with open(volcano_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Eğer liste değilse listeye çevir
-            if not isinstance(data, list):
-                data = [data] if data else []
-            
-            # En yakın volkan tarihinden itibaren filtrele
-            return filter_events_from_latest(data, event_type='volcano')
-    except Exception as e:
-        print(f"Error loading volcano data: {e}")
-        return []
+    def read():
+        try:
+            with open(volcano_file, 'rb') as f:
+                data = loads(f.read())
+                # Eğer liste değilse listeye çevir
+                if not isinstance(data, list):
+                    data = [data] if data else []
+                
+                # En yakın volkan tarihinden itibaren filtrele
+                return filter_events_from_latest(data, event_type='volcano')
+        except Exception as e:
+            print(f"Error loading volcano data: {e}")
+            return []
+    return shared_load('volcanos', [volcano_file], read, ttl=SHARED_CACHE_TTL)
 
 def load_flood_data():
+    """Flood risk verileri (son 1 hafta) - worker'lar arası paylaşılan önbellekten"""
+    return shared_load('floods', [veri_klasoru / "flood_risk.json"], _read_flood_data, ttl=SHARED_CACHE_TTL)
+
+def _read_flood_data():
     """Flood risk verilerini yükle - Son 1 hafta filtresi uygula (tüm risk seviyeleri dahil)
     Efe'nin flood_regional_analysis modülünü kullanarak veri yükleme"""
     from processing.flood_regional_analysis import load_flood_data as load_flood_data_analysis
@@ -982,43 +603,26 @@ def load_flood_data():
     else:
         events = payload if isinstance(payload, list) else []
     
-    # Flood verilerindeki tarih formatı: "2025-12-30 T00:00:00" - özel parse gerekli
+    # Flood verilerindeki tarih formatı: "2025-12-30 T00:00:00" (timeutils ayrıştırıcısı okur)
     # Son 1 hafta filtresi uygula (tüm risk seviyeleri dahil)
-    one_week_ago = datetime.now() - timedelta(days=7)
+    one_week_ago = (datetime.now() - timedelta(days=7)).timestamp()
     filtered = []
-    
     for event in events:
-        time_str = event.get('time')
-        if not time_str:
-            continue
-        
-        try:
-            # Flood verilerindeki özel format: "2025-12-30 T00:00:00"
-            if ' T' in str(time_str):
-                event_time = datetime.strptime(str(time_str), '%Y-%m-%d T%H:%M:%S')
-            elif 'T' in str(time_str):
-                time_str_clean = str(time_str).replace('Z', '+00:00')
-                event_time = datetime.fromisoformat(time_str_clean)
-            else:
-                event_time = datetime.strptime(str(time_str), '%Y-%m-%d %H:%M:%S')
-            
-            if event_time.tzinfo:
-                event_time = event_time.astimezone().replace(tzinfo=None)
-            
-            if event_time >= one_week_ago:
-                filtered.append(event)
-        except Exception as e:
-            print(f"Flood tarih parse hatası: {time_str}, {e}")
-            continue
+        epoch = event_epoch(event)
+        if epoch is not None and epoch >= one_week_ago:
+            filtered.append(event)
     
     return filtered
 
 @app.route('/api/wildfires')
 def api_wildfires():
     """Wildfire verilerini döndür"""
+    page = event_page('wildfires', 'wildfires')
+    if page is not None:
+        return page
     wildfires = load_wildfire_data()
     return jsonify({
-        'wildfires': wildfires,
+        'wildfires': encoded_load('wildfires', [veri_klasoru / "wildfires.json"], wildfires, ttl=SHARED_CACHE_TTL),
         'count': len(wildfires),
         'timestamp': datetime.now().isoformat()
     })
@@ -1026,9 +630,12 @@ def api_wildfires():
 @app.route('/api/storms')
 def api_storms():
     """Storm verilerini döndür"""
+    page = event_page('storms', 'storms')
+    if page is not None:
+        return page
     storms = load_storm_data()
     return jsonify({
-        'storms': storms,
+        'storms': encoded_load('storms', [veri_klasoru / "storms.json"], storms, ttl=SHARED_CACHE_TTL),
         'count': len(storms),
         'timestamp': datetime.now().isoformat()
     })
@@ -1036,9 +643,12 @@ def api_storms():
 @app.route('/api/volcanoes')
 def api_volcanoes():
     """Volcano verilerini döndür"""
+    page = event_page('volcanoes', 'volcanoes')
+    if page is not None:
+        return page
     volcanoes = load_volcano_data()
     return jsonify({
-        'volcanoes': volcanoes,
+        'volcanoes': encoded_load('volcanoes', [veri_klasoru / "volcanoes.json"], volcanoes, ttl=SHARED_CACHE_TTL),
         'count': len(volcanoes),
         'timestamp': datetime.now().isoformat()
     })
@@ -1049,12 +659,19 @@ def api_floods():
     floods = load_flood_data()
     # Tüm risk seviyelerini döndür (low, medium, high)
     # Kullanıcı dashboard'da filtreleyebilir
+    summary = cached_load('flood_analytics', get_flood_analytics).summarize(floods)
+    page = event_page('floods', 'floods', high_risk_count=summary['risk_counts']['high'],
+                      medium_risk_count=summary['risk_counts']['medium'],
+                      low_risk_count=summary['risk_counts']['low'], city_summary=summary['cities'])
+    if page is not None:
+        return page
     return jsonify({
-        'floods': floods,
+        'floods': encoded_load('floods', [veri_klasoru / "flood_risk.json"], floods, ttl=SHARED_CACHE_TTL),
         'count': len(floods),
-        'high_risk_count': len([f for f in floods if f.get('risk_level') == 'high']),
-        'medium_risk_count': len([f for f in floods if f.get('risk_level') == 'medium']),
-        'low_risk_count': len([f for f in floods if f.get('risk_level') == 'low']),
+        'high_risk_count': summary['risk_counts']['high'],
+        'medium_risk_count': summary['risk_counts']['medium'],
+        'low_risk_count': summary['risk_counts']['low'],
+        'city_summary': summary['cities'],
         'timestamp': datetime.now().isoformat()
     })
 
@@ -1083,7 +700,12 @@ def api_seismic_risk_faults():
 def api_seismic_risk_fault(fault_id):
     """Belirli bir fay hattı için sismik risk analizi"""
     try:
-        result = analyze_seismic_risk(fault_id=fault_id)
+        if fault_id in FAULT_LINE_DATA:
+            # Analiz tüm deprem dosyalarını okur; sonuç dosyalar değişene kadar worker'lar arasında paylaşılır
+            result = shared_load(f'fault_risk_{fault_id}', glob.glob(str(veri_klasoru / "earthquakes_*.json")),
+                                 lambda: analyze_seismic_risk(fault_id=fault_id), ttl=SHARED_CACHE_TTL)
+        else:
+            result = analyze_seismic_risk(fault_id=fault_id)
         return jsonify(result)
     except Exception as e:
         import traceback
@@ -1123,6 +745,24 @@ def api_seismic_risk_swarms():
         min_days = request.args.get('min_days', default=0, type=int)
         max_days = request.args.get('max_days', default=1, type=int)
         
+        # Pipeline'ın artımlı olarak güncellediği swarm durumu aynı parametrelerle
+        # hesaplandıysa yeniden kümeleme yapmadan onu döndür
+        state = load_swarm_state()
+        if state:
+            tracker = SwarmTracker.from_state(state)
+            if tracker.matches(min_count, max_magnitude, cluster_radius, min_days, max_days):
+                tracker.expire()
+                swarms = tracker.get_swarms()
+                return jsonify({
+                    'swarms': swarms,
+                    'count': len(swarms),
+                    'parameters': tracker.parameters,
+                    'events': tracker.get_recent_events(),
+                    'updated_at': state.get('updated_at'),
+                    'source': 'stream',
+                    'timestamp': datetime.now().isoformat()
+                })
+        
         # Haritada gösterilen deprem verilerini al (dashboard'dan)
         earthquakes = load_earthquake_data()
         
@@ -1171,6 +811,72 @@ def api_seismic_risk_swarms():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/seismic-risk/b-value')
+def api_seismic_risk_b_value():
+    """Gutenberg-Richter b-değeri ve tamamlanma magnitüdü (Mc)
+    fault_id, lat/lon (grid hücresi) veya scope=grid (tüm hücreler) ile sorgulanır"""
+    try:
+        fault_id = request.args.get('fault_id')
+        lat = request.args.get('lat', type=float)
+        lon = request.args.get('lon', type=float)
+        scope = request.args.get('scope', default='all')
+        min_events = request.args.get('min_events', default=MIN_EVENTS_FOR_B, type=int)
+        
+        analyzer = cached_load('magnitude_frequency', get_magnitude_frequency_analyzer)
+        
+        if fault_id:
+            result = analyzer.analyze_fault(fault_id, min_events=min_events)
+            if 'error' in result:
+                return jsonify(result), 404
+        elif lat is not None and lon is not None:
+            result = analyzer.analyze_point(lat, lon, min_events=min_events)
+        elif scope == 'grid':
+            cells = analyzer.analyze_grid(min_events=min_events)
+            result = {
+                'cells': cells,
+                'count': len(cells),
+                'cell_size_deg': analyzer.cell_size,
+                'window_days': analyzer.window_days
+            }
+        else:
+            result = analyzer.analyze('all', min_events=min_events)
+        
+        result['timestamp'] = datetime.now().isoformat()
+        return jsonify(result)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/seismic-risk/aftershocks')
+def api_seismic_risk_aftershocks():
+    """M5.0+ ana şoklar için Omori-Utsu / ETAS artçı deprem tahmini
+    Önümüzdeki 24 saat ve 7 gün için grid hücresi başına artçı olasılığı döndürür. Pipeline'ın
+    aftershock_forecasts.json durumu yalnızca okunur; sonuç (simülasyon sayısı, zaman dilimi) başına paylaşılır"""
+    try:
+        mainshock_id = request.args.get('mainshock_id')
+        n_simulations = request.args.get('n_simulations', default=1000, type=int)
+        n_simulations = max(100, min(n_simulations, 10000))
+        
+        forecasts = shared_load(f'aftershocks_{n_simulations}', [veri_klasoru / AFTERSHOCK_STATE_FILE],
+                                lambda: SeismicRiskAnalyzer().forecast_aftershocks(n_simulations=n_simulations),
+                                ttl=FORECAST_REFRESH_SECONDS)
+        
+        if mainshock_id:
+            forecasts = [f for f in forecasts if f['mainshock_id'] == mainshock_id]
+            if not forecasts:
+                return jsonify({"error": f"Ana şok bulunamadı: {mainshock_id}"}), 404
+        
+        return jsonify({
+            'forecasts': forecasts,
+            'count': len(forecasts),
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/eonet')
 def api_eonet():
     """NASA EONET doğal afet verilerini döndür - Pipeline'dan oluşturulan JSON dosyasından veya API'den"""
@@ -1180,13 +886,14 @@ def api_eonet():
     # Önce pipeline'dan oluşturulan JSON dosyasını kontrol et
     eonet_file = veri_klasoru / "eonet_events.json"
     if eonet_file.exists():
+        def read():
+            data = read_json(eonet_file, [])
+            # Eğer liste değilse listeye çevir
+            if not isinstance(data, list):
+                return [data] if data else []
+            return data
         try:
-            with open(eonet_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Eğer liste değilse listeye çevir
-                if not isinstance(data, list):
-                    return jsonify([data] if data else [])
-                return jsonify(data)
+            return jsonify(encoded_load('eonet_file', [eonet_file], read))
         except Exception as e:
             print(f"EONET JSON dosyası okuma hatası: {e}")
     
@@ -1212,20 +919,19 @@ def api_eonet():
             bbox = [-180, -60, -30, 85]
 
         src = EONETSource(status=status, days=days, limit=limit, category_ids=category_ids, bbox=bbox)
-        events = src.fetch_and_parse()
+        events = src.fetch_batch()
         
-        # Iceberg kategorilerini filtrele (pipeline ile tutarlılık için)
-        filtered_events = []
-        for event in events:
-            event_dict = event.toDictionary() if hasattr(event, 'toDictionary') else event
-            categories = event_dict.get('categories', [])
+        # Iceberg kategorilerini filtrele (pipeline ile tutarlılık için; yalnızca categories sütunu)
+        keep = []
+        for categories in events.column('categories'):
             if categories:
                 categories_str = ','.join(categories).lower()
                 if 'ice' in categories_str or 'iceberg' in categories_str or 'sea and lake ice' in categories_str:
+                    keep.append(False)
                     continue
-            filtered_events.append(event)
+            keep.append(True)
         
-        return jsonify([e.toDictionary() if hasattr(e, 'toDictionary') else e for e in filtered_events])
+        return jsonify(events.filter(keep).records())
     except Exception as e:
         import traceback
         print(f"EONET API Error: {e}")
@@ -1259,6 +965,128 @@ def api_seismic_simulation_trigger():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/seismic-simulation/monte-carlo', methods=['POST'])
+def api_seismic_simulation_monte_carlo():
+    """Monte Carlo toplu simülasyon: scenarios (varsayılan 5000), seed, magnitude_range, sensors, cities,
+    include_scenarios. Sensör ve şehir başına uyarı süresi dağılımı döner; varsayılan parametreli sonuçlar
+    sensör/şehir yapılandırması başına paylaşılan önbellekte tutulur (en fazla MONTE_CARLO_CACHE_ENTRIES)"""
+    try:
+        options = seismic_simulation.batch_options(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        if not seismic_simulation.is_default_run(options):
+            return jsonify(seismic_simulation.simulate_earthquake_batch(**options))
+        key = seismic_simulation.configuration_key(options)
+        result = encoded_load(f'seismic_monte_carlo_{key}', [seismic_simulation.__file__],
+                              lambda: seismic_simulation.simulate_earthquake_batch(**options))
+        SHARED_CACHE.prune('seismic_monte_carlo_', MONTE_CARLO_CACHE_ENTRIES)
+        return jsonify(result)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+def load_eonet_file_data():
+    """Harita katmanı için yalnızca pipeline'ın EONET dosyası (API fallback'i yok)"""
+    return load_eonet_data() if (veri_klasoru / "eonet_events.json").exists() else []
+
+# Harita katmanları: katman -> (kaynak dosyalar, yükleyici, kümede özetlenen sayısal alan,
+# kümede dağılımı sayılan alan, ttl). Zaman filtresi uygulanan katmanlar ttl ile yenilenir.
+MAP_LAYERS = {
+    'earthquakes': (lambda: [get_latest_earthquake_file()], load_earthquake_data, 'magnitude', None, None),
+    'wildfires': (lambda: [veri_klasoru / "wildfires.json"], load_wildfire_data, None, None, SHARED_CACHE_TTL),
+    'storms': (lambda: [veri_klasoru / "storms.json"], load_storm_data, None, 'subtype', SHARED_CACHE_TTL),
+    'volcanoes': (lambda: [veri_klasoru / "volcanoes.json"], load_volcano_data, None, None, SHARED_CACHE_TTL),
+    'floods': (lambda: [veri_klasoru / "flood_risk.json"], load_flood_data, 'river_discharge', 'risk_level',
+               SHARED_CACHE_TTL),
+    'eonet': (lambda: [veri_klasoru / "eonet_events.json"], load_eonet_file_data, None, 'type', SHARED_CACHE_TTL),
+    # Sabit sensör listesi; sürüm modül dosyasına bağlı
+    'sensors': (lambda: [seismic_simulation.__file__], lambda: seismic_simulation.SENSOR_LOCATIONS, None, None, None)
+}
+
+def load_cluster_index(layer):
+    """Katmanın küme indeksi; veri sürümü başına bir kez kurulur ve worker'lar arasında paylaşılır"""
+    paths, loader, value_field, category_field, ttl = MAP_LAYERS[layer]
+    return shared_load(f'map_clusters_{layer}', paths(),
+                       lambda: ClusterIndex(loader(), value_field=value_field, category_field=category_field),
+                       ttl=ttl)
+
+@app.route('/api/map/clusters')
+def api_map_clusters():
+    """Görünüm alanı (bbox=minLon,minLat,maxLon,maxLat) ve zoom için önceden kümelenmiş katmanlar
+    layers=earthquakes,floods (varsayılan: hepsi); MAX_CLUSTER_ZOOM üstünde tek tek noktalar döner"""
+    try:
+        bbox = parse_bbox(request.args.get('bbox'))
+    except ValueError as e:
+        return jsonify({'error': f'Invalid bbox: {e}'}), 400
+    zoom = request.args.get('zoom', default=MIN_ZOOM, type=float)
+    limit = max(1, min(request.args.get('limit', default=MAX_FEATURES, type=int), MAX_FEATURES))
+    layers = [l.strip() for l in request.args.get('layers', ','.join(MAP_LAYERS)).split(',') if l.strip()]
+    unknown = [l for l in layers if l not in MAP_LAYERS]
+    if unknown:
+        return jsonify({'error': f"Unknown layer(s): {', '.join(unknown)}", 'layers': list(MAP_LAYERS)}), 400
+
+    result = {}
+    for layer in layers:
+        try:
+            result[layer] = load_cluster_index(layer).query(bbox, zoom, limit=limit)
+        except Exception as e:
+            log_message(f"Harita kümeleme hatası ({layer}): {e}", "ERROR")
+            result[layer] = {'type': 'FeatureCollection', 'features': [], 'count': 0, 'error': str(e)}
+
+    return jsonify({
+        'layers': result,
+        'bbox': list(bbox) if bbox else None,
+        'zoom': zoom,
+        'max_cluster_zoom': MAX_CLUSTER_ZOOM,
+        'timestamp': datetime.now().isoformat()
+    })
+
+TILE_CACHE = TileCache()
+
+def _collect_tile_cache(registry):
+    registry.set_gauge('tile_cache_bytes', TILE_CACHE.stats()['bytes'] or 0)
+
+DASHBOARD_METRICS.register_collector('tile_cache', _collect_tile_cache)
+
+@app.route('/api/tiles/<layers>/<int:z>/<int:x>/<int:y>.pbf')
+def api_tiles(layers, z, x, y):
+    """Mapbox Vector Tile: layers=earthquakes,eonet,floods,sensors (ya da 'all'), z/x/y XYZ şeması
+    Tile'lar küme indeksinden üretilir ve (z, x, y, veri sürümü) başına diskte önbelleklenir"""
+    names = list(MAP_LAYERS) if layers == 'all' else sorted({l.strip() for l in layers.split(',') if l.strip()})
+    unknown = [l for l in names if l not in MAP_LAYERS]
+    if unknown or not names:
+        return jsonify({'error': f"Unknown layer(s): {', '.join(unknown) or layers}", 'layers': list(MAP_LAYERS)}), 400
+    if not valid_tile(z, x, y):
+        return jsonify({'error': f'Invalid tile {z}/{x}/{y}'}), 404
+
+    paths = [p for name in names for p in MAP_LAYERS[name][0]()]
+    ttl = SHARED_CACHE_TTL if any(MAP_LAYERS[name][4] for name in names) else None
+    version = data_version(paths, ttl=ttl)
+
+    def build():
+        return encode_tile({name: load_cluster_index(name).tile(z, x, y, extent=TILE_EXTENT, buffer=TILE_BUFFER)
+                            for name in names})
+
+    tile, hit = TILE_CACHE.get(','.join(names).replace(',', '+'), z, x, y, version, build)
+    DASHBOARD_METRICS.inc('cache_requests_total', cache='tiles', result='hit' if hit else 'miss')
+    response = Response(tile, mimetype=MVT_MIMETYPE)
+    response.headers['Cache-Control'] = f'public, max-age={SHARED_CACHE_TTL}'
+    response.set_etag(f'{version}-{z}-{x}-{y}')
+    return response.make_conditional(request)
+
+@app.route('/metrics')
+def metrics():
+    """Pipeline (data/metrics.json) ve dashboard metrikleri - Prometheus text formatı, ?format=json ile JSON"""
+    pipeline_snapshot = load_metrics_snapshot(veri_klasoru / METRICS_FILE)
+    dashboard_snapshot = DASHBOARD_METRICS.snapshot()
+    if request.args.get('format') == 'json':
+        return jsonify({'pipeline': pipeline_snapshot, 'dashboard': dashboard_snapshot})
+    return Response(render_prometheus([pipeline_snapshot, dashboard_snapshot]),
+                    mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 if __name__ == '__main__':
     # Başlangıçta eski dosyaları temizle
     try:
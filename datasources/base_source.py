@@ -1,6 +1,7 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
+from models.event_batch import EventBatch
 
 Event = Dict[str, Any]
 
@@ -11,6 +12,11 @@ class DataSourceError(Exception):
 
 class DataSource(ABC):
 
+    # Son fetch_raw çağrısında indirilen yanıt boyutu (bayt); metrikler için
+    last_response_bytes: int = 0
+    # parse çıktısının olay tipi (models/event_batch.EVENT_SCHEMAS anahtarı)
+    event_type: Optional[str] = None
+
     @abstractmethod
     def fetch_raw(self) -> Any:
         raise NotImplementedError
@@ -22,3 +28,10 @@ class DataSource(ABC):
     def fetch_and_parse(self) -> List[Any]:
         raw = self.fetch_raw()
         return self.parse(raw)
+
+    def parse_batch(self, raw: Any) -> EventBatch:
+        # Pipeline'a giden biçim: parse çıktısı olay tipinin şemasıyla sütunsal batch'e paketlenir
+        return EventBatch.from_events(self.parse(raw), event_type=self.event_type)
+
+    def fetch_batch(self) -> EventBatch:
+        return self.parse_batch(self.fetch_raw())
@@ -11,6 +11,7 @@ from datasources.base_source import DataSource, DataSourceError, Event
 
 class EONETSource(DataSource):
 
+    event_type = "natural_event"
     BASE_URL = "https://eonet.gsfc.nasa.gov/api/v3/events"
 
     def __init__(
@@ -46,6 +47,7 @@ class EONETSource(DataSource):
         try:
             r = requests.get(self.BASE_URL, params=params, timeout=15)
             r.raise_for_status()
+            self.last_response_bytes = len(r.content)
             return r.json()
         except Exception as e:
             raise DataSourceError(f"EONET fetch failed: {e}")
@@ -11,6 +11,7 @@ from datasources.base_source import DataSource, DataSourceError, Event
 
 class EONETVolcanoSource(DataSource):
     
+    event_type = "volcano"
     BASE_URL = "https://eonet.gsfc.nasa.gov/api/v3/events"
 
     DEFAULT_AMERICAS_BBOX = "-180,85,-30,-60"
@@ -48,6 +49,7 @@ class EONETVolcanoSource(DataSource):
         try:
             r = requests.get(self.BASE_URL, params=params, timeout=15)
             r.raise_for_status()
+            self.last_response_bytes = len(r.content)
             return r.json()
         except Exception as e:
             raise DataSourceError(f"EONET volcanoes fetch failed: {e}")
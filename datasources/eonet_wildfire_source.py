@@ -11,6 +11,7 @@ from datasources.base_source import DataSource, DataSourceError, Event
 
 class EONETWildfireSource(DataSource):
 
+    event_type = "wildfire"
     BASE_URL = "https://eonet.gsfc.nasa.gov/api/v3/events"
 
     DEFAULT_NA_BBOX = "-180,85,-30,-60"
@@ -43,6 +44,7 @@ class EONETWildfireSource(DataSource):
         try:
             r = requests.get(self.BASE_URL, params=params, timeout=15)
             r.raise_for_status()
+            self.last_response_bytes = len(r.content)
             return r.json()
         except Exception as e:
             raise DataSourceError(f"EONET wildfires fetch failed: {e}")
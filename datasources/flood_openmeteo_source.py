@@ -1,11 +1,13 @@
 import requests
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from datasources.base_source import DataSource, DataSourceError, Event
+from processing.flood_analytics import DEFAULT_THRESHOLDS, classify_discharge
 
 class OpenMeteoFloodSource(DataSource):
 
+    event_type = "flood"
     API_ENDPOINT = "https://flood-api.open-meteo.com/v1/flood"
 
     def __init__(
@@ -15,12 +17,14 @@ class OpenMeteoFloodSource(DataSource):
         past_days: int = 3,
         forecast_days: int = 7,
         location_name: Optional[str] = None,
+        thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
     ):
         self.latitude = latitude
         self.longitude = longitude
         self.past_days = past_days
         self.forecast_days = forecast_days
         self.location_name = location_name
+        self.thresholds = thresholds
 
     def fetch_raw(self):
         query_params = {
@@ -35,6 +39,7 @@ class OpenMeteoFloodSource(DataSource):
         try:
             response = requests.get(self.API_ENDPOINT, params=query_params, timeout=12)
             response.raise_for_status()
+            self.last_response_bytes = len(response.content)
             return response.json()
         except requests.exceptions.RequestException as error:
             raise DataSourceError(f"Network error during Open-Meteo flood fetch: {error}")
@@ -53,21 +58,15 @@ class OpenMeteoFloodSource(DataSource):
         else:
             label = f"{self.latitude},{self.longitude}"
 
-        for iso_date, flow_rate in zip(time_series, discharge_values):
+        # Tüm gün serisi tek seferde sınıflandırılır (eşikler nehre özel olabilir)
+        risk_levels = classify_discharge(discharge_values, self.thresholds)
+
+        for iso_date, flow_rate, current_risk in zip(time_series, discharge_values, risk_levels):
             try:
                 event_date = datetime.fromisoformat(iso_date)
             except (ValueError, TypeError):
                 event_date = None
 
-            if flow_rate is None:
-                current_risk = "unknown"
-            elif flow_rate < 200:
-                current_risk = "low"
-            elif flow_rate < 800:
-                current_risk = "medium"
-            else:
-                current_risk = "high"
-
             flood_events.append({
                 "type": "flood_risk",
                 "source": "Open-Meteo Flood",
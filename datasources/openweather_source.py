@@ -21,6 +21,7 @@ AMERICAS_CITY_COUNTRY_MAP = {
 
 
 class OpenWeatherSource(DataSource):
+    event_type = "weather"
     BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
     FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"  # 5 günlük, 3 saatlik tahmin
 
@@ -50,6 +51,7 @@ class OpenWeatherSource(DataSource):
             r = requests.get(self.BASE_URL, params=params, timeout=10)
             r.raise_for_status()
             current_data = r.json()
+            self.last_response_bytes = len(r.content)
             
             # Forecast verisi de isteniyorsa çek
             forecast_data = None
@@ -58,6 +60,7 @@ class OpenWeatherSource(DataSource):
                     r_forecast = requests.get(self.FORECAST_URL, params=params, timeout=10)
                     r_forecast.raise_for_status()
                     forecast_data = r_forecast.json()
+                    self.last_response_bytes += len(r_forecast.content)
                 except Exception as e:
                     # Forecast başarısız olsa bile current data'yı döndür
                     pass
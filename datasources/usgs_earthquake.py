@@ -2,9 +2,11 @@ import requests
 from datetime import datetime
 from datasources.base_source import DataSource, DataSourceError
 from models import RawEarthquake
+from models.event_batch import EventBatch
 
 
 class USGSEarthquakeSource(DataSource):
+    event_type = "earthquake"
     URL = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/2.5_day.geojson"
 
     def __init__(self, bbox=None):
@@ -14,12 +16,13 @@ class USGSEarthquakeSource(DataSource):
         try:
             r = requests.get(self.URL, timeout=10)
             r.raise_for_status()
+            self.last_response_bytes = len(r.content)
             return r.json()
         except Exception as e:
             raise DataSourceError(f"USGS fetch failed: {e}")
 
-    def parse(self, raw):
-        events = []
+    def _features(self, raw):
+        # (properties, lat, lon); bbox filtresi varsa uygulanmış
         for item in raw.get("features", []):
             props = item.get("properties", {})
             coords = item.get("geometry", {}).get("coordinates", [None, None])
@@ -34,7 +37,12 @@ class USGSEarthquakeSource(DataSource):
                     continue
                 if not (min_lat <= lat <= max_lat and min_lon <= lon <= max_lon):
                     continue  # Bu deprem bbox dışında, atla
+            
+            yield props, lat, lon
 
+    def parse(self, raw):
+        events = []
+        for props, lat, lon in self._features(raw):
             # Create RawEarthquake object instead of dictionary
             raw_eq = RawEarthquake(
                 type="earthquake",
@@ -49,3 +57,26 @@ class USGSEarthquakeSource(DataSource):
             events.append(raw_eq)
 
         return events
+
+    def parse_batch(self, raw):
+        # parse() + RawEarthquake.toDictionary ile aynı satırlar; büyük feed'lerde nesne kurulmadan
+        # doğrudan sütunlara yazılır
+        locations, magnitudes, times, latitudes, longitudes, epochs = [], [], [], [], [], []
+        for props, lat, lon in self._features(raw):
+            event_time = datetime.fromtimestamp((props.get("time", 0) / 1000))
+            locations.append(props.get("place"))
+            magnitudes.append(props.get("mag"))
+            times.append(event_time.isoformat())
+            latitudes.append(lat)
+            longitudes.append(lon)
+            epochs.append(event_time.timestamp())
+        return EventBatch.from_columns(self.event_type, {
+            "type": ["earthquake"] * len(times),
+            "source": ["USGS"] * len(times),
+            "location": locations,
+            "magnitude": magnitudes,
+            "time": times,
+            "latitude": latitudes,
+            "longitude": longitudes,
+            "epoch": epochs,
+        })
@@ -1,3 +1,4 @@
+import argparse
 import traceback
 from datasources.usgs_earthquake import USGSEarthquakeSource
 from datasources.openweather_source import OpenWeatherSource, AMERICAS_CITY_COUNTRY_MAP
@@ -11,7 +12,19 @@ from pipeline.fetch_flood import CITIES as FLOOD_CITIES
 from processing import log_message
 
 
-def main():
+def replay(include_processed: bool = False):
+    # Veri çekmeden WAL'daki batch'leri işler (çökme sonrası kurtarma / kayıtlı girdiyle benchmark)
+    runtime = RuntimeSystem(data_sources=[])
+    try:
+        runtime.replay(include_processed=include_processed)
+    except KeyboardInterrupt:
+        log_message("\nDetected keyboard interrupt", "INFO")
+    finally:
+        runtime.stop()
+        log_message("Replay stopped", "INFO")
+
+
+def main(once: bool = False):
 
     americas_bbox = [-180, -60, -30, 85]
     earthquake_source = USGSEarthquakeSource(bbox=americas_bbox)
@@ -60,7 +73,8 @@ def main():
     log_message("Runtime system is ready", "INFO")
     
     try:
-        runtime.start()
+        # Varsayılan: durdurulana kadar baskıya göre ayarlanan aralıklarla çek-işle
+        runtime.start(cycles=1 if once else None)
         
     except KeyboardInterrupt:
         log_message("\nDetected keyboard interrupt", "INFO")
@@ -73,4 +87,16 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="SDEWS runtime")
+    parser.add_argument("--once", action="store_true",
+                        help="Tek çek-işle döngüsü çalıştır ve çık (varsayılan: durdurulana kadar sürekli)")
+    parser.add_argument("--replay", action="store_true",
+                        help="Veri çekmeden write-ahead log'daki işlenmemiş batch'leri işle")
+    parser.add_argument("--include-processed", action="store_true",
+                        help="--replay ile birlikte: WAL'da kalan işlenmiş batch'leri de yeniden işle")
+    args = parser.parse_args()
+
+    if args.replay:
+        replay(include_processed=args.include_processed)
+    else:
+        main(once=args.once)
@@ -0,0 +1,342 @@
+# Model batch'leri için sütunsal (columnar) depolama
+# Büyük batch'ler (aylarca tahmin, binlerce deprem) nesne/sözlük listesi yerine alan başına paralel
+# tipli dizilerde tutulur:
+#   NUMBER  array('d'); None -> NaN, tamsayılar ayrı bir bayrakla geri int döner
+#   TEXT    sözlük kodlaması: tekrar eden metinler (konum, kaynak, tip) bir kez saklanır, satırda
+#           array('I') kodu
+#   OBJECT  düz liste (benzersiz metinler, listeler, datetime)
+# Satırda bulunmayan alan (sözlükte anahtar yok) None'dan ayrı tutulur, böylece satırlar
+# toDictionary()/kaynak sözlüğünün birebir aynısı olarak geri okunur. Tipine uymayan bir değer
+# gelirse sütun OBJECT'e yükseltilir (veri kaybolmaz, yalnızca o sütun sıkıştırılmaz).
+# Not: NUMBER sütununda NaN değeri None olarak okunur (JSON çıktısında zaten null).
+# Tablo işlemleri (take/filter/extend_table/set_column/numbers/matches) satır sözlüğü kurmadan
+# sütun sütun çalışır; pipeline'ın olay batch'i bunun üzerine kuruludur (models/event_batch).
+
+from __future__ import annotations
+import math
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .earthquake import RawEarthquake, CleanedEarthquake
+from .natural_event import NaturalEvent
+from .weather import Weather
+
+NUMBER = 'number'
+TEXT = 'text'
+OBJECT = 'object'
+
+# double'da tam saklanabilen en büyük tamsayı
+MAX_EXACT_INT = 2 ** 53
+# Satır sözlükleri bu büyüklükte parçalar halinde üretilir (iterasyonda bellek tepe noktası)
+ITER_CHUNK_ROWS = 4096
+
+_NAN = math.nan
+_ABSENT = object()
+
+
+class ObjectColumn:
+    kind = OBJECT
+
+    def __init__(self):
+        self.data: Any = []
+        # None: tüm satırlarda alan var; aksi halde satır başına 1 (var) / 0 (yok)
+        self.mask: Optional[bytearray] = None
+
+    def __len__(self):
+        return len(self.data)
+
+    def _store(self, values: List[Any]):
+        self.data.extend(values)
+
+    def extend(self, values: List[Any]):
+        if any(v is _ABSENT for v in values):
+            flags = bytearray(v is not _ABSENT for v in values)
+            self._store([None if v is _ABSENT else v for v in values])
+            if self.mask is None:
+                self.mask = bytearray(b'\x01') * (len(self) - len(values))
+            self.mask += flags
+        else:
+            self._store(values)
+            if self.mask is not None:
+                self.mask += b'\x01' * len(values)
+
+    def values(self, start: int = 0, stop: Optional[int] = None) -> List[Any]:
+        return list(self.data[start:stop])
+
+    def cells(self, start: int = 0, stop: Optional[int] = None) -> List[Any]:
+        # values() ile aynı, ancak satırda olmayan alan _ABSENT (extend'e geri verilebilir)
+        values = self.values(start, stop)
+        if self.mask is None:
+            return values
+        return [v if present else _ABSENT for v, present in zip(values, self.mask[start:stop])]
+
+    def promote(self) -> "ObjectColumn":
+        column = ObjectColumn()
+        column.data = self.values()
+        column.mask = self.mask
+        return column
+
+
+class NumberColumn(ObjectColumn):
+    kind = NUMBER
+
+    def __init__(self):
+        super().__init__()
+        self.data = array('d')
+        # None: hiç tamsayı gelmedi; aksi halde satır başına 1 (int) / 0 (float)
+        self.ints: Optional[bytearray] = None
+
+    def _store(self, values: List[Any]):
+        floats = []
+        int_flags = None
+        for i, value in enumerate(values):
+            kind = type(value)
+            if kind is float:
+                floats.append(value)
+            elif value is None:
+                floats.append(_NAN)
+            elif kind is int and -MAX_EXACT_INT <= value <= MAX_EXACT_INT:
+                if int_flags is None:
+                    int_flags = bytearray(len(values))
+                int_flags[i] = 1
+                floats.append(float(value))
+            else:
+                raise TypeError(f"NUMBER sütununa uymayan değer: {value!r}")
+        if int_flags is not None and self.ints is None:
+            self.ints = bytearray(len(self.data))
+        self.data.extend(floats)
+        if self.ints is not None:
+            self.ints += int_flags if int_flags is not None else bytes(len(values))
+
+    def values(self, start: int = 0, stop: Optional[int] = None) -> List[Any]:
+        data = self.data[start:stop]
+        if self.ints is None:
+            return [None if v != v else v for v in data]
+        return [None if v != v else (int(v) if flag else v) for v, flag in zip(data, self.ints[start:stop])]
+
+
+class TextColumn(ObjectColumn):
+    kind = TEXT
+
+    def __init__(self):
+        super().__init__()
+        self.data = array('I')
+        # Kod 0 None'a ayrılmıştır
+        self.table: List[Optional[str]] = [None]
+        self.index: Dict[str, int] = {}
+
+    def _store(self, values: List[Any]):
+        index, table = self.index, self.table
+        codes = []
+        for value in values:
+            if value is None:
+                codes.append(0)
+                continue
+            if type(value) is not str:
+                raise TypeError(f"TEXT sütununa uymayan değer: {value!r}")
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(table)
+                table.append(value)
+            codes.append(code)
+        self.data.extend(codes)
+
+    def values(self, start: int = 0, stop: Optional[int] = None) -> List[Any]:
+        table = self.table
+        return [table[code] for code in self.data[start:stop]]
+
+    def __getstate__(self):
+        # index tablodan yeniden kurulabilir; pickle (WAL, süreç havuzu) yalnızca tabloyu taşır
+        state = self.__dict__.copy()
+        del state['index']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.index = {value: code for code, value in enumerate(self.table) if code}
+
+
+COLUMN_KINDS = {NUMBER: NumberColumn, TEXT: TextColumn, OBJECT: ObjectColumn}
+
+# Model alanları toDictionary() sırasıyla; benzersiz metinler (zaman, başlık, id) OBJECT
+MODEL_SCHEMAS: Dict[type, Tuple[Tuple[str, str], ...]] = {
+    RawEarthquake: (
+        ('type', TEXT), ('source', TEXT), ('location', TEXT), ('magnitude', NUMBER), ('time', OBJECT),
+        ('latitude', NUMBER), ('longitude', NUMBER), ('epoch', NUMBER)),
+    CleanedEarthquake: (
+        ('id', NUMBER), ('event_type', TEXT), ('timestamp', OBJECT), ('magnitude', NUMBER), ('location', TEXT),
+        ('latitude', NUMBER), ('longitude', NUMBER), ('epoch', NUMBER)),
+    NaturalEvent: (
+        ('type', TEXT), ('source', TEXT), ('event_id', OBJECT), ('title', OBJECT), ('status', TEXT),
+        ('time', OBJECT), ('event_time', OBJECT), ('categories', OBJECT), ('link', OBJECT),
+        ('latitude', NUMBER), ('longitude', NUMBER), ('geometry_type', TEXT), ('epoch', NUMBER)),
+    Weather: (
+        ('type', TEXT), ('source', TEXT), ('location', TEXT), ('temperature', NUMBER), ('wind_speed', NUMBER),
+        ('time', OBJECT), ('humidity', NUMBER), ('pressure', NUMBER), ('wind_direction', NUMBER),
+        ('wind_gust', NUMBER), ('clouds', NUMBER), ('precipitation', NUMBER), ('visibility', NUMBER),
+        ('weather_main', TEXT), ('weather_description', TEXT), ('weather_icon', TEXT), ('sunrise', NUMBER),
+        ('sunset', NUMBER), ('latitude', NUMBER), ('longitude', NUMBER), ('feels_like', NUMBER),
+        ('temp_min', NUMBER), ('temp_max', NUMBER), ('forecast_time', OBJECT), ('epoch', NUMBER)),
+}
+
+
+class ColumnarTable:
+    """Sözlük/model kayıtlarını alan başına tipli dizilerde tutar; şemada olmayan alanlar
+    ilk görüldüklerinde OBJECT sütunu olarak eklenir"""
+
+    def __init__(self, schema: Sequence[Tuple[str, str]] = (), model_cls: Optional[type] = None):
+        self.model_cls = model_cls
+        self.columns: Dict[str, ObjectColumn] = {name: COLUMN_KINDS[kind]() for name, kind in schema}
+        self.length = 0
+
+    @classmethod
+    def for_model(cls, model_cls: type, records: Iterable[Any] = ()) -> "ColumnarTable":
+        table = cls(MODEL_SCHEMAS[model_cls], model_cls=model_cls)
+        table.extend(records)
+        return table
+
+    def __len__(self):
+        return self.length
+
+    def _add_column(self, name: str, kind: str = OBJECT):
+        column = COLUMN_KINDS[kind]()
+        if self.length:
+            column.extend([_ABSENT] * self.length)
+        self.columns[name] = column
+
+    def _extend_column(self, name: str, values: List[Any]):
+        column = self.columns[name]
+        try:
+            column.extend(values)
+        except TypeError:
+            column = self.columns[name] = column.promote()
+            column.extend(values)
+
+    def _modified(self):
+        # Alt sınıflar satır önbelleklerini burada geçersiz kılar
+        pass
+
+    def extend(self, records: Iterable[Any]):
+        rows = [r.toDictionary() if hasattr(r, 'toDictionary') else r for r in records]
+        if not rows:
+            return
+        for shape in {tuple(row) for row in rows}:
+            for name in shape:
+                if name not in self.columns:
+                    self._add_column(name)
+        for name in self.columns:
+            self._extend_column(name, [row.get(name, _ABSENT) for row in rows])
+        self.length += len(rows)
+        self._modified()
+
+    def extend_table(self, other: "ColumnarTable"):
+        """Başka bir tablonun satırlarını sütun sütun ekler (satır sözlüğü kurulmaz)"""
+        for name, column in other.columns.items():
+            if name not in self.columns:
+                self._add_column(name, column.kind)
+        for name in self.columns:
+            column = other.columns.get(name)
+            self._extend_column(name, column.cells() if column is not None else [_ABSENT] * len(other))
+        self.length += len(other)
+        self._modified()
+
+    def append(self, record: Any):
+        self.extend((record,))
+
+    def column(self, name: str) -> List[Any]:
+        """Alanın tüm satırlardaki değerleri (olmayanlar None)"""
+        return self.columns[name].values()
+
+    def numbers(self, name: str) -> array:
+        """Alanın sayısal değerleri array('d') olarak; sayı olmayan/olmayan alanlar NaN"""
+        column = self.columns.get(name)
+        if column is None:
+            return array('d', [_NAN]) * self.length
+        if column.kind == NUMBER:
+            return array('d', column.data)
+        return array('d', [float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else _NAN
+                           for v in column.values()])
+
+    def matches(self, name: str, value: Any) -> List[bool]:
+        """Satır başına alan == value maskesi; TEXT sütununda metin değil kod karşılaştırılır"""
+        column = self.columns.get(name)
+        if column is None:
+            return [value is None] * self.length
+        if column.kind == TEXT and (value is None or type(value) is str):
+            code = 0 if value is None else column.index.get(value)
+            if code is None:
+                return [False] * self.length
+            return [c == code for c in column.data]
+        return [v == value for v in column.values()]
+
+    def distinct(self, name: str) -> List[Any]:
+        """Alanın farklı (None olmayan) değerleri; TEXT sütununda satırlar taranmaz, kod tablosu okunur"""
+        column = self.columns.get(name)
+        if column is None:
+            return []
+        if column.kind == TEXT:
+            return column.table[1:]
+        values = [v for v in column.values() if v is not None]
+        try:
+            return list(dict.fromkeys(values))
+        except TypeError:
+            return [v for i, v in enumerate(values) if v not in values[:i]]
+
+    def set_column(self, name: str, values: Sequence[Any], kind: str = OBJECT):
+        """Alanı verilen değerlerle değiştirir (yoksa sona ekler); _ABSENT olmayan alan demektir"""
+        if len(values) != self.length:
+            raise ValueError(f"{name}: {len(values)} değer, tabloda {self.length} satır var")
+        existing = self.columns.get(name)
+        self.columns[name] = COLUMN_KINDS[existing.kind if existing is not None else kind]()
+        self._extend_column(name, list(values))
+        self._modified()
+
+    def _empty_like(self) -> "ColumnarTable":
+        table = self.__class__.__new__(self.__class__)
+        table.__dict__.update(self.__dict__)
+        table.columns = {name: COLUMN_KINDS[column.kind]() for name, column in self.columns.items()}
+        table.length = 0
+        table._modified()
+        return table
+
+    def take(self, positions: Sequence[int]) -> "ColumnarTable":
+        """Verilen satırlardan (verilen sırayla) aynı şemalı yeni tablo"""
+        table = self._empty_like()
+        for name, column in self.columns.items():
+            cells = column.cells()
+            table.columns[name].extend([cells[p] for p in positions])
+        table.length = len(positions)
+        return table
+
+    def filter(self, mask: Iterable[Any]) -> "ColumnarTable":
+        return self.take([position for position, keep in enumerate(mask) if keep])
+
+    def to_dicts(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        start, stop, _ = slice(start, stop).indices(self.length)
+        rows: List[Dict[str, Any]] = [{} for _ in range(max(0, stop - start))]
+        for name, column in self.columns.items():
+            values = column.values(start, stop)
+            if column.mask is None:
+                for row, value in zip(rows, values):
+                    row[name] = value
+            else:
+                for row, value, present in zip(rows, values, column.mask[start:stop]):
+                    if present:
+                        row[name] = value
+        return rows
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for start in range(0, self.length, ITER_CHUNK_ROWS):
+            yield from self.to_dicts(start, start + ITER_CHUNK_ROWS)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        return self.to_dicts(index, index + 1)[0]
+
+    def to_models(self) -> List[Any]:
+        if self.model_cls is None:
+            raise TypeError("ColumnarTable bir model sınıfına bağlı değil")
+        return [self.model_cls.fromDict(row) for row in self]
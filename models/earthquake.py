@@ -1,6 +1,11 @@
 class CleanedEarthquake:
 
-    def __init__(self, id, event_type, timestamp, magnitude, location, latitude=None, longitude=None):
+    # __dict__ yerine sabit alan yuvaları (nesne başına daha az bellek, daha hızlı alan erişimi)
+    __slots__ = ('id', 'event_type', 'timestamp', 'location', 'magnitude', 'latitude', 'longitude', 'epoch')
+
+    def __init__(self, id, event_type, timestamp, magnitude, location, latitude=None, longitude=None, epoch=None):
+        # processing paketi models'i import ettiği için burada geç import edilir
+        from processing.timeutils import parse_timestamp
         self.id = id
         self.event_type = event_type
         self.timestamp = timestamp
@@ -8,6 +13,8 @@ class CleanedEarthquake:
         self.magnitude = magnitude
         self.latitude = latitude
         self.longitude = longitude
+        # Olay zamanı epoch saniye (ingest'te bir kez hesaplanır)
+        self.epoch = epoch if epoch is not None else parse_timestamp(timestamp)
 
     def __repr__(self):
         return f" id:{self.id}, event_type:{self.event_type}, timestamp:{self.timestamp}, location:{self.location}, magnitude:{self.magnitude}"
@@ -24,8 +31,23 @@ class CleanedEarthquake:
             result["latitude"] = self.latitude
         if self.longitude is not None:
             result["longitude"] = self.longitude
+        if self.epoch is not None:
+            result["epoch"] = self.epoch
         return result
 
+    @classmethod
+    def fromDict(c, data_: dict):
+        return c(
+            id=data_.get("id"),
+            event_type=data_.get("event_type"),
+            timestamp=data_.get("timestamp"),
+            magnitude=data_.get("magnitude"),
+            location=data_.get("location"),
+            latitude=data_.get("latitude"),
+            longitude=data_.get("longitude"),
+            epoch=data_.get("epoch")
+        )
+
     @classmethod
     def fromRaw(c, raw_earthquake, id=None):
         if hasattr(raw_earthquake.time, "isoformat"):
@@ -49,7 +71,10 @@ class CleanedEarthquake:
 
 class RawEarthquake:
 
+    __slots__ = ('type', 'source', 'location', 'magnitude', 'time', 'latitude', 'longitude', 'epoch')
+
     def __init__(self, type, source, location, magnitude, time, latitude, longitude):
+        from processing.timeutils import parse_timestamp
         self.type = type
         self.source = source
         self.location = location
@@ -57,6 +82,7 @@ class RawEarthquake:
         self.time = time
         self.latitude = latitude
         self.longitude = longitude
+        self.epoch = parse_timestamp(time)
 
     def __repr__(self):
         return f" type:{self.type}, source:{self.source}, location:{self.location}, magnitude:{self.magnitude}, time:{self.time}, latitude:{self.latitude}, longitude:{self.longitude}"
@@ -73,6 +99,7 @@ class RawEarthquake:
             "time": time_val,
             "latitude": self.latitude,
             "longitude": self.longitude,
+            "epoch": self.epoch,
         }
 
     @classmethod
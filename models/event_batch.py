@@ -0,0 +1,184 @@
+# Pipeline boyunca taşınan sütunsal olay batch'i
+# Kaynaklar parse çıktısını olay tipinin şemasıyla bir kez EventBatch'e paketler
+# (DataSource.parse_batch). WAL, öncelik kuyruğu, süreç havuzu ve processor'lar nesne/sözlük
+# listesi yerine bunu taşır: sütunlar tipli dizi olduğu için pickle (WAL kaydı, süreç havuzu
+# gidiş-dönüşü) küçük kalır; maske, filtre, epoch damgalama ve istatistik satır sözlüğü
+# kurmadan sütun üzerinde çalışır. Satır bazlı mantık (sürü takibi, uyarı kuralları) ve JSON
+# kodlaması için satırlar records() ile bir kez açılır.
+#
+# Şemalar kaynakların ürettiği alan sırasındadır, böylece çıktı dosyalarındaki anahtar sırası
+# liste tabanlı akışla aynıdır. Şemada olmayan alanlar ilk görüldükleri yerde OBJECT sütunu
+# olarak eklenir.
+
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .columnar import ColumnarTable, MODEL_SCHEMAS, NUMBER, TEXT, OBJECT, _ABSENT
+from .earthquake import RawEarthquake, CleanedEarthquake
+from .natural_event import NaturalEvent
+from .weather import Weather
+
+# EONET kaynaklarının (olay, yangın, fırtına, volkan) ortak alan grupları
+_EONET_DETAIL = (
+    ('title', OBJECT), ('description', OBJECT))
+_EONET_CATEGORIES = (
+    ('categories', OBJECT), ('category_ids', OBJECT), ('category_titles', OBJECT), ('closed', OBJECT),
+    ('link', OBJECT))
+
+EVENT_SCHEMAS: Dict[str, Sequence] = {
+    'earthquake': MODEL_SCHEMAS[RawEarthquake],
+    'cleaned_earthquake': MODEL_SCHEMAS[CleanedEarthquake],
+    'weather': MODEL_SCHEMAS[Weather],
+    'natural_event': (
+        ('type', TEXT), ('source', TEXT), ('event_id', OBJECT)) + _EONET_DETAIL + (
+        ('time', OBJECT), ('event_time', OBJECT), ('latitude', NUMBER), ('longitude', NUMBER)) + _EONET_CATEGORIES + (
+        ('status', TEXT), ('geometry_type', TEXT), ('epoch', NUMBER)),
+    'wildfire': (
+        ('type', TEXT), ('source', TEXT), ('event_id', OBJECT)) + _EONET_DETAIL + (
+        ('time', OBJECT), ('latitude', NUMBER), ('longitude', NUMBER)) + _EONET_CATEGORIES + (
+        ('epoch', NUMBER),),
+    'storm': (
+        ('type', TEXT), ('subtype', TEXT), ('source', TEXT), ('event_id', OBJECT)) + _EONET_DETAIL + (
+        ('time', OBJECT), ('latitude', NUMBER), ('longitude', NUMBER)) + _EONET_CATEGORIES + (
+        ('epoch', NUMBER),),
+    'volcano': (
+        ('type', TEXT), ('subtype', TEXT), ('source', TEXT), ('event_id', OBJECT)) + _EONET_DETAIL + (
+        ('time', OBJECT), ('event_time', OBJECT), ('latitude', NUMBER), ('longitude', NUMBER)) + _EONET_CATEGORIES + (
+        ('status', TEXT), ('epoch', NUMBER)),
+    'flood': (
+        ('type', TEXT), ('source', TEXT), ('time', OBJECT), ('location', TEXT), ('latitude', NUMBER),
+        ('longitude', NUMBER), ('river_discharge', NUMBER), ('risk_level', TEXT), ('epoch', NUMBER)),
+}
+
+# to_models() için olay tipi -> model sınıfı
+EVENT_MODELS: Dict[str, type] = {
+    'earthquake': RawEarthquake,
+    'cleaned_earthquake': CleanedEarthquake,
+    'weather': Weather,
+}
+
+# Tip belirtilmeden gelen listeler (eski WAL kayıtları, dış çağıranlar) için tahmin tabloları
+MODEL_EVENT_TYPES: Dict[type, str] = {
+    RawEarthquake: 'earthquake',
+    CleanedEarthquake: 'cleaned_earthquake',
+    Weather: 'weather',
+    NaturalEvent: 'natural_event',
+}
+RECORD_EVENT_TYPES: Dict[str, str] = {
+    'earthquake': 'earthquake',
+    'weather': 'weather',
+    'weather_forecast': 'weather',
+    'natural_event': 'natural_event',
+    'wildfire': 'wildfire',
+    'storm': 'storm',
+    'volcano': 'volcano',
+    'flood_risk': 'flood',
+}
+
+
+def infer_event_type(record: Any) -> Optional[str]:
+    """Tek bir kaydın olay tipi (model sınıfından ya da sözlüğün 'type' alanından); bilinmiyorsa None"""
+    if isinstance(record, dict):
+        return RECORD_EVENT_TYPES.get(record.get('type'))
+    return MODEL_EVENT_TYPES.get(type(record))
+
+
+def event_count(data: Any) -> int:
+    """Kuyruk/WAL batch'indeki olay sayısı (EventBatch, eski liste ya da tek kayıt)"""
+    return len(data) if isinstance(data, (EventBatch, list)) else 1
+
+
+class EventBatch(ColumnarTable):
+    """Olay tipine bağlı şemalı sütunsal batch"""
+
+    def __init__(self, event_type: Optional[str] = None):
+        super().__init__(EVENT_SCHEMAS.get(event_type, ()), model_cls=EVENT_MODELS.get(event_type))
+        self.event_type = event_type
+        self._rows: Optional[List[Dict[str, Any]]] = None
+
+    def __repr__(self):
+        return f"EventBatch(event_type={self.event_type!r}, rows={self.length}, columns={len(self.columns)})"
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_rows'] = None
+        return state
+
+    def _modified(self):
+        self._rows = None
+
+    @classmethod
+    def from_events(cls, events: Iterable[Any], event_type: Optional[str] = None) -> "EventBatch":
+        """Model/sözlük listesinden batch; zaten EventBatch ise olduğu gibi döner"""
+        if isinstance(events, EventBatch):
+            return events
+        events = list(events)
+        if event_type is None and events:
+            event_type = infer_event_type(events[0])
+        batch = cls(event_type)
+        batch.extend(events)
+        return batch
+
+    @classmethod
+    def from_columns(cls, event_type: Optional[str], columns: Mapping[str, Sequence[Any]],
+                     omit_none: Sequence[str] = ()) -> "EventBatch":
+        """Sütun listelerinden batch; omit_none alanlarında None, satırda alan yok demektir
+        (modellerin toDictionary'de atladığı alanlar)"""
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Sütun uzunlukları farklı: {sorted(lengths)}")
+        batch = cls(event_type)
+        batch.length = lengths.pop() if lengths else 0
+        for name in list(batch.columns):
+            if name not in columns:
+                batch.set_column(name, [_ABSENT] * batch.length)
+        for name, values in columns.items():
+            if name in omit_none:
+                values = [_ABSENT if value is None else value for value in values]
+            batch.set_column(name, values)
+        return batch
+
+    @classmethod
+    def concat(cls, batches: Sequence["EventBatch"]) -> "EventBatch":
+        if len(batches) == 1:
+            return batches[0]
+        result = cls(batches[0].event_type if batches else None)
+        for batch in batches:
+            result.extend_table(batch)
+        return result
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Satır sözlükleri; ilk çağrıda üretilip batch değişene kadar saklanır. Birden çok
+        tüketici aynı listeyi paylaştığı için değiştirilmemelidir (değiştirecekler to_dicts())"""
+        if self._rows is None:
+            self._rows = self.to_dicts()
+        return self._rows
+
+    def epochs(self):
+        """Satır başına epoch saniye (array('d')); damgasız satırlar NaN"""
+        from processing.timeutils import EPOCH_FIELD
+        return self.numbers(EPOCH_FIELD)
+
+    def stamp_epochs(self):
+        """timeutils.stamp_epochs'un sütunsal karşılığı: epoch alanı olmayan satırlara
+        TIME_FIELDS'ten ilk okunabilen zamanı yazar (modeller kurucuda hesapladığı için atlanır)"""
+        from processing.timeutils import EPOCH_FIELD, TIME_FIELDS, parse_timestamp
+        column = self.columns.get(EPOCH_FIELD)
+        if not self.length or (column is not None and column.mask is None):
+            return
+        cells = column.cells() if column is not None else [_ABSENT] * self.length
+        sources = [self.columns[field].values() for field in TIME_FIELDS if field in self.columns]
+        for position, cell in enumerate(cells):
+            if cell is not _ABSENT:
+                continue
+            for values in sources:
+                epoch = parse_timestamp(values[position])
+                if epoch is not None:
+                    cells[position] = epoch
+                    break
+        self.set_column(EPOCH_FIELD, cells, kind=NUMBER)
+
+    def encode(self, indent: bool = False) -> bytes:
+        """JSON (storage.save_events_to_json ile aynı biçim)"""
+        from processing.serialization import dumps
+        return dumps(self.records(), indent=indent)
@@ -1,8 +1,13 @@
 class NaturalEvent:
 
+    __slots__ = ('type', 'source', 'event_id', 'title', 'status', 'time', 'event_time', 'categories', 'link',
+                 'latitude', 'longitude', 'geometry_type', 'epoch')
+
     def __init__(self, type, source, event_id, title, status, time,
                  event_time=None, categories=None, link=None,
                  latitude=None, longitude=None, geometry_type=None):
+        # processing paketi models'i import ettiği için burada geç import edilir
+        from processing.timeutils import parse_timestamp
         self.type = type
         self.source = source
         self.event_id = event_id
@@ -15,6 +20,8 @@ class NaturalEvent:
         self.latitude = latitude
         self.longitude = longitude
         self.geometry_type = geometry_type
+        # Olay zamanı epoch saniye (event_time yoksa time); ingest'te bir kez hesaplanır
+        self.epoch = parse_timestamp(event_time) if event_time is not None else parse_timestamp(time)
 
     def __repr__(self):
         return f"type:{self.type}, source:{self.source}, title:{self.title}, status:{self.status}, event_time:{self.event_time}"
@@ -41,6 +48,8 @@ class NaturalEvent:
             result["longitude"] = self.longitude
         if self.geometry_type is not None:
             result["geometry_type"] = self.geometry_type
+        if self.epoch is not None:
+            result["epoch"] = self.epoch
 
         return result
 
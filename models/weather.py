@@ -1,11 +1,19 @@
 class Weather:
 
+    # __dict__ yerine sabit alan yuvaları; büyük batch'ler için models/columnar.py
+    __slots__ = ('type', 'source', 'location', 'temperature', 'wind_speed', 'time', 'humidity', 'pressure',
+                 'wind_direction', 'wind_gust', 'clouds', 'precipitation', 'visibility', 'weather_main',
+                 'weather_description', 'weather_icon', 'sunrise', 'sunset', 'latitude', 'longitude',
+                 'feels_like', 'temp_min', 'temp_max', 'forecast_time', 'epoch')
+
     def __init__(self, type, source, location, temperature, wind_speed, time, 
                  humidity=None, pressure=None, wind_direction=None, wind_gust=None,
                  clouds=None, precipitation=None, visibility=None,
                  weather_main=None, weather_description=None, weather_icon=None,
                  sunrise=None, sunset=None, latitude=None, longitude=None,
                  feels_like=None, temp_min=None, temp_max=None, forecast_time=None):
+        # processing paketi models'i import ettiği için burada geç import edilir
+        from processing.timeutils import parse_timestamp
         self.type = type
         self.source = source
         self.location = location
@@ -30,6 +38,7 @@ class Weather:
         self.temp_min = temp_min
         self.temp_max = temp_max
         self.forecast_time = forecast_time  # For forecast data
+        self.epoch = parse_timestamp(time)  # Ölçüm/çekim zamanı epoch saniye
 
     def __repr__(self):
         return f"type:{self.type}, source:{self.source}, location:{self.location}, temperature:{self.temperature}, wind_speed:{self.wind_speed}, time:{self.time}"
@@ -84,6 +93,8 @@ class Weather:
             result["temp_max"] = self.temp_max
         if self.forecast_time is not None:
             result["forecast_time"] = self.forecast_time
+        if self.epoch is not None:
+            result["epoch"] = self.epoch
             
         return result
 
@@ -0,0 +1,132 @@
+# Consumer autoscaler
+# EventPipeline'daki consumer worker sayısını min/max sınırları içinde ayarlar. Her turda
+# kuyruk derinliği, en eski batch'in yaşı ve son batch'lerin ortalama işlenme süresi okunur:
+#   istenen worker = ceil(derinlik * ortalama süre / hedef boşaltma süresi)
+# En eski batch max_oldest_age'i aşarsa en az bir worker eklenir. Büyütme anında ve gerektiği
+# kadar adımla yapılır (açılıştaki ~36 batch'lik patlama hemen karşılanır); küçültme ise
+# istenen sayı idle_seconds boyunca mevcut sayının altında kalırsa tek tek yapılır.
+# Çıkarılan worker elindeki batch'i bitirip kapanır (EventPipeline.retire_consumer).
+
+from __future__ import annotations
+import math
+import threading
+import time
+from typing import Any, Dict, Optional
+from processing import log_message
+
+MIN_CONSUMERS = 1
+MAX_CONSUMERS = 8
+CHECK_INTERVAL = 0.25
+TARGET_DRAIN_SECONDS = 2.0
+MAX_OLDEST_AGE = 3.0
+IDLE_SECONDS = 10.0
+# Henüz ölçüm yokken bir batch'in işlenme süresi tahmini
+DEFAULT_BATCH_SECONDS = 0.5
+
+
+class ConsumerAutoscaler:
+
+    def __init__(self, pipeline, min_consumers: int = MIN_CONSUMERS, max_consumers: int = MAX_CONSUMERS,
+                 interval: float = CHECK_INTERVAL, target_drain_seconds: float = TARGET_DRAIN_SECONDS,
+                 max_oldest_age: float = MAX_OLDEST_AGE, idle_seconds: float = IDLE_SECONDS):
+        self.pipeline = pipeline
+        self.min_consumers = max(1, min_consumers)
+        self.max_consumers = max(self.min_consumers, max_consumers)
+        self.interval = interval
+        self.target_drain_seconds = target_drain_seconds
+        self.max_oldest_age = max_oldest_age
+        self.idle_seconds = idle_seconds
+
+        self.scale_up_count = 0
+        self.scale_down_count = 0
+        self.last_decision: Dict[str, Any] = {}
+        self._below_since: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _average_batch_seconds(self) -> float:
+        with self.pipeline.stats_lock:
+            recent = list(self.pipeline.processing_latency.recent)[-32:]
+        return sum(recent) / len(recent) if recent else DEFAULT_BATCH_SECONDS
+
+    def desired_consumers(self, depth: int, oldest_age: float, current: int) -> int:
+        desired = math.ceil(depth * self._average_batch_seconds() / self.target_drain_seconds) if depth else 0
+        if depth and oldest_age > self.max_oldest_age:
+            desired = max(desired, current + 1)
+        return min(self.max_consumers, max(self.min_consumers, desired))
+
+    def evaluate(self, now: Optional[float] = None) -> int:
+        """Tek karar adımı; eklenen (+) ya da çıkarılan (-) worker sayısını döndürür."""
+        now = now if now is not None else time.time()
+        depth = self.pipeline.input_queue.qsize()
+        oldest_age = self.pipeline.input_queue.oldest_age()
+        current = self.pipeline.active_consumers
+        desired = self.desired_consumers(depth, oldest_age, current)
+        with self.pipeline.stats_lock:
+            busy = self.pipeline.busy_workers
+        if busy:
+            # Çalışan worker'lar batch'lerini bitirene kadar küçültme yapılmaz
+            desired = max(desired, min(current, busy))
+
+        delta = 0
+        if desired > current:
+            for _ in range(desired - current):
+                self.pipeline.add_consumer()
+            delta = desired - current
+            self.scale_up_count += 1
+            self._below_since = None
+            log_message(f"Autoscaler: {current} -> {desired} consumer (kuyruk: {depth}, "
+                        f"en eski: {oldest_age:.1f}s)", "INFO")
+        elif desired < current:
+            if self._below_since is None:
+                self._below_since = now
+            elif now - self._below_since >= self.idle_seconds:
+                if self.pipeline.retire_consumer():
+                    delta = -1
+                    self.scale_down_count += 1
+                    log_message(f"Autoscaler: {current} -> {current - 1} consumer (boşta)", "INFO")
+                self._below_since = now
+        else:
+            self._below_since = None
+
+        self.last_decision = {
+            'queue_depth': depth,
+            'oldest_age': round(oldest_age, 3),
+            'consumers': current + delta,
+            'desired': desired,
+            'at': now
+        }
+        return delta
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            if not self.pipeline.running:
+                continue
+            try:
+                self.evaluate()
+            except Exception as e:
+                log_message(f"Autoscaler hatası: {str(e)}", "ERROR")
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="Consumer-Autoscaler", daemon=True)
+        self._thread.start()
+        log_message(f"Autoscaler started ({self.min_consumers}-{self.max_consumers} consumers)", "INFO")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'min_consumers': self.min_consumers,
+            'max_consumers': self.max_consumers,
+            'active_consumers': self.pipeline.active_consumers,
+            'scale_up_count': self.scale_up_count,
+            'scale_down_count': self.scale_down_count,
+            'last_decision': self.last_decision
+        }
@@ -0,0 +1,80 @@
+# CPU ağırlıklı pipeline adımları
+# EventPipeline 'cpu' olarak işaretlenmiş processor'ların bu adımlarını süreç havuzuna
+# gönderir. Fonksiyonlar modül seviyesindedir (pickle edilebilir), EventBatch (ya da eski
+# model/sözlük listesi) alır ve tek bir dict döndürür: JSON çıktısı hazır bytes olarak döner,
+# olaylar sütunsal batch olarak geri gelir; böylece ana süreç yalnızca dosyaya yazar ve büyük
+# nesne listeleri süreçler arasında pickle edilmez.
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from models.event_batch import EventBatch
+from processing.earthquake_processing import clean_usgs_earthquake_batch
+from processing.analytics import compute_basic_stats
+from processing.alert_rules import AlertRuleEngine, select_current_weather, group_forecasts
+from processing.serialization import encode_events, read_json
+
+_alert_engine: Optional[AlertRuleEngine] = None
+
+
+def _get_alert_engine() -> AlertRuleEngine:
+    # Kurallar her worker sürecinde bir kez derlenir
+    global _alert_engine
+    if _alert_engine is None:
+        _alert_engine = AlertRuleEngine()
+    return _alert_engine
+
+
+def encode_events_json(events: Any) -> bytes:
+    # storage.save_events_to_json ile aynı biçim (processing/serialization)
+    return encode_events(events)
+
+
+def clean_earthquake_batch(raw_events: Any) -> Dict[str, Any]:
+    # 'events' temizlenmiş depremlerin EventBatch'i (cleaned_earthquake şeması)
+    cleaned = clean_usgs_earthquake_batch(raw_events)
+    if not len(cleaned):
+        return {'events': cleaned}
+    records = cleaned.records()
+    return {
+        'events': cleaned,
+        'stats': compute_basic_stats(cleaned),
+        'payload': encode_events_json(records),
+        'alerts': _get_alert_engine().evaluate('earthquake', records)
+    }
+
+
+def _read_weather_file(weather_file: Path) -> List[Dict[str, Any]]:
+    try:
+        existing = read_json(weather_file, [])
+    except Exception:
+        return []
+    return existing if isinstance(existing, list) else []
+
+
+def merge_weather_batch(weather_file: Path, events: Any) -> Dict[str, Any]:
+    # Şehir başına son anlık kayıt tutulur, tahminler eklenir (weather_all.json içeriği).
+    # Mevcut dosyayı worker kendisi okur; süreç havuzuna yalnızca yeni olaylar gönderilir
+    city_current: Dict[str, Dict[str, Any]] = {}
+    forecast_list: List[Dict[str, Any]] = []
+
+    for item in _read_weather_file(weather_file) + EventBatch.from_events(events, 'weather').records():
+        if not isinstance(item, dict):
+            continue
+        if item.get('type') == 'weather_forecast':
+            forecast_list.append(item)
+        elif item.get('location'):
+            city_current[item['location']] = item
+
+    all_weather = list(city_current.values()) + forecast_list
+    engine = _get_alert_engine()
+    forecasts = [f for city_forecasts in group_forecasts(all_weather).values() for f in city_forecasts]
+    return {
+        'total_cities': len(city_current),
+        'payload': encode_events_json(all_weather),
+        'alerts': {
+            'weather': engine.evaluate('weather', select_current_weather(all_weather)),
+            'forecast': engine.evaluate('forecast', forecasts)
+        }
+    }
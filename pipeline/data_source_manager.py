@@ -4,9 +4,13 @@
 import threading
 import queue
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 from datasources.base_source import DataSource
+from models.event_batch import event_count
 from processing import log_message
+from pipeline.priority_queue import PriorityEventQueue, SOURCE_PRIORITIES, NORMAL, LOW
+from pipeline.write_ahead_log import WriteAheadLog
+from pipeline.metrics import METRICS
 
 
 class DataSourceManager:
@@ -15,11 +19,24 @@ class DataSourceManager:
     TIMEOUT_MEDIUM = 15
     TIMEOUT_FAST = 10
     
-    def __init__(self, data_sources: List[DataSource] = None, fetch_interval: int = 60):
+    # Pipeline ya da kendi kuyruğu bu doluluğu aşınca düşük öncelikli kaynaklar (hava durumu, sel) o tur atlanır
+    THROTTLE_PRESSURE = 0.8
+    MAX_INTERVAL_FACTOR = 3.0
+    
+    def __init__(self, data_sources: List[DataSource] = None, fetch_interval: int = 60,
+                 max_queue_size: int = 200, queue_policy: str = 'drop_lowest_priority',
+                 wal: Optional[WriteAheadLog] = None):
         self.data_sources = data_sources or []
         self.fetch_interval = fetch_interval
-        self.event_queue = queue.Queue()
+        # Çekilen her batch kuyruğa girmeden önce WAL'a yazılır (çökme sonrası yeniden çekmeye gerek kalmaz)
+        self.wal = wal
+        # Sınırlı kuyruk: dolunca önce düşük öncelikli batch'ler atılır, deprem verisi korunur;
+        # atılan batch'ler WAL'da kapatılır (yeniden başlatmada tekrar oynatılmaz)
+        self.event_queue = PriorityEventQueue(maxsize=max_queue_size, policy=queue_policy, name='sources',
+                                              on_drop=self._checkpoint_wal, wal_backed=wal is not None)
         self.lock = threading.Lock()
+        self.backpressure: Optional[Callable[[], float]] = None
+        self.throttled_count = 0
         
         log_message(f"DataSourceManager: {len(self.data_sources)} kaynak hazır", "INFO")
     
@@ -28,6 +45,29 @@ class DataSourceManager:
             self.data_sources.append(source)
             log_message(f"Kaynak eklendi: {source.__class__.__name__}", "INFO")
     
+    def set_backpressure(self, pressure_fn: Callable[[], float]):
+        # Tüketici tarafının doluluk oranını (0.0-1.0+) döndüren fonksiyon
+        self.backpressure = pressure_fn
+    
+    def get_pressure(self) -> float:
+        pressure = self.event_queue.pressure()
+        if self.backpressure is not None:
+            try:
+                pressure = max(pressure, self.backpressure())
+            except Exception:
+                pass
+        return pressure
+    
+    def next_fetch_interval(self) -> float:
+        # Tüketici yavaşladıkça çekme aralığı MAX_INTERVAL_FACTOR katına kadar uzar
+        factor = 1.0 + (self.MAX_INTERVAL_FACTOR - 1.0) * min(self.get_pressure(), 1.0)
+        return self.fetch_interval * factor
+    
+    def _should_throttle(self, source_name: str) -> bool:
+        if SOURCE_PRIORITIES.get(source_name, NORMAL) < LOW:
+            return False
+        return self.get_pressure() >= self.THROTTLE_PRESSURE
+    
     def _get_timeout_for_source(self, source_name: str) -> int:
         source_lower = source_name.lower()
         if 'openweather' in source_lower or 'flood' in source_lower:
@@ -41,21 +81,50 @@ class DataSourceManager:
         source_name = source.__class__.__name__
         start_time = time.time()
         
+        if self._should_throttle(source_name):
+            with self.lock:
+                self.throttled_count += 1
+            log_message(f"{source_name}: tüketici kuyruğu dolu, bu tur atlanıyor", "WARNING")
+            return
+        
         try:
             if 'OpenWeather' in source_name or 'Flood' in source_name:
                 log_message(f"{source_name} verisi çekiliyor...", "INFO")
             
-            data = source.fetch_and_parse()
+            # fetch_and_parse yerine iki adım ayrı ölçülür (ağ + JSON çözme / sütunsal batch'e paketleme)
+            fetch_started = time.perf_counter()
+            if isinstance(source, DataSource):
+                raw = source.fetch_raw()
+                METRICS.observe('stage_seconds', time.perf_counter() - fetch_started, stage='fetch', source=source_name)
+                with METRICS.timer('stage_seconds', stage='parse', source=source_name):
+                    data = source.parse_batch(raw)
+                METRICS.inc('fetched_bytes_total', getattr(source, 'last_response_bytes', 0) or 0, source=source_name)
+            else:
+                data = source.fetch_and_parse()
+                METRICS.observe('stage_seconds', time.perf_counter() - fetch_started, stage='fetch', source=source_name)
             elapsed = time.time() - start_time
             
+            METRICS.inc('fetches_total', source=source_name, result='ok' if data else 'empty')
             if data:
-                self.event_queue.put({
+                METRICS.inc('fetched_items_total', event_count(data), source=source_name)
+                batch = {
                     'source': source_name,
                     'data': data,
                     'timestamp': time.time()
-                })
+                }
+                if self.wal is not None:
+                    try:
+                        batch['wal_seq'] = self.wal.append(batch)
+                    except Exception as e:
+                        log_message(f"{source_name}: WAL'a yazılamadı, batch yalnızca bellekte: {e}", "ERROR")
+                try:
+                    self.event_queue.put(batch, timeout=self._get_timeout_for_source(source_name))
+                except queue.Full:
+                    log_message(f"{source_name}: kaynak kuyruğu dolu, batch atıldı", "WARNING")
+                    self._checkpoint_wal(batch)
+                    return
                 
-                data_count = len(data) if isinstance(data, list) else 1
+                data_count = event_count(data)
                 if elapsed > 2.0 or data_count > 50:
                     log_message(f"✓ {source_name}: {data_count} öğe ({elapsed:.2f}s)", "INFO")
             else:
@@ -64,8 +133,17 @@ class DataSourceManager:
                     
         except Exception as e:
             elapsed = time.time() - start_time
+            METRICS.inc('fetches_total', source=source_name, result='error')
             log_message(f"✗ {source_name} hata: {str(e)} ({elapsed:.2f}s)", "ERROR")
     
+    def _checkpoint_wal(self, batch: Dict[str, Any]):
+        if self.wal is None or not isinstance(batch, dict) or 'wal_seq' not in batch:
+            return
+        try:
+            self.wal.checkpoint(batch['wal_seq'])
+        except Exception as e:
+            log_message(f"{batch.get('source')}: atılan batch WAL'da kapatılamadı: {e}", "WARNING")
+    
     def fetch_all_sources(self):
         with self.lock:
             sources = self.data_sources.copy()
@@ -112,9 +190,13 @@ class DataSourceManager:
     
     def get_status(self) -> Dict[str, Any]:
         with self.lock:
-            return {
+            status = {
                 'source_count': len(self.data_sources),
                 'queue_size': self.event_queue.qsize(),
                 'fetch_interval': self.fetch_interval,
+                'throttled_count': self.throttled_count,
                 'sources': [src.__class__.__name__ for src in self.data_sources]
             }
+        status['next_fetch_interval'] = round(self.next_fetch_interval(), 1)
+        status['queue'] = self.event_queue.get_statistics()
+        return status
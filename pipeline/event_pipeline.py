@@ -1,27 +1,94 @@
+import os
 import threading
 import queue
 import time
-from typing import Dict, Any, List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pickle import PicklingError
+from typing import Dict, Any, List, Optional
 from processing import (
     log_message,
-    clean_usgs_earthquake_events,
     save_events_to_json,
-    compute_basic_stats
 )
+from processing.storage import save_json_bytes
+from processing.swarm_tracker import SwarmTracker
+from processing.streaming_stats import StreamingStatsEngine
+from processing.magnitude_frequency import MagnitudeFrequencyAnalyzer
+from processing.aftershock_forecast import AftershockForecaster
+from processing.flood_analytics import FloodAnalytics
+from processing.alert_rules import AlertRuleEngine, save_alert_section
+from processing.alert_lifecycle import AlertLifecycleManager
+from models.columnar import TEXT
+from models.event_batch import EventBatch, event_count
+from pipeline.cpu_stages import clean_earthquake_batch, merge_weather_batch
+from pipeline.priority_queue import PriorityEventQueue, LatencyStats, classify_priority, PRIORITY_NAMES, NORMAL
+from pipeline.write_ahead_log import WriteAheadLog
+from pipeline.metrics import METRICS
+
+# Processor tipi: 'io' processor'lar tamamen consumer thread'inde çalışır, 'cpu' processor'ların
+# ağır adımları (temizleme, birleştirme, JSON serileştirme, kural değerlendirme) süreç havuzuna gider
+PROCESSOR_KINDS = {
+    'USGSEarthquakeSource': 'cpu',
+    'OpenWeatherSource': 'cpu',
+}
+# Küçük batch'lerde pickle maliyeti kazancı aşar, bunlar thread içinde çalıştırılır
+CPU_DISPATCH_MIN_ITEMS = 200
+
+# Şehir başına ayrı gelen batch'ler kısa bir pencere içinde toplanıp tek birim olarak işlenir
+# (tip başına döngüde tek dosya yazımı ve tek istatistik geçişi)
+COALESCE_SOURCES = ('OpenWeatherSource', 'OpenMeteoFloodSource')
+COALESCE_WINDOW_SECONDS = 0.5
+COALESCE_MAX_ITEMS = 5000
 
 
 class EventPipeline:
     # Producer-Consumer pattern kullanarak event işleme
     
-    def __init__(self, num_consumers: int = 3, max_queue_size: int = 100):
-        self.input_queue = queue.Queue(maxsize=max_queue_size)
-        self.output_queue = queue.Queue()
+    def __init__(self, num_consumers: int = 3, max_queue_size: int = 100, cpu_workers: Optional[int] = None,
+                 queue_policy: str = 'block', max_output_size: int = 1000, wal: Optional[WriteAheadLog] = None):
+        # Deprem/yüksek riskli sel batch'leri toplu hava durumu işinin önüne geçer;
+        # kuyruk dolunca davranış queue_policy ile belirlenir (block, drop_oldest, drop_lowest_priority, spill_to_disk)
+        # İşlenen batch'ler WAL'da checkpoint'lenir (wal_seq taşıyan batch'ler)
+        self.wal = wal
+        # Politika gereği atılan batch'ler WAL'da kapatılır
+        self.input_queue = PriorityEventQueue(maxsize=max_queue_size, policy=queue_policy, name='pipeline',
+                                              on_drop=self._checkpoint_wal, wal_backed=wal is not None)
+        # Sonuçlar sınırlı tutulur; okunmayan en eski sonuç yenisine yer açmak için atılır
+        self.output_queue = queue.Queue(maxsize=max_output_size)
+        self.dropped_result_count = 0
         self.num_consumers = num_consumers
         self.consumer_threads = []
+        # Çalışan worker'lar ve emekliye ayırma sinyalleri (autoscaler worker ekleyip çıkarabilir)
+        self._workers: Dict[int, threading.Event] = {}
+        self._next_worker_id = 0
+        self.busy_workers = 0
+        self.processing_latency = LatencyStats()
         self.running = False
         self.processed_count = 0
         self.error_count = 0
+        # lock worker kaydını ve birleştirme gruplarını korur; sayaçlar ve gecikmeler için ayrı,
+        # kısa tutulan stats_lock kullanılır (autoscaler ve istatistik okuyucuları beklemez)
         self.lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        # Dosya başına kilit: birleştir-yaz adımları yalnızca aynı dosyayı yazan batch'leri sıralar
+        self.weather_file_lock = threading.Lock()
+        self.flood_file_lock = threading.Lock()
+        
+        # CPU adımları için süreç havuzu (ilk ihtiyaçta oluşturulur); 0/1 ise her şey thread'de çalışır
+        self.cpu_workers = cpu_workers if cpu_workers is not None else (os.cpu_count() or 1)
+        self.processor_kinds = dict(PROCESSOR_KINDS)
+        self.process_pool = None
+        self.pool_lock = threading.Lock()
+        self.cpu_dispatched_count = 0
+        self.cpu_inline_count = 0
+        
+        self.coalesce_window = COALESCE_WINDOW_SECONDS
+        self.coalesce_max_items = COALESCE_MAX_ITEMS
+        self.coalesced_batch_count = 0
+        # Kaynak başına açık birleştirme grubu; başka worker'ın aldığı batch gruba devredilir
+        self._open_groups: Dict[str, List[Dict[str, Any]]] = {}
+        # Farklı processor'ların paylaştığı durum dosyaları (stats, alerts) aynı anda yazılmasın
+        self.state_lock = threading.Lock()
         
         self.processors = {
             'USGSEarthquakeSource': self._process_earthquake_events,
@@ -34,27 +101,106 @@ class EventPipeline:
             'default': self._process_generic_events
         }
         
+        # Deprem sürüleri her batch'te artımlı olarak güncellenir (dashboard swarms.json'u okur)
+        self.swarm_tracker = SwarmTracker.load()
+        self.swarm_tracker.add_listener(self._on_swarm_event)
+        
+        # 1h/24h/7d kayan pencere istatistikleri (dashboard stats.json'u okur)
+        self.stats_engine = StreamingStatsEngine.load()
+        
+        # Gutenberg-Richter histogramları (b-değeri / Mc) artımlı güncellenir
+        self.magnitude_frequency = MagnitudeFrequencyAnalyzer.load()
+        
+        # M5.0+ ana şoklar için artçı tahmini; yeni artçı gelen ana şoklar yeniden hesaplanır.
+        # Simülasyon uyarılar yayımlandıktan sonra tek bir arka plan thread'inde çalışır
+        self.aftershock_forecaster = AftershockForecaster.load()
+        self.forecast_executor = None
+        self.forecast_lock = threading.Lock()
+        self._forecast_pending = False
+        
+        # Şehir başına debi geçmişi; nehre özel yüzdelik eşikler buradan türetilir
+        self.flood_analytics = FloodAnalytics.load()
+        
+        # Uyarı kuralları bir kez derlenir; her veri değişiminde ilgili bölüm alerts.json'a yazılır
+        self.alert_engine = AlertRuleEngine()
+        # Kalıcı uyarı ID'leri, histerezis ve cooldown (dashboard alert_state.json'u okur)
+        self.alert_lifecycle = AlertLifecycleManager.load()
+        
+        METRICS.register_collector('pipeline', self._collect_metrics)
+        
         log_message(f"EventPipeline initialized with {num_consumers} consumers", "INFO")
     
-    def _process_earthquake_events(self, events: List[Any], source_name: str) -> Dict[str, Any]:
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self.pool_lock:
+            if self.process_pool is None:
+                self.process_pool = ProcessPoolExecutor(max_workers=self.cpu_workers)
+                log_message(f"CPU process pool started with {self.cpu_workers} workers", "INFO")
+            return self.process_pool
+    
+    def _run_cpu(self, source_name: str, func, *args, size: int = 0):
+        # 'cpu' processor'ların yeterince büyük batch'leri süreç havuzunda, diğerleri yerinde çalışır
+        if self.processor_kinds.get(source_name) != 'cpu' or self.cpu_workers <= 1 or size < CPU_DISPATCH_MIN_ITEMS:
+            with self.pool_lock:
+                self.cpu_inline_count += 1
+            return func(*args)
+        
+        try:
+            result = self._get_process_pool().submit(func, *args).result()
+            with self.pool_lock:
+                self.cpu_dispatched_count += 1
+            return result
+        except (BrokenProcessPool, PicklingError, OSError) as e:
+            log_message(f"Process pool kullanılamadı, CPU adımları thread'de çalışacak: {e}", "WARNING")
+            with self.pool_lock:
+                self.cpu_workers = 0
+                self.cpu_inline_count += 1
+            return func(*args)
+    
+    def _process_earthquake_events(self, events: EventBatch, source_name: str) -> Dict[str, Any]:
         try:
-            cleaned_events = clean_usgs_earthquake_events(events)
+            with METRICS.timer('stage_seconds', stage='clean', source=source_name):
+                batch = self._run_cpu(source_name, clean_earthquake_batch, events, size=len(events))
             
-            if cleaned_events:
+            if len(batch['events']):
                 filename = f"earthquakes_{int(time.time())}.json"
-                save_events_to_json(cleaned_events, filename)
+                with METRICS.timer('stage_seconds', stage='persist', source=source_name):
+                    save_json_bytes(batch['payload'], filename)
+                    
+                    from processing.storage import eski_dosyalari_temizle
+                    eski_dosyalari_temizle()
+                METRICS.inc('persisted_bytes_total', len(batch['payload']), source=source_name)
+                
+                # Satır bazlı analizler (sürü, pencere istatistiği, G-R, artçı) aynı satır listesini paylaşır
+                stats_events = batch['events'].records()
+                stats = batch['stats']
                 
-                from processing.storage import eski_dosyalari_temizle
-                eski_dosyalari_temizle()
+                with METRICS.timer('stage_seconds', stage='analytics', source=source_name):
+                    swarm_events = self.swarm_tracker.add_earthquakes(stats_events)
+                    self.swarm_tracker.save_state()
+                    if swarm_events:
+                        # Partideki tüm başlama/büyüme/bitiş olayları için tek yayın (tracker kilidi dışında)
+                        self._publish_swarm_alerts()
+                    
+                    with self.state_lock:
+                        self.stats_engine.update('earthquake', stats_events)
+                        self.stats_engine.save_state()
+                    
+                    self.magnitude_frequency.add_earthquakes(stats_events)
+                    self.magnitude_frequency.save_state()
+                    
+                    self.aftershock_forecaster.add_earthquakes(stats_events)
                 
-                stats_events = [ev.toDictionary() if hasattr(ev, 'toDictionary') else ev for ev in cleaned_events]
-                stats = compute_basic_stats(stats_events)
+                self._publish_alerts('earthquake', batch['alerts'])
+                forecast_scheduled = self._schedule_aftershock_forecast()
                 
                 return {
                     'success': True,
                     'source': source_name,
-                    'event_count': len(cleaned_events),
+                    'event_count': len(stats_events),
                     'stats': stats,
+                    'window_stats': self.stats_engine.snapshot('earthquake'),
+                    'swarm_events': swarm_events,
+                    'aftershock_forecast_scheduled': forecast_scheduled,
                     'filename': filename
                 }
             else:
@@ -64,67 +210,84 @@ class EventPipeline:
             log_message(f"Error processing earthquake events: {str(e)}", "ERROR")
             return {'success': False, 'source': source_name, 'error': str(e)}
     
-    def _process_weather_events(self, events: List[Any], source_name: str) -> Dict[str, Any]:
+    def _schedule_aftershock_forecast(self) -> bool:
+        # Bekleyen bir tur varsa yenisi eklenmez; o tur başladığında güncel kataloğu kullanır
+        with self.forecast_lock:
+            if self._forecast_pending:
+                return False
+            if self.forecast_executor is None:
+                self.forecast_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='aftershock')
+            self._forecast_pending = True
+            self.forecast_executor.submit(self._refresh_aftershock_forecasts)
+        return True
+    
+    def _refresh_aftershock_forecasts(self):
+        with self.forecast_lock:
+            self._forecast_pending = False
         try:
-            if not events:
+            with METRICS.timer('stage_seconds', stage='aftershock_forecast', source='USGSEarthquakeSource'):
+                forecasts = self.aftershock_forecaster.forecast_all()
+                self.aftershock_forecaster.save_state()
+            METRICS.set_gauge('aftershock_forecasts_active', len(forecasts))
+        except Exception as e:
+            log_message(f"Artçı tahmini hesaplanamadı: {str(e)}", "ERROR")
+    
+    def _publish_alerts(self, section: str, alerts: List[Dict[str, Any]], locations: Optional[List[str]] = None):
+        # Yaşam döngüsü uyarılara id/status ekler, ardından bölüm alerts.json'a yazılır
+        with METRICS.timer('stage_seconds', stage='alerts', source=section), self.state_lock:
+            counts = self.alert_lifecycle.reconcile(section, alerts, locations=locations)
+            self.alert_lifecycle.save_state()
+            save_alert_section(section, alerts, locations=locations)
+        METRICS.inc('alerts_evaluated_total', len(alerts), section=section)
+        if counts['opened'] or counts['resolved']:
+            log_message(f"Uyarılar ({section}): {counts['opened']} yeni, {counts['updated']} güncellendi, "
+                        f"{counts['resolved']} kapandı", "INFO")
+    
+    def _publish_swarm_alerts(self):
+        # Etkin sürülerin tamamı değerlendirilir; biten sürülerin uyarıları yaşam döngüsünde kapanır
+        self._publish_alerts('swarm', self.alert_engine.evaluate('swarm', self.swarm_tracker.get_swarms()))
+    
+    def _on_swarm_event(self, event: Dict[str, Any]):
+        level = "WARNING" if event['event'] == 'swarm_start' else "INFO"
+        log_message(
+            f"{event['event']}: {event['swarm_id']} - {event['earthquake_count']} deprem "
+            f"({event['center_latitude']:.2f}, {event['center_longitude']:.2f})",
+            level
+        )
+    
+    def _process_weather_events(self, events: EventBatch, source_name: str) -> Dict[str, Any]:
+        try:
+            if not len(events):
                 return {'success': False, 'source': source_name, 'error': 'No weather events'}
             
-            from pathlib import Path
             from processing.storage import veri_klasoru
-            from models import Weather
-            import json
             
-            with self.lock:
-                weather_file = veri_klasoru / "weather_all.json"
-                
-                all_weather = []
-                if weather_file.exists():
-                    try:
-                        with open(weather_file, 'r', encoding='utf-8') as f:
-                            existing_data = json.load(f)
-                            if isinstance(existing_data, list):
-                                for item in existing_data:
-                                    if isinstance(item, dict):
-                                        all_weather.append(Weather.fromDict(item))
-                                    else:
-                                        all_weather.append(item)
-                    except:
-                        pass
-                
-                city_current_dict = {}
-                forecast_list = []
-                
-                for item in all_weather:
-                    item_dict = item.toDictionary() if hasattr(item, 'toDictionary') else item
-                    if item_dict.get('type') == 'weather_forecast':
-                        forecast_list.append(item)
-                    else:
-                        city = item_dict.get('location')
-                        if city:
-                            city_current_dict[city] = item
-                
-                for event in events:
-                    event_dict = event.toDictionary() if hasattr(event, 'toDictionary') else event
-                    event_type = event_dict.get('type', 'weather')
-                    city = event_dict.get('location')
+            with self.weather_file_lock:
+                # Okuma, birleştirme, serileştirme ve uyarı kuralları CPU adımı olarak çalışır
+                with METRICS.timer('stage_seconds', stage='clean', source=source_name):
+                    merged = self._run_cpu(source_name, merge_weather_batch, veri_klasoru / "weather_all.json",
+                                           events, size=len(events))
+                with METRICS.timer('stage_seconds', stage='persist', source=source_name):
+                    save_json_bytes(merged['payload'], "weather_all.json")
                     
-                    if event_type == 'weather_forecast':
-                        forecast_list.append(event)
-                    elif city:
-                        city_current_dict[city] = event
-                
-                all_weather = list(city_current_dict.values()) + forecast_list
-                save_events_to_json(all_weather, "weather_all.json")
-                
-                from processing.storage import eski_dosyalari_temizle
-                eski_dosyalari_temizle()
+                    from processing.storage import eski_dosyalari_temizle
+                    eski_dosyalari_temizle()
+                METRICS.inc('persisted_bytes_total', len(merged['payload']), source=source_name)
+            
+            for section, alerts in merged['alerts'].items():
+                self._publish_alerts(section, alerts)
+            
+            current_events = events.filter([not forecast for forecast in events.matches('type', 'weather_forecast')])
+            with self.state_lock:
+                self.stats_engine.update('weather', current_events)
+                self.stats_engine.save_state()
             
             return {
                 'success': True,
                 'source': source_name,
                 'event_count': len(events),
-                'total_cities': len(city_current_dict),
-                'data': events[0].toDictionary() if events and hasattr(events[0], 'toDictionary') else (events[0] if events else None),
+                'total_cities': merged['total_cities'],
+                'data': events.row(0),
                 'filename': 'weather_all.json'
             }
             
@@ -132,24 +295,23 @@ class EventPipeline:
             log_message(f"Error processing weather events: {str(e)}", "ERROR")
             return {'success': False, 'source': source_name, 'error': str(e)}
     
-    def _process_eonet_events(self, events: List[Any], source_name: str) -> Dict[str, Any]:
+    def _process_eonet_events(self, events: EventBatch, source_name: str) -> Dict[str, Any]:
         try:
-            if not events:
+            if not len(events):
                 return {'success': False, 'source': source_name, 'error': 'No EONET events'}
             
-            filtered_events = []
-            for event in events:
-                event_dict = event.toDictionary() if hasattr(event, 'toDictionary') else event
-                categories = event_dict.get('categories', [])
-                
+            # Buz/buzdağı kategorili olaylar atılır (maske yalnızca categories sütunundan)
+            keep = []
+            for categories in events.column('categories'):
                 if categories:
                     categories_str = ','.join(categories).lower()
                     if 'ice' in categories_str or 'iceberg' in categories_str or 'sea and lake ice' in categories_str:
+                        keep.append(False)
                         continue
-                
-                filtered_events.append(event)
+                keep.append(True)
+            filtered_events = events.filter(keep)
             
-            if filtered_events:
+            if len(filtered_events):
                 filename = "eonet_events.json"
                 save_events_to_json(filtered_events, filename)
                 
@@ -167,19 +329,16 @@ class EventPipeline:
             log_message(f"Error processing EONET events: {str(e)}", "ERROR")
             return {'success': False, 'source': source_name, 'error': str(e)}
     
-    def _process_wildfire_events(self, events: List[Any], source_name: str) -> Dict[str, Any]:
+    def _process_wildfire_events(self, events: EventBatch, source_name: str) -> Dict[str, Any]:
         try:
-            if not events:
+            if not len(events):
                 return {'success': False, 'source': source_name, 'error': 'No wildfire events'}
             
-            from pipeline.fetch_wildfires import assign_city
+            from pipeline.fetch_wildfires import find_matching_city
             
-            for ev in events:
-                if isinstance(ev, dict):
-                    lat = ev.get("latitude")
-                    lon = ev.get("longitude")
-                    city = assign_city(lat, lon)
-                    ev["city"] = city
+            # En yakın izlenen şehir koordinat sütunlarından hesaplanıp city sütunu olarak eklenir
+            events.set_column("city", [find_matching_city(lat, lon) for lat, lon
+                                       in zip(events.column("latitude"), events.column("longitude"))], kind=TEXT)
             
             filename = "wildfires.json"
             save_events_to_json(events, filename)
@@ -195,19 +354,16 @@ class EventPipeline:
             log_message(f"Error processing wildfire events: {str(e)}", "ERROR")
             return {'success': False, 'source': source_name, 'error': str(e)}
     
-    def _process_storm_events(self, events: List[Any], source_name: str) -> Dict[str, Any]:
+    def _process_storm_events(self, events: EventBatch, source_name: str) -> Dict[str, Any]:
         try:
-            if not events:
+            if not len(events):
                 return {'success': False, 'source': source_name, 'error': 'No storm events'}
             
-            from pipeline.fetch_storms import assign_city
+            from pipeline.fetch_storms import find_nearest_city
             
-            for ev in events:
-                if isinstance(ev, dict):
-                    lat = ev.get("latitude")
-                    lon = ev.get("longitude")
-                    city = assign_city(lat, lon)
-                    ev["city"] = city
+            # En yakın izlenen şehir koordinat sütunlarından hesaplanıp city sütunu olarak eklenir
+            events.set_column("city", [find_nearest_city(lat, lon) for lat, lon
+                                       in zip(events.column("latitude"), events.column("longitude"))], kind=TEXT)
             
             filename = "storms.json"
             save_events_to_json(events, filename)
@@ -223,14 +379,14 @@ class EventPipeline:
             log_message(f"Error processing storm events: {str(e)}", "ERROR")
             return {'success': False, 'source': source_name, 'error': str(e)}
     
-    def _process_volcano_events(self, events: List[Any], source_name: str) -> Dict[str, Any]:
+    def _process_volcano_events(self, events: EventBatch, source_name: str) -> Dict[str, Any]:
         try:
-            if not events:
+            if not len(events):
                 return {'success': False, 'source': source_name, 'error': 'No volcano events'}
             
             try:
                 from pipeline.fetch_volcanoes import summarize_volcano_events
-                summarize_volcano_events(events)
+                summarize_volcano_events(events.records())
             except Exception as e:
                 log_message(f"Volcano özet yazdırma hatası (devam ediliyor): {str(e)}", "WARNING")
             
@@ -248,39 +404,66 @@ class EventPipeline:
             log_message(f"Error processing volcano events: {str(e)}", "ERROR")
             return {'success': False, 'source': source_name, 'error': str(e)}
     
-    def _process_flood_events(self, events: List[Any], source_name: str) -> Dict[str, Any]:
+    def _process_flood_events(self, events: EventBatch, source_name: str) -> Dict[str, Any]:
         try:
-            if not events:
+            if not len(events):
                 return {'success': False, 'source': source_name, 'error': 'No flood events'}
             
-            high_risk_events = [
-                ev for ev in events
-                if isinstance(ev, dict) and ev.get("risk_level") == "high"
-            ]
-            
             from datetime import datetime
-            from pathlib import Path
             from processing.storage import veri_klasoru
-            import json
-            
-            payload = {
-                "generated_at": datetime.now().strftime("%Y-%m-%d T%H:%M:%S"),
-                "total_events": len(events),
-                "total_high_risk_events": len(high_risk_events),
-                "events": events,
-                "high_risk_events": high_risk_events,
-            }
+            from processing.serialization import dumps, read_json
             
+            # Sınıflandırma risk_level'ı yerinde güncellediği ve dosya birleştirmesi sözlük listesiyle
+            # çalıştığı için satırlar burada değiştirilebilir kopya olarak açılır
+            events = events.to_dicts()
+            cities = {ev.get("location", "Unknown") for ev in events}
             filename = "flood_risk.json"
             file_path = veri_klasoru / filename
             
-            def default_serializer(obj):
-                if isinstance(obj, datetime):
-                    return obj.strftime("%Y-%m-%d T%H:%M:%S")
-                raise TypeError(f"Type {type(obj)} is not JSON serializable")
+            with self.flood_file_lock, METRICS.timer('stage_seconds', stage='analytics', source=source_name):
+                self.flood_analytics.add_events(events)
+                self.flood_analytics.save_state()
+            
+            with self.flood_file_lock:
+                # Dosya şehir bazında birleştirilir: bu batch'teki şehirlerin eski kayıtları değiştirilir,
+                # diğer şehirlerinki korunur
+                existing_events = []
+                if file_path.exists():
+                    try:
+                        existing_events = read_json(file_path, {}).get("events", [])
+                    except:
+                        existing_events = []
+                all_events = [ev for ev in existing_events
+                              if isinstance(ev, dict) and ev.get("location", "Unknown") not in cities] + events
+                
+                self.flood_analytics.classify_events(all_events)
+                city_summary = self.flood_analytics.summarize(all_events)['cities']
+                
+                high_risk_events = [ev for ev in all_events if ev.get("risk_level") == "high"]
+                
+                payload = {
+                    "generated_at": datetime.now().strftime("%Y-%m-%d T%H:%M:%S"),
+                    "total_events": len(all_events),
+                    "total_high_risk_events": len(high_risk_events),
+                    "events": all_events,
+                    "high_risk_events": high_risk_events,
+                    "city_summary": city_summary,
+                }
+                
+                def default_serializer(obj):
+                    if isinstance(obj, datetime):
+                        return obj.strftime("%Y-%m-%d T%H:%M:%S")
+                    raise TypeError(f"Type {type(obj)} is not JSON serializable")
+                
+                with METRICS.timer('stage_seconds', stage='persist', source=source_name):
+                    tmp_path = file_path.with_suffix('.tmp')
+                    tmp_path.write_bytes(dumps(payload, default=default_serializer))
+                    os.replace(tmp_path, file_path)
             
-            with file_path.open("w", encoding="utf-8") as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2, default=default_serializer)
+            # Yalnızca bu batch'teki şehirlerin uyarıları değiştirilir
+            self._publish_alerts('flood', self.alert_engine.evaluate('flood', events), locations=list(cities))
+            
+            high_risk_events = [ev for ev in events if ev.get("risk_level") == "high"]
             
             return {
                 'success': True,
@@ -297,7 +480,7 @@ class EventPipeline:
     def _process_generic_events(self, events: Any, source_name: str) -> Dict[str, Any]:
         try:
             filename = f"{source_name}_{int(time.time())}.json"
-            save_events_to_json(events if isinstance(events, list) else [events], filename)
+            save_events_to_json(events if isinstance(events, (EventBatch, list)) else [events], filename)
             
             return {'success': True, 'source': source_name, 'filename': filename}
             
@@ -305,44 +488,196 @@ class EventPipeline:
             log_message(f"Error in generic processor: {str(e)}", "ERROR")
             return {'success': False, 'source': source_name, 'error': str(e)}
     
-    def _consumer_worker(self, worker_id: int):
+    def _coalesce(self, batches: List[Dict[str, Any]]) -> bool:
+        # batches[0] ile aynı kaynaktan bekleyen batch'leri pencere dolana ya da öğe sınırına ulaşılana
+        # kadar aynı listeye toplar (hata olsa da alınanlar çağıranın listesinde kalır). Kaynağın açık
+        # bir grubu varsa batch ona devredilir ve False döner (grubun sahibi işler).
+        event_data = batches[0]
+        source_name = event_data.get('source')
+        if source_name not in COALESCE_SOURCES or not isinstance(event_data.get('data'), (EventBatch, list)):
+            return True
+        
+        with self.lock:
+            group = self._open_groups.get(source_name)
+            if group is not None:
+                group.append(event_data)
+                return False
+            self._open_groups[source_name] = batches
+        
+        item_count = len(event_data['data'])
+        
+        def _matches(batch):
+            nonlocal item_count
+            data = batch.get('data')
+            if batch.get('source') != source_name or not isinstance(data, (EventBatch, list)):
+                return False
+            if item_count + len(data) > self.coalesce_max_items:
+                return False
+            item_count += len(data)
+            return True
+        
+        try:
+            deadline = time.time() + self.coalesce_window
+            while self.running and item_count < self.coalesce_max_items:
+                taken = self.input_queue.take_matching(_matches)
+                with self.lock:
+                    batches.extend(taken)
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                time.sleep(min(0.05, remaining))
+        finally:
+            with self.lock:
+                del self._open_groups[source_name]
+        return True
+    
+    @staticmethod
+    def _merge_batch_data(batches: List[Dict[str, Any]]) -> Any:
+        # Processor'lar EventBatch alır; liste taşıyan eski WAL/spill kayıtları burada paketlenir
+        data = [batch.get('data') for batch in batches]
+        if len(data) == 1 and not isinstance(data[0], (EventBatch, list)):
+            return data[0]
+        return EventBatch.concat([EventBatch.from_events(part) for part in data])
+    
+    def _process_batches(self, worker_id: int, source_name: str, batches: List[Dict[str, Any]]):
+        data = self._merge_batch_data(batches)
+        if isinstance(data, EventBatch):
+            # Düz sözlük olaylar kanonik epoch alanını burada bir kez alır (sütunsal)
+            data.stamp_epochs()
+        priority = min(batch.get('priority', NORMAL) for batch in batches)
+        
+        dequeued_at = time.time()
+        for batch in batches:
+            if 'enqueued_at' in batch:
+                METRICS.observe('stage_seconds', dequeued_at - batch['enqueued_at'],
+                                stage='queue_wait', source=source_name)
+        
+        log_message(f"Worker {worker_id} processing event from {source_name} "
+                    f"(priority: {PRIORITY_NAMES[priority]}, batches: {len(batches)})", "INFO")
+        
+        processor = self.processors.get(source_name, self.processors['default'])
+        with self.stats_lock:
+            self.busy_workers += 1
+        started = time.time()
+        try:
+            result = processor(data, source_name)
+        finally:
+            elapsed = time.time() - started
+            with self.stats_lock:
+                self.busy_workers -= 1
+                self.processing_latency.add(elapsed)
+            METRICS.observe('stage_seconds', elapsed, stage='process', source=source_name)
+        if len(batches) > 1:
+            result['coalesced_batches'] = len(batches)
+        
+        self._put_result(result)
+        
+        with self.stats_lock:
+            if result.get('success'):
+                self.processed_count += len(batches)
+            else:
+                self.error_count += len(batches)
+            self.coalesced_batch_count += len(batches) - 1
+        
+        METRICS.inc('batches_total', len(batches), source=source_name,
+                    result='success' if result.get('success') else 'error')
+        if result.get('success'):
+            METRICS.inc('events_total', event_count(data), source=source_name)
+        METRICS.maybe_save()
+    
+    def _checkpoint_wal(self, batch: Dict[str, Any]):
+        # İşlenen, hata veren ya da kuyrukta atılan batch'in WAL kaydı kapatılır
+        if self.wal is None or not isinstance(batch, dict) or 'wal_seq' not in batch:
+            return
+        try:
+            self.wal.checkpoint(batch['wal_seq'])
+        except Exception as e:
+            log_message(f"WAL checkpoint failed for batch from {batch.get('source')}: {str(e)}", "WARNING")
+    
+    def _finish_batches(self, batches: List[Dict[str, Any]]):
+        # Başarılı ya da hatalı her batch için tamamlanma gecikmesi, WAL checkpoint'i ve task_done;
+        # task_done atlanırsa input_queue.join() sonsuza kadar bekler
+        now = time.time()
+        for batch in batches:
+            try:
+                if 'enqueued_at' in batch:
+                    self.input_queue.record_completion(batch.get('priority', NORMAL), now - batch['enqueued_at'])
+                self._checkpoint_wal(batch)
+            except Exception as e:
+                log_message(f"Batch kapatılamadı ({batch.get('source')}): {str(e)}", "ERROR")
+            finally:
+                self.input_queue.task_done()
+    
+    def _consumer_worker(self, worker_id: int, retire: threading.Event):
         log_message(f"Consumer worker {worker_id} started", "INFO")
         
-        while self.running:
+        # Emekliye ayrılan worker elindeki batch'i bitirir, yeni batch almadan çıkar
+        while self.running and not retire.is_set():
             try:
                 event_data = self.input_queue.get(timeout=1.0)
-                
-                if event_data is None:
-                    self.input_queue.task_done()
-                    break
-                
-                source_name = event_data.get('source', 'unknown')
-                data = event_data.get('data')
-                
-                log_message(f"Worker {worker_id} processing event from {source_name}", "INFO")
-                
-                processor = self.processors.get(source_name, self.processors['default'])
-                result = processor(data, source_name)
-                
-                self.output_queue.put(result)
-                
-                with self.lock:
-                    if result.get('success'):
-                        self.processed_count += 1
-                    else:
-                        self.error_count += 1
-                
-                self.input_queue.task_done()
-                
             except queue.Empty:
                 continue
+            
+            if event_data is None:
+                self.input_queue.task_done()
+                break
+            
+            source_name = event_data.get('source', 'unknown')
+            # Bu worker'ın sorumlu olduğu batch'ler; birleştirme/işleme hata verse de hepsi kapatılır
+            batches = [event_data]
+            try:
+                if not self._coalesce(batches):
+                    batches = []
+                    continue
+                self._process_batches(worker_id, source_name, batches)
             except Exception as e:
                 log_message(f"Worker {worker_id} error: {str(e)}", "ERROR")
-                with self.lock:
-                    self.error_count += 1
+                with self.stats_lock:
+                    self.error_count += len(batches)
+                self._put_result({'success': False, 'source': source_name, 'error': str(e)})
+                METRICS.inc('batches_total', len(batches), source=source_name, result='error')
+            finally:
+                self._finish_batches(batches)
+        
+        with self.lock:
+            self._workers.pop(worker_id, None)
+            current = threading.current_thread()
+            if current in self.consumer_threads:
+                self.consumer_threads.remove(current)
         
         log_message(f"Consumer worker {worker_id} stopped", "INFO")
     
+    def add_consumer(self) -> int:
+        retire = threading.Event()
+        with self.lock:
+            worker_id = self._next_worker_id
+            self._next_worker_id += 1
+            self._workers[worker_id] = retire
+            thread = threading.Thread(
+                target=self._consumer_worker,
+                args=(worker_id, retire),
+                name=f"Consumer-{worker_id}",
+                daemon=True
+            )
+            self.consumer_threads.append(thread)
+        thread.start()
+        return worker_id
+    
+    def retire_consumer(self) -> bool:
+        # En son eklenen worker'a durma sinyali verir; en az bir worker her zaman kalır
+        with self.lock:
+            if len(self._workers) <= 1:
+                return False
+            worker_id = max(self._workers)
+            self._workers.pop(worker_id).set()
+        log_message(f"Consumer worker {worker_id} retiring", "INFO")
+        return True
+    
+    @property
+    def active_consumers(self) -> int:
+        with self.lock:
+            return len(self._workers)
+    
     def start_consumers(self):
         if self.running:
             log_message("Consumers already running", "WARNING")
@@ -354,15 +689,8 @@ class EventPipeline:
         
         log_message(f"Starting {self.num_consumers} consumer workers", "INFO")
         
-        for i in range(self.num_consumers):
-            thread = threading.Thread(
-                target=self._consumer_worker,
-                args=(i,),
-                name=f"Consumer-{i}",
-                daemon=True
-            )
-            thread.start()
-            self.consumer_threads.append(thread)
+        for _ in range(self.num_consumers):
+            self.add_consumer()
     
     def stop_consumers(self):
         if not self.running:
@@ -372,21 +700,92 @@ class EventPipeline:
         log_message("Stopping consumer workers...", "INFO")
         self.running = False
         
-        for _ in range(self.num_consumers):
+        with self.lock:
+            threads = list(self.consumer_threads)
+            active = len(self._workers)
+        
+        for _ in range(active):
             self.input_queue.put(None)
         
-        for thread in self.consumer_threads:
+        for thread in threads:
             thread.join(timeout=5)
         
-        self.consumer_threads.clear()
+        with self.lock:
+            self.consumer_threads.clear()
+            self._workers.clear()
+        self.input_queue.discard_control()
+        
+        # Bekleyen artçı tahmini bitirilir (durum dosyası yazılır)
+        with self.forecast_lock:
+            forecast_executor, self.forecast_executor = self.forecast_executor, None
+        if forecast_executor is not None:
+            forecast_executor.shutdown(wait=True)
+        
+        try:
+            METRICS.save()
+        except Exception as e:
+            log_message(f"Metrikler kaydedilemedi: {e}", "WARNING")
+        
+        with self.pool_lock:
+            if self.process_pool is not None:
+                self.process_pool.shutdown(wait=True)
+                self.process_pool = None
+        
         log_message("All consumer workers stopped", "INFO")
     
+    def _put_result(self, result: Dict[str, Any]):
+        while True:
+            try:
+                self.output_queue.put_nowait(result)
+                return
+            except queue.Full:
+                try:
+                    self.output_queue.get_nowait()
+                    with self.stats_lock:
+                        self.dropped_result_count += 1
+                except queue.Empty:
+                    pass
+    
+    def _collect_metrics(self, registry):
+        # Anlık durum gauge'ları (metrik görüntüsü alınırken çağrılır)
+        from processing.streaming_stats import classify_region
+        queue_stats = self.input_queue.get_statistics()
+        registry.set_gauge('queue_depth', queue_stats['size'], queue='pipeline')
+        registry.set_gauge('queue_high_watermark', queue_stats['high_watermark'], queue='pipeline')
+        registry.set_gauge('queue_pressure', queue_stats['pressure'], queue='pipeline')
+        for priority, count in queue_stats['dropped'].items():
+            registry.set_gauge('queue_dropped_batches', count, queue='pipeline', priority=priority)
+        registry.set_gauge('queue_oldest_age_seconds', self.input_queue.oldest_age(), queue='pipeline')
+        registry.set_gauge('consumers_active', self.active_consumers)
+        with self.stats_lock:
+            registry.set_gauge('consumers_busy', self.busy_workers)
+        with self.pool_lock:
+            registry.set_gauge('cpu_stage_runs', self.cpu_dispatched_count, mode='process_pool')
+            registry.set_gauge('cpu_stage_runs', self.cpu_inline_count, mode='inline')
+        
+        info = classify_region.cache_info()
+        lookups = info.hits + info.misses
+        registry.set_gauge('cache_hits', info.hits, cache='region_classification')
+        registry.set_gauge('cache_misses', info.misses, cache='region_classification')
+        registry.set_gauge('cache_hit_ratio', round(info.hits / lookups, 4) if lookups else 0.0,
+                           cache='region_classification')
+    
+    def get_pressure(self) -> float:
+        # Üreticiler (DataSourceManager) çekme hızını bu değere göre ayarlar
+        return self.input_queue.pressure()
+    
     def add_events(self, events: Dict[str, Any], block: bool = True, timeout: float = None):
         try:
+            events = dict(events, priority=classify_priority(events), enqueued_at=time.time())
             self.input_queue.put(events, block=block, timeout=timeout)
-            log_message(f"Added events from {events.get('source')} to processing queue", "INFO")
+            log_message(f"Added events from {events.get('source')} to processing queue "
+                        f"(priority: {PRIORITY_NAMES[events['priority']]})", "INFO")
         except queue.Full:
-            log_message("Processing queue is full, event dropped", "WARNING")
+            with self.stats_lock:
+                self.error_count += 1
+            log_message(f"Processing queue is full, batch from {events.get('source')} "
+                        f"(priority: {PRIORITY_NAMES[events['priority']]}) dropped", "WARNING")
+            self._checkpoint_wal(events)
     
     def get_results(self, timeout: float = 0.1) -> List[Dict[str, Any]]:
         results = []
@@ -401,15 +800,29 @@ class EventPipeline:
         return results
     
     def get_statistics(self) -> Dict[str, Any]:
-        with self.lock:
-            return {
-                'running': self.running,
+        stats = {
+            'running': self.running,
+            'input_queue_size': self.input_queue.qsize(),
+            'output_queue_size': self.output_queue.qsize(),
+            'num_consumers': self.num_consumers,
+            'active_consumers': self.active_consumers,
+        }
+        with self.stats_lock:
+            stats.update({
                 'processed_count': self.processed_count,
                 'error_count': self.error_count,
-                'input_queue_size': self.input_queue.qsize(),
-                'output_queue_size': self.output_queue.qsize(),
-                'num_consumers': self.num_consumers
-            }
+                'busy_workers': self.busy_workers,
+                'coalesced_batch_count': self.coalesced_batch_count,
+                'dropped_result_count': self.dropped_result_count,
+            })
+        with self.pool_lock:
+            stats.update({
+                'cpu_workers': self.cpu_workers,
+                'cpu_dispatched_count': self.cpu_dispatched_count,
+                'cpu_inline_count': self.cpu_inline_count,
+            })
+        stats['priority_queue'] = self.input_queue.get_statistics()
+        return stats
     
     def wait_for_completion(self, timeout: float = None):
         import time
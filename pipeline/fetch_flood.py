@@ -5,6 +5,7 @@ from pathlib import Path
 
 from datasources.flood_openmeteo_source import OpenMeteoFloodSource
 from processing.storage import log_message
+from processing.flood_analytics import summarize_flood_events
 
 CITIES = [
     ("New Orleans", 29.9511, -90.0715),
@@ -91,28 +92,7 @@ def save_events_to_json(all_events, high_events, filename="flood_risk.json"):
     return file_path
 
 def summarize_flood_risk(events):
-    stats = {}
-
-    for ev in events:
-        location = ev.get("location", "Unknown City")
-        risk = ev.get("risk_level", "unknown")
-        
-        if location not in stats:
-            stats[location] = {"low": 0, "medium": 0, "high": 0, "unknown": 0, "peak_discharge": 0.0}
-
-        if risk in stats[location]:
-            stats[location][risk] += 1
-        else:
-            stats[location]["unknown"] += 1
-
-        val = ev.get("river_discharge")
-        if val:
-            try:
-                num_val = float(val)
-                if num_val > stats[location]["peak_discharge"]:
-                    stats[location]["peak_discharge"] = num_val
-            except:
-                pass
+    stats = summarize_flood_events(events)["cities"]
 
     print("\n" + "="*45)
     print(" SEL RİSKİ ÖZET RAPORU ".center(45, "#"))
@@ -121,8 +101,10 @@ def summarize_flood_risk(events):
     for city, data in stats.items():
         print(f"\n[*] Şehir: {city}")
         print(f"    Risk Dağılımı -> High: {data['high']}, Med: {data['medium']}, Low: {data['low']}")
-        if data["peak_discharge"] > 0:
+        if data["peak_discharge"]:
             print(f"    Maksimum Debi: {data['peak_discharge']} m3/s")
+        if data["max_rate_of_rise"] is not None:
+            print(f"    Maks. Yükselme: {data['max_rate_of_rise']} m3/s/gün")
     
     print("="*45)
 
@@ -0,0 +1,225 @@
+# Pipeline metrikleri: aşama/kaynak başına gecikme histogramları, sayaçlar ve gauge'lar
+# Süreç başına tek bir kayıt (METRICS) tutulur. Runtime süreci anlık görüntüyü
+# data/metrics.json'a yazar; dashboard ayrı bir süreç olduğu için /metrics endpoint'i bu
+# dosyayı kendi (HTTP, önbellek) metrikleriyle birleştirip Prometheus text formatında sunar.
+#
+# Histogramlar Prometheus uyumlu kümülatif bucket'lar tutar; p50/p95/p99 son
+# HISTOGRAM_SAMPLES ölçümden hesaplanır (JSON görüntüsünde ve get_status()'ta).
+
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from processing.storage import log_message, veri_klasoru
+
+METRICS_FILE = "metrics.json"
+NAMESPACE = "sdews"
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+HISTOGRAM_SAMPLES = 1024
+SAVE_INTERVAL_SECONDS = 2.0
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count', 'recent')
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.recent: Deque[float] = deque(maxlen=HISTOGRAM_SAMPLES)
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self.recent)
+
+        def _q(q):
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 6) if ordered else None
+
+        cumulative, running = [], 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            cumulative.append([bound, running])
+        return {
+            'buckets': cumulative,
+            'sum': round(self.sum, 6),
+            'count': self.count,
+            'p50': _q(0.50),
+            'p95': _q(0.95),
+            'p99': _q(0.99)
+        }
+
+
+class MetricsRegistry:
+
+    def __init__(self, process: str = 'pipeline'):
+        self.process = process
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+        self.counters: Dict[Tuple[str, LabelKey], float] = {}
+        self.gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self.histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        # Görüntü alınırken anlık değer üreten fonksiyonlar (kuyruk derinliği, önbellek oranı vb.)
+        self.collectors: Dict[str, Callable[["MetricsRegistry"], None]] = {}
+        self._last_save = 0.0
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self.lock:
+            self.gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def register_collector(self, key: str, collector: Callable[["MetricsRegistry"], None]):
+        self.collectors[key] = collector
+
+    def reset(self):
+        # Birikmiş ölçümleri sıfırlar (aynı süreçte art arda benchmark turları için)
+        with self.lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+        self.started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        for key, collector in list(self.collectors.items()):
+            try:
+                collector(self)
+            except Exception as e:
+                log_message(f"Metrik toplayıcı hatası ({key}): {e}", "WARNING")
+
+        now = time.time()
+        uptime = max(now - self.started_at, 1e-9)
+        process_label = ('process', self.process)
+        with self.lock:
+            counters = [{'name': name, 'labels': dict(labels + (process_label,)), 'value': value,
+                         'rate_per_second': round(value / uptime, 4)}
+                        for (name, labels), value in self.counters.items()]
+            gauges = [{'name': name, 'labels': dict(labels + (process_label,)), 'value': value}
+                      for (name, labels), value in self.gauges.items()]
+            histograms = [dict(histogram.snapshot(), name=name, labels=dict(labels + (process_label,)))
+                          for (name, labels), histogram in self.histograms.items()]
+        return {
+            'process': self.process,
+            'started_at': self.started_at,
+            'generated_at': now,
+            'uptime_seconds': round(uptime, 3),
+            'counters': counters,
+            'gauges': gauges,
+            'histograms': histograms
+        }
+
+    def save(self, path: Optional[Path] = None):
+        path = path or (veri_klasoru / METRICS_FILE)
+        snapshot = self.snapshot()
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._last_save = time.time()
+
+    def maybe_save(self, path: Optional[Path] = None):
+        # Her batch sonrası çağrılabilir; dosya en fazla SAVE_INTERVAL_SECONDS'ta bir yazılır
+        if time.time() - self._last_save < SAVE_INTERVAL_SECONDS:
+            return
+        try:
+            self.save(path)
+        except Exception as e:
+            log_message(f"Metrikler kaydedilemedi: {e}", "WARNING")
+
+
+def load_metrics_snapshot(path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    path = path or (veri_klasoru / METRICS_FILE)
+    if not path.exists():
+        return None
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, Any], extra: Optional[Tuple[str, str]] = None) -> str:
+    items = sorted(labels.items())
+    if extra:
+        items.append(extra)
+    if not items:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in items) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not float(value).is_integer() else str(int(value))
+
+
+def render_prometheus(snapshots: Iterable[Optional[Dict[str, Any]]], namespace: str = NAMESPACE) -> str:
+    """Bir ya da daha fazla süreç görüntüsünü Prometheus text exposition formatına çevirir."""
+    grouped: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for snapshot in snapshots:
+        if not snapshot:
+            continue
+        for kind, entries in (('counter', snapshot.get('counters', [])), ('gauge', snapshot.get('gauges', [])),
+                              ('histogram', snapshot.get('histograms', []))):
+            for entry in entries:
+                grouped.setdefault((entry['name'], kind), []).append(entry)
+
+    lines = []
+    for (name, kind), entries in sorted(grouped.items()):
+        metric = f"{namespace}_{name}"
+        lines.append(f"# TYPE {metric} {kind}")
+        for entry in entries:
+            labels = entry.get('labels', {})
+            if kind != 'histogram':
+                lines.append(f"{metric}{_format_labels(labels)} {_format_value(entry['value'])}")
+                continue
+            for bound, count in entry['buckets']:
+                lines.append(f"{metric}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {count}")
+            lines.append(f"{metric}_bucket{_format_labels(labels, ('le', '+Inf'))} {entry['count']}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {_format_value(entry['sum'])}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {entry['count']}")
+    return '\n'.join(lines) + '\n'
+
+
+METRICS = MetricsRegistry()
@@ -0,0 +1,535 @@
+# Öncelikli event kuyruğu
+# EventPipeline'ın FIFO input_queue'su yerine kullanılır: her batch kaynak tipine ve içeriğine
+# (deprem büyüklüğü, sel risk seviyesi) göre bir öncelik şeridine (lane) konur ve consumer'lar
+# en yüksek öncelikli şeritten alır. Düşük öncelikli batch'ler bekledikçe yaşlanır (aging):
+# her aging_seconds bekleme bir seviye kazandırır, böylece hava durumu batch'leri aç kalmaz.
+# Yaşlanma yalnızca kritik olmayan şeritleri yeniden sıralar: kritik şerit doluysa önce o alınır.
+# None sentinel'leri (consumer durdurma) kapasiteye takılmayan ayrı kontrol şeridine gider.
+# queue.Queue ile aynı arayüz: put/get/task_done/join/qsize/empty/full, queue.Full/queue.Empty.
+# Kuyruk dolduğunda davranış policy ile seçilir:
+#   block                 - put() yer açılana kadar bekler (timeout'ta queue.Full)
+#   drop_oldest           - en eski batch atılır
+#   drop_lowest_priority  - en düşük öncelikli şeritteki en eski batch atılır; gelen batch
+#                           kuyruktakilerin hepsinden düşük öncelikliyse kendisi atılır
+#   spill_to_disk         - taşan batch'ler diske pickle edilir, yer açıldıkça sırayla geri yüklenir;
+#                           süreç çökerse bir sonraki açılışta diskten kurtarılır. WAL kullanılıyorsa
+#                           (wal_backed) wal_seq taşıyan dosyalar açılışta silinir, onları WAL yeniden oynatır
+# Doluluk high watermark'ı aşınca under_pressure True olur (low watermark altına inince False);
+# üreticiler pressure()/under_pressure ile çekme hızlarını ayarlar.
+
+from __future__ import annotations
+import pickle
+import queue
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from processing.storage import log_message, veri_klasoru
+from models.event_batch import EventBatch
+
+CRITICAL, HIGH, NORMAL, LOW = 0, 1, 2, 3
+PRIORITY_NAMES = ('critical', 'high', 'normal', 'low')
+
+# Kaynak tipine göre varsayılan öncelik; içerik kuralları bunu yükseltebilir
+SOURCE_PRIORITIES = {
+    'USGSEarthquakeSource': NORMAL,
+    'OpenMeteoFloodSource': LOW,
+    'EONETSource': NORMAL,
+    'EONETWildfireSource': NORMAL,
+    'EONETStormSource': NORMAL,
+    'EONETVolcanoSource': NORMAL,
+    'OpenWeatherSource': LOW,
+}
+
+CRITICAL_MAGNITUDE = 6.0
+HIGH_MAGNITUDE = 4.5
+AGING_SECONDS = 5.0
+LATENCY_SAMPLES = 512
+
+QUEUE_POLICIES = ('block', 'drop_oldest', 'drop_lowest_priority', 'spill_to_disk')
+HIGH_WATERMARK_RATIO = 0.8
+LOW_WATERMARK_RATIO = 0.5
+SPILL_DIR = "spill"
+
+
+def _field(item, name):
+    if isinstance(item, dict):
+        return item.get(name)
+    return getattr(item, name, None)
+
+
+def _magnitudes(data) -> List[float]:
+    if isinstance(data, EventBatch):
+        # Yalnızca magnitude sütunu okunur (NaN: değer yok)
+        return [m for m in data.numbers('magnitude') if m == m]
+    magnitudes = []
+    for item in (data if isinstance(data, list) else [data]):
+        try:
+            magnitudes.append(float(_field(item, 'magnitude')))
+        except (TypeError, ValueError):
+            continue
+    return magnitudes
+
+
+def _has_high_risk(data) -> bool:
+    if isinstance(data, EventBatch):
+        return any(str(value).lower() == 'high' for value in data.distinct('risk_level'))
+    return any(str(_field(item, 'risk_level')).lower() == 'high'
+               for item in (data if isinstance(data, list) else [data]))
+
+
+def classify_priority(event_data: Dict[str, Any]) -> int:
+    """Batch önceliği: M6+ deprem critical, M4.5+ deprem veya yüksek riskli sel high."""
+    source = event_data.get('source', '')
+    priority = SOURCE_PRIORITIES.get(source, NORMAL)
+    data = event_data.get('data')
+
+    if source == 'USGSEarthquakeSource':
+        max_magnitude = max(_magnitudes(data), default=0.0)
+        if max_magnitude >= CRITICAL_MAGNITUDE:
+            priority = CRITICAL
+        elif max_magnitude >= HIGH_MAGNITUDE:
+            priority = min(priority, HIGH)
+    elif source == 'OpenMeteoFloodSource':
+        if _has_high_risk(data):
+            priority = min(priority, HIGH)
+
+    return priority
+
+
+def _spill_name(path: Path) -> Tuple[int, int, int, Optional[int]]:
+    # <ms>_<sıra>_<öncelik>[_<wal_seq>].pkl -> (ms, sıra, öncelik, wal_seq); biçim dışıysa ValueError
+    parts = path.stem.split("_")
+    if len(parts) not in (3, 4):
+        raise ValueError(path.name)
+    millis, seq, priority = (int(part) for part in parts[:3])
+    return millis, seq, priority, int(parts[3]) if len(parts) == 4 else None
+
+
+class LatencyStats:
+    # Sayaç, toplam, maksimum ve yüzdelikler için son LATENCY_SAMPLES ölçüm
+
+    __slots__ = ('count', 'total', 'max', 'recent')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self.recent)
+
+        def _pct(q):
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4) if ordered else None
+
+        return {
+            'count': self.count,
+            'avg': round(self.total / self.count, 4) if self.count else None,
+            'max': round(self.max, 4),
+            'p50': _pct(0.50),
+            'p95': _pct(0.95)
+        }
+
+
+class PriorityEventQueue:
+
+    def __init__(self, maxsize: int = 0, aging_seconds: float = AGING_SECONDS, policy: str = 'block',
+                 name: str = 'pipeline', spill_dir: Optional[Path] = None,
+                 on_drop: Optional[Callable[[Any], None]] = None, wal_backed: bool = False):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy} (expected one of {', '.join(QUEUE_POLICIES)})")
+        self.maxsize = maxsize
+        self.aging_seconds = aging_seconds
+        self.policy = policy
+        self.name = name
+        # Politika gereği atılan her batch için (kilit dışında) çağrılır; örn. WAL checkpoint'i.
+        # Diskten geri yüklenemeyen batch'ler için {'source', 'spill_file', 'wal_seq'} özeti verilir
+        self.on_drop = on_drop
+        self.wal_backed = wal_backed
+        self._lost: List[Dict[str, Any]] = []
+        # Şerit başına (kuyruğa girme zamanı, öncelik, batch); her şerit kendi içinde FIFO
+        self._lanes: List[Deque[Tuple[float, int, Any]]] = [deque() for _ in PRIORITY_NAMES]
+        self._control: Deque[Any] = deque()
+        self._size = 0
+        self.unfinished_tasks = 0
+        self.aged_count = 0
+
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.not_full = threading.Condition(self.mutex)
+        self.all_tasks_done = threading.Condition(self.mutex)
+
+        self.enqueued = [0] * len(PRIORITY_NAMES)
+        self.wait_latency = [LatencyStats() for _ in PRIORITY_NAMES]
+        self.end_to_end_latency = [LatencyStats() for _ in PRIORITY_NAMES]
+
+        # Backpressure metrikleri
+        self.high_watermark = 0
+        self.under_pressure = False
+        self.pressure_events = 0
+        self.dropped = [0] * len(PRIORITY_NAMES)
+        self.blocked_puts = 0
+        self.blocked_seconds = 0.0
+
+        # Diske taşan batch'ler: (öncelik, kuyruğa girme zamanı, dosya yolu), FIFO
+        self.spill_dir = spill_dir or (veri_klasoru / SPILL_DIR / name)
+        self._spilled: Deque[Tuple[int, float, Path]] = deque()
+        self._spill_seq = 0
+        self.spilled_count = 0
+        self.restored_count = 0
+        if policy == 'spill_to_disk':
+            with self.mutex:
+                self._recover_spilled()
+            self._report_lost()
+
+    def priority_of(self, item: Any) -> int:
+        if isinstance(item, dict):
+            priority = item.get('priority')
+            if isinstance(priority, int) and 0 <= priority < len(PRIORITY_NAMES):
+                return priority
+            return classify_priority(item)
+        return NORMAL
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None):
+        dropped = None
+        with self.not_full:
+            if item is None:
+                self._control.append(item)
+                self.unfinished_tasks += 1
+                self.not_empty.notify()
+                return
+
+            priority = self.priority_of(item)
+            if self.maxsize > 0 and (self._size >= self.maxsize or self._spilled):
+                if self.policy == 'block':
+                    self._wait_for_space(block, timeout)
+                elif self.policy == 'spill_to_disk':
+                    if self._spill(priority, time.time(), item):
+                        return
+                    dropped = (priority, item)
+                elif self.policy == 'drop_oldest':
+                    oldest = min((lane for lane in self._lanes if lane), key=lambda lane: lane[0][0])
+                    dropped = self._evict(oldest)
+                else:
+                    lowest = max(level for level, lane in enumerate(self._lanes) if lane)
+                    if lowest < priority:
+                        # Gelen batch kuyruktaki her şeyden daha düşük öncelikli: kendisi atılır
+                        self.enqueued[priority] += 1
+                        self.dropped[priority] += 1
+                        dropped = (priority, item)
+                    else:
+                        dropped = self._evict(self._lanes[lowest])
+
+            if dropped is None or dropped[1] is not item:
+                self._lanes[priority].append((time.time(), priority, item))
+                self._size += 1
+                self.enqueued[priority] += 1
+                self.unfinished_tasks += 1
+                self._update_pressure()
+                self.not_empty.notify()
+
+        if dropped is not None:
+            log_message(f"Queue '{self.name}' full ({self.policy}): dropped {PRIORITY_NAMES[dropped[0]]} "
+                        f"batch from {_field(dropped[1], 'source')}", "WARNING")
+            if self.on_drop is not None:
+                self.on_drop(dropped[1])
+
+    def _wait_for_space(self, block: bool, timeout: Optional[float]):
+        if not block:
+            raise queue.Full
+        started = time.time()
+        self.blocked_puts += 1
+        try:
+            if timeout is None:
+                while self._size >= self.maxsize:
+                    self.not_full.wait()
+            else:
+                deadline = started + timeout
+                while self._size >= self.maxsize:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise queue.Full
+                    self.not_full.wait(remaining)
+        finally:
+            self.blocked_seconds += time.time() - started
+
+    def _evict(self, lane: Deque[Tuple[float, int, Any]]) -> Tuple[int, Any]:
+        _, priority, item = lane.popleft()
+        self._size -= 1
+        self.unfinished_tasks -= 1
+        self.dropped[priority] += 1
+        return priority, item
+
+    def _spill(self, priority: int, enqueued_at: float, item: Any) -> bool:
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._spill_seq += 1
+        # WAL sıra numarası dosya adında da tutulur: geri yüklenemeyen batch'in WAL kaydı kapatılabilsin
+        wal_seq = item.get('wal_seq') if isinstance(item, dict) else None
+        suffix = f"_{wal_seq}" if isinstance(wal_seq, int) else ""
+        path = self.spill_dir / f"{int(enqueued_at * 1000)}_{self._spill_seq:06d}_{priority}{suffix}.pkl"
+        try:
+            with path.open("wb") as f:
+                pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            path.unlink(missing_ok=True)
+            self.enqueued[priority] += 1
+            self.dropped[priority] += 1
+            log_message(f"Queue '{self.name}': batch could not be spilled to disk, dropped: {e}", "ERROR")
+            return False
+        self._spilled.append((priority, enqueued_at, path))
+        self.enqueued[priority] += 1
+        self.spilled_count += 1
+        self.unfinished_tasks += 1
+        self._update_pressure()
+        return True
+
+    def _restore_spilled(self):
+        # Yer açıldıkça diskteki batch'ler sırayla şeritlerine geri yüklenir
+        while self._spilled and self._size < self.maxsize:
+            priority, enqueued_at, path = self._spilled.popleft()
+            try:
+                with path.open("rb") as f:
+                    item = pickle.load(f)
+                path.unlink(missing_ok=True)
+            except Exception as e:
+                self.unfinished_tasks -= 1
+                if self.unfinished_tasks <= 0:
+                    self.all_tasks_done.notify_all()
+                self.dropped[priority] += 1
+                log_message(f"Queue '{self.name}': spilled batch {path.name} could not be restored: {e}", "ERROR")
+                try:
+                    # Sonraki açılışta yeniden denenmesin; inceleme için .bad olarak bırakılır
+                    path.replace(path.with_suffix('.bad'))
+                except OSError:
+                    pass
+                lost = {'source': f"spill:{path.name}", 'spill_file': str(path)}
+                wal_seq = _spill_name(path)[3]
+                if wal_seq is not None:
+                    lost['wal_seq'] = wal_seq
+                self._lost.append(lost)
+                continue
+            self._lanes[priority].append((enqueued_at, priority, item))
+            self._size += 1
+            self.restored_count += 1
+            self.not_empty.notify()
+
+    def _recover_spilled(self):
+        # Önceki çalışmadan kalan (çökme/kapanma) dosyalar kuyruğun başına alınır
+        if not self.spill_dir.exists():
+            return
+        replayed = 0
+        for path in sorted(self.spill_dir.glob("*.pkl")):
+            try:
+                millis, seq, priority, wal_seq = _spill_name(path)
+            except ValueError:
+                continue
+            self._spill_seq = max(self._spill_seq, seq)
+            if self.wal_backed and wal_seq is not None:
+                # Aynı batch WAL'da işlenmemiş duruyor; iki kez işlenmemesi için tek kurtarma kaynağı WAL
+                path.unlink(missing_ok=True)
+                replayed += 1
+                continue
+            self._spilled.append((priority, millis / 1000.0, path))
+        if replayed:
+            log_message(f"Queue '{self.name}': {replayed} spilled batches discarded, WAL will replay them", "INFO")
+        if self._spilled:
+            self.unfinished_tasks += len(self._spilled)
+            log_message(f"Queue '{self.name}': {len(self._spilled)} spilled batches recovered from disk", "INFO")
+            if self.maxsize <= 0:
+                self.maxsize = len(self._spilled)
+            self._restore_spilled()
+
+    def _report_lost(self):
+        # Geri yüklenemeyen batch'ler kilit dışında on_drop'a bildirilir
+        if not self._lost:
+            return
+        with self.mutex:
+            lost, self._lost = self._lost, []
+        if self.on_drop is not None:
+            for item in lost:
+                self.on_drop(item)
+
+    def _pending(self) -> int:
+        return self._size + len(self._spilled)
+
+    def _update_pressure(self):
+        pending = self._pending()
+        self.high_watermark = max(self.high_watermark, pending)
+        if self.maxsize <= 0:
+            return
+        ratio = pending / self.maxsize
+        if not self.under_pressure and ratio >= HIGH_WATERMARK_RATIO:
+            self.under_pressure = True
+            self.pressure_events += 1
+        elif self.under_pressure and ratio <= LOW_WATERMARK_RATIO:
+            self.under_pressure = False
+
+    def pressure(self) -> float:
+        # Doluluk oranı; diske taşan batch'ler nedeniyle 1.0'ı aşabilir
+        with self.mutex:
+            return self._pending() / self.maxsize if self.maxsize > 0 else 0.0
+
+    def put_nowait(self, item: Any):
+        return self.put(item, block=False)
+
+    def _select_lane(self, now: float) -> int:
+        # Kritik şerit her zaman önce; diğerlerinde en düşük etkin seviye kazanır: seviye - bekleme / aging_seconds
+        if self._lanes[CRITICAL]:
+            return CRITICAL
+        best, best_score, top = -1, None, -1
+        for level, lane in enumerate(self._lanes):
+            if level == CRITICAL or not lane:
+                continue
+            if top < 0:
+                top = level
+            score = level - (now - lane[0][0]) / self.aging_seconds
+            if best_score is None or score < best_score:
+                best, best_score = level, score
+        if best != top:
+            self.aged_count += 1
+        return best
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        with self.not_empty:
+            if not block:
+                if not self._control and not self._size:
+                    raise queue.Empty
+            elif timeout is None:
+                while not self._control and not self._size:
+                    self.not_empty.wait()
+            else:
+                deadline = time.time() + timeout
+                while not self._control and not self._size:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise queue.Empty
+                    self.not_empty.wait(remaining)
+
+            if self._control:
+                return self._control.popleft()
+
+            now = time.time()
+            enqueued_at, priority, item = self._lanes[self._select_lane(now)].popleft()
+            self._size -= 1
+            self.wait_latency[priority].add(now - enqueued_at)
+            self._restore_spilled()
+            self._update_pressure()
+            self.not_full.notify()
+        self._report_lost()
+        return item
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def take_matching(self, predicate: Callable[[Any], bool]) -> List[Any]:
+        # Koşulu sağlayan bekleyen batch'leri tüm şeritlerden çıkarır (coalescing için).
+        # Çıkarılan her batch için çağıran task_done() çağırmakla yükümlüdür.
+        with self.mutex:
+            now = time.time()
+            taken = []
+            for lane in self._lanes:
+                if not lane:
+                    continue
+                kept = deque()
+                for entry in lane:
+                    if predicate(entry[2]):
+                        taken.append(entry[2])
+                        self.wait_latency[entry[1]].add(now - entry[0])
+                    else:
+                        kept.append(entry)
+                lane.clear()
+                lane.extend(kept)
+            if taken:
+                self._size -= len(taken)
+                self._restore_spilled()
+                self._update_pressure()
+                self.not_full.notify(len(taken))
+        self._report_lost()
+        return taken
+
+    def task_done(self):
+        with self.all_tasks_done:
+            unfinished = self.unfinished_tasks - 1
+            if unfinished <= 0:
+                if unfinished < 0:
+                    raise ValueError('task_done() called too many times')
+                self.all_tasks_done.notify_all()
+            self.unfinished_tasks = unfinished
+
+    def join(self):
+        with self.all_tasks_done:
+            while self.unfinished_tasks:
+                self.all_tasks_done.wait()
+
+    def record_completion(self, priority: int, seconds: float):
+        # Kuyruğa girişten işlemenin bitmesine kadar geçen süre (time-to-alert)
+        with self.mutex:
+            self.end_to_end_latency[priority].add(seconds)
+
+    def qsize(self) -> int:
+        with self.mutex:
+            return self._size
+
+    def empty(self) -> bool:
+        with self.mutex:
+            return not self._size and not self._control
+
+    def full(self) -> bool:
+        with self.mutex:
+            return 0 < self.maxsize <= self._size
+
+    def discard_control(self):
+        # Durdurma sonrası tüketilmemiş sentinel'ler bir sonraki başlatmaya kalmasın
+        with self.all_tasks_done:
+            self.unfinished_tasks -= len(self._control)
+            self._control.clear()
+            if self.unfinished_tasks <= 0:
+                self.unfinished_tasks = 0
+                self.all_tasks_done.notify_all()
+
+    def oldest_age(self) -> float:
+        # Kuyrukta en uzun süredir bekleyen batch'in yaşı (saniye)
+        with self.mutex:
+            heads = [lane[0][0] for lane in self._lanes if lane]
+            return time.time() - min(heads) if heads else 0.0
+
+    def lane_sizes(self) -> Dict[str, int]:
+        with self.mutex:
+            return {name: len(lane) for name, lane in zip(PRIORITY_NAMES, self._lanes)}
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self.mutex:
+            return {
+                'lanes': {
+                    name: {
+                        'queued': len(self._lanes[level]),
+                        'enqueued': self.enqueued[level],
+                        'wait_seconds': self.wait_latency[level].snapshot(),
+                        'end_to_end_seconds': self.end_to_end_latency[level].snapshot()
+                    }
+                    for level, name in enumerate(PRIORITY_NAMES)
+                },
+                'aged_count': self.aged_count,
+                'aging_seconds': self.aging_seconds,
+                'policy': self.policy,
+                'maxsize': self.maxsize,
+                'size': self._size,
+                'high_watermark': self.high_watermark,
+                'pressure': round(self._pending() / self.maxsize, 3) if self.maxsize > 0 else 0.0,
+                'under_pressure': self.under_pressure,
+                'pressure_events': self.pressure_events,
+                'dropped': dict(zip(PRIORITY_NAMES, self.dropped)),
+                'blocked_puts': self.blocked_puts,
+                'blocked_seconds': round(self.blocked_seconds, 3),
+                'spilled': self.spilled_count,
+                'spilled_pending': len(self._spilled),
+                'restored': self.restored_count
+            }
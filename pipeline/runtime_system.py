@@ -1,20 +1,36 @@
 import time
 import signal
 import sys
-from typing import List
+import threading
+from typing import List, Optional
 from datasources.base_source import DataSource
+from models.event_batch import event_count
 from .data_source_manager import DataSourceManager
 from .event_pipeline import EventPipeline
+from .write_ahead_log import WriteAheadLog
+from .autoscaler import ConsumerAutoscaler
+from .metrics import METRICS
 from processing import log_message
 
 
 class RuntimeSystem:
 
-    def __init__(self, data_sources: List[DataSource] = None, fetch_interval: int = 60, num_consumers: int = 3):
-        self.source_manager = DataSourceManager(data_sources=data_sources, fetch_interval=fetch_interval)
-        self.pipeline = EventPipeline(num_consumers=num_consumers)
+    def __init__(self, data_sources: List[DataSource] = None, fetch_interval: int = 60, num_consumers: int = 3,
+                 use_wal: bool = True, autoscale: bool = True, min_consumers: int = 1, max_consumers: int = 8,
+                 wal_dir=None):
+        # Çekilen batch'ler işlenene kadar WAL'da tutulur; çökmeden sonra start() işlenmemişleri yeniden kuyruğa alır
+        self.wal = WriteAheadLog(directory=wal_dir) if use_wal else None
+        self.source_manager = DataSourceManager(data_sources=data_sources, fetch_interval=fetch_interval, wal=self.wal)
+        self.pipeline = EventPipeline(num_consumers=num_consumers, wal=self.wal)
+        # Kaynaklar pipeline kuyruğunun doluluğuna göre yavaşlar
+        self.source_manager.set_backpressure(self.pipeline.get_pressure)
+        # Consumer sayısı kuyruk derinliğine göre min/max arasında ayarlanır
+        self.autoscaler = ConsumerAutoscaler(self.pipeline, min_consumers=min_consumers,
+                                             max_consumers=max_consumers) if autoscale else None
         self.running = False
         self.start_time = None
+        # Sürekli modda döngüler arası beklemeyi stop() keser
+        self._stop_event = threading.Event()
         
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -29,43 +45,126 @@ class RuntimeSystem:
     def add_data_source(self, source: DataSource):
         self.source_manager.add_source(source)
     
-    def start(self):
+    def start(self, cycles: Optional[int] = 1):
+        """cycles kez çek-işle döngüsü çalıştırır (None: durdurulana kadar). Döngüler arasında
+        beklenen süre tüketici baskısıyla uzar (DataSourceManager.next_fetch_interval); sürekli
+        modda döngü pipeline'ın boşalmasını beklemez, böylece birikmiş kuyruk bir sonraki turun
+        çekme aralığını ve düşük öncelikli kaynakların atlanmasını belirler."""
         if self.running:
             log_message("Runtime sistemi zaten çalışıyor", "WARNING")
             return
         
         self.running = True
         self.start_time = time.time()
+        self._stop_event.clear()
         
         log_message("=" * 60, "INFO")
         log_message("SDEWS Runtime System Başlatılıyor", "INFO")
         log_message("=" * 60, "INFO")
         
-        self.pipeline.start_consumers()
+        self._start_consumers()
         
         try:
-            self.source_manager.fetch_all_sources()
-            events = self.source_manager.get_events()
-            
-            if events:
-                for event in events:
-                    self.pipeline.add_events(event)
+            recovered = self._recover_from_wal()
+            completed = 0
+            while self.running:
+                self._run_cycle(recovered, wait=cycles is not None)
+                recovered = 0
+                completed += 1
+                if cycles is not None and completed >= cycles:
+                    break
                 
-                log_message(f"{len(events)} event batch pipeline'a eklendi", "INFO")
-                self.pipeline.wait_for_completion(timeout=60.0)
-                
-                results = self.pipeline.get_results()
-                self._display_results(results)
-            else:
-                log_message("Bu döngüde veri çekilemedi", "INFO")
+                interval = self.source_manager.next_fetch_interval()
+                log_message(f"Sonraki veri çekme {interval:.0f}s sonra "
+                            f"(kuyruk baskısı: {self.source_manager.get_pressure():.2f})", "INFO")
+                if self._stop_event.wait(interval):
+                    break
             
         except Exception as e:
             log_message(f"Veri çekme-işleme döngüsünde hata: {str(e)}", "ERROR")
         finally:
             self.running = False
-            self.pipeline.stop_consumers()
+            self._stop_consumers()
             self.stop()
     
+    def _run_cycle(self, recovered: int, wait: bool):
+        self.source_manager.fetch_all_sources()
+        events = self.source_manager.get_events()
+        
+        for event in events:
+            self.pipeline.add_events(event)
+        if events:
+            log_message(f"{len(events)} event batch pipeline'a eklendi", "INFO")
+        else:
+            log_message("Bu döngüde veri çekilemedi", "INFO")
+        
+        if wait and (events or recovered):
+            self.pipeline.wait_for_completion(timeout=60.0)
+        results = self.pipeline.get_results()
+        if results:
+            self._display_results(results)
+    
+    def _start_consumers(self):
+        self.pipeline.start_consumers()
+        if self.autoscaler is not None:
+            self.autoscaler.start()
+    
+    def _stop_consumers(self):
+        if self.autoscaler is not None:
+            self.autoscaler.stop()
+        self.pipeline.stop_consumers()
+    
+    def _recover_from_wal(self) -> int:
+        # Önceki çalışmada çekilip işlenemeden kalan batch'ler
+        if self.wal is None:
+            return 0
+        count = 0
+        for batch in self.wal.pending():
+            self.pipeline.add_events(batch)
+            count += 1
+        if count:
+            log_message(f"WAL: önceki çalışmadan {count} işlenmemiş batch yeniden kuyruğa alındı", "WARNING")
+        return count
+    
+    def replay(self, include_processed: bool = False) -> dict:
+        # WAL'daki batch'leri veri çekmeden pipeline'dan tam hızda geçirir (kurtarma ve benchmark)
+        if self.wal is None:
+            log_message("Replay için WAL gerekli (use_wal=True)", "ERROR")
+            return {}
+        
+        self.running = True
+        self.start_time = time.time()
+        log_message(f"WAL replay başlatılıyor ({'tüm kayıtlar' if include_processed else 'işlenmemiş kayıtlar'})", "INFO")
+        
+        self._start_consumers()
+        summary = {'batches': 0, 'items': 0, 'seconds': 0.0}
+        
+        try:
+            started = time.time()
+            for batch in self.wal.records(include_processed=include_processed):
+                data = batch.get('data')
+                summary['batches'] += 1
+                summary['items'] += event_count(data)
+                self.pipeline.add_events(batch)
+            
+            self.pipeline.wait_for_completion()
+            summary['seconds'] = round(time.time() - started, 3)
+            
+            self._display_results(self.pipeline.get_results())
+            if summary['seconds'] > 0:
+                summary['batches_per_second'] = round(summary['batches'] / summary['seconds'], 2)
+                summary['items_per_second'] = round(summary['items'] / summary['seconds'], 2)
+            log_message(f"Replay tamamlandı: {summary}", "INFO")
+            
+        except Exception as e:
+            log_message(f"WAL replay hatası: {str(e)}", "ERROR")
+        finally:
+            self.running = False
+            self._stop_consumers()
+            self.stop()
+        
+        return summary
+    
     def _display_results(self, results: List[dict]):
         log_message("=" * 60, "INFO")
         log_message("PROCESSING RESULTS", "INFO")
@@ -97,12 +196,16 @@ class RuntimeSystem:
             log_message("-" * 60, "INFO")
     
     def stop(self):
+        self._stop_event.set()
+        if self.wal is not None:
+            self.wal.close()
+        
         if not self.running:
             return
         
         log_message("RuntimeSystem durduruluyor...", "INFO")
         self.running = False
-        self.pipeline.stop_consumers()
+        self._stop_consumers()
         
         log_message("=" * 60, "INFO")
         log_message("SDEWS Runtime System Durduruldu", "INFO")
@@ -113,5 +216,8 @@ class RuntimeSystem:
             'running': self.running,
             'uptime': time.time() - self.start_time if self.start_time else 0,
             'source_manager': self.source_manager.get_status(),
-            'pipeline': self.pipeline.get_statistics()
+            'pipeline': self.pipeline.get_statistics(),
+            'autoscaler': self.autoscaler.get_status() if self.autoscaler is not None else None,
+            'wal': self.wal.get_status() if self.wal is not None else None,
+            'metrics': METRICS.snapshot()
         }
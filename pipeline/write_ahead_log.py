@@ -0,0 +1,232 @@
+# Write-ahead log (WAL) - çekilen ham batch'ler işlenmeden önce diske eklenir
+# DataSourceManager her batch'i kuyruğa koymadan önce WAL'a yazar ve bir sıra numarası (wal_seq)
+# verir; EventPipeline batch'i işledikten sonra checkpoint() çağırır. Süreç bu arada ölürse
+# işlenmemiş batch'ler bir sonraki açılışta pending() ile yeniden kuyruğa alınır, rate limit'li
+# API'lerden tekrar çekmek gerekmez. Aynı kayıtlar replay modunda processor'ları kaydedilmiş
+# girdiyle tam hızda çalıştırmak için de kullanılır.
+#
+# Dosya düzeni: data/wal/wal-<ilk seq>.log segmentleri ve checkpoint.json.
+# Kayıt: 4 bayt uzunluk + 4 bayt crc32 + pickle({'seq', 'source', 'timestamp', 'data'}).
+# Yarım yazılmış son kayıt (çökme) açılışta kesilip atılır. CRC'si doğru olup pickle'dan
+# açılamayan kayıt (ör. sınıf adı değişmiş) kesilmez: loglanır ve atlanır.
+
+from __future__ import annotations
+import json
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from processing.storage import log_message, veri_klasoru
+
+WAL_DIR = "wal"
+CHECKPOINT_FILE = "checkpoint.json"
+SEGMENT_MAX_BYTES = 32 * 1024 * 1024
+# Tamamen işlenmiş segmentlerin en yenileri replay/benchmark için saklanır
+KEEP_PROCESSED_SEGMENTS = 2
+
+_HEADER = struct.Struct('>II')
+
+
+def _segment_name(first_seq: int) -> str:
+    return f"wal-{first_seq:012d}.log"
+
+
+def _read_segment(path: Path) -> Iterator[Tuple[Optional[Dict[str, Any]], int]]:
+    # (kayıt, kaydın bittiği offset); yalnızca yarım başlık/gövde ya da CRC uyuşmazlığında durur.
+    # Açılamayan kayıt için kayıt None döner, okuma sonraki kayıttan sürer
+    with path.open("rb") as f:
+        offset = 0
+        while True:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            length, crc = _HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return
+            offset += _HEADER.size + length
+            try:
+                record = pickle.loads(payload)
+            except Exception as e:
+                log_message(f"WAL: {path.name} içinde {offset - _HEADER.size - length} offset'indeki kayıt "
+                            f"açılamadı, atlanıyor: {e}", "ERROR")
+                record = None
+            yield record, offset
+
+
+class WriteAheadLog:
+
+    def __init__(self, directory: Optional[Path] = None, segment_max_bytes: int = SEGMENT_MAX_BYTES,
+                 keep_processed_segments: int = KEEP_PROCESSED_SEGMENTS, fsync: bool = True):
+        self.directory = Path(directory) if directory else (veri_klasoru / WAL_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.keep_processed_segments = keep_processed_segments
+        self.fsync = fsync
+        self.checkpoint_file = self.directory / CHECKPOINT_FILE
+        self.lock = threading.Lock()
+
+        # committed_seq'e kadar her şey işlendi; done sıra dışı biten daha büyük seq'ler
+        self.committed_seq = 0
+        self.done: Set[int] = set()
+        self._load_checkpoint()
+
+        self._segments: List[Tuple[int, Path]] = self._list_segments()
+        self.last_seq = max([self.committed_seq] + list(self.done))
+        self._recover_tail()
+
+        self._writer = None
+        self._writer_size = 0
+
+    def _list_segments(self) -> List[Tuple[int, Path]]:
+        segments = []
+        for path in self.directory.glob("wal-*.log"):
+            try:
+                segments.append((int(path.stem.split("-", 1)[1]), path))
+            except ValueError:
+                continue
+        return sorted(segments)
+
+    def _recover_tail(self):
+        # Son segmentin sonunda yarım kalmış kayıt varsa kesilir; son seq buradan bulunur
+        if not self._segments:
+            return
+        first_seq, path = self._segments[-1]
+        valid_end = 0
+        for record, offset in _read_segment(path):
+            if record is not None:
+                self.last_seq = max(self.last_seq, record['seq'])
+            valid_end = offset
+        size = path.stat().st_size
+        if size > valid_end:
+            log_message(f"WAL: {path.name} sonunda {size - valid_end} baytlık yarım kayıt kesildi", "WARNING")
+            with path.open("r+b") as f:
+                f.truncate(valid_end)
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_file.exists():
+            return
+        try:
+            with self.checkpoint_file.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.committed_seq = int(state.get('committed_seq', 0))
+            self.done = {int(seq) for seq in state.get('done', [])}
+        except Exception as e:
+            log_message(f"WAL checkpoint okunamadı, tüm kayıtlar işlenmemiş sayılacak: {e}", "WARNING")
+
+    def _save_checkpoint(self):
+        tmp_path = self.checkpoint_file.with_suffix('.tmp')
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump({'committed_seq': self.committed_seq, 'done': sorted(self.done),
+                       'updated_at': time.time()}, f)
+        os.replace(tmp_path, self.checkpoint_file)
+
+    def _open_writer(self, seq: int):
+        if self._writer is not None:
+            if self._writer_size < self.segment_max_bytes:
+                return self._writer
+            self._writer.close()
+            path = None
+        elif self._segments and self._segments[-1][1].stat().st_size < self.segment_max_bytes:
+            # Açılışta son segment doluluk sınırının altındaysa ona devam edilir
+            path = self._segments[-1][1]
+        else:
+            path = None
+        if path is None:
+            path = self.directory / _segment_name(seq)
+            self._segments.append((seq, path))
+        self._writer = path.open("ab")
+        self._writer_size = path.stat().st_size
+        return self._writer
+
+    def append(self, batch: Dict[str, Any]) -> int:
+        """Batch'i WAL'a ekler ve sıra numarasını döndürür."""
+        with self.lock:
+            seq = self.last_seq + 1
+            payload = pickle.dumps({
+                'seq': seq,
+                'source': batch.get('source'),
+                'timestamp': batch.get('timestamp', time.time()),
+                'data': batch.get('data')
+            }, protocol=pickle.HIGHEST_PROTOCOL)
+            writer = self._open_writer(seq)
+            writer.write(_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+            writer.flush()
+            if self.fsync:
+                os.fsync(writer.fileno())
+            self._writer_size += _HEADER.size + len(payload)
+            self.last_seq = seq
+            return seq
+
+    def checkpoint(self, seq: int):
+        """seq numaralı batch'in işlendiğini kaydeder; tamamen işlenmiş eski segmentler silinir."""
+        with self.lock:
+            if seq <= self.committed_seq or seq in self.done:
+                return
+            self.done.add(seq)
+            while self.committed_seq + 1 in self.done:
+                self.committed_seq += 1
+                self.done.discard(self.committed_seq)
+            self._save_checkpoint()
+            self._compact()
+
+    def _compact(self):
+        # Bir segment, sonraki segmentin ilk seq'inden önceki her şey işlendiyse tamamen işlenmiştir
+        processed = [index for index in range(len(self._segments) - 1)
+                     if self._segments[index + 1][0] - 1 <= self.committed_seq]
+        removable = processed[:max(0, len(processed) - self.keep_processed_segments)]
+        for index in reversed(removable):
+            _, path = self._segments.pop(index)
+            try:
+                path.unlink()
+            except OSError as e:
+                log_message(f"WAL segmenti silinemedi ({path.name}): {e}", "WARNING")
+
+    def is_processed(self, seq: int) -> bool:
+        return seq <= self.committed_seq or seq in self.done
+
+    def records(self, include_processed: bool = False) -> Iterator[Dict[str, Any]]:
+        """WAL'daki batch'ler (sıra numarasıyla); varsayılan olarak yalnızca işlenmemiş olanlar."""
+        with self.lock:
+            segments = list(self._segments)
+            if self._writer is not None:
+                self._writer.flush()
+        for _, path in segments:
+            if not path.exists():
+                continue
+            for record, _ in _read_segment(path):
+                if record is None:
+                    continue
+                if not include_processed and self.is_processed(record['seq']):
+                    continue
+                yield {
+                    'source': record['source'],
+                    'data': record['data'],
+                    'timestamp': record['timestamp'],
+                    'wal_seq': record['seq']
+                }
+
+    def pending(self) -> Iterator[Dict[str, Any]]:
+        return self.records(include_processed=False)
+
+    def close(self):
+        with self.lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def get_status(self) -> Dict[str, Any]:
+        with self.lock:
+            segments = [path for _, path in self._segments if path.exists()]
+            return {
+                'directory': str(self.directory),
+                'last_seq': self.last_seq,
+                'committed_seq': self.committed_seq,
+                'pending': self.last_seq - self.committed_seq - len(self.done),
+                'segments': len(segments),
+                'bytes': sum(path.stat().st_size for path in segments)
+            }
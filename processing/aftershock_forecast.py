@@ -0,0 +1,434 @@
+# Artçı deprem tahmini (Omori-Utsu + ETAS benzeri stokastik simülasyon)
+# Büyük bir depremden sonra gözlenen artçılara Omori-Utsu bozunması uydurulur,
+# ardından süreç havuzunda çok sayıda stokastik katalog üretilerek önümüzdeki
+# 24 saat / 7 gün için grid hücresi başına artçı olasılığı hesaplanır.
+# Sonuçlar (ana şok, zaman dilimi, simülasyon sayısı) başına önbelleğe alınır: yeni artçı
+# geldikçe ya da FORECAST_REFRESH_SECONDS dolunca yeniden hesaplanır.
+
+from __future__ import annotations
+import json
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .storage import log_message, veri_klasoru
+from .timeutils import event_epoch
+
+AFTERSHOCK_STATE_FILE = "aftershock_forecasts.json"
+
+MAINSHOCK_MIN_MAGNITUDE = 5.0
+CATALOGUE_RETENTION_DAYS = 30
+MIN_AFTERSHOCKS_FOR_FIT = 8
+HORIZONS_DAYS = {'24h': 1.0, '7d': 7.0}
+GRID_CELL_DEG = 0.25
+MAX_GRID_CELLS = 200
+# "Önümüzdeki 24 saat / 7 gün" penceresi kaydıkça tahmin bu aralıkla yenilenir
+FORECAST_REFRESH_SECONDS = 3600
+
+# Reasenberg & Jones (1989) genel parametreleri; yeterli artçı yokken kullanılır
+GENERIC_PARAMS = {'a': -1.67, 'b': 0.91, 'p': 1.08, 'c': 0.05}
+# İkincil artçı üretkenliği: k(m) = K_ikincil * 10^(alpha (m - m_min)), K_ikincil dallanma
+# oranından türetilir; oran < 1 olduğu sürece simülasyon kritik altı kalır
+ETAS_ALPHA = 0.6
+BRANCHING_RATIO = 0.3
+MAX_EVENTS_PER_CATALOGUE = 20000
+MAX_SIMULATED_MAGNITUDE = 9.5
+
+DISCLAIMER = 'Bu analiz istatistiksel verilere dayalı bir olasılık değerlendirmesidir; kesin bir tarih veya zaman bildirmez. Lütfen resmi kurumların (AFAD, USGS vb.) açıklamalarını takip edin.'
+
+
+def haversine_distance(lat1, lon1, lat2, lon2):
+    R = 6371
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
+    c = 2 * math.asin(math.sqrt(a))
+    return R * c
+
+
+def aftershock_radius_km(magnitude: float) -> float:
+    # Wells & Coppersmith kırılma uzunluğunun iki katı, en az 20 km
+    return max(20.0, 2.0 * 10 ** (0.5 * magnitude - 1.8))
+
+
+def omori_integral(t1: float, t2: float, c: float, p: float) -> float:
+    # ∫ (t + c)^-p dt, t1..t2 (gün)
+    if t2 <= t1:
+        return 0.0
+    if abs(p - 1.0) < 1e-9:
+        return math.log((t2 + c) / (t1 + c))
+    return ((t2 + c) ** (1 - p) - (t1 + c) ** (1 - p)) / (1 - p)
+
+
+def fit_omori_utsu(times: List[float], duration: float) -> Optional[Dict[str, float]]:
+    # Maksimum olabilirlik: K kapalı formda, c ve p için grid araması
+    n = len(times)
+    if n < MIN_AFTERSHOCKS_FOR_FIT or duration <= 0:
+        return None
+
+    best = None
+    c_values = [10 ** (-3 + i * 0.25) for i in range(13)]
+    p_values = [0.6 + i * 0.05 for i in range(25)]
+    for c in c_values:
+        log_terms = [math.log(t + c) for t in times]
+        sum_log = sum(log_terms)
+        for p in p_values:
+            integral = omori_integral(0.0, duration, c, p)
+            if integral <= 0:
+                continue
+            k = n / integral
+            log_likelihood = n * math.log(k) - p * sum_log - n
+            if best is None or log_likelihood > best['log_likelihood']:
+                best = {'K': k, 'c': c, 'p': p, 'log_likelihood': log_likelihood}
+
+    if best:
+        best = {key: round(value, 5) for key, value in best.items()}
+    return best
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    if mean <= 0:
+        return 0
+    if mean > 30:
+        return max(0, int(round(rng.gauss(mean, math.sqrt(mean)))))
+    limit = math.exp(-mean)
+    k, product = 0, rng.random()
+    while product > limit:
+        k += 1
+        product *= rng.random()
+    return k
+
+
+def _sample_omori_time(rng: random.Random, t1: float, t2: float, c: float, p: float) -> float:
+    u = rng.random()
+    if abs(p - 1.0) < 1e-9:
+        return (t1 + c) * ((t2 + c) / (t1 + c)) ** u - c
+    a = (t1 + c) ** (1 - p)
+    b = (t2 + c) ** (1 - p)
+    return (a + u * (b - a)) ** (1 / (1 - p)) - c
+
+
+def _simulate_chunk(args: Tuple) -> Dict[str, Any]:
+    # Süreç havuzunda çalışır: birkaç stokastik katalog üretip hücre sayımlarını döndürür
+    (seed, n_catalogues, parents, params, t_now, horizon, horizons, m_min, b_value,
+     main_magnitude, cell_deg, large_magnitude) = args
+    rng = random.Random(seed)
+    k_main, c, p = params['K'], params['c'], params['p']
+    beta = b_value * math.log(10)
+    alpha = ETAS_ALPHA * math.log(10)
+    # E[10^(alpha (m - m_min))] üstel magnitüd dağılımında beta / (beta - alpha)
+    mean_productivity = beta / (beta - alpha) if beta > alpha else 10.0
+    k_secondary = BRANCHING_RATIO / (mean_productivity * omori_integral(0.0, horizon, c, p))
+
+    cell_hits = {name: {} for name in horizons}
+    large_hits = {name: 0 for name in horizons}
+    event_counts = {name: 0 for name in horizons}
+
+    for _ in range(n_catalogues):
+        catalogue_cells = {name: set() for name in horizons}
+        catalogue_large = {name: False for name in horizons}
+        # (zaman, lat, lon, magnitüd, artçı yarıçapı); ana şok ve gözlenen artçılar ebeveyn olur
+        queue = list(parents)
+        simulated = 0
+        while queue and simulated < MAX_EVENTS_PER_CATALOGUE:
+            t_parent, lat, lon, magnitude, radius = queue.pop()
+            if magnitude >= main_magnitude:
+                productivity = k_main
+            else:
+                productivity = k_secondary * 10 ** (ETAS_ALPHA * (magnitude - m_min))
+            start = max(t_now, t_parent)
+            end = t_now + horizon
+            expected = productivity * omori_integral(start - t_parent, end - t_parent, c, p)
+            for _ in range(_poisson(rng, expected)):
+                t_child = t_parent + _sample_omori_time(rng, start - t_parent, end - t_parent, c, p)
+                m_child = min(MAX_SIMULATED_MAGNITUDE, m_min + rng.expovariate(beta))
+                # Ebeveyn etrafında güç yasası mesafe çekirdeği (3 yarıçapta kesilir)
+                u = rng.random()
+                distance = min(3 * radius, 0.5 * radius * math.sqrt(u / (1 - u + 1e-12)))
+                angle = rng.uniform(0, 2 * math.pi)
+                child_lat = lat + (distance / 111.0) * math.cos(angle)
+                child_lon = lon + (distance / (111.0 * max(math.cos(math.radians(lat)), 0.01))) * math.sin(angle)
+
+                for name, days in horizons.items():
+                    if t_child - t_now <= days:
+                        cell = (math.floor(child_lat / cell_deg), math.floor(child_lon / cell_deg))
+                        catalogue_cells[name].add(cell)
+                        event_counts[name] += 1
+                        if m_child >= large_magnitude:
+                            catalogue_large[name] = True
+                queue.append((t_child, child_lat, child_lon, m_child, aftershock_radius_km(m_child)))
+                simulated += 1
+
+        for name in horizons:
+            for cell in catalogue_cells[name]:
+                cell_hits[name][cell] = cell_hits[name].get(cell, 0) + 1
+            if catalogue_large[name]:
+                large_hits[name] += 1
+
+    return {'cell_hits': cell_hits, 'large_hits': large_hits, 'event_counts': event_counts}
+
+
+class AftershockForecaster:
+
+    def __init__(self, n_simulations: int = 1000, max_workers: Optional[int] = None,
+                 state_file: Optional[Path] = None):
+        self.n_simulations = n_simulations
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.state_file = state_file or (veri_klasoru / AFTERSHOCK_STATE_FILE)
+        self.catalogue: Dict[tuple, Dict[str, Any]] = {}
+        # (ana şok id, zaman dilimi, simülasyon sayısı) -> tahmin
+        self.cache: Dict[Tuple[str, Optional[int], int], Dict[str, Any]] = {}
+        # Ana şok başına artçı sürümü; simülasyon sürerken yeni artçı gelirse sonuç önbelleğe yazılmaz
+        self._revisions: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        # Simülasyonlar katalog kilidi dışında, tek seferde bir tahmin turu olacak şekilde çalışır
+        self.compute_lock = threading.Lock()
+
+    @staticmethod
+    def _event_key(eq: Dict[str, Any], epoch: float) -> tuple:
+        return (round(epoch), round(eq['latitude'], 4), round(eq['longitude'], 4), eq['magnitude'])
+
+    @staticmethod
+    def time_bucket(now: float) -> int:
+        return int(now // FORECAST_REFRESH_SECONDS)
+
+    @staticmethod
+    def mainshock_id(mainshock: Dict[str, Any]) -> str:
+        return f"{int(mainshock['epoch'])}_{mainshock['latitude']:.3f}_{mainshock['longitude']:.3f}_{mainshock['magnitude']}"
+
+    def add_earthquakes(self, earthquakes: Iterable[Any], now: Optional[float] = None) -> List[str]:
+        # Kataloğu günceller, yeni artçı alan ana şokların önbelleğini düşürür
+        now = now if now is not None else time.time()
+        invalidated = set()
+        with self.lock:
+            cutoff = now - CATALOGUE_RETENTION_DAYS * 86400
+            for key in [k for k, eq in self.catalogue.items() if eq['epoch'] < cutoff]:
+                del self.catalogue[key]
+
+            mainshocks = self._mainshocks()
+            for eq in earthquakes:
+                eq = eq.toDictionary() if hasattr(eq, 'toDictionary') else eq
+                lat, lon, magnitude = eq.get('latitude'), eq.get('longitude'), eq.get('magnitude')
+                epoch = event_epoch(eq)
+                if lat is None or lon is None or not isinstance(magnitude, (int, float)) or epoch is None:
+                    continue
+                if epoch < cutoff:
+                    continue
+                key = self._event_key(eq, epoch)
+                if key in self.catalogue:
+                    continue
+                record = {
+                    'latitude': lat, 'longitude': lon, 'magnitude': magnitude, 'epoch': epoch,
+                    'timestamp': eq.get('timestamp'), 'location': eq.get('location', 'Unknown')
+                }
+                self.catalogue[key] = record
+
+                parents = [m for m in mainshocks if self._is_aftershock(m, record)]
+                invalidated.update(self.mainshock_id(m) for m in parents)
+                if magnitude >= MAINSHOCK_MIN_MAGNITUDE and not parents:
+                    mainshocks.append(record)
+
+            for mainshock_id in invalidated:
+                self._revisions[mainshock_id] = self._revisions.get(mainshock_id, 0) + 1
+            for key in [k for k in self.cache if k[0] in invalidated]:
+                del self.cache[key]
+        return sorted(invalidated)
+
+    def _mainshocks(self) -> List[Dict[str, Any]]:
+        # Daha büyük bir ana şokun artçısı olan M5+ depremler ayrı dizi olarak sayılmaz
+        candidates = [eq for eq in self.catalogue.values() if eq['magnitude'] >= MAINSHOCK_MIN_MAGNITUDE]
+        return [eq for eq in candidates if not any(self._is_aftershock(other, eq) for other in candidates)]
+
+    @staticmethod
+    def _is_aftershock(mainshock: Dict[str, Any], eq: Dict[str, Any]) -> bool:
+        if eq is mainshock or eq['epoch'] <= mainshock['epoch'] or eq['magnitude'] >= mainshock['magnitude']:
+            return False
+        distance = haversine_distance(mainshock['latitude'], mainshock['longitude'], eq['latitude'], eq['longitude'])
+        return distance <= aftershock_radius_km(mainshock['magnitude'])
+
+    def _aftershocks_of(self, mainshock: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return sorted((eq for eq in self.catalogue.values() if self._is_aftershock(mainshock, eq)),
+                      key=lambda eq: eq['epoch'])
+
+    def _run_simulations(self, parents, params, t_now, m_min, b_value, main_magnitude,
+                         n_simulations: int) -> Dict[str, Any]:
+        horizon = max(HORIZONS_DAYS.values())
+        workers = max(1, min(self.max_workers, n_simulations // 50 or 1))
+        per_chunk = [n_simulations // workers + (1 if i < n_simulations % workers else 0) for i in range(workers)]
+        base_seed = random.randrange(1 << 30)
+        tasks = [
+            (base_seed + i, n, parents, params, t_now, horizon, HORIZONS_DAYS, m_min, b_value,
+             main_magnitude, GRID_CELL_DEG, MAINSHOCK_MIN_MAGNITUDE)
+            for i, n in enumerate(per_chunk) if n > 0
+        ]
+
+        if len(tasks) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=len(tasks)) as pool:
+                    return self._merge_chunks(list(pool.map(_simulate_chunk, tasks)))
+            except Exception as e:
+                log_message(f"Artçı simülasyonu süreç havuzunda çalıştırılamadı, tek süreçte devam ediliyor: {e}", "WARNING")
+        return self._merge_chunks([_simulate_chunk(task) for task in tasks])
+
+    @staticmethod
+    def _merge_chunks(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        merged = {'cell_hits': {name: {} for name in HORIZONS_DAYS},
+                  'large_hits': {name: 0 for name in HORIZONS_DAYS},
+                  'event_counts': {name: 0 for name in HORIZONS_DAYS}}
+        for chunk in chunks:
+            for name in HORIZONS_DAYS:
+                for cell, hits in chunk['cell_hits'][name].items():
+                    merged['cell_hits'][name][cell] = merged['cell_hits'][name].get(cell, 0) + hits
+                merged['large_hits'][name] += chunk['large_hits'][name]
+                merged['event_counts'][name] += chunk['event_counts'][name]
+        return merged
+
+    def _forecast(self, mainshock: Dict[str, Any], aftershocks: List[Dict[str, Any]], now: float,
+                  n_simulations: int) -> Dict[str, Any]:
+        t_now = max((now - mainshock['epoch']) / 86400.0, 1e-3)
+        times = [(eq['epoch'] - mainshock['epoch']) / 86400.0 for eq in aftershocks]
+        m_min = min([eq['magnitude'] for eq in aftershocks] + [2.5])
+        b_value = GENERIC_PARAMS['b']
+
+        fitted = fit_omori_utsu(times, t_now)
+        if fitted:
+            params = {'K': fitted['K'], 'c': fitted['c'], 'p': fitted['p']}
+            model = 'omori_utsu_mle'
+        else:
+            # Genel model: M >= m_min artçı oranı = 10^(a + b(Mana - m_min)) (t + c)^-p
+            k = 10 ** (GENERIC_PARAMS['a'] + GENERIC_PARAMS['b'] * (mainshock['magnitude'] - m_min))
+            params = {'K': k, 'c': GENERIC_PARAMS['c'], 'p': GENERIC_PARAMS['p']}
+            model = 'reasenberg_jones_generic'
+
+        expected = {
+            name: round(params['K'] * omori_integral(t_now, t_now + days, params['c'], params['p']), 2)
+            for name, days in HORIZONS_DAYS.items()
+        }
+
+        parents = [(0.0, mainshock['latitude'], mainshock['longitude'], mainshock['magnitude'],
+                    aftershock_radius_km(mainshock['magnitude']))]
+        parents += [((eq['epoch'] - mainshock['epoch']) / 86400.0, eq['latitude'], eq['longitude'],
+                     eq['magnitude'], aftershock_radius_km(eq['magnitude'])) for eq in aftershocks]
+
+        started = time.time()
+        simulation = self._run_simulations(parents, params, t_now, m_min, b_value, mainshock['magnitude'],
+                                           n_simulations)
+        elapsed = time.time() - started
+
+        cells = {}
+        for name in HORIZONS_DAYS:
+            for (row, col), hits in simulation['cell_hits'][name].items():
+                cell = cells.setdefault((row, col), {
+                    'latitude': round((row + 0.5) * GRID_CELL_DEG, 3),
+                    'longitude': round((col + 0.5) * GRID_CELL_DEG, 3),
+                    **{f"probability_{n}": 0.0 for n in HORIZONS_DAYS}
+                })
+                cell[f"probability_{name}"] = round(hits / n_simulations, 4)
+        longest = max(HORIZONS_DAYS, key=HORIZONS_DAYS.get)
+        grid = sorted(cells.values(), key=lambda c: c[f"probability_{longest}"], reverse=True)[:MAX_GRID_CELLS]
+
+        return {
+            'mainshock_id': self.mainshock_id(mainshock),
+            'mainshock': {k: v for k, v in mainshock.items() if k != 'epoch'},
+            'aftershock_count': len(aftershocks),
+            'latest_aftershock_epoch': aftershocks[-1]['epoch'] if aftershocks else None,
+            'days_since_mainshock': round(t_now, 3),
+            'model': model,
+            'parameters': {**params, 'b': b_value, 'min_magnitude': m_min},
+            'expected_aftershocks': expected,
+            'simulated_mean_aftershocks': {
+                name: round(simulation['event_counts'][name] / n_simulations, 2) for name in HORIZONS_DAYS
+            },
+            'probability_m5_plus': {
+                name: round(simulation['large_hits'][name] / n_simulations, 4) for name in HORIZONS_DAYS
+            },
+            'grid_cell_deg': GRID_CELL_DEG,
+            'probability_grid': grid,
+            'n_simulations': n_simulations,
+            'time_bucket': self.time_bucket(now),
+            'simulation_seconds': round(elapsed, 2),
+            'analysis_date': datetime.now().isoformat(),
+            'disclaimer': DISCLAIMER
+        }
+
+    def forecast_all(self, now: Optional[float] = None, n_simulations: Optional[int] = None) -> List[Dict[str, Any]]:
+        now = now if now is not None else time.time()
+        n_simulations = n_simulations or self.n_simulations
+        bucket = self.time_bucket(now)
+        with self.compute_lock:
+            with self.lock:
+                mainshocks = [m for m in self._mainshocks() if now - m['epoch'] <= CATALOGUE_RETENTION_DAYS * 86400]
+                results, pending = [], []
+                for mainshock in mainshocks:
+                    mainshock_id = self.mainshock_id(mainshock)
+                    cached = self.cache.get((mainshock_id, bucket, n_simulations))
+                    if cached is not None:
+                        results.append(cached)
+                    else:
+                        pending.append((mainshock, self._aftershocks_of(mainshock),
+                                        self._revisions.get(mainshock_id, 0)))
+                active = {self.mainshock_id(m) for m in mainshocks}
+                for stale in [k for k in self.cache if k[0] not in active or k[1] != bucket]:
+                    del self.cache[stale]
+
+            # Süreç havuzu simülasyonu katalog kilidi dışında: add_earthquakes beklemez
+            for mainshock, aftershocks, revision in pending:
+                forecast = self._forecast(mainshock, aftershocks, now, n_simulations)
+                mainshock_id = forecast['mainshock_id']
+                log_message(f"Artçı tahmini hesaplandı: {mainshock_id} ({forecast['aftershock_count']} artçı, "
+                            f"{forecast['simulation_seconds']}s)", "INFO")
+                with self.lock:
+                    if self._revisions.get(mainshock_id, 0) == revision:
+                        self.cache[(mainshock_id, bucket, n_simulations)] = forecast
+                results.append(forecast)
+        results.sort(key=lambda r: r['mainshock']['magnitude'], reverse=True)
+        return results
+
+    def save_state(self):
+        with self.lock:
+            state = {
+                'catalogue': list(self.catalogue.values()),
+                'forecasts': list(self.cache.values()),
+                'updated_at': datetime.now().isoformat()
+            }
+        tmp_path = self.state_file.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_file)
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], **kwargs) -> "AftershockForecaster":
+        forecaster = cls(**kwargs)
+        for eq in state.get('catalogue', []):
+            forecaster.catalogue[forecaster._event_key(eq, eq['epoch'])] = eq
+        forecaster.cache = {(r['mainshock_id'], r.get('time_bucket'), r['n_simulations']): r
+                            for r in state.get('forecasts', [])}
+        return forecaster
+
+    @classmethod
+    def load(cls, state_file: Optional[Path] = None, **kwargs) -> "AftershockForecaster":
+        state_file = state_file or (veri_klasoru / AFTERSHOCK_STATE_FILE)
+        state = load_aftershock_state(state_file)
+        if state:
+            try:
+                return cls.from_state(state, state_file=state_file, **kwargs)
+            except Exception as e:
+                log_message(f"Artçı tahmin durumu yüklenemedi, sıfırdan başlanıyor: {e}", "WARNING")
+        return cls(state_file=state_file, **kwargs)
+
+
+def load_aftershock_state(state_file: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    state_file = state_file or (veri_klasoru / AFTERSHOCK_STATE_FILE)
+    if not state_file.exists():
+        return None
+    try:
+        with state_file.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        log_message(f"Artçı tahmin durum dosyası okunamadı: {e}", "WARNING")
+        return None
@@ -0,0 +1,244 @@
+# Uyarı yaşam döngüsü yöneticisi (open -> updated -> resolved)
+# Her uyarı (type, location, rule_id) anahtarıyla izlenir ve bu anahtardan türetilen
+# kalıcı bir ID taşır. Histerezis: uyarı ancak art arda RESOLVE_AFTER_MISSES
+# değerlendirmede görülmezse kapanır, şiddet düşüşü DOWNGRADE_AFTER değerlendirme
+# sürer. Kapanan uyarı cooldown süresi içinde geri gelirse yeni uyarı sayılmaz.
+# Her değişiklik global revizyonu artırır; istemci /api/alerts/changes?cursor=
+# ile yalnızca son gördüğü revizyondan sonraki değişiklikleri çeker.
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .storage import log_message, veri_klasoru
+
+ALERT_STATE_FILE = "alert_state.json"
+
+RESOLVE_AFTER_MISSES = 2
+DOWNGRADE_AFTER = 2
+COOLDOWN_SECONDS = 30 * 60
+RESOLVED_RETENTION_SECONDS = 24 * 3600
+SEVERITY_RANK = {'low': 0, 'medium': 1, 'high': 2}
+
+
+def alert_key(alert: Dict[str, Any]) -> Tuple[str, str, str]:
+    return (alert.get('type', ''), str(alert.get('location', '')), alert.get('rule_id') or alert.get('title', ''))
+
+
+def alert_id(key: Tuple[str, str, str]) -> str:
+    digest = hashlib.sha1('|'.join(key).encode('utf-8')).hexdigest()[:12]
+    return f"{key[0]}-{digest}"
+
+
+def assign_alert_ids(alerts: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Yaşam döngüsü durumu olmayan (istek anında üretilen) uyarılara da aynı kalıcı ID verilir
+    alerts = list(alerts)
+    for alert in alerts:
+        alert.setdefault('id', alert_id(alert_key(alert)))
+    return alerts
+
+
+class AlertLifecycleManager:
+
+    def __init__(self, resolve_after_misses: int = RESOLVE_AFTER_MISSES, downgrade_after: int = DOWNGRADE_AFTER,
+                 cooldown_seconds: float = COOLDOWN_SECONDS, state_file: Optional[Path] = None):
+        self.resolve_after_misses = resolve_after_misses
+        self.downgrade_after = downgrade_after
+        self.cooldown_seconds = cooldown_seconds
+        self.state_file = state_file or (veri_klasoru / ALERT_STATE_FILE)
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.revision = 0
+        # (revizyon, id) sıralı değişiklik günlüğü; cursor sorguları bisect ile çözülür
+        self._log: List[Tuple[int, str]] = []
+        self._log_floor = 0
+        self.lock = threading.Lock()
+
+    def _touch(self, record: Dict[str, Any], status: str, now: float):
+        self.revision += 1
+        record['status'] = status
+        record['revision'] = self.revision
+        record['changed_at'] = now
+        self._log.append((self.revision, record['id']))
+
+    def reconcile(self, section: str, alerts: List[Dict[str, Any]], now: Optional[float] = None,
+                  locations: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Bir bölümün yeni değerlendirme sonucunu mevcut durumla birleştirir.
+        Uyarılara 'id' ve 'status' alanları eklenir. locations verilirse yalnızca o konumlar kapatılabilir."""
+        now = now if now is not None else time.time()
+        locations = set(locations) if locations is not None else None
+        counts = {'opened': 0, 'updated': 0, 'resolved': 0, 'unchanged': 0}
+
+        with self.lock:
+            seen = set()
+            for alert in alerts:
+                key = alert_key(alert)
+                record_id = alert_id(key)
+                alert['id'] = record_id
+                seen.add(record_id)
+                record = self.records.get(record_id)
+
+                if record is None or record['status'] == 'resolved':
+                    reopened = record is not None and now - (record.get('resolved_at') or 0) < self.cooldown_seconds
+                    if record is None:
+                        record = self.records[record_id] = {
+                            'id': record_id, 'key': list(key), 'section': section,
+                            'occurrence': 0, 'flap_count': 0
+                        }
+                    record.update({'severity': alert.get('severity'), 'alert': alert, 'misses': 0,
+                                   'downgrade_streak': 0, 'resolved_at': None, 'last_seen': now})
+                    if reopened:
+                        # Cooldown içinde geri gelen uyarı yeni bir olay değil, önceki olayın devamı
+                        record['flap_count'] += 1
+                        self._touch(record, 'updated', now)
+                        counts['updated'] += 1
+                    else:
+                        record['occurrence'] += 1
+                        record['opened_at'] = now
+                        self._touch(record, 'open', now)
+                        counts['opened'] += 1
+                    alert['status'] = record['status']
+                    continue
+
+                record['misses'] = 0
+                record['last_seen'] = now
+                changed = False
+                old_rank = SEVERITY_RANK.get(record['severity'], 0)
+                new_rank = SEVERITY_RANK.get(alert.get('severity'), 0)
+                if new_rank > old_rank:
+                    record['severity'] = alert.get('severity')
+                    record['downgrade_streak'] = 0
+                    changed = True
+                elif new_rank < old_rank:
+                    # Şiddet düşüşü için histerezis: art arda downgrade_after değerlendirme gerekir
+                    record['downgrade_streak'] += 1
+                    if record['downgrade_streak'] >= self.downgrade_after:
+                        record['severity'] = alert.get('severity')
+                        record['downgrade_streak'] = 0
+                        changed = True
+                else:
+                    record['downgrade_streak'] = 0
+
+                if alert.get('message') != record['alert'].get('message') or alert.get('title') != record['alert'].get('title'):
+                    changed = True
+                record['alert'] = alert
+                alert['severity'] = record['severity']
+                if changed:
+                    self._touch(record, 'updated', now)
+                    counts['updated'] += 1
+                else:
+                    counts['unchanged'] += 1
+                alert['status'] = record['status']
+
+            for record in self.records.values():
+                if record['section'] != section or record['status'] == 'resolved' or record['id'] in seen:
+                    continue
+                if locations is not None and record['key'][1] not in locations:
+                    continue
+                record['misses'] += 1
+                if record['misses'] >= self.resolve_after_misses:
+                    record['resolved_at'] = now
+                    self._touch(record, 'resolved', now)
+                    counts['resolved'] += 1
+
+            self._prune(now)
+        return counts
+
+    def _prune(self, now: float):
+        expired = [rid for rid, record in self.records.items()
+                   if record['status'] == 'resolved' and now - record['resolved_at'] > RESOLVED_RETENTION_SECONDS]
+        for rid in expired:
+            self._log_floor = max(self._log_floor, self.records[rid]['revision'])
+            del self.records[rid]
+        # Günlükte her ID'nin yalnızca son kaydı anlamlıdır; günlük çok uzarsa sıkıştır
+        if len(self._log) > 4 * max(len(self.records), 256):
+            self._log = sorted((record['revision'], rid) for rid, record in self.records.items())
+
+    def _public(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        alert = dict(record['alert'])
+        alert.update({
+            'id': record['id'],
+            'status': record['status'],
+            'severity': record['severity'],
+            'revision': record['revision'],
+            'opened_at': record.get('opened_at'),
+            'resolved_at': record.get('resolved_at'),
+            'occurrence': record['occurrence']
+        })
+        return alert
+
+    def active_alerts(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [self._public(r) for r in self.records.values() if r['status'] != 'resolved']
+
+    def changes_since(self, cursor: int = 0) -> Dict[str, Any]:
+        """cursor'dan sonra değişen uyarılar. cursor budanmış geçmişten eskiyse tam liste döner (full=True)."""
+        with self.lock:
+            if cursor > self.revision:
+                cursor = 0
+            full = cursor < self._log_floor or cursor == 0
+            if full:
+                changes = [self._public(r) for r in self.records.values()]
+                if cursor == 0:
+                    changes = [c for c in changes if c['status'] != 'resolved']
+            else:
+                start = bisect_right(self._log, (cursor, '\uffff'))
+                changed_ids = dict.fromkeys(rid for _, rid in self._log[start:])
+                changes = [self._public(self.records[rid]) for rid in changed_ids
+                           if rid in self.records and self.records[rid]['revision'] > cursor]
+            changes.sort(key=lambda c: c['revision'])
+            return {'cursor': self.revision, 'full': full, 'changes': changes}
+
+    def to_state(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'revision': self.revision,
+                'log_floor': self._log_floor,
+                'records': list(self.records.values()),
+                'parameters': {
+                    'resolve_after_misses': self.resolve_after_misses,
+                    'downgrade_after': self.downgrade_after,
+                    'cooldown_seconds': self.cooldown_seconds
+                }
+            }
+
+    def save_state(self):
+        state = self.to_state()
+        tmp_path = self.state_file.with_suffix('.tmp')
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.state_file)
+
+    @classmethod
+    def load(cls, state_file: Optional[Path] = None, **kwargs) -> "AlertLifecycleManager":
+        manager = cls(state_file=state_file, **kwargs)
+        if manager.state_file.exists():
+            try:
+                with manager.state_file.open("r", encoding="utf-8") as f:
+                    state = json.load(f)
+                manager.revision = state.get('revision', 0)
+                manager._log_floor = state.get('log_floor', 0)
+                manager.records = {record['id']: record for record in state.get('records', [])}
+                manager._log = sorted((record['revision'], rid) for rid, record in manager.records.items())
+            except Exception as e:
+                log_message(f"Uyarı durumu yüklenemedi, sıfırdan başlanıyor: {e}", "WARNING")
+        return manager
+
+
+_cached_manager: Tuple[Optional[float], Optional[AlertLifecycleManager]] = (None, None)
+
+
+def get_alert_lifecycle() -> AlertLifecycleManager:
+    # Dashboard her istekte durumu yeniden okumasın diye dosya mtime'ına göre önbellek
+    global _cached_manager
+    state_file = veri_klasoru / ALERT_STATE_FILE
+    mtime = state_file.stat().st_mtime if state_file.exists() else None
+    cached_mtime, manager = _cached_manager
+    if manager is None or cached_mtime != mtime:
+        manager = AlertLifecycleManager.load(state_file)
+        _cached_manager = (mtime, manager)
+    return manager
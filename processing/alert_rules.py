@@ -0,0 +1,477 @@
+# Bildirimsel uyarı (alert) kural motoru
+# Eşik kuralları sözlük olarak tanımlanır ve bir kez derlenir: aynı alan üzerindeki
+# kademeli eşikler (ör. sıcaklık >= 35 yüksek, >= 30 orta) sıralı eşik listesine
+# dönüşür ve her kayıt için tek bir bisect ile değerlendirilir. Dashboard'daki
+# if/elif çiftleri kademeler ve "group" (birbirini dışlayan kurallar) ile ifade edilir.
+# Pipeline uyarıları veri değiştikçe üretip data/alerts.json'a yazar; dashboard
+# istek başına yeniden hesaplamak yerine bu dosyayı okur.
+
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from .storage import log_message, veri_klasoru
+from .timeutils import parse_timestamp
+
+ALERTS_FILE = "alerts.json"
+
+# Amerika kıtaları filtresi: [minLon, minLat, maxLon, maxLat] = [-180, -60, -30, 85]
+AMERICAS_BBOX = {'min_lon': -180, 'min_lat': -60, 'max_lon': -30, 'max_lat': 85}
+
+# Bölüm -> uyarı tipi / kategori / zaman alanı
+SECTIONS = {
+    'earthquake': {'type': 'earthquake', 'category': 'current', 'time_field': 'timestamp'},
+    'weather': {'type': 'weather', 'category': 'current', 'time_field': 'time', 'dedupe': True},
+    'eonet': {'type': 'natural_event', 'category': 'current', 'time_field': 'event_time'},
+    'forecast': {'type': 'weather', 'category': 'forecast', 'time_field': 'forecast_time'},
+    'flood': {'type': 'flood', 'category': 'forecast', 'time_field': 'time'},
+    'swarm': {'type': 'earthquake_swarm', 'category': 'current', 'time_field': 'last_earthquake_date'},
+}
+CURRENT_SECTIONS = ('earthquake', 'weather', 'eonet', 'swarm')
+FORECAST_SECTIONS = ('forecast', 'flood')
+
+_FORECAST_PREFIX = '{location} şehrinde önümüzdeki 5 günde {count} tahmin noktasında'
+
+# Kurallar: op ">=" / "<=" için "levels" en yüksek kademeden başlayarak verilebilir (derlemede sıralanır),
+# "in" için her kademe "values" listesi taşır, "contains" metin içinde anahtar kelime arar.
+# "aggregate" kuralları (tahmin, sel) şehir başına tüm eşleşmeleri tek uyarıda birleştirir.
+DEFAULT_ALERT_RULES: List[Dict[str, Any]] = [
+    {'id': 'earthquake_magnitude', 'section': 'earthquake', 'field': 'magnitude', 'op': '>=', 'levels': [
+        {'threshold': 6.0, 'severity': 'high'},
+        {'threshold': 5.0, 'severity': 'medium'}],
+     'title': 'Yüksek Büyüklükte Deprem: {magnitude:.1f}',
+     'message': '{location} bölgesinde {magnitude:.1f} büyüklüğünde deprem'},
+
+    {'id': 'heat', 'section': 'weather', 'field': 'temperature', 'op': '>=', 'levels': [
+        {'threshold': 35, 'severity': 'high', 'title': 'Aşırı Sıcak Uyarısı: {location}',
+         'message': '{location} şehrinde sıcaklık {temperature:.1f}°C (hissedilen: {feels_like:.1f}°C) - Aşırı sıcak hava uyarısı'},
+        {'threshold': 30, 'severity': 'medium', 'title': 'Yüksek Sıcaklık Uyarısı: {location}',
+         'message': '{location} şehrinde sıcaklık {temperature:.1f}°C - Yüksek sıcaklık uyarısı'}]},
+    {'id': 'cold', 'section': 'weather', 'field': 'temperature', 'op': '<=', 'levels': [
+        {'threshold': -5, 'severity': 'high', 'title': 'Aşırı Soğuk Uyarısı: {location}',
+         'message': '{location} şehrinde sıcaklık {temperature:.1f}°C (hissedilen: {feels_like:.1f}°C) - Aşırı soğuk hava uyarısı'},
+        {'threshold': 0, 'severity': 'medium', 'title': 'Düşük Sıcaklık Uyarısı: {location}',
+         'message': '{location} şehrinde sıcaklık {temperature:.1f}°C - Düşük sıcaklık uyarısı'}]},
+    {'id': 'wind', 'section': 'weather', 'field': 'wind_speed', 'op': '>=', 'group': 'wind', 'levels': [
+        {'threshold': 20, 'severity': 'high', 'title': 'Yüksek Rüzgar Uyarısı: {location}',
+         'message': '{location} şehrinde rüzgar hızı {wind_speed:.1f} m/s{gust_suffix} - Yüksek rüzgar uyarısı'},
+        {'threshold': 15, 'severity': 'medium', 'title': 'Yüksek Rüzgar Uyarısı: {location}',
+         'message': '{location} şehrinde rüzgar hızı {wind_speed:.1f} m/s{gust_suffix} - Yüksek rüzgar uyarısı'},
+        {'threshold': 10, 'severity': 'medium', 'title': 'Güçlü Rüzgar Uyarısı: {location}',
+         'message': '{location} şehrinde rüzgar hızı {wind_speed:.1f} m/s - Güçlü rüzgar uyarısı'}]},
+    # Ortalama rüzgar eşik altındayken tek başına sert hamle (gust) uyarısı
+    {'id': 'wind_gust', 'section': 'weather', 'field': 'wind_gust', 'op': '>=', 'group': 'wind', 'levels': [
+        {'threshold': 25, 'severity': 'high', 'title': 'Rüzgar Fırtınası Uyarısı: {location}',
+         'message': '{location} şehrinde rüzgar fırtınası {wind_gust:.1f} m/s - Ani rüzgar hamlesi uyarısı'}]},
+    {'id': 'humidity', 'section': 'weather', 'field': 'humidity', 'op': '>=', 'levels': [
+        {'threshold': 90, 'severity': 'medium', 'title': 'Yüksek Nem Uyarısı: {location}',
+         'message': '{location} şehrinde nem oranı %{humidity:.0f} - Yüksek nem uyarısı (yağış riski)'}]},
+    {'id': 'low_pressure', 'section': 'weather', 'field': 'pressure', 'op': '<=', 'require_truthy': True, 'levels': [
+        {'threshold': 1000, 'severity': 'high', 'title': 'Düşük Basınç Uyarısı: {location}',
+         'message': '{location} şehrinde atmosfer basıncı {pressure:.0f} hPa - Düşük basınç uyarısı (fırtına riski)'}]},
+    {'id': 'visibility', 'section': 'weather', 'field': 'visibility', 'op': '<=', 'require_truthy': True, 'levels': [
+        {'threshold': 500, 'severity': 'high'},
+        {'threshold': 1000, 'severity': 'medium'}],
+     'title': 'Düşük Görüş Mesafesi Uyarısı: {location}',
+     'message': '{location} şehrinde görüş mesafesi {visibility_km:.1f} km - Düşük görüş uyarısı (sis riski)'},
+    {'id': 'precipitation', 'section': 'weather', 'field': 'weather_main', 'op': 'in', 'levels': [
+        {'values': ['thunderstorm'], 'severity': 'high'},
+        {'values': ['rain', 'drizzle'], 'severity': 'medium'}],
+     'title': 'Yağış Uyarısı: {location}',
+     'message': '{location} şehrinde {weather_description} bekleniyor - Yağış uyarısı'},
+    {'id': 'snow', 'section': 'weather', 'field': 'weather_main', 'op': 'in', 'levels': [
+        {'values': ['snow'], 'severity': 'high', 'title': 'Kar Uyarısı: {location}',
+         'message': '{location} şehrinde kar yağışı bekleniyor - Kar uyarısı'}]},
+    {'id': 'clouds', 'section': 'weather', 'field': 'clouds', 'op': '>=', 'levels': [
+        {'threshold': 80, 'severity': 'medium', 'title': 'Yoğun Bulutluluk: {location}',
+         'message': '{location} şehrinde bulutluluk %{clouds:.0f} - Yoğun bulutluluk (yağış riski)'}]},
+
+    # Sürü: SwarmTracker'ın etkin kümeleri (get_swarms) kayıt olarak değerlendirilir
+    {'id': 'earthquake_swarm', 'section': 'swarm', 'field': 'risk_score', 'op': '>=', 'levels': [
+        {'threshold': 50, 'severity': 'high'},
+        {'threshold': 0, 'severity': 'medium'}],
+     'title': 'Deprem Sürüsü: {location}',
+     'message': '{earthquake_count} küçük deprem {time_span_days} gün içinde {cluster_radius_km:.0f} km yarıçapında '
+                '({center_latitude:.2f}, {center_longitude:.2f}) - {risk_level}'},
+
+    {'id': 'natural_event', 'section': 'eonet', 'field': 'categories', 'op': 'contains', 'where': {'status': 'open'},
+     'levels': [{'keywords': ['wildfire', 'fire', 'yangın', 'volcano', 'volkan', 'storm', 'fırtına', 'severe',
+                              'flood', 'sel'], 'severity': 'high'}],
+     'default_severity': 'medium',
+     'title': 'Doğal Afet Uyarısı: {title}',
+     'message': '{category_text} - {title}. Durum: AÇIK. {location}'},
+
+    {'id': 'forecast_low_temp', 'section': 'forecast', 'field': 'temperature', 'op': '<=', 'threshold': 0,
+     'aggregate': True, 'window_hours': 120, 'severity': 'medium',
+     'escalate': {'op': '<=', 'threshold': -5, 'severity': 'high'},
+     'title': 'Düşük Sıcaklık Tahmini: {location}',
+     'message': _FORECAST_PREFIX + ' düşük sıcaklık bekleniyor ({min:.1f}°C ile {max:.1f}°C arası)',
+     'data': {'forecast_count': 'count', 'min_temp': 'min', 'max_temp': 'max'}},
+    {'id': 'forecast_high_temp', 'section': 'forecast', 'field': 'temperature', 'op': '>=', 'threshold': 30,
+     'aggregate': True, 'window_hours': 120, 'severity': 'medium',
+     'escalate': {'op': '>=', 'threshold': 35, 'severity': 'high'},
+     'title': 'Yüksek Sıcaklık Tahmini: {location}',
+     'message': _FORECAST_PREFIX + ' yüksek sıcaklık bekleniyor ({min:.1f}°C ile {max:.1f}°C arası)',
+     'data': {'forecast_count': 'count', 'min_temp': 'min', 'max_temp': 'max'}},
+    {'id': 'forecast_wind', 'section': 'forecast', 'field': 'wind_speed', 'op': '>=', 'threshold': 15,
+     'aggregate': True, 'window_hours': 120, 'severity': 'medium',
+     'escalate': {'op': '>=', 'threshold': 20, 'severity': 'high'},
+     'title': 'Yüksek Rüzgar Tahmini: {location}',
+     'message': _FORECAST_PREFIX + ' yüksek rüzgar bekleniyor (maksimum: {max:.1f} m/s)',
+     'data': {'forecast_count': 'count', 'max_wind': 'max'}},
+    {'id': 'forecast_snow', 'section': 'forecast', 'field': 'weather_main', 'op': 'in', 'values': ['snow'],
+     'aggregate': True, 'window_hours': 120, 'severity': 'high',
+     'title': 'Kar Yağışı Tahmini: {location}',
+     'message': '{location} şehrinde önümüzdeki 5 günde kar yağışı bekleniyor',
+     'data': {'forecast_count': 'count'}},
+    {'id': 'forecast_precipitation', 'section': 'forecast', 'field': 'weather_main', 'op': 'in',
+     'values': ['rain', 'drizzle', 'thunderstorm'],
+     'aggregate': True, 'window_hours': 120, 'severity': 'medium',
+     'escalate': {'op': 'in', 'values': ['thunderstorm'], 'severity': 'high',
+                  'title': 'Fırtına Tahmini: {location}',
+                  'message': _FORECAST_PREFIX + ' yağış bekleniyor ({escalated_count} fırtına tahmini)'},
+     'title': 'Yağış Tahmini: {location}',
+     'message': _FORECAST_PREFIX + ' yağış bekleniyor',
+     'data': {'forecast_count': 'count', 'thunderstorm_count': 'escalated_count'}},
+    {'id': 'forecast_humidity', 'section': 'forecast', 'field': 'humidity', 'op': '>=', 'threshold': 90,
+     'aggregate': True, 'window_hours': 120, 'severity': 'medium',
+     'title': 'Yüksek Nem Tahmini: {location}',
+     'message': _FORECAST_PREFIX + ' yüksek nem bekleniyor (maksimum: %{max:.0f})',
+     'data': {'forecast_count': 'count', 'max_humidity': 'max'}},
+    {'id': 'forecast_low_pressure', 'section': 'forecast', 'field': 'pressure', 'op': '<=', 'threshold': 1000,
+     'require_truthy': True, 'aggregate': True, 'window_hours': 120, 'severity': 'high',
+     'title': 'Düşük Basınç Tahmini: {location}',
+     'message': _FORECAST_PREFIX + ' düşük basınç bekleniyor (minimum: {min:.0f} hPa) - Fırtına riski',
+     'data': {'forecast_count': 'count', 'min_pressure': 'min'}},
+
+    # Sel: risk seviyesi nehre özel eşiklerle (flood_analytics) belirlenir, debi istatistik için kullanılır
+    {'id': 'flood_high_discharge', 'section': 'flood', 'field': 'risk_level', 'op': 'in', 'values': ['high'],
+     'stat_field': 'river_discharge', 'aggregate': True, 'window_hours': 240, 'severity': 'high',
+     'title': 'Yüksek Sel Riski: {location}',
+     'message': '{location} bölgesinde {count} gün yüksek nehir debisi bekleniyor (maksimum: {max:.0f} m3/s)',
+     'data': {'day_count': 'count', 'max_discharge': 'max'}},
+]
+
+
+def in_americas(record: Dict[str, Any]) -> bool:
+    lat = record.get('latitude')
+    lon = record.get('longitude')
+    if lat is None or lon is None:
+        return False
+    return (AMERICAS_BBOX['min_lat'] <= lat <= AMERICAS_BBOX['max_lat'] and
+            AMERICAS_BBOX['min_lon'] <= lon <= AMERICAS_BBOX['max_lon'])
+
+
+def select_current_weather(weather_data: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Anlık hava durumu kayıtları (forecast hariç) - Sadece Amerika kıtaları"""
+    return [item for item in weather_data if item.get('type') == 'weather' and in_americas(item)]
+
+
+def group_forecasts(weather_data: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Forecast kayıtlarını şehir başına, tahmin zamanına göre sıralı gruplar - Sadece Amerika kıtaları"""
+    forecasts_by_city: Dict[str, List[Dict[str, Any]]] = {}
+    for item in weather_data:
+        if item.get('type') == 'weather_forecast' and in_americas(item):
+            forecasts_by_city.setdefault(item.get('location', 'Unknown'), []).append(item)
+    for city in forecasts_by_city:
+        forecasts_by_city[city].sort(key=lambda x: x.get('forecast_time', ''))
+    return forecasts_by_city
+
+
+def _weather_context(record: Dict[str, Any]) -> Dict[str, Any]:
+    ctx = dict(record)
+    temperature = record.get('temperature') or 0
+    wind = record.get('wind_speed') or 0
+    gust = record.get('wind_gust') or 0
+    ctx['location'] = record.get('location', 'Bilinmeyen')
+    ctx['feels_like'] = record.get('feels_like', temperature)
+    ctx['gust_suffix'] = f' (rüzgar fırtınası: {gust:.1f} m/s)' if gust and gust > wind else ''
+    ctx['visibility_km'] = (record.get('visibility') or 0) / 1000
+    ctx['weather_description'] = record.get('weather_description', 'yağış')
+    return ctx
+
+
+def _eonet_context(record: Dict[str, Any]) -> Dict[str, Any]:
+    ctx = dict(record)
+    categories = record.get('categories') or []
+    ctx['title'] = record.get('title', 'Doğal Afet')
+    ctx['category_text'] = ', '.join(categories) if categories else 'Doğal Afet'
+    ctx['location'] = 'Bilinmeyen Konum'
+    if record.get('latitude') and record.get('longitude'):
+        ctx['location'] = f"Koordinat: {record.get('latitude'):.4f}, {record.get('longitude'):.4f}"
+    return ctx
+
+
+def _swarm_context(record: Dict[str, Any]) -> Dict[str, Any]:
+    # Sürü merkezi her yeni depremle kayar; yaşam döngüsü anahtarı sabit kalsın diye konum sürü kimliğidir
+    ctx = dict(record)
+    ctx['location'] = record.get('swarm_id', 'Bilinmeyen')
+    return ctx
+
+
+def _default_context(record: Dict[str, Any]) -> Dict[str, Any]:
+    ctx = dict(record)
+    ctx['location'] = record.get('location', 'Bilinmeyen')
+    return ctx
+
+
+_CONTEXT_BUILDERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    'weather': _weather_context,
+    'eonet': _eonet_context,
+    'swarm': _swarm_context,
+}
+
+
+class CompiledRule:
+    # Tek bir kuralın derlenmiş hali: kademeler sıralı eşik dizisine indirgenir
+
+    __slots__ = ('id', 'section', 'field', 'stat_field', 'group', 'op', 'require_truthy', 'where',
+                 'keys', 'levels', 'lookup', 'keywords', 'default_level', 'aggregate', 'window_seconds',
+                 'escalate', 'data_fields')
+
+    def __init__(self, rule: Dict[str, Any]):
+        self.id = rule['id']
+        self.section = rule['section']
+        self.field = rule['field']
+        self.stat_field = rule.get('stat_field', rule['field'])
+        self.group = rule.get('group', rule['id'])
+        self.op = rule['op']
+        self.require_truthy = rule.get('require_truthy', False)
+        self.where = rule.get('where', {})
+        self.aggregate = rule.get('aggregate', False)
+        self.window_seconds = rule['window_hours'] * 3600 if rule.get('window_hours') else None
+        self.data_fields = rule.get('data', {})
+
+        base = {'severity': rule.get('severity', 'medium'), 'title': rule.get('title', ''),
+                'message': rule.get('message', '')}
+        # Tek eşikli kurallar tek kademeli merdiven olarak derlenir
+        levels = rule.get('levels') or [{'threshold': rule.get('threshold'), 'values': rule.get('values')}]
+        levels = [{**base, **{k: v for k, v in level.items() if v is not None}} for level in levels]
+
+        self.keys, self.levels, self.lookup, self.keywords = [], [], {}, []
+        if self.op in ('>=', '<='):
+            sign = 1 if self.op == '>=' else -1
+            ordered = sorted(levels, key=lambda level: sign * level['threshold'])
+            self.keys = [sign * level['threshold'] for level in ordered]
+            self.levels = ordered
+        elif self.op == 'in':
+            for level in levels:
+                for value in level.get('values', []):
+                    self.lookup[str(value).lower()] = level
+        elif self.op == 'contains':
+            self.keywords = [(keyword, level) for level in levels for keyword in level.get('keywords', [])]
+        else:
+            raise ValueError(f"Bilinmeyen kural operatörü: {self.op} ({self.id})")
+
+        self.default_level = None
+        if rule.get('default_severity'):
+            self.default_level = {**base, 'severity': rule['default_severity']}
+
+        self.escalate = None
+        if rule.get('escalate'):
+            self.escalate = CompiledRule({
+                'id': f"{self.id}_escalate", 'section': self.section, 'field': self.field,
+                'severity': rule['escalate']['severity'],
+                'title': rule['escalate'].get('title', base['title']),
+                'message': rule['escalate'].get('message', base['message']),
+                **{k: v for k, v in rule['escalate'].items() if k in ('op', 'threshold', 'values')}
+            })
+
+    def match(self, value) -> Optional[Dict[str, Any]]:
+        if value is None or (self.require_truthy and not value):
+            return None
+        if self.keys:
+            if not isinstance(value, (int, float)):
+                return None
+            index = bisect_right(self.keys, value if self.op == '>=' else -value) - 1
+            return self.levels[index] if index >= 0 else None
+        if self.lookup:
+            return self.lookup.get(str(value).lower())
+        text = ','.join(value).lower() if isinstance(value, list) else str(value).lower()
+        for keyword, level in self.keywords:
+            if keyword in text:
+                return level
+        return self.default_level
+
+    def primary_level(self) -> Dict[str, Any]:
+        # Birleştirilen (aggregate) kurallar tek kademelidir
+        if self.levels:
+            return self.levels[0]
+        if self.lookup:
+            return next(iter(self.lookup.values()))
+        return self.keywords[0][1] if self.keywords else self.default_level
+
+    def applies_to(self, record: Dict[str, Any]) -> bool:
+        return all(record.get(key) == expected for key, expected in self.where.items())
+
+
+def _format(template: str, ctx: Dict[str, Any]) -> str:
+    try:
+        return template.format_map(ctx)
+    except (KeyError, ValueError, TypeError):
+        return template
+
+
+class AlertRuleEngine:
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None):
+        self.rules = [CompiledRule(rule) for rule in (rules if rules is not None else DEFAULT_ALERT_RULES)]
+        self.by_section: Dict[str, List[CompiledRule]] = {}
+        for rule in self.rules:
+            self.by_section.setdefault(rule.section, []).append(rule)
+
+    def evaluate(self, section: str, records: Iterable[Any]) -> List[Dict[str, Any]]:
+        rules = self.by_section.get(section, [])
+        if not rules:
+            return []
+        records = [r.toDictionary() if hasattr(r, 'toDictionary') else r for r in records]
+        records = [r for r in records if isinstance(r, dict)]
+        per_record = [rule for rule in rules if not rule.aggregate]
+        aggregated = [rule for rule in rules if rule.aggregate]
+
+        alerts = self._evaluate_records(section, per_record, records) if per_record else []
+        if aggregated:
+            alerts.extend(self._evaluate_aggregates(section, aggregated, records))
+
+        # Tarihe göre sırala (en yeni önce)
+        alerts.sort(key=lambda x: str(x.get('timestamp', '')), reverse=True)
+        return alerts
+
+    def _evaluate_records(self, section: str, rules: List[CompiledRule], records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        meta = SECTIONS[section]
+        build_context = _CONTEXT_BUILDERS.get(section, _default_context)
+        alerts = []
+        latest: Dict[tuple, int] = {}
+
+        for record in records:
+            ctx = None
+            fired_groups = set()
+            for rule in rules:
+                if rule.group in fired_groups or not rule.applies_to(record):
+                    continue
+                level = rule.match(record.get(rule.field))
+                if level is None:
+                    continue
+                fired_groups.add(rule.group)
+                if ctx is None:
+                    ctx = build_context(record)
+                timestamp = record.get(meta['time_field']) or record.get('time') or datetime.now().isoformat()
+                alert = {
+                    'type': meta['type'],
+                    'category': meta['category'],
+                    'severity': level['severity'],
+                    'title': _format(level['title'], ctx),
+                    'message': _format(level['message'], ctx),
+                    'location': ctx['location'],
+                    'timestamp': timestamp,
+                    'rule_id': rule.id,
+                    'data': record
+                }
+                # Aynı şehir için aynı kuralın tekrar eden uyarılarından en yenisi tutulur
+                if meta.get('dedupe'):
+                    key = (rule.id, alert['location'])
+                    if key in latest:
+                        index = latest[key]
+                        if str(timestamp) >= str(alerts[index]['timestamp']):
+                            alerts[index] = alert
+                        continue
+                    latest[key] = len(alerts)
+                alerts.append(alert)
+        return alerts
+
+    def _evaluate_aggregates(self, section: str, rules: List[CompiledRule], records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Şehir başına birleştirme penceresi içindeki eşleşmeler tek uyarıya indirgenir
+        meta = SECTIONS[section]
+        time_field = meta['time_field']
+        by_location: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_location.setdefault(record.get('location', 'Unknown'), []).append(record)
+
+        alerts = []
+        for location, items in by_location.items():
+            window_start = None
+            epochs = [parse_timestamp(item.get(time_field)) for item in items]
+            known = [e for e in epochs if e is not None]
+            if known:
+                window_start = min(known)
+
+            for rule in rules:
+                count, escalated_count, first_time = 0, 0, None
+                low, high = None, None
+                for item, epoch in zip(items, epochs):
+                    if rule.window_seconds and epoch is not None and window_start is not None \
+                            and epoch - window_start > rule.window_seconds:
+                        continue
+                    if not rule.applies_to(item) or rule.match(item.get(rule.field)) is None:
+                        continue
+                    count += 1
+                    if first_time is None:
+                        first_time = item.get(time_field, '')
+                        if hasattr(first_time, 'isoformat'):
+                            first_time = first_time.isoformat()
+                    stat = item.get(rule.stat_field)
+                    if isinstance(stat, (int, float)):
+                        low = stat if low is None or stat < low else low
+                        high = stat if high is None or stat > high else high
+                    if rule.escalate and rule.escalate.match(item.get(rule.field)) is not None:
+                        escalated_count += 1
+                if not count:
+                    continue
+
+                level = rule.escalate.primary_level() if rule.escalate and escalated_count else rule.primary_level()
+
+                ctx = {'location': location, 'count': count, 'escalated_count': escalated_count,
+                       'min': low if low is not None else 0, 'max': high if high is not None else 0}
+                alerts.append({
+                    'type': meta['type'],
+                    'category': meta['category'],
+                    'severity': level['severity'],
+                    'title': _format(level['title'], ctx),
+                    'message': _format(level['message'], ctx),
+                    'location': location,
+                    'timestamp': first_time,
+                    'rule_id': rule.id,
+                    'data': {key: ctx[name] for key, name in rule.data_fields.items()}
+                })
+        return alerts
+
+
+_store_lock = threading.Lock()
+
+
+def load_alert_state() -> Optional[Dict[str, Any]]:
+    path = veri_klasoru / ALERTS_FILE
+    if not path.exists():
+        return None
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        log_message(f"Uyarı dosyası okunamadı: {e}", "WARNING")
+        return None
+
+
+def save_alert_section(section: str, alerts: List[Dict[str, Any]], locations: Optional[Iterable[str]] = None):
+    """Bir bölümün uyarılarını data/alerts.json'a yazar.
+    locations verilirse yalnızca o konumlara ait uyarılar değiştirilir (şehir bazlı batch'ler için)."""
+    path = veri_klasoru / ALERTS_FILE
+    with _store_lock:
+        state = load_alert_state() or {}
+        sections = state.setdefault('sections', {})
+        updated = state.setdefault('updated_at', {})
+        if locations is not None:
+            locations = set(locations)
+            kept = [a for a in sections.get(section, []) if a.get('location') not in locations]
+            alerts = kept + list(alerts)
+            alerts.sort(key=lambda x: str(x.get('timestamp', '')), reverse=True)
+        sections[section] = alerts
+        updated[section] = time.time()
+
+        tmp_path = path.with_suffix('.tmp')
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
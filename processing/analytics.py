@@ -1,10 +1,9 @@
 import csv
 import json
-from pathlib import Path
 from datetime import datetime
-
-project_path = Path(__file__).resolve().parent.parent
-veri_klasoru = project_path / "data"
+from .streaming_stats import RunningStats
+from .storage import veri_klasoru
+from models.event_batch import EventBatch
 
 def _veri_tipini_duzelt(event_dict):
     try:
@@ -53,21 +52,25 @@ def compute_basic_stats(events):
     if not events:
         return None
 
-    magnitudes = []
-    for e in events:
-        mag = getattr(e, 'magnitude', None) if not isinstance(e, dict) else e.get("magnitude")
-        
+    # Tek geçişte sayım/min/max/ortalama (magnitude listesi kurmadan); EventBatch'te yalnızca
+    # magnitude sütunu okunur
+    running = RunningStats()
+    if isinstance(events, EventBatch):
+        magnitudes = events.column("magnitude") if "magnitude" in events.columns else []
+    else:
+        magnitudes = (getattr(e, 'magnitude', None) if not isinstance(e, dict) else e.get("magnitude") for e in events)
+    for mag in magnitudes:
         if isinstance(mag, (int, float)):
-            magnitudes.append(mag)
+            running.add(mag)
 
-    if not magnitudes:
+    if running.count == 0:
         return {"total_events": len(events), "status": "No magnitude data found"}
 
     stats = {
         "total_events": len(events),
-        "max_magnitude": max(magnitudes),
-        "min_magnitude": min(magnitudes),
-        "avg_magnitude": round(sum(magnitudes) / len(magnitudes), 2),
+        "max_magnitude": running.max,
+        "min_magnitude": running.min,
+        "avg_magnitude": round(running.mean, 2),
         "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
 
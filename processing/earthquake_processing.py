@@ -1,6 +1,8 @@
 from datetime import datetime
 from .storage import log_message
+from .timeutils import parse_timestamp
 from models import RawEarthquake, CleanedEarthquake
+from models.event_batch import EventBatch
 
 # Genel veri için alınacak zorunlu alanlar
 ZORUNLU_ALANLAR = ["id", "event_type", "timestamp", "magnitude", "location"]
@@ -49,6 +51,23 @@ def clean_earthquake_events(raw_events):
     log_message(f"Processing complete. Cleaned: {len(cleaned_list)}", level="INFO")
     return cleaned_list
 
+def _usgs_timestamp(time_val, iso_text=False):
+    # iso_text: metin zaman RawEarthquake.toDictionary'nin isoformat çıktısıdır (EventBatch sütunu),
+    # datetime'a geri çevrilip aynı biçimde yazılır
+    try:
+        if isinstance(time_val, (int, float)):
+            return datetime.fromtimestamp(time_val / 1000).strftime('%Y-%m-%d %H:%M:%S')
+        if iso_text and isinstance(time_val, str):
+            try:
+                time_val = datetime.fromisoformat(time_val)
+            except ValueError:
+                pass
+        if hasattr(time_val, "strftime"):
+            return time_val.strftime('%Y-%m-%d %H:%M:%S')
+        return str(time_val)
+    except:
+        return "Unknown"
+
 def clean_usgs_earthquake_events(usgs_events):
     final_output = []
     counter = 0
@@ -73,15 +92,7 @@ def clean_usgs_earthquake_events(usgs_events):
                 continue
 
         # Tarih formatını ISO yapmıştık ama bunu da strftime çeviriyoruz
-        try:
-            if isinstance(time_val, (int, float)):
-                ts = datetime.fromtimestamp(time_val / 1000).strftime('%Y-%m-%d %H:%M:%S')
-            elif hasattr(time_val, "strftime"):
-                ts = time_val.strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                ts = str(time_val)
-        except:
-            ts = "Unknown"
+        ts = _usgs_timestamp(time_val)
 
         try:
             magnitude = float(raw_dict.get("magnitude", 0))
@@ -102,4 +113,44 @@ def clean_usgs_earthquake_events(usgs_events):
             continue
 
     log_message(f"USGS conversion finished. Records: {len(final_output)}", level="INFO")
-    return final_output
\ No newline at end of file
+    return final_output
+
+def clean_usgs_earthquake_batch(batch):
+    """clean_usgs_earthquake_events'in sütunsal karşılığı: RawEarthquake şemalı EventBatch ->
+    CleanedEarthquake şemalı EventBatch (id'ler batch içindeki sıra, 1'den başlar)"""
+    batch = EventBatch.from_events(batch, 'earthquake')
+    ids, timestamps, magnitudes, locations, latitudes, longitudes, epochs = [], [], [], [], [], [], []
+    errors = 0
+
+    rows = zip(batch.column("time"), batch.column("magnitude"), batch.column("location"),
+               batch.column("latitude"), batch.column("longitude"))
+    for counter, (time_val, magnitude, location, latitude, longitude) in enumerate(rows, 1):
+        try:
+            magnitude = float(magnitude)
+        except (TypeError, ValueError):
+            errors += 1
+            continue
+        ts = _usgs_timestamp(time_val, iso_text=True)
+        ids.append(counter)
+        timestamps.append(ts)
+        magnitudes.append(magnitude)
+        locations.append(str(location))
+        latitudes.append(latitude)
+        longitudes.append(longitude)
+        epochs.append(parse_timestamp(ts))
+
+    if errors:
+        log_message(f"Conversion error in USGS: {errors} kayıtta geçersiz magnitude", level="WARNING")
+
+    cleaned = EventBatch.from_columns('cleaned_earthquake', {
+        "id": ids,
+        "event_type": ["earthquake"] * len(ids),
+        "timestamp": timestamps,
+        "magnitude": magnitudes,
+        "location": locations,
+        "latitude": latitudes,
+        "longitude": longitudes,
+        "epoch": epochs,
+    }, omit_none=("latitude", "longitude", "epoch"))
+    log_message(f"USGS conversion finished. Records: {len(cleaned)}", level="INFO")
+    return cleaned
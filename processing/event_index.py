@@ -0,0 +1,196 @@
+# Olay listeleri için uzamsal-zamansal indeks (dashboard olay API'lerinde bbox/zaman/sayfalama)
+# Olaylar (epoch, anahtar) sırasına göre sıralanır; zaman aralığı ve cursor bisect ile bir
+# konum aralığına çevrilir. bbox için CELL_SIZE derecelik grid hücreleri, hücredeki olayların
+# (artan) konum listesini tutar: az hücreli görünümlerde yalnızca bu listeler zaman sırasıyla
+# birleştirilir, çok geniş bbox'ta zaman aralığı doğrudan taranır.
+#
+# Cursor, son dönen olayın (epoch, anahtar) çiftidir; veri dosyası yenilense de geçerli kalır.
+# order=asc ile son sayfanın next_cursor'u sonraki isteklerde yalnızca yeni olayları döndürür.
+
+from __future__ import annotations
+import base64
+import hashlib
+import heapq
+import json
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from .map_clustering import parse_bbox
+from .timeutils import event_epoch, parse_timestamp
+
+KEY_FIELDS = ('id', 'event_id')
+MAGNITUDE_FIELD = 'magnitude'
+CELL_SIZE = 1.0
+MAX_GRID_CELLS = 4096
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 10000
+QUERY_PARAMS = ('bbox', 'since', 'until', 'min_magnitude', 'limit', 'cursor', 'order')
+
+
+def _float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def encode_cursor(epoch: float, key: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([epoch, key]).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        epoch, key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return float(epoch), str(key)
+    except Exception:
+        raise ValueError("invalid cursor")
+
+
+def parse_query(args: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+    """İstek parametrelerini EventIndex.query argümanlarına çevirir; hiçbiri yoksa None
+    (eski davranış: tam liste). Geçersiz değerde ValueError."""
+    if not any(args.get(name) not in (None, '') for name in QUERY_PARAMS):
+        return None
+
+    query: Dict[str, Any] = {'bbox': parse_bbox(args.get('bbox'))}
+    for name in ('since', 'until'):
+        value = args.get(name)
+        query[name] = parse_timestamp(value) if value not in (None, '') else None
+        if value not in (None, '') and query[name] is None:
+            raise ValueError(f"{name} must be an ISO timestamp or epoch seconds")
+    min_magnitude = args.get('min_magnitude')
+    query['min_magnitude'] = float(min_magnitude) if min_magnitude not in (None, '') else None
+    limit = args.get('limit')
+    query['limit'] = max(1, min(int(limit), MAX_LIMIT)) if limit not in (None, '') else DEFAULT_LIMIT
+    cursor = args.get('cursor')
+    query['cursor'] = decode_cursor(cursor) if cursor else None
+    order = (args.get('order') or 'desc').lower()
+    if order not in ('asc', 'desc'):
+        raise ValueError("order must be asc or desc")
+    query['order'] = order
+    return query
+
+
+def _lon_ranges(min_lon: float, max_lon: float) -> List[Tuple[float, float]]:
+    if max_lon - min_lon >= 360:
+        return [(-180.0, 180.0)]
+    min_lon = ((min_lon + 180) % 360 + 360) % 360 - 180
+    max_lon = ((max_lon + 180) % 360 + 360) % 360 - 180
+    if min_lon <= max_lon:
+        return [(min_lon, max_lon)]
+    # Anti-meridyeni geçen bbox
+    return [(min_lon, 180.0), (-180.0, max_lon)]
+
+
+class EventIndex:
+
+    def __init__(self, events: Iterable[Dict[str, Any]], time_fields: Optional[Tuple[str, ...]] = None,
+                 magnitude_field: str = MAGNITUDE_FIELD, cell_size: float = CELL_SIZE):
+        self.cell_size = cell_size
+        records = []
+        content_keys: Dict[str, int] = {}
+        for event in events:
+            if not isinstance(event, dict):
+                continue
+            epoch = event_epoch(event, time_fields)
+            key = next((str(event[k]) for k in KEY_FIELDS if event.get(k) is not None), None)
+            if key is None:
+                # Kimliksiz olaylar (ör. sel ölçümleri) için konum + içerik özeti: dosyaya satır
+                # eklense de anahtar (ve cursor) değişmez; birebir aynı kayıtlar tekrar sırasıyla ayrılır
+                digest = hashlib.sha1(json.dumps(event, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:12]
+                key = f"{event.get('latitude')},{event.get('longitude')}#{digest}"
+                repeat = content_keys.get(key, 0)
+                content_keys[key] = repeat + 1
+                if repeat:
+                    key = f"{key}-{repeat}"
+            records.append((epoch if epoch is not None else -math.inf, key, event))
+        records.sort(key=lambda r: (r[0], r[1]))
+
+        self.events: List[Dict[str, Any]] = [r[2] for r in records]
+        self.order_keys: List[Tuple[float, str]] = [(r[0], r[1]) for r in records]
+        self.epochs = array('d', (r[0] for r in records))
+        self.lats = array('d', (_float(e.get('latitude')) for e in self.events))
+        self.lons = array('d', (_float(e.get('longitude')) for e in self.events))
+        self.magnitudes = array('d', (_float(e.get(magnitude_field)) for e in self.events))
+
+        grid: Dict[Tuple[int, int], List[int]] = {}
+        for position, (lat, lon) in enumerate(zip(self.lats, self.lons)):
+            if math.isnan(lat) or math.isnan(lon):
+                continue
+            grid.setdefault(self._cell(lat, lon), []).append(position)
+        self.grid = {cell: array('q', positions) for cell, positions in grid.items()}
+
+    def __len__(self):
+        return len(self.events)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_size)), int(math.floor(lon / self.cell_size))
+
+    def _bbox_cells(self, min_lat, max_lat, lon_ranges) -> Optional[List[Tuple[int, int]]]:
+        rows = range(int(math.floor(min_lat / self.cell_size)), int(math.floor(max_lat / self.cell_size)) + 1)
+        columns = [c for lo, hi in lon_ranges
+                   for c in range(int(math.floor(lo / self.cell_size)), int(math.floor(hi / self.cell_size)) + 1)]
+        if len(rows) * len(columns) > MAX_GRID_CELLS:
+            return None
+        return [(r, c) for r in rows for c in columns if (r, c) in self.grid]
+
+    def _candidates(self, lo: int, hi: int, cells: Optional[List[Tuple[int, int]]],
+                    descending: bool) -> Iterator[int]:
+        if cells is None:
+            return iter(range(hi - 1, lo - 1, -1) if descending else range(lo, hi))
+        slices = []
+        for cell in cells:
+            positions = self.grid[cell]
+            start, end = bisect_left(positions, lo), bisect_left(positions, hi)
+            if start < end:
+                part = positions[start:end]
+                slices.append(reversed(part) if descending else part)
+        return heapq.merge(*slices, reverse=descending)
+
+    def query(self, bbox: Optional[Tuple[float, float, float, float]] = None, since: Optional[float] = None,
+              until: Optional[float] = None, min_magnitude: Optional[float] = None, limit: int = DEFAULT_LIMIT,
+              cursor: Optional[Tuple[float, str]] = None, order: str = 'desc') -> Dict[str, Any]:
+        descending = order == 'desc'
+        lo = bisect_left(self.epochs, since) if since is not None else 0
+        hi = bisect_right(self.epochs, until) if until is not None else len(self.events)
+        if cursor is not None:
+            if descending:
+                hi = min(hi, bisect_left(self.order_keys, cursor))
+            else:
+                lo = max(lo, bisect_right(self.order_keys, cursor))
+
+        cells = None
+        lon_ranges = None
+        if bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            lon_ranges = _lon_ranges(min_lon, max_lon)
+            cells = self._bbox_cells(min_lat, max_lat, lon_ranges)
+
+        selected = []
+        has_more = False
+        if lo < hi:
+            for position in self._candidates(lo, hi, cells, descending):
+                if bbox is not None:
+                    lat, lon = self.lats[position], self.lons[position]
+                    if not (min_lat <= lat <= max_lat and any(a <= lon <= b for a, b in lon_ranges)):
+                        continue
+                if min_magnitude is not None and not self.magnitudes[position] >= min_magnitude:
+                    continue
+                if len(selected) >= limit:
+                    has_more = True
+                    break
+                selected.append(position)
+
+        if selected:
+            next_cursor = encode_cursor(*self.order_keys[selected[-1]])
+        else:
+            # Boş sayfada cursor korunur (artan sırada yeni olaylar için tekrar sorgulanabilir)
+            next_cursor = encode_cursor(*cursor) if cursor is not None else None
+        return {
+            'events': [self.events[p] for p in selected],
+            'count': len(selected),
+            'has_more': has_more,
+            'next_cursor': next_cursor,
+            'order': order
+        }
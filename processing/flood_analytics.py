@@ -0,0 +1,290 @@
+# Sel analitiği: şehir/nehir başına debi zaman serileri
+# Debi değerleri şehir başına array('d') içinde tutulur (eksik değer NaN); risk seviyesi,
+# tepe debi, yükselme hızı ve şehir özetleri tek geçişte hesaplanır.
+# Yeterli geçmiş biriktiğinde her nehir kendi yüzdelik eşiklerini kullanır,
+# aksi halde global 200/800 m3/s eşiklerine geri dönülür.
+
+from __future__ import annotations
+import json
+import math
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from .storage import log_message, veri_klasoru
+
+FLOOD_HISTORY_FILE = "flood_history.json"
+
+RISK_LEVELS = ("low", "medium", "high")
+DEFAULT_THRESHOLDS = (200.0, 800.0)
+THRESHOLD_PERCENTILES = (75.0, 95.0)
+MIN_HISTORY_FOR_PERCENTILES = 30
+HISTORY_DAYS = 365
+
+NAN = float('nan')
+
+
+def _date_key(value) -> Optional[str]:
+    # "2025-12-30 T00:00:00", ISO string veya datetime -> "2025-12-30"
+    if value is None:
+        return None
+    text = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+    return text[:10] if len(text) >= 10 else None
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value) if value is not None else NAN
+    except (TypeError, ValueError):
+        return NAN
+
+
+def classify_discharge(values: Iterable[Any], thresholds: Sequence[float] = DEFAULT_THRESHOLDS) -> List[str]:
+    # Sıralı eşikler üzerinde bisect: < eşik[0] low, < eşik[1] medium, diğerleri high
+    levels = []
+    for value in values:
+        value = _to_float(value)
+        levels.append("unknown" if value != value else RISK_LEVELS[bisect_right(thresholds, value)])
+    return levels
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return NAN
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = int(math.floor(position))
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def series_stats(values: Sequence[float], dates: Sequence[Optional[str]]) -> Dict[str, Any]:
+    # Tarih sırasına dizilmiş seri için tepe debi, son değer ve günlük yükselme hızı
+    peak, peak_date, latest, previous, max_rise = NAN, None, NAN, NAN, NAN
+    for value, date in zip(values, dates):
+        if value != value:
+            continue
+        if peak != peak or value > peak:
+            peak, peak_date = value, date
+        if previous == previous:
+            rise = value - previous
+            if max_rise != max_rise or rise > max_rise:
+                max_rise = rise
+        previous = latest = value
+
+    last_rise = NAN
+    valid = [v for v in values if v == v]
+    if len(valid) >= 2:
+        last_rise = valid[-1] - valid[-2]
+
+    def _clean(x):
+        return round(x, 2) if x == x else None
+
+    return {
+        'peak_discharge': _clean(peak),
+        'peak_date': peak_date,
+        'latest_discharge': _clean(latest),
+        'max_rate_of_rise': _clean(max_rise),
+        'latest_rate_of_rise': _clean(last_rise),
+        'rising': bool(last_rise == last_rise and last_rise > 0)
+    }
+
+
+class DischargeSeries:
+    # Tek şehir/nehir için tarih sıralı günlük debi serisi
+
+    __slots__ = ('location', 'latitude', 'longitude', 'dates', 'values')
+
+    def __init__(self, location: str, latitude: Optional[float] = None, longitude: Optional[float] = None):
+        self.location = location
+        self.latitude = latitude
+        self.longitude = longitude
+        self.dates: List[str] = []
+        self.values = array('d')
+
+    def upsert(self, date: str, value: float):
+        # Aynı gün için gelen daha yeni tahmin eski değerin üzerine yazılır
+        index = bisect_left(self.dates, date)
+        if index < len(self.dates) and self.dates[index] == date:
+            if value == value:
+                self.values[index] = value
+            return
+        self.dates.insert(index, date)
+        self.values.insert(index, value)
+
+    def trim(self, oldest_date: str):
+        cut = bisect_left(self.dates, oldest_date)
+        if cut:
+            del self.dates[:cut]
+            del self.values[:cut]
+
+    def thresholds(self) -> Tuple[float, float]:
+        valid = sorted(v for v in self.values if v == v)
+        if len(valid) < MIN_HISTORY_FOR_PERCENTILES:
+            return DEFAULT_THRESHOLDS
+        medium, high = (percentile(valid, q) for q in THRESHOLD_PERCENTILES)
+        if not high > medium:
+            return DEFAULT_THRESHOLDS
+        return (round(medium, 2), round(high, 2))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'location': self.location,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'dates': self.dates,
+            'values': [v if v == v else None for v in self.values]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DischargeSeries":
+        series = cls(data['location'], data.get('latitude'), data.get('longitude'))
+        series.dates = list(data.get('dates', []))
+        series.values = array('d', (_to_float(v) for v in data.get('values', [])))
+        return series
+
+
+def _group_by_city(events: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    # Tek geçişte olayları şehir başına tarih/debi/risk dizilerine ayırır
+    groups: Dict[str, Dict[str, Any]] = {}
+    for ev in events:
+        if not isinstance(ev, dict):
+            continue
+        city = ev.get("location", "Unknown")
+        group = groups.get(city)
+        if group is None:
+            group = groups[city] = {
+                'latitude': ev.get('latitude'), 'longitude': ev.get('longitude'),
+                'dates': [], 'values': array('d'), 'risks': []
+            }
+        group['dates'].append(_date_key(ev.get('time')))
+        group['values'].append(_to_float(ev.get('river_discharge')))
+        group['risks'].append(ev.get("risk_level", "unknown"))
+    return groups
+
+
+def summarize_flood_events(events: Iterable[Dict[str, Any]],
+                           thresholds: Optional[Dict[str, Tuple[float, float]]] = None) -> Dict[str, Any]:
+    # Şehir başına risk dağılımı, tepe debi ve yükselme hızı + genel toplamlar
+    cities = {}
+    totals = {"low": 0, "medium": 0, "high": 0, "unknown": 0}
+    total_events = 0
+
+    for city, group in _group_by_city(events).items():
+        counts = {"low": 0, "medium": 0, "high": 0, "unknown": 0}
+        for risk in group['risks']:
+            key = str(risk).lower()
+            counts[key if key in counts else "unknown"] += 1
+        for key, count in counts.items():
+            totals[key] += count
+        total_events += len(group['risks'])
+
+        order = sorted(range(len(group['dates'])), key=lambda i: group['dates'][i] or "")
+        summary = series_stats([group['values'][i] for i in order], [group['dates'][i] for i in order])
+        summary.update(counts)
+        summary.update({
+            'latitude': group['latitude'],
+            'longitude': group['longitude'],
+            'event_count': len(group['risks']),
+            'thresholds': list((thresholds or {}).get(city, DEFAULT_THRESHOLDS))
+        })
+        cities[city] = summary
+
+    return {
+        'total_events': total_events,
+        'risk_counts': totals,
+        'cities': cities
+    }
+
+
+class FloodAnalytics:
+
+    def __init__(self, history_days: int = HISTORY_DAYS, river_thresholds: Optional[Dict[str, Tuple[float, float]]] = None,
+                 state_file: Optional[Path] = None):
+        self.history_days = history_days
+        # Elle tanımlanmış nehir eşikleri yüzdelik/global eşiklerden önce gelir
+        self.river_thresholds = dict(river_thresholds or {})
+        self.state_file = state_file or (veri_klasoru / FLOOD_HISTORY_FILE)
+        self.series: Dict[str, DischargeSeries] = {}
+        self.lock = threading.Lock()
+
+    def add_events(self, events: Iterable[Dict[str, Any]]):
+        oldest = (datetime.now() - timedelta(days=self.history_days)).strftime("%Y-%m-%d")
+        with self.lock:
+            for city, group in _group_by_city(events).items():
+                series = self.series.get(city)
+                if series is None:
+                    series = self.series[city] = DischargeSeries(city, group['latitude'], group['longitude'])
+                for date, value in zip(group['dates'], group['values']):
+                    if date:
+                        series.upsert(date, value)
+                series.trim(oldest)
+
+    def thresholds_for(self, location: str) -> Tuple[float, float]:
+        if location in self.river_thresholds:
+            return tuple(self.river_thresholds[location])
+        series = self.series.get(location)
+        return series.thresholds() if series else DEFAULT_THRESHOLDS
+
+    def classify_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Olayların risk seviyesini nehrin kendi eşiklerine göre yeniden hesaplar
+        by_city: Dict[str, List[Dict[str, Any]]] = {}
+        for ev in events:
+            if isinstance(ev, dict):
+                by_city.setdefault(ev.get("location", "Unknown"), []).append(ev)
+        with self.lock:
+            for city, city_events in by_city.items():
+                levels = classify_discharge((ev.get("river_discharge") for ev in city_events), self.thresholds_for(city))
+                for ev, level in zip(city_events, levels):
+                    ev["risk_level"] = level
+        return events
+
+    def summarize(self, events: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        events = list(events)
+        with self.lock:
+            thresholds = {ev.get("location", "Unknown"): self.thresholds_for(ev.get("location", "Unknown"))
+                          for ev in events if isinstance(ev, dict)}
+        return summarize_flood_events(events, thresholds)
+
+    def save_state(self):
+        with self.lock:
+            state = {
+                'history_days': self.history_days,
+                'series': [series.to_dict() for series in self.series.values()],
+                'updated_at': datetime.now().isoformat()
+            }
+        tmp_path = self.state_file.with_suffix('.tmp')
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_file)
+
+    @classmethod
+    def load(cls, state_file: Optional[Path] = None, **kwargs) -> "FloodAnalytics":
+        analytics = cls(state_file=state_file, **kwargs)
+        if analytics.state_file.exists():
+            try:
+                with analytics.state_file.open("r", encoding="utf-8") as f:
+                    state = json.load(f)
+                for data in state.get('series', []):
+                    series = DischargeSeries.from_dict(data)
+                    analytics.series[series.location] = series
+            except Exception as e:
+                log_message(f"Sel geçmişi yüklenemedi, sıfırdan başlanıyor: {e}", "WARNING")
+        return analytics
+
+
+_cached_analytics: Tuple[Optional[float], Optional[FloodAnalytics]] = (None, None)
+
+
+def get_flood_analytics() -> FloodAnalytics:
+    # Dashboard her istekte geçmişi yeniden okumasın diye dosya mtime'ına göre önbellek
+    global _cached_analytics
+    state_file = veri_klasoru / FLOOD_HISTORY_FILE
+    mtime = state_file.stat().st_mtime if state_file.exists() else None
+    cached_mtime, analytics = _cached_analytics
+    if analytics is None or cached_mtime != mtime:
+        analytics = FloodAnalytics.load(state_file)
+        _cached_analytics = (mtime, analytics)
+    return analytics
@@ -2,11 +2,8 @@
 
 from __future__ import annotations
 import json
-from pathlib import Path
-from processing.storage import log_message
-
-project_path = Path(__file__).resolve().parent.parent
-veri_klasoru = project_path / "data"
+from processing.storage import log_message, veri_klasoru
+from processing.flood_analytics import summarize_flood_events
 
 def load_flood_data(filename: str = "flood_risk.json"):
     file_path = veri_klasoru / filename
@@ -52,24 +49,11 @@ def main():
         "unknown": []
     }
 
-    per_city = {}
-
     for ev in events:
         risk = ev.get("risk_level", "unknown").lower()
-        city = ev.get("location", "Unknown")
-
-        if risk in categorized_events:
-            categorized_events[risk].append(ev)
-        else:
-            categorized_events["unknown"].append(ev)
+        categorized_events[risk if risk in categorized_events else "unknown"].append(ev)
 
-        if city not in per_city:
-            per_city[city] = {"low": 0, "medium": 0, "high": 0, "unknown": 0}
-        
-        if risk in per_city[city]:
-            per_city[city][risk] += 1
-        else:
-            per_city[city]["unknown"] += 1
+    per_city = payload.get("city_summary") or summarize_flood_events(events)["cities"]
 
     print("-" * 40)
     print(" SEL BÖLGESEL ANALİZ RAPORU (ABD & Kanada)")
@@ -83,7 +67,8 @@ def main():
 
     print("\n ŞEHİR BAZLI ÖZET:")
     for city, stats in per_city.items():
-        print(f"   • {city:15} | H:{stats['high']} | M:{stats['medium']} | L:{stats['low']}")
+        print(f"   • {city:15} | H:{stats['high']} | M:{stats['medium']} | L:{stats['low']}"
+              f" | tepe: {stats['peak_discharge']} m3/s")
 
     print_sample_events("YÜKSEK RİSK", categorized_events['high'])
     print_sample_events("ORTA RİSK", categorized_events['medium'])
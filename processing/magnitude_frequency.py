@@ -0,0 +1,351 @@
+# Gutenberg-Richter magnitüd-frekans analizi
+# Maksimum olabilirlik (Aki-Utsu) b-değeri, tamamlanma magnitüdü (Mc, maksimum eğrilik)
+# ve grid hücresi / fay hattı bbox'ı başına kayan pencere b-değeri.
+# Depremler 0.1'lik magnitüd bin'lerine ve günlük bucket'lara sayılır; b-değeri her
+# seferinde tüm katalog yerine bu histogramlardan O(bin sayısı) ile hesaplanır.
+
+from __future__ import annotations
+import glob
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .storage import log_message, veri_klasoru
+from .timeutils import event_epoch
+from .serialization import loads
+from .seismic_risk_analyzer import FAULT_LINE_DATA
+
+MF_STATE_FILE = "magnitude_frequency.json"
+
+BIN_WIDTH = 0.1
+MAXC_CORRECTION = 0.2
+DEFAULT_CELL_SIZE = 1.0
+DEFAULT_WINDOW_DAYS = 365
+MIN_EVENTS_FOR_B = 50
+SEEN_RETENTION_DAYS = 3
+LOG10_E = math.log10(math.e)
+
+
+def estimate_mc(histogram: Dict[int, int]) -> Optional[float]:
+    # Maksimum eğrilik: en kalabalık magnitüd bin'i + 0.2 düzeltmesi
+    if not histogram:
+        return None
+    peak_bin = max(histogram.items(), key=lambda item: (item[1], -item[0]))[0]
+    return round(peak_bin * BIN_WIDTH + MAXC_CORRECTION, 1)
+
+
+def b_value_mle(histogram: Dict[int, int], mc: Optional[float] = None,
+                min_events: int = MIN_EVENTS_FOR_B) -> Dict[str, Any]:
+    mc = estimate_mc(histogram) if mc is None else mc
+    if mc is None:
+        return {'mc': None, 'event_count': 0, 'b_value': None, 'b_uncertainty': None, 'a_value': None}
+
+    mc_bin = int(round(mc / BIN_WIDTH))
+    count = 0
+    total = 0.0
+    total_sq = 0.0
+    for magnitude_bin, n in histogram.items():
+        if magnitude_bin < mc_bin:
+            continue
+        m = magnitude_bin * BIN_WIDTH
+        count += n
+        total += n * m
+        total_sq += n * m * m
+
+    result = {'mc': mc, 'event_count': count, 'b_value': None, 'b_uncertainty': None, 'a_value': None}
+    if count < max(min_events, 2):
+        return result
+
+    mean = total / count
+    denominator = mean - (mc - BIN_WIDTH / 2.0)
+    if denominator <= 0:
+        return result
+
+    b = LOG10_E / denominator
+    # Shi & Bolt (1982) belirsizliği
+    variance = max(0.0, (total_sq - count * mean * mean) / (count * (count - 1)))
+    result['b_value'] = round(b, 3)
+    result['b_uncertainty'] = round(2.3 * b * b * math.sqrt(variance), 3)
+    result['a_value'] = round(math.log10(count) + b * mc, 3)
+    return result
+
+
+class _RegionHistogram:
+
+    def __init__(self):
+        self.total: Counter = Counter()
+        self.window: Counter = Counter()
+        self.days: Dict[int, Counter] = {}
+
+    def add(self, day: int, magnitude_bin: int, oldest_day: int, n: int = 1):
+        self.total[magnitude_bin] += n
+        if day < oldest_day:
+            return
+        self.days.setdefault(day, Counter())[magnitude_bin] += n
+        self.window[magnitude_bin] += n
+
+    def expire(self, oldest_day: int):
+        for day in [d for d in self.days if d < oldest_day]:
+            self.window.subtract(self.days.pop(day))
+        self.window += Counter()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total': dict(self.total),
+            'days': {str(day): dict(hist) for day, hist in self.days.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "_RegionHistogram":
+        region = cls()
+        region.total = Counter({int(k): v for k, v in data.get('total', {}).items()})
+        for day, hist in data.get('days', {}).items():
+            counter = Counter({int(k): v for k, v in hist.items()})
+            region.days[int(day)] = counter
+            region.window.update(counter)
+        return region
+
+
+class MagnitudeFrequencyAnalyzer:
+    # Bölge anahtarları: 'all', 'fault:<fault_id>', 'cell:<lat>:<lon>'
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE, window_days: int = DEFAULT_WINDOW_DAYS,
+                 state_file: Optional[Path] = None):
+        self.cell_size = cell_size
+        self.window_days = window_days
+        self.state_file = state_file or (veri_klasoru / MF_STATE_FILE)
+        self.fault_lines = FAULT_LINE_DATA
+        self.regions: Dict[str, _RegionHistogram] = {}
+        self._seen: Dict[tuple, float] = {}
+        self._newest_epoch = 0.0
+        self._cell_regions: Dict[Tuple[int, int], List[str]] = {}
+        self.lock = threading.Lock()
+
+    def _cell_key(self, lat: float, lon: float) -> str:
+        return f"cell:{math.floor(lat / self.cell_size)}:{math.floor(lon / self.cell_size)}"
+
+    def _region_keys_for_cell(self, row: int, col: int) -> List[str]:
+        # Fay hattı üyeliği hücre merkezine göre belirlenir (bbox'lar tam derece olduğu
+        # için varsayılan 1 derecelik grid ile örtüşür)
+        keys = self._cell_regions.get((row, col))
+        if keys is None:
+            lat = (row + 0.5) * self.cell_size
+            lon = (col + 0.5) * self.cell_size
+            keys = ['all', f"cell:{row}:{col}"]
+            for fault_id, fault in self.fault_lines.items():
+                bbox = fault['bbox']
+                if bbox['min_lat'] <= lat <= bbox['max_lat'] and bbox['min_lon'] <= lon <= bbox['max_lon']:
+                    keys.append(f"fault:{fault_id}")
+            self._cell_regions[(row, col)] = keys
+        return keys
+
+    def _expire(self, now: float):
+        oldest_day = int(now // 86400) - self.window_days + 1
+        for region in self.regions.values():
+            region.expire(oldest_day)
+
+    def _expire_seen(self):
+        # Tekrar anahtarları duvar saatine göre değil, alınan en yeni depreme göre
+        # budanır; eski snapshot'lar yeniden okunduğunda çift sayım olmaz
+        seen_cutoff = self._newest_epoch - SEEN_RETENTION_DAYS * 86400
+        for key in [k for k, epoch in self._seen.items() if epoch < seen_cutoff]:
+            del self._seen[key]
+
+    def add_earthquakes(self, earthquakes: Iterable[Any], now: Optional[float] = None,
+                        deduplicate: bool = True, expire_seen: bool = True) -> int:
+        now = now if now is not None else time.time()
+        oldest_day = int(now // 86400) - self.window_days + 1
+        cell_size = self.cell_size
+        floor = math.floor
+
+        # 1. aşama: (hücre, gün, magnitüd bin'i) başına sayım; büyük kataloglarda
+        # aynı anahtar çok tekrar ettiği için bölge histogramlarına az sayıda yazılır
+        counts: Dict[Tuple[int, int, int, int], int] = {}
+        added = 0
+        with self.lock:
+            self._expire(now)
+            if expire_seen:
+                self._expire_seen()
+            seen = self._seen
+            newest = self._newest_epoch
+            for eq in earthquakes:
+                if not isinstance(eq, dict):
+                    eq = eq.toDictionary()
+                magnitude = eq.get('magnitude')
+                lat = eq.get('latitude')
+                lon = eq.get('longitude')
+                if not isinstance(magnitude, (int, float)) or lat is None or lon is None:
+                    continue
+                epoch = event_epoch(eq)
+                if epoch is None:
+                    continue
+
+                if deduplicate:
+                    # Magnitüd anahtarda yok: USGS revizyonu aynı depremi ikinci kez saydırmaz
+                    key = (round(epoch), round(lat, 4), round(lon, 4))
+                    if key in seen:
+                        continue
+                    seen[key] = epoch
+                    if epoch > newest:
+                        newest = epoch
+
+                bucket = (floor(lat / cell_size), floor(lon / cell_size), int(epoch // 86400), int(round(magnitude / BIN_WIDTH)))
+                counts[bucket] = counts.get(bucket, 0) + 1
+                added += 1
+            self._newest_epoch = newest
+
+            # 2. aşama: toplanan sayımları 'all', hücre ve fay bölgelerine dağıt
+            regions = self.regions
+            for (row, col, day, magnitude_bin), n in counts.items():
+                for region_key in self._region_keys_for_cell(row, col):
+                    region = regions.get(region_key)
+                    if region is None:
+                        region = regions[region_key] = _RegionHistogram()
+                    region.add(day, magnitude_bin, oldest_day, n)
+
+        return added
+
+    def analyze(self, region_key: str = 'all', min_events: int = MIN_EVENTS_FOR_B,
+                now: Optional[float] = None) -> Dict[str, Any]:
+        now = now if now is not None else time.time()
+        with self.lock:
+            self._expire(now)
+            region = self.regions.get(region_key)
+            total = dict(region.total) if region else {}
+            window = dict(region.window) if region else {}
+
+        return {
+            'region': region_key,
+            'window_days': self.window_days,
+            'window': b_value_mle(window, min_events=min_events),
+            'all_time': b_value_mle(total, min_events=min_events),
+            'analysis_date': datetime.now().isoformat()
+        }
+
+    def analyze_fault(self, fault_id: str, min_events: int = MIN_EVENTS_FOR_B) -> Dict[str, Any]:
+        if fault_id not in self.fault_lines:
+            return {'error': f'Unknown fault line: {fault_id}'}
+        result = self.analyze(f"fault:{fault_id}", min_events=min_events)
+        result['fault_id'] = fault_id
+        result['fault_name'] = self.fault_lines[fault_id]['name']
+        return result
+
+    def analyze_point(self, latitude: float, longitude: float, min_events: int = MIN_EVENTS_FOR_B) -> Dict[str, Any]:
+        result = self.analyze(self._cell_key(latitude, longitude), min_events=min_events)
+        result['query_location'] = {'latitude': latitude, 'longitude': longitude, 'cell_size_deg': self.cell_size}
+        return result
+
+    def analyze_grid(self, min_events: int = MIN_EVENTS_FOR_B) -> List[Dict[str, Any]]:
+        with self.lock:
+            keys = [k for k in self.regions if k.startswith('cell:')]
+        cells = []
+        for key in keys:
+            result = self.analyze(key, min_events=min_events)
+            if result['window']['b_value'] is None and result['all_time']['b_value'] is None:
+                continue
+            _, row, col = key.split(':')
+            result['bbox'] = {
+                'min_lat': int(row) * self.cell_size, 'max_lat': (int(row) + 1) * self.cell_size,
+                'min_lon': int(col) * self.cell_size, 'max_lon': (int(col) + 1) * self.cell_size
+            }
+            cells.append(result)
+        return cells
+
+    def to_state(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'cell_size': self.cell_size,
+                'window_days': self.window_days,
+                'regions': {key: region.to_dict() for key, region in self.regions.items()},
+                'seen': [[list(k), e] for k, e in self._seen.items()],
+                'updated_at': datetime.now().isoformat()
+            }
+
+    def save_state(self):
+        state = self.to_state()
+        tmp_path = self.state_file.with_suffix('.tmp')
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_file)
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], state_file: Optional[Path] = None) -> "MagnitudeFrequencyAnalyzer":
+        analyzer = cls(cell_size=state.get('cell_size', DEFAULT_CELL_SIZE),
+                       window_days=state.get('window_days', DEFAULT_WINDOW_DAYS),
+                       state_file=state_file)
+        analyzer.regions = {key: _RegionHistogram.from_dict(data) for key, data in state.get('regions', {}).items()}
+        # Eski durum dosyalarındaki anahtarlar magnitüd de içerir; ilk üç alan yeterli
+        analyzer._seen = {tuple(k[:3]): e for k, e in state.get('seen', [])}
+        analyzer._newest_epoch = max(analyzer._seen.values(), default=0.0)
+        return analyzer
+
+    @classmethod
+    def load(cls, state_file: Optional[Path] = None) -> "MagnitudeFrequencyAnalyzer":
+        state_file = state_file or (veri_klasoru / MF_STATE_FILE)
+        if state_file.exists():
+            try:
+                with state_file.open("r", encoding="utf-8") as f:
+                    return cls.from_state(json.load(f), state_file=state_file)
+            except Exception as e:
+                log_message(f"Magnitüd-frekans durumu yüklenemedi, sıfırdan başlanıyor: {e}", "WARNING")
+        return cls(state_file=state_file)
+
+    @classmethod
+    def from_catalogue(cls, paths: Optional[List[str]] = None, **kwargs) -> "MagnitudeFrequencyAnalyzer":
+        # Tarihsel kataloğun tamamı üzerinden toplu hesaplama (JSON listeleri)
+        analyzer = cls(**kwargs)
+        if paths is None:
+            paths = glob.glob(str(veri_klasoru / "earthquakes_*.json")) + [str(veri_klasoru / "earthquakes.json")]
+
+        started = time.time()
+        total = 0
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    events = loads(f.read())
+            except Exception as e:
+                log_message(f"Katalog dosyası okunamadı {path}: {e}", "WARNING")
+                continue
+            if isinstance(events, list):
+                # Snapshot'lar aynı feed'in örtüşen kopyaları: her deprem bir kez sayılır
+                # Katalog oluşturulurken anahtarlar budanmaz (dosya sırası kronolojik değil)
+                total += analyzer.add_earthquakes(events, expire_seen=False)
+        with analyzer.lock:
+            analyzer._expire_seen()
+        log_message(f"Magnitüd-frekans kataloğu oluşturuldu: {total} deprem ({time.time() - started:.2f}s)", "INFO")
+        return analyzer
+
+
+_cached_analyzer: Tuple[Optional[float], Optional[MagnitudeFrequencyAnalyzer]] = (None, None)
+
+
+def get_magnitude_frequency_analyzer() -> MagnitudeFrequencyAnalyzer:
+    # Dashboard her istekte durumu yeniden okumasın diye dosya mtime'ına göre önbellek
+    global _cached_analyzer
+    state_file = veri_klasoru / MF_STATE_FILE
+    mtime = state_file.stat().st_mtime if state_file.exists() else None
+    cached_mtime, analyzer = _cached_analyzer
+    if analyzer is None or cached_mtime != mtime:
+        analyzer = MagnitudeFrequencyAnalyzer.load(state_file)
+        _cached_analyzer = (mtime, analyzer)
+    return analyzer
+
+
+def main():
+    import sys
+    paths = sys.argv[1:] or None
+    analyzer = MagnitudeFrequencyAnalyzer.from_catalogue(paths)
+    analyzer.save_state()
+    overall = analyzer.analyze('all', min_events=2)
+    print(f"Mc: {overall['all_time']['mc']} | b: {overall['all_time']['b_value']} | N: {overall['all_time']['event_count']}")
+
+
+if __name__ == "__main__":
+    main()
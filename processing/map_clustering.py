@@ -0,0 +1,290 @@
+# Sunucu tarafı harita kümeleme (dashboard katmanları için zoom'a duyarlı detay seviyesi)
+# Noktalar Web Mercator'a ([0, 1] normalize) çevrilir ve supercluster'a benzer hiyerarşik bir
+# grid kümelemesi yapılır: MAX_CLUSTER_ZOOM'dan MIN_ZOOM'a doğru her seviye, bir üst zoom'un
+# kümelerini CLUSTER_RADIUS piksellik hücrelerde birleştirir. Böylece bir görünüm alanında
+# dönen küme sayısı veri boyutundan bağımsızdır (görünüm alanı / hücre alanı ile sınırlı);
+# tek tek noktalar yalnızca MAX_CLUSTER_ZOOM'un üstünde (ya da tek elemanlı kümelerde) döner.
+#
+# İndeks veri sürümü başına bir kez kurulur (dashboard bunu paylaşılan önbellekte tutar);
+# sorgu, zoom seviyesinin x'e göre sıralı listesinde bisect + y filtresidir.
+
+from __future__ import annotations
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MIN_ZOOM = 0
+MAX_CLUSTER_ZOOM = 16
+TILE_EXTENT = 256
+CLUSTER_RADIUS = 60
+MAX_FEATURES = 5000
+MAX_LATITUDE = 85.05112878
+
+
+def lon_to_x(lon: float) -> float:
+    return lon / 360.0 + 0.5
+
+
+def lat_to_y(lat: float) -> float:
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    sin = math.sin(math.radians(lat))
+    return 0.5 - 0.25 * math.log((1 + sin) / (1 - sin)) / math.pi
+
+
+def x_to_lon(x: float) -> float:
+    return (x - 0.5) * 360.0
+
+
+def y_to_lat(y: float) -> float:
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+
+
+def parse_bbox(value: Optional[str]) -> Optional[Tuple[float, float, float, float]]:
+    """'minLon,minLat,maxLon,maxLat' -> tuple; geçersizse ValueError"""
+    if not value:
+        return None
+    parts = [float(p) for p in value.split(',')]
+    if len(parts) != 4:
+        raise ValueError("bbox must be minLon,minLat,maxLon,maxLat")
+    min_lon, min_lat, max_lon, max_lat = parts
+    if min_lat > max_lat:
+        raise ValueError("bbox minLat must be <= maxLat")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def _coordinates(event: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    try:
+        lon, lat = float(event.get('longitude')), float(event.get('latitude'))
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(lon) or math.isnan(lat) or not (-180 <= lon <= 180 and -90 <= lat <= 90):
+        return None
+    return lon, lat
+
+
+class _Level:
+    # Bir zoom seviyesindeki kümeler, x'e göre sıralı paralel tipli diziler olarak
+    # (düğüm nesneleri yerine: bellekte ve pickle'da çok daha küçük)
+    # point: tek nokta ise self.points indeksi, küme ise -1; value_max: değer yoksa NaN
+
+    __slots__ = ('x', 'y', 'count', 'id', 'expansion_zoom', 'point', 'value_max', 'value_sum',
+                 'value_count', 'categories')
+
+    def __init__(self):
+        self.x = array('d')
+        self.y = array('d')
+        self.count = array('q')
+        self.id = array('q')
+        self.expansion_zoom = array('b')
+        self.point = array('q')
+        self.value_max = array('d')
+        self.value_sum = array('d')
+        self.value_count = array('q')
+        self.categories: List[Optional[Dict[str, int]]] = []
+
+    def __len__(self):
+        return len(self.x)
+
+    def append(self, x, y, count, node_id, expansion_zoom, point, value_max, value_sum, value_count, categories):
+        self.x.append(x)
+        self.y.append(y)
+        self.count.append(count)
+        self.id.append(node_id)
+        self.expansion_zoom.append(expansion_zoom)
+        self.point.append(point)
+        self.value_max.append(value_max)
+        self.value_sum.append(value_sum)
+        self.value_count.append(value_count)
+        self.categories.append(categories)
+
+    def sorted_by_x(self) -> "_Level":
+        order = sorted(range(len(self.x)), key=self.x.__getitem__)
+        ordered = _Level()
+        for name in self.__slots__:
+            column = getattr(self, name)
+            values = [column[i] for i in order]
+            setattr(ordered, name, values if name == 'categories' else array(column.typecode, values))
+        return ordered
+
+
+class ClusterIndex:
+    """
+    points: enlem/boylamlı olay sözlükleri
+    value_field: kümelerde max/ortalaması verilecek sayısal alan (ör. magnitude)
+    category_field: kümelerde dağılımı sayılacak alan (ör. risk_level)
+    """
+
+    def __init__(self, points: Iterable[Dict[str, Any]], value_field: Optional[str] = None,
+                 category_field: Optional[str] = None, min_zoom: int = MIN_ZOOM,
+                 max_zoom: int = MAX_CLUSTER_ZOOM, radius: int = CLUSTER_RADIUS, extent: int = TILE_EXTENT):
+        self.value_field = value_field
+        self.category_field = category_field
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.radius = radius
+        self.extent = extent
+        self.points: List[Dict[str, Any]] = []
+        self.skipped = 0
+        self.levels: Dict[int, _Level] = {}
+
+        level = _Level()
+        for event in points:
+            coords = _coordinates(event) if isinstance(event, dict) else None
+            if coords is None:
+                self.skipped += 1
+                continue
+            lon, lat = coords
+            value = self._value(event)
+            category = event.get(category_field) if category_field else None
+            index = len(self.points)
+            self.points.append(event)
+            level.append(lon_to_x(lon), lat_to_y(lat), 1, self._node_id(index, max_zoom + 1), 0, index,
+                         value if value is not None else math.nan,
+                         value if value is not None else 0.0,
+                         1 if value is not None else 0,
+                         {str(category): 1} if category is not None else None)
+        self.levels[max_zoom + 1] = level.sorted_by_x()
+
+        for zoom in range(max_zoom, min_zoom - 1, -1):
+            previous = self.levels[zoom + 1]
+            clustered = self._cluster(previous, zoom)
+            # Hiç birleşme olmadıysa seviye bir üsttekiyle aynıdır (yüksek zoom'larda sık)
+            self.levels[zoom] = previous if clustered is None else clustered.sorted_by_x()
+
+    def _value(self, event):
+        if not self.value_field:
+            return None
+        try:
+            value = float(event.get(self.value_field))
+        except (TypeError, ValueError):
+            return None
+        return None if math.isnan(value) else value
+
+    @staticmethod
+    def _node_id(index: int, zoom: int) -> int:
+        # supercluster gibi: id'den zoom seviyesi okunabilir (alt 5 bit)
+        return (index << 5) + zoom
+
+    def _cluster(self, level: _Level, zoom: int) -> Optional[_Level]:
+        cell = self.radius / (self.extent * (1 << zoom))
+        xs, ys = level.x, level.y
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for i in range(len(level)):
+            groups.setdefault((int(xs[i] // cell), int(ys[i] // cell)), []).append(i)
+        if len(groups) == len(level):
+            return None
+
+        clustered = _Level()
+        for members in groups.values():
+            if len(members) == 1:
+                i = members[0]
+                clustered.append(xs[i], ys[i], level.count[i], level.id[i], level.expansion_zoom[i],
+                                 level.point[i], level.value_max[i], level.value_sum[i], level.value_count[i],
+                                 level.categories[i])
+                continue
+            count = sum(level.count[i] for i in members)
+            values = [level.value_max[i] for i in members if not math.isnan(level.value_max[i])]
+            categories = None
+            for i in members:
+                if level.categories[i]:
+                    categories = categories or {}
+                    for key, value in level.categories[i].items():
+                        categories[key] = categories.get(key, 0) + value
+            clustered.append(sum(xs[i] * level.count[i] for i in members) / count,
+                             sum(ys[i] * level.count[i] for i in members) / count,
+                             count, self._node_id(len(clustered), zoom), zoom + 1, -1,
+                             max(values) if values else math.nan,
+                             sum(level.value_sum[i] for i in members),
+                             sum(level.value_count[i] for i in members),
+                             categories)
+        return clustered
+
+    def _properties(self, level: _Level, i: int) -> Dict[str, Any]:
+        if level.point[i] >= 0:
+            return dict(self.points[level.point[i]], cluster=False)
+        properties = {'cluster': True, 'point_count': level.count[i], 'expansion_zoom': level.expansion_zoom[i]}
+        if self.value_field and level.value_count[i]:
+            properties[f'max_{self.value_field}'] = round(level.value_max[i], 3)
+            properties[f'mean_{self.value_field}'] = round(level.value_sum[i] / level.value_count[i], 3)
+        if self.category_field and level.categories[i]:
+            properties[f'{self.category_field}_counts'] = level.categories[i]
+        return properties
+
+    def _feature(self, level: _Level, i: int) -> Dict[str, Any]:
+        if level.point[i] >= 0:
+            lon, lat = _coordinates(self.points[level.point[i]])
+        else:
+            lon, lat = round(x_to_lon(level.x[i]), 6), round(y_to_lat(level.y[i]), 6)
+        return {
+            'type': 'Feature',
+            'id': level.id[i],
+            'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+            'properties': self._properties(level, i)
+        }
+
+    def _in_range(self, level: _Level, min_x: float, max_x: float, min_y: float, max_y: float) -> Iterable[int]:
+        ys = level.y
+        for i in range(bisect_left(level.x, min_x), bisect_right(level.x, max_x)):
+            if min_y <= ys[i] <= max_y:
+                yield i
+
+    def query(self, bbox: Optional[Tuple[float, float, float, float]], zoom: float,
+              limit: int = MAX_FEATURES) -> Dict[str, Any]:
+        """bbox (minLon, minLat, maxLon, maxLat) ve zoom için kümeleri GeoJSON FeatureCollection olarak döndürür"""
+        zoom_level = max(self.min_zoom, min(self.max_zoom + 1, int(math.floor(zoom))))
+        level = self.levels[zoom_level]
+        min_lon, min_lat, max_lon, max_lat = bbox or (-180.0, -90.0, 180.0, 90.0)
+        min_y, max_y = lat_to_y(max_lat), lat_to_y(min_lat)
+        if max_lon - min_lon >= 360:
+            ranges = [(0.0, 1.0)]
+        else:
+            min_lon = ((min_lon + 180) % 360 + 360) % 360 - 180
+            max_lon = ((max_lon + 180) % 360 + 360) % 360 - 180
+            if min_lon <= max_lon:
+                ranges = [(lon_to_x(min_lon), lon_to_x(max_lon))]
+            else:
+                # Anti-meridyeni geçen görünüm
+                ranges = [(lon_to_x(min_lon), 1.0), (0.0, lon_to_x(max_lon))]
+
+        features = []
+        point_count = 0
+        truncated = False
+        for min_x, max_x in ranges:
+            for i in self._in_range(level, min_x, max_x, min_y, max_y):
+                if len(features) >= limit:
+                    truncated = True
+                    break
+                features.append(self._feature(level, i))
+                point_count += level.count[i]
+            if truncated:
+                break
+
+        return {
+            'type': 'FeatureCollection',
+            'features': features,
+            'zoom': zoom_level,
+            'clustered': zoom_level <= self.max_zoom,
+            'count': len(features),
+            'point_count': point_count,
+            'total_points': len(self.points),
+            'truncated': truncated
+        }
+
+    def tile(self, z: int, x: int, y: int, extent: int = 4096, buffer: int = 64,
+             limit: int = MAX_FEATURES) -> List[Tuple[int, int, int, Dict[str, Any]]]:
+        """z/x/y tile'ı için (tile_x, tile_y, id, properties) listesi; koordinatlar 0..extent
+        aralığındadır, buffer kadar taşan noktalar komşu tile kenarında kesilmesin diye dahil edilir"""
+        level = self.levels[max(self.min_zoom, min(self.max_zoom + 1, z))]
+        scale = 1 << z
+        pad = buffer / extent
+        min_x, max_x = (x - pad) / scale, (x + 1 + pad) / scale
+        min_y, max_y = (y - pad) / scale, (y + 1 + pad) / scale
+        features = []
+        for i in self._in_range(level, min_x, max_x, min_y, max_y):
+            if len(features) >= limit:
+                break
+            features.append((int(round((level.x[i] * scale - x) * extent)),
+                             int(round((level.y[i] * scale - y) * extent)),
+                             level.id[i], self._properties(level, i)))
+        return features
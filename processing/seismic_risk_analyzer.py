@@ -4,9 +4,11 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from pathlib import Path
-import json
 import glob
 from .storage import log_message, veri_klasoru
+from .serialization import loads
+from .timeutils import event_epoch, parse_timestamp, to_datetime
+from .aftershock_forecast import AftershockForecaster, AFTERSHOCK_STATE_FILE, load_aftershock_state
 
 # Amerika kıtalarındaki önemli fay hatları
 FAULT_LINE_DATA = {
@@ -77,15 +79,15 @@ class SeismicRiskAnalyzer:
         
     def get_historical_earthquakes(self, bbox: Dict[str, float], min_magnitude: float = 7.0, years_back: int = 200) -> List[Dict]:
         historical_quakes = []
-        cutoff_date = datetime.now() - timedelta(days=years_back * 365)
+        cutoff_epoch = (datetime.now() - timedelta(days=years_back * 365)).timestamp()
         
         pattern = str(self.veri_klasoru / "earthquakes_*.json")
         earthquake_files = glob.glob(pattern)
         
         for file_path in earthquake_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    earthquakes = json.load(f)
+                with open(file_path, 'rb') as f:
+                    earthquakes = loads(f.read())
                     
                 if not isinstance(earthquakes, list):
                     continue
@@ -108,12 +110,11 @@ class SeismicRiskAnalyzer:
                     timestamp = eq.get('timestamp')
                     if timestamp:
                         try:
-                            if isinstance(timestamp, str):
-                                eq_date = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                            else:
+                            if not isinstance(timestamp, str):
                                 continue
                             
-                            if eq_date < cutoff_date:
+                            epoch = event_epoch(eq)
+                            if epoch is None or epoch < cutoff_epoch:
                                 continue
                                 
                             historical_quakes.append({
@@ -155,8 +156,8 @@ class SeismicRiskAnalyzer:
         if historical_quakes:
             most_recent = historical_quakes[0]
             try:
-                recent_date = datetime.fromisoformat(most_recent['timestamp'].replace('Z', '+00:00'))
-                if last_major_date is None or recent_date > last_major_date:
+                recent_date = to_datetime(parse_timestamp(most_recent['timestamp']))
+                if recent_date is not None and (last_major_date is None or recent_date > last_major_date):
                     last_major_date = recent_date
                     last_major_date_str = most_recent['timestamp']
             except:
@@ -254,7 +255,9 @@ class SeismicRiskAnalyzer:
         
         most_recent = historical_quakes[0]
         try:
-            recent_date = datetime.fromisoformat(most_recent['timestamp'].replace('Z', '+00:00'))
+            recent_date = to_datetime(parse_timestamp(most_recent['timestamp']))
+            if recent_date is None:
+                raise ValueError(f"Tarih okunamadı: {most_recent['timestamp']}")
             now = datetime.now()
             time_elapsed = (now - recent_date).days / 365.25
             
@@ -304,6 +307,27 @@ class SeismicRiskAnalyzer:
             for fault_id, data in self.fault_lines.items()
         ]
 
+    def forecast_aftershocks(self, n_simulations: int = 1000) -> List[Dict]:
+        # M5.0+ ana şoklar için Omori-Utsu/ETAS artçı tahmini; pipeline'ın kalıcı durumundan okunur
+        # (dosyaya yazılmaz). İstenen simülasyon sayısı ya da güncel zaman dilimi için tahmin yoksa
+        # yalnızca bellekte hesaplanır
+        state = load_aftershock_state(self.veri_klasoru / AFTERSHOCK_STATE_FILE)
+        if not state:
+            return []
+        forecaster = AftershockForecaster.from_state(state, state_file=self.veri_klasoru / AFTERSHOCK_STATE_FILE,
+                                                     n_simulations=n_simulations)
+        forecasts = forecaster.forecast_all()
+        
+        for forecast in forecasts:
+            lat = forecast['mainshock']['latitude']
+            lon = forecast['mainshock']['longitude']
+            forecast['fault_ids'] = [
+                fault_id for fault_id, data in self.fault_lines.items()
+                if data['bbox']['min_lat'] <= lat <= data['bbox']['max_lat']
+                and data['bbox']['min_lon'] <= lon <= data['bbox']['max_lon']
+            ]
+        return forecasts
+
     def detect_earthquake_swarms_from_data(self, earthquakes: List[Dict], min_count: int = 3, 
                                            max_magnitude: float = 5.0, cluster_radius_km: float = 100.0, 
                                            min_days: int = 0, max_days: int = 1) -> List[Dict]:
@@ -330,21 +354,8 @@ class SeismicRiskAnalyzer:
             eq_date = None
             if timestamp:
                 try:
-                    if isinstance(timestamp, str):
-                        clean_timestamp = timestamp.replace('Z', '').strip()
-                        try:
-                            if '.' in clean_timestamp:
-                                parts = clean_timestamp.split('.')
-                                eq_date = datetime.strptime(parts[0], '%Y-%m-%dT%H:%M:%S')
-                            else:
-                                eq_date = datetime.strptime(clean_timestamp, '%Y-%m-%dT%H:%M:%S')
-                        except:
-                            try:
-                                eq_date = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                            except:
-                                eq_date = datetime.now()
-                    else:
-                        eq_date = datetime.now()
+                    epoch = event_epoch(eq) if isinstance(timestamp, str) else None
+                    eq_date = to_datetime(epoch) if epoch is not None else datetime.now()
                     
                     if eq_date > datetime.now():
                         eq_date = datetime.now()
@@ -489,8 +500,8 @@ class SeismicRiskAnalyzer:
         
         for file_path in earthquake_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    earthquakes = json.load(f)
+                with open(file_path, 'rb') as f:
+                    earthquakes = loads(f.read())
                     
                 if not isinstance(earthquakes, list):
                     continue
@@ -514,20 +525,8 @@ class SeismicRiskAnalyzer:
                     eq_date = None
                     if timestamp:
                         try:
-                            if isinstance(timestamp, str):
-                                try:
-                                    clean_timestamp = timestamp.replace('Z', '').strip()
-                                    if '.' in clean_timestamp:
-                                        eq_date = datetime.strptime(clean_timestamp.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                                    else:
-                                        eq_date = datetime.strptime(clean_timestamp, '%Y-%m-%dT%H:%M:%S')
-                                except:
-                                    try:
-                                        eq_date = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                                    except:
-                                        eq_date = datetime.now()
-                            else:
-                                eq_date = datetime.now()
+                            epoch = event_epoch(eq) if isinstance(timestamp, str) else None
+                            eq_date = to_datetime(epoch) if epoch is not None else datetime.now()
                             
                             if eq_date > datetime.now():
                                 eq_date = datetime.now()
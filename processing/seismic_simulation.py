@@ -1,9 +1,49 @@
 # Deprem simülasyonu ve erken uyarı sistemi
 # Author: Fikret Ahıskalı
+#
+# simulate_earthquake tek bir senaryo üretir (dashboard'daki tetikleme). Monte Carlo toplu modu
+# (simulate_earthquake_batch) Amerika kıtalarında binlerce merkez üssü/büyüklük üretir; her senaryo
+# için algılayan sensör, P/S varış ve uyarı süresi hesaplanır, uyarı saniyelerinin dağılımı sensör
+# ve şehir başına toplanır. Senaryolar sütun dizileri (array('d')) halinde tutulur: her sensör/şehir
+# için bütün senaryolara karşı tek döngüde mesafe hesaplanır, sensör trigonometrisi yapılandırma
+# başına bir kez hesaplanır. Sabit boyutlu parçalar süreç havuzunda çalışır; parça seed'leri
+# çalışan sayısından bağımsız olduğundan aynı yapılandırma ve seed her makinede aynı sonucu verir.
 
+import hashlib
+import json
+import os
 import random
 import math
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+
+from .flood_analytics import percentile
+from .storage import log_message
+
+P_WAVE_SPEED = 6.0
+S_WAVE_SPEED = 3.5
+P_DETECTION_TIME = 5.0
+MAX_DETECTION_DISTANCE = 500
+EARTH_RADIUS_KM = 6371
+# Rastgele merkez üssünün sensörden uzaklığı (km) ve magnitüd aralığı
+EPICENTER_DISTANCE_RANGE = (200, 800)
+MAGNITUDE_RANGE = (4.0, 8.5)
+AMERICAS_BBOX = {'min_lon': -180, 'min_lat': -60, 'max_lon': -30, 'max_lat': 85}
+
+# Monte Carlo toplu simülasyon
+MONTE_CARLO_SEED = 20240601
+DEFAULT_SCENARIOS = 5000
+MAX_SCENARIOS = 200000
+SCENARIOS_PER_CHUNK = 2000
+# Şehir dağılımına yalnızca bu yarıçap içindeki depremler girer (algılama yarıçapıyla aynı)
+CITY_IMPACT_RADIUS_KM = MAX_DETECTION_DISTANCE
+WARNING_BIN_SECONDS = 10
+WARNING_PERCENTILES = (10, 25, 50, 75, 90)
 
 # 24 sabit sensör konumu
 SENSOR_LOCATIONS = [
@@ -33,10 +73,22 @@ SENSOR_LOCATIONS = [
     {'id': 'sensor_24', 'name': 'Montevideo Sensörü', 'latitude': -34.9, 'longitude': -56.1}
 ]
 
+# Toplu simülasyonda uyarı süresi dağılımı hesaplanan şehirler (varsayılan: sensörlerin bulunduğu şehirler)
+CITY_LOCATIONS = [
+    ("New York", 40.7, -74.0), ("Montreal", 45.5, -73.5), ("Boston", 42.3, -71.0),
+    ("Miami", 25.7, -80.2), ("Atlanta", 33.7, -84.4), ("Chicago", 41.8, -87.6),
+    ("Dallas", 32.7, -96.8), ("Denver", 39.7, -104.9), ("Kansas City", 39.1, -94.5),
+    ("Los Angeles", 34.0, -118.2), ("San Francisco", 37.7, -122.4), ("Seattle", 47.6, -122.3),
+    ("Phoenix", 33.4, -112.0), ("Anchorage", 61.2, -149.8), ("Mexico City", 19.4, -99.1),
+    ("Guatemala City", 14.6, -90.5), ("Bogota", 4.7, -74.0), ("Caracas", 10.5, -66.9),
+    ("Brasilia", -15.8, -47.8), ("Sao Paulo", -23.5, -46.6), ("Lima", -12.0, -77.0),
+    ("Buenos Aires", -34.6, -58.4), ("Santiago", -33.4, -70.6), ("Montevideo", -34.9, -56.1),
+]
+
 
 def haversine_distance(lat1, lon1, lat2, lon2):
     # Haversine formülü ile mesafe hesaplama (km)
-    R = 6371
+    R = EARTH_RADIUS_KM
     dlat = math.radians(lat2 - lat1)
     dlon = math.radians(lon2 - lon1)
     a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
@@ -54,28 +106,30 @@ def generate_random_epicenter(user_lat, user_lon):
             min_user_distance = distance
             closest_sensor_to_user = sensor
     
-    min_distance_from_sensor = 200
-    max_distance_from_sensor = 800
+    return offset_epicenter(closest_sensor_to_user['latitude'], closest_sensor_to_user['longitude'])
+
+
+def offset_epicenter(sensor_lat, sensor_lon, rng=random):
+    # Sensörden EPICENTER_DISTANCE_RANGE uzaklıkta rastgele yönde bir merkez üssü
+    min_distance_from_sensor, max_distance_from_sensor = EPICENTER_DISTANCE_RANGE
     
-    angle = random.uniform(0, 2 * math.pi)
-    distance_from_sensor = random.uniform(min_distance_from_sensor, max_distance_from_sensor)
+    angle = rng.uniform(0, 2 * math.pi)
+    distance_from_sensor = rng.uniform(min_distance_from_sensor, max_distance_from_sensor)
     
     lat_offset = (distance_from_sensor / 111.0) * math.cos(angle)
-    lon_offset = (distance_from_sensor / (111.0 * math.cos(math.radians(closest_sensor_to_user['latitude'])))) * math.sin(angle)
+    lon_offset = (distance_from_sensor / (111.0 * math.cos(math.radians(sensor_lat)))) * math.sin(angle)
     
-    epicenter_lat = closest_sensor_to_user['latitude'] + lat_offset
-    epicenter_lon = closest_sensor_to_user['longitude'] + lon_offset
+    epicenter_lat = sensor_lat + lat_offset
+    epicenter_lon = sensor_lon + lon_offset
     
     # Amerika kıtaları sınırları içinde tut
-    americas_bbox = {'min_lon': -180, 'min_lat': -60, 'max_lon': -30, 'max_lat': 85}
-    epicenter_lat = max(americas_bbox['min_lat'], min(americas_bbox['max_lat'], epicenter_lat))
-    epicenter_lon = max(americas_bbox['min_lon'], min(americas_bbox['max_lon'], epicenter_lon))
+    epicenter_lat = max(AMERICAS_BBOX['min_lat'], min(AMERICAS_BBOX['max_lat'], epicenter_lat))
+    epicenter_lon = max(AMERICAS_BBOX['min_lon'], min(AMERICAS_BBOX['max_lon'], epicenter_lon))
     
     return epicenter_lat, epicenter_lon
 
 
 def find_detecting_sensors(epicenter_lat, epicenter_lon):
-    MAX_DETECTION_DISTANCE = 500
     detecting_sensors = []
     
     for sensor in SENSOR_LOCATIONS:
@@ -110,10 +164,6 @@ def find_detecting_sensors(epicenter_lat, epicenter_lon):
 
 
 def calculate_wave_analysis(distance_km):
-    P_WAVE_SPEED = 6.0
-    S_WAVE_SPEED = 3.5
-    P_DETECTION_TIME = 5.0
-    
     p_wave_arrival_time = (distance_km / P_WAVE_SPEED)
     s_wave_arrival_time = (distance_km / S_WAVE_SPEED)
     early_warning_time = max(0, s_wave_arrival_time - P_DETECTION_TIME)
@@ -157,7 +207,7 @@ def simulate_earthquake(user_lat, user_lon, epicenter_lat=None, epicenter_lon=No
     if epicenter_lat is None or epicenter_lon is None:
         epicenter_lat, epicenter_lon = generate_random_epicenter(user_lat, user_lon)
     
-    magnitude = round(random.uniform(4.0, 8.5), 1)
+    magnitude = round(random.uniform(*MAGNITUDE_RANGE), 1)
     
     closest_sensor, min_distance, all_detecting_sensors = find_detecting_sensors(epicenter_lat, epicenter_lon)
     
@@ -199,3 +249,307 @@ def simulate_earthquake(user_lat, user_lon, epicenter_lat=None, epicenter_lon=No
         'critical_actions': critical_actions,
         'timestamp': datetime.now().isoformat()
     }
+
+
+def _coordinate(lat, lon):
+    try:
+        lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError):
+        raise ValueError("latitude and longitude must be numbers")
+    if not (-90 < lat < 90 and -180 <= lon <= 180):
+        raise ValueError(f"coordinate out of range: {lat}, {lon}")
+    return lat, lon
+
+
+def normalize_sensors(sensors=None):
+    """Sensör yapılandırması -> ((id, ad, enlem, boylam), ...); {id, name, latitude, longitude} ya da
+    [id, ad, enlem, boylam], verilmezse SENSOR_LOCATIONS"""
+    result = []
+    for number, sensor in enumerate(SENSOR_LOCATIONS if sensors is None else sensors, 1):
+        if isinstance(sensor, dict):
+            sensor_id, name, lat, lon = sensor.get('id'), sensor.get('name'), sensor.get('latitude'), sensor.get('longitude')
+        elif isinstance(sensor, (list, tuple)) and len(sensor) == 4:
+            sensor_id, name, lat, lon = sensor
+        else:
+            raise ValueError("sensors must be {id, name, latitude, longitude} objects or [id, name, lat, lon] lists")
+        lat, lon = _coordinate(lat, lon)
+        sensor_id = str(sensor_id or f'sensor_{number}')
+        result.append((sensor_id, str(name or sensor_id), lat, lon))
+    if not result:
+        raise ValueError("at least one sensor is required")
+    return tuple(result)
+
+
+def normalize_cities(cities=None):
+    """Şehir listesi -> ((ad, enlem, boylam), ...); {name, latitude, longitude} ya da [ad, enlem, boylam]"""
+    result = []
+    for city in CITY_LOCATIONS if cities is None else cities:
+        if isinstance(city, dict):
+            name, lat, lon = city.get('name'), city.get('latitude'), city.get('longitude')
+        elif isinstance(city, (list, tuple)) and len(city) == 3:
+            name, lat, lon = city
+        else:
+            raise ValueError("cities must be {name, latitude, longitude} objects or [name, lat, lon] lists")
+        lat, lon = _coordinate(lat, lon)
+        result.append((str(name), lat, lon))
+    return tuple(result)
+
+
+def batch_options(data):
+    """POST gövdesini simulate_earthquake_batch argümanlarına çevirir; geçersiz değerde ValueError"""
+    data = data or {}
+    try:
+        n_scenarios = int(data.get('scenarios', DEFAULT_SCENARIOS))
+        seed = int(data.get('seed', MONTE_CARLO_SEED))
+        min_magnitude, max_magnitude = (float(v) for v in data.get('magnitude_range', MAGNITUDE_RANGE))
+    except (TypeError, ValueError):
+        raise ValueError("scenarios and seed must be integers, magnitude_range must be [min, max]")
+    if not 1 <= n_scenarios <= MAX_SCENARIOS:
+        raise ValueError(f"scenarios must be between 1 and {MAX_SCENARIOS}")
+    if not 0 <= min_magnitude <= max_magnitude <= 10:
+        raise ValueError("magnitude_range must satisfy 0 <= min <= max <= 10")
+    return {
+        'n_scenarios': n_scenarios,
+        'seed': seed,
+        'magnitude_range': (min_magnitude, max_magnitude),
+        'sensors': normalize_sensors(data.get('sensors')),
+        'cities': normalize_cities(data.get('cities')),
+        'include_scenarios': bool(data.get('include_scenarios', False))
+    }
+
+
+def configuration_key(options):
+    """Sensör/şehir yapılandırmasının anahtarı (önbellek anahtarı; senaryo parametreleri girmez)"""
+    text = json.dumps([options['sensors'], options['cities']])
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def is_default_run(options):
+    """Varsayılan senaryo parametreleri (sayı, seed, büyüklük aralığı) ve senaryo sütunları istenmemiş mi;
+    yalnızca bu sonuçlar yapılandırma başına önbelleğe alınır"""
+    return (options['n_scenarios'] == DEFAULT_SCENARIOS and options['seed'] == MONTE_CARLO_SEED
+            and tuple(options['magnitude_range']) == MAGNITUDE_RANGE and not options['include_scenarios'])
+
+
+@lru_cache(maxsize=32)
+def _site_geometry(sites):
+    # (enlem rad, boylam rad, cos enlem); sensör/şehir yapılandırması başına süreçte bir kez
+    return tuple((math.radians(lat), math.radians(lon), math.cos(math.radians(lat))) for lat, lon in sites)
+
+
+def _distance_column(site, lat_rad, lon_rad, cos_lat):
+    # Bir noktanın bütün senaryo merkez üslerine mesafesi (haversine_distance ile aynı formül)
+    site_lat, site_lon, site_cos = site
+    sin, asin, sqrt = math.sin, math.asin, math.sqrt
+    return array('d', (
+        2 * EARTH_RADIUS_KM * asin(sqrt(sin((site_lat - lat) / 2) ** 2 + cos * site_cos * sin((site_lon - lon) / 2) ** 2))
+        for lat, lon, cos in zip(lat_rad, lon_rad, cos_lat)))
+
+
+def _simulate_chunk(args):
+    # Süreç havuzunda çalışır: senaryoları üretip sütunlarını ve şehir başına uyarı örneklerini döndürür
+    seed, n_scenarios, sensors, cities, magnitude_range = args
+    rng = random.Random(seed)
+
+    # Merkez üssü: rastgele bir sensörden EPICENTER_DISTANCE_RANGE uzaklıkta (tekli simülasyonla aynı üretici)
+    lats, lons, magnitudes = array('d'), array('d'), array('d')
+    for _ in range(n_scenarios):
+        _, _, sensor_lat, sensor_lon = sensors[rng.randrange(len(sensors))]
+        lat, lon = offset_epicenter(sensor_lat, sensor_lon, rng)
+        lats.append(lat)
+        lons.append(lon)
+        magnitudes.append(round(rng.uniform(*magnitude_range), 1))
+    lat_rad = array('d', map(math.radians, lats))
+    lon_rad = array('d', map(math.radians, lons))
+    cos_lat = array('d', map(math.cos, lat_rad))
+
+    # Algılayan sensör en yakın sensördür (find_detecting_sensors: menzildekilerin en yakını ya da en yakın)
+    distances = array('d', [math.inf]) * n_scenarios
+    detecting = array('i', [0]) * n_scenarios
+    in_range = array('i', [0]) * n_scenarios
+    for index, site in enumerate(_site_geometry(tuple((s[2], s[3]) for s in sensors))):
+        for position, distance in enumerate(_distance_column(site, lat_rad, lon_rad, cos_lat)):
+            if distance < distances[position]:
+                distances[position] = distance
+                detecting[position] = index
+            if distance <= MAX_DETECTION_DISTANCE:
+                in_range[position] += 1
+
+    p_arrival = array('d', (d / P_WAVE_SPEED for d in distances))
+    s_arrival = array('d', (d / S_WAVE_SPEED for d in distances))
+    warning = array('d', (max(0.0, t - P_DETECTION_TIME) for t in s_arrival))
+
+    # Şehirde uyarı süresi: S dalgasının şehre varışı - uyarı anı (P'nin algılayan sensöre varışı + algılama)
+    alert_times = array('d', (t + P_DETECTION_TIME for t in p_arrival))
+    city_warnings, city_magnitudes = [], []
+    for site in _site_geometry(tuple((c[1], c[2]) for c in cities)):
+        warnings, affected = array('d'), array('d')
+        for position, distance in enumerate(_distance_column(site, lat_rad, lon_rad, cos_lat)):
+            if distance <= CITY_IMPACT_RADIUS_KM:
+                warnings.append(max(0.0, distance / S_WAVE_SPEED - alert_times[position]))
+                affected.append(magnitudes[position])
+        city_warnings.append(warnings)
+        city_magnitudes.append(affected)
+
+    return {
+        'latitude': lats, 'longitude': lons, 'magnitude': magnitudes, 'sensor': detecting,
+        'sensors_in_range': in_range, 'distance_km': distances, 'p_arrival': p_arrival,
+        's_arrival': s_arrival, 'warning': warning,
+        'city_warnings': city_warnings, 'city_magnitudes': city_magnitudes
+    }
+
+
+# İstekler arasında paylaşılan süreç havuzu (ilk ihtiyaçta oluşturulur)
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+        return _pool, _pool_workers
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_chunks(tasks, max_workers=None):
+    workers = max(1, min(max_workers or min(4, os.cpu_count() or 1), len(tasks)))
+    if workers > 1:
+        try:
+            pool, pool_workers = _get_pool(workers)
+            return list(pool.map(_simulate_chunk, tasks)), min(pool_workers, len(tasks))
+        except Exception as e:
+            _reset_pool()
+            log_message(f"Monte Carlo simülasyonu süreç havuzunda çalıştırılamadı, tek süreçte devam ediliyor: {e}", "WARNING")
+    return [_simulate_chunk(task) for task in tasks], 1
+
+
+def warning_distribution(values):
+    """Uyarı saniyelerinin dağılımı: ortalama, yüzdelikler, kör bölge (0 sn) oranı ve histogram"""
+    ordered = sorted(values)
+    if not ordered:
+        return {'count': 0, 'mean_seconds': None, 'min_seconds': None, 'max_seconds': None,
+                'percentiles': {}, 'blind_zone_ratio': None,
+                'histogram': {'bin_seconds': WARNING_BIN_SECONDS, 'counts': []}}
+    histogram = [0] * (int(ordered[-1] // WARNING_BIN_SECONDS) + 1)
+    for value in ordered:
+        histogram[int(value // WARNING_BIN_SECONDS)] += 1
+    return {
+        'count': len(ordered),
+        'mean_seconds': round(sum(ordered) / len(ordered), 1),
+        'min_seconds': round(ordered[0], 1),
+        'max_seconds': round(ordered[-1], 1),
+        'percentiles': {f'p{q}': round(percentile(ordered, q), 1) for q in WARNING_PERCENTILES},
+        'blind_zone_ratio': round(bisect_right(ordered, 0.0) / len(ordered), 4),
+        'histogram': {'bin_seconds': WARNING_BIN_SECONDS, 'counts': histogram}
+    }
+
+
+def simulate_earthquake_batch(n_scenarios=DEFAULT_SCENARIOS, sensors=None, cities=None, seed=MONTE_CARLO_SEED,
+                              magnitude_range=MAGNITUDE_RANGE, include_scenarios=False, max_workers=None):
+    """Monte Carlo toplu simülasyon: n_scenarios rastgele merkez üssü/büyüklük için algılayan sensör,
+    P/S varış ve uyarı süresi; uyarı saniyesi dağılımı sensör ve şehir başına. include_scenarios ile
+    senaryolar sütunlar halinde döner."""
+    if n_scenarios < 1:
+        raise ValueError("n_scenarios must be positive")
+    sensors = normalize_sensors(sensors)
+    cities = normalize_cities(cities)
+    if seed is None:
+        seed = random.randrange(1 << 30)
+    magnitude_range = tuple(float(v) for v in magnitude_range)
+    options = {'n_scenarios': n_scenarios, 'seed': seed, 'magnitude_range': magnitude_range,
+               'sensors': sensors, 'cities': cities, 'include_scenarios': bool(include_scenarios)}
+    started = time.perf_counter()
+
+    # Parça seed'leri (seed, parça no)'dan türetilir: sonuç çalışan sayısından bağımsızdır
+    tasks = [(f"{seed}:{number}", min(SCENARIOS_PER_CHUNK, n_scenarios - start), sensors, cities, magnitude_range)
+             for number, start in enumerate(range(0, n_scenarios, SCENARIOS_PER_CHUNK))]
+    chunks, workers = _run_chunks(tasks, max_workers)
+
+    columns = {name: chunks[0][name] for name in chunks[0] if not name.startswith('city_')}
+    city_warnings = chunks[0]['city_warnings']
+    city_magnitudes = chunks[0]['city_magnitudes']
+    for chunk in chunks[1:]:
+        for name in columns:
+            columns[name].extend(chunk[name])
+        for index in range(len(cities)):
+            city_warnings[index].extend(chunk['city_warnings'][index])
+            city_magnitudes[index].extend(chunk['city_magnitudes'][index])
+
+    sensor_warnings = [array('d') for _ in sensors]
+    sensor_distances = [0.0] * len(sensors)
+    for index, warning, distance in zip(columns['sensor'], columns['warning'], columns['distance_km']):
+        sensor_warnings[index].append(warning)
+        sensor_distances[index] += distance
+
+    sensor_stats = []
+    for (sensor_id, name, lat, lon), warnings, total_distance in zip(sensors, sensor_warnings, sensor_distances):
+        sensor_stats.append({
+            'id': sensor_id,
+            'name': name,
+            'latitude': lat,
+            'longitude': lon,
+            'detections': len(warnings),
+            'detection_share': round(len(warnings) / n_scenarios, 4),
+            'mean_distance_km': round(total_distance / len(warnings), 1) if warnings else None,
+            'warning': warning_distribution(warnings)
+        })
+
+    city_stats = []
+    for (name, lat, lon), warnings, magnitudes in zip(cities, city_warnings, city_magnitudes):
+        by_severity = {}
+        for magnitude in magnitudes:
+            severity = get_severity_and_actions(magnitude)[0]
+            by_severity[severity] = by_severity.get(severity, 0) + 1
+        city_stats.append({
+            'name': name,
+            'latitude': lat,
+            'longitude': lon,
+            'affected_scenarios': len(warnings),
+            'by_severity': by_severity,
+            'warning': warning_distribution(warnings)
+        })
+
+    result = {
+        'configuration_key': configuration_key(options),
+        'scenario_count': n_scenarios,
+        'seed': seed,
+        'magnitude_range': list(magnitude_range),
+        'parameters': {
+            'p_wave_speed_km_s': P_WAVE_SPEED,
+            's_wave_speed_km_s': S_WAVE_SPEED,
+            'p_detection_time_seconds': P_DETECTION_TIME,
+            'max_detection_distance_km': MAX_DETECTION_DISTANCE,
+            'city_impact_radius_km': CITY_IMPACT_RADIUS_KM
+        },
+        'warning': warning_distribution(columns['warning']),
+        'undetected_ratio': round(sum(1 for count in columns['sensors_in_range'] if count == 0) / n_scenarios, 4),
+        'sensors': sensor_stats,
+        'cities': city_stats,
+        'workers': workers,
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+        'timestamp': datetime.now().isoformat()
+    }
+    if include_scenarios:
+        result['scenarios'] = {
+            'epicenter_latitude': [round(v, 4) for v in columns['latitude']],
+            'epicenter_longitude': [round(v, 4) for v in columns['longitude']],
+            'magnitude': list(columns['magnitude']),
+            'sensor_id': [sensors[index][0] for index in columns['sensor']],
+            'sensors_in_range': list(columns['sensors_in_range']),
+            'distance_km': [round(v, 1) for v in columns['distance_km']],
+            'p_wave_arrival_time_seconds': [round(v, 1) for v in columns['p_arrival']],
+            's_wave_arrival_time_seconds': [round(v, 1) for v in columns['s_arrival']],
+            'early_warning_time_seconds': [round(v, 1) for v in columns['warning']]
+        }
+    return result
@@ -0,0 +1,108 @@
+# JSON serileştirme katmanı (pipeline dosya yazımları ve dashboard yanıtları)
+# orjson kuruluysa hızlı yol kullanılır, yoksa standart json; SDEWS_JSON_BACKEND=json ile
+# standart kütüphane zorlanabilir. Çıktı varsayılan olarak kompakttır (indent yok), UTF-8 bayttır.
+#
+# Model nesneleri (toDictionary'li) önce ayrı bir listeye çevrilmez; serileştirici default
+# kancasıyla her nesneyi kodlama sırasında tek tek çevirir. datetime'lar storage'ın biçimiyle
+# ('%Y-%m-%d %H:%M:%S') yazılır. orjson 64 bitten büyük tamsayı gibi desteklemediği bir değerde
+# standart json'a düşer. Fark: orjson NaN/Infinity'yi null yazar (standart json geçersiz NaN yazar).
+#
+# RawJSON önceden kodlanmış baytları taşır: dumps() üst seviye sözlükte (ya da tek başına)
+# RawJSON değerlerini yeniden kodlamadan yerleştirir; dashboard veri sürümü başına kodlanmış
+# listeleri önbellekte tutup yalnızca küçük alanları (count, timestamp) her istekte kodlar.
+
+from __future__ import annotations
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from models.event_batch import EventBatch
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None and os.environ.get('SDEWS_JSON_BACKEND', '').lower() != 'json' else 'json'
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class RawJSON:
+    """Önceden kodlanmış JSON değeri"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+
+def storage_default(obj: Any) -> Any:
+    # storage.veriyi_hazirla + tarih_formatla ile aynı kurallar
+    if hasattr(obj, 'toDictionary'):
+        return obj.toDictionary()
+    if isinstance(obj, datetime):
+        return obj.strftime(DATETIME_FORMAT)
+    return str(obj)
+
+
+def _with_raw(default: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def hook(obj):
+        # İç içe RawJSON (yalnızca üst seviye doğrudan yerleştirilir)
+        if isinstance(obj, RawJSON):
+            return loads(obj.data)
+        return default(obj)
+    return hook
+
+
+def _dumps(obj: Any, default: Callable[[Any], Any], indent: bool) -> bytes:
+    hook = _with_raw(default)
+    if BACKEND == 'orjson':
+        try:
+            return orjson.dumps(obj, default=hook,
+                                option=_ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, default=hook, indent=2 if indent else None,
+                      separators=None if indent else (',', ':')).encode('utf-8')
+
+
+def dumps(obj: Any, default: Callable[[Any], Any] = storage_default, indent: bool = False) -> bytes:
+    if isinstance(obj, RawJSON):
+        return obj.data
+    if not indent and isinstance(obj, dict) and any(isinstance(v, RawJSON) for v in obj.values()):
+        parts = []
+        for key, value in obj.items():
+            encoded = value.data if isinstance(value, RawJSON) else _dumps(value, default, False)
+            parts.append(_dumps(str(key), default, False) + b':' + encoded)
+        return b'{' + b','.join(parts) + b'}'
+    return _dumps(obj, default, indent)
+
+
+def loads(data: Any) -> Any:
+    if BACKEND == 'orjson':
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode('utf-8')
+    return json.loads(data)
+
+
+def encode_events(events: Iterable[Any], indent: bool = False) -> bytes:
+    """Model nesneleri ya da sözlüklerden oluşan olay listesini (veya EventBatch'i) kodlar"""
+    if isinstance(events, EventBatch):
+        events = events.records()
+    return dumps(events if isinstance(events, list) else list(events), indent=indent)
+
+
+def read_json(path: Any, default: Optional[Any] = None) -> Any:
+    try:
+        return loads(Path(path).read_bytes())
+    except FileNotFoundError:
+        return default
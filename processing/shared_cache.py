@@ -0,0 +1,162 @@
+# Süreçler arası paylaşılan önbellek (dashboard worker'ları için)
+# Çok worker'lı sunucuda (serve.py) her worker data/ JSON'larını ayrı ayrı okuyup işlemesin
+# diye, yükleyici sonuçları veri sürümüyle anahtarlanmış pickle dosyalarında tutulur:
+#   data/.cache/<anahtar>.<sürüm>.pkl
+# Sürüm, kaynak dosyaların (yol, mtime_ns, boyut) bilgisinden üretilir; dosya değişince
+# yeni sürüm oluşur ve eskisi silinir. Şimdiki zamana bağlı sonuçlar (son 1 hafta filtresi
+# gibi) için ttl verilirse sürüme zaman dilimi de eklenir.
+#
+# Okuma sırası: süreç içi bellek -> paylaşılan dosya -> oluştur. Oluşturma dosya kilidiyle
+# (fcntl) yapılır, aynı anda gelen diğer worker'lar kilidi bekleyip hazır dosyayı okur.
+
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from .storage import log_message, veri_klasoru
+
+try:
+    import fcntl
+except ImportError:  # Windows: kilit yok, en kötü ihtimalle iki worker aynı sonucu üretir
+    fcntl = None
+
+CACHE_DIR = ".cache"
+
+
+def data_version(paths: Iterable[Any], ttl: Optional[float] = None, now: Optional[float] = None) -> str:
+    parts = []
+    for path in sorted(str(p) for p in paths if p):
+        try:
+            st = os.stat(path)
+            parts.append(f"{path}:{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            parts.append(f"{path}:-")
+    if ttl:
+        parts.append(f"t{int((now if now is not None else time.time()) // ttl)}")
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class SharedCache:
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory) if directory else (veri_klasoru / CACHE_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self._memory: Dict[str, Tuple[str, Any]] = {}
+        self._used: Dict[str, float] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+    def _safe_key(self, key: str) -> str:
+        return "".join(c if c.isalnum() or c in "-_" else "_" for c in key)
+
+    def _path(self, key: str, version: str) -> Path:
+        return self.directory / f"{self._safe_key(key)}.{version}.pkl"
+
+    def _read(self, path: Path):
+        try:
+            with path.open("rb") as f:
+                return True, pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception as e:
+            log_message(f"Paylaşılan önbellek okunamadı ({path.name}): {e}", "WARNING")
+            return False, None
+
+    def _write(self, key: str, path: Path, value: Any):
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        # Aynı anahtarın eski sürümleri
+        for stale in self.directory.glob(f"{self._safe_key(key)}.*.pkl"):
+            if stale != path:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+    def _file_lock(self, key: str):
+        if fcntl is None:
+            return None
+        handle = (self.directory / f"{self._safe_key(key)}.lock").open("a")
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def get(self, key: str, paths: Iterable[Any], builder: Callable[[], Any],
+            ttl: Optional[float] = None) -> Tuple[Any, str]:
+        """(değer, kaynak) döndürür; kaynak 'memory', 'shared' ya da 'build'."""
+        version = data_version(paths, ttl=ttl)
+        with self.lock:
+            self._used[key] = time.time()
+            cached = self._memory.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1], 'memory'
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        path = self._path(key, version)
+        # Aynı worker'daki thread'ler de tek seferde oluşturur
+        with build_lock:
+            with self.lock:
+                cached = self._memory.get(key)
+                if cached is not None and cached[0] == version:
+                    return cached[1], 'memory'
+
+            found, value = self._read(path)
+            source = 'shared'
+            if not found:
+                handle = self._file_lock(key)
+                try:
+                    found, value = self._read(path)
+                    if not found:
+                        value = builder()
+                        source = 'build'
+                        try:
+                            self._write(key, path, value)
+                        except Exception as e:
+                            log_message(f"Paylaşılan önbelleğe yazılamadı ({key}): {e}", "WARNING")
+                finally:
+                    if handle is not None:
+                        fcntl.flock(handle, fcntl.LOCK_UN)
+                        handle.close()
+
+            with self.lock:
+                self._memory[key] = (version, value)
+            return value, source
+
+    def prune(self, prefix: str, max_entries: int):
+        """prefix ile başlayan anahtarlardan en fazla max_entries tanesi tutulur: bellekte en son
+        kullanılanlar, data/.cache'te en son yazılanlar kalır (istemci girdisine bağlı anahtarlar için)"""
+        with self.lock:
+            keys = sorted((k for k in self._memory if k.startswith(prefix)),
+                          key=lambda k: self._used.get(k, 0.0), reverse=True)
+            for key in keys[max_entries:]:
+                self._memory.pop(key, None)
+                self._used.pop(key, None)
+                self._build_locks.pop(key, None)
+
+        def _mtime(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        files = sorted(self.directory.glob(f"{self._safe_key(prefix)}*.pkl"), key=_mtime, reverse=True)
+        for path in files[max_entries:]:
+            for stale in (path, self.directory / f"{path.name.split('.')[0]}.lock"):
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+    def clear(self):
+        with self.lock:
+            self._memory.clear()
+        for path in self.directory.glob("*.pkl"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -1,16 +1,18 @@
 import csv
-import json
 import glob
 import os
 from pathlib import Path
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
+from .serialization import encode_events
+from models.event_batch import EventBatch
 
 project_path = Path(__file__).resolve().parent.parent
-veri_klasoru = project_path / "data"
+# SDEWS_DATA_DIR ile veri klasörü değiştirilebilir (ör. yük testi fixture'ları, ayrı ortamlar)
+veri_klasoru = Path(os.environ["SDEWS_DATA_DIR"]).resolve() if os.environ.get("SDEWS_DATA_DIR") else project_path / "data"
 log_klasoru = project_path / "logs"
 
-veri_klasoru.mkdir(exist_ok=True)
+veri_klasoru.mkdir(parents=True, exist_ok=True)
 log_klasoru.mkdir(exist_ok=True)
 
 
@@ -50,6 +52,9 @@ def eski_dosyalari_temizle():
                 log_message(f"app.log dosyası silinemedi: {hata}", "WARNING")
 
 def veriyi_hazirla(ham_liste):
+    # EventBatch satırları zaten sözlüktür
+    if isinstance(ham_liste, EventBatch):
+        return ham_liste.records()
     duzenli_liste = []
     for madde in ham_liste:
         if hasattr(madde, 'toDictionary'):
@@ -85,16 +90,22 @@ def save_events_to_json(events, filename="events.json"):
 
     file_path = veri_klasoru / filename
 
-    serializable_events = veriyi_hazirla(events)
+    # Model nesneleri kodlama sırasında sözlüğe çevrilir (veriyi_hazirla ara listesi yok),
+    # EventBatch satırları doğrudan kodlanır; datetime'lar '%Y-%m-%d %H:%M:%S' biçiminde yazılır
+    payload = encode_events(events)
+
+    with file_path.open("wb") as f:
+        f.write(payload)
 
-    # datetime objelerini ISO'dan kendi insiyatifimize uymak için formatladık
-    def tarih_formatla(obj):
-        if isinstance(obj, datetime):
-            return obj.strftime('%Y-%m-%d %H:%M:%S')
-        return str(obj)
 
-    with file_path.open("w", encoding="utf-8") as f:
-        json.dump(serializable_events, f, ensure_ascii=False, indent=2, default=tarih_formatla)
+def save_json_bytes(payload, filename):
+    # Süreç havuzunda önceden serileştirilmiş JSON çıktısını dosyaya yazar
+    if not payload:
+        return
+
+    file_path = veri_klasoru / filename
+    with file_path.open("wb") as f:
+        f.write(payload)
 
 
 def log_message(message, level="INFO"):
@@ -0,0 +1,436 @@
+# Artımlı (streaming) istatistik motoru
+# Deprem ve hava durumu metrikleri için sayım, ortalama, varyans (Welford),
+# yüzdelikler (t-digest) ve bölge sayaçlarını 1h/24h/7d kayan pencerelerde tutar.
+# Pipeline her batch'te update() çağırır; okuma tarafı hazır toplamları kullanır.
+
+from __future__ import annotations
+import math
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .storage import log_message, veri_klasoru
+from .timeutils import parse_timestamp
+from .serialization import dumps, loads
+
+STATS_STATE_FILE = "stats.json"
+
+# pencere adı -> (toplam süre saniye, bucket sayısı)
+DEFAULT_WINDOWS = {
+    '1h': (3600, 60),
+    '24h': (86400, 96),
+    '7d': (604800, 168),
+}
+
+# event tipi -> (takip edilen sayısal alanlar, zaman alanı, tekrar kontrolü için anahtar alanlar)
+EVENT_TYPES = {
+    'earthquake': (('magnitude',), 'timestamp', ('timestamp', 'latitude', 'longitude', 'magnitude')),
+    'weather': (('temperature', 'wind_speed', 'humidity', 'pressure'), 'time', ('location', 'time')),
+}
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+@lru_cache(maxsize=4096)
+def classify_region(location: str) -> str:
+    # dashboard.calculate_statistics ile aynı bölge eşlemesi; aynı yer adı tekrar tekrar
+    # geldiği için sonuç önbelleğe alınır
+    if not location:
+        return 'Other'
+    if 'Alaska' in location:
+        return 'Alaska'
+    elif 'California' in location or 'CA' in location:
+        return 'California'
+    elif 'Japan' in location:
+        return 'Japan'
+    elif 'Chile' in location:
+        return 'Chile'
+    elif 'Indonesia' in location:
+        return 'Indonesia'
+    elif 'Puerto Rico' in location:
+        return 'Puerto Rico'
+    return 'Other'
+
+
+class RunningStats:
+    # Welford algoritması; merge/subtract ile bucket toplamları O(1) güncellenir
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0,
+                 min_value: Optional[float] = None, max_value: Optional[float] = None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = min_value
+        self.max = max_value
+
+    def add(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+
+    def merge(self, other: "RunningStats"):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = other.min if other.min < self.min else self.min
+        self.max = other.max if other.max > self.max else self.max
+
+    def subtract(self, other: "RunningStats"):
+        # merge'ün tersi; min/max geri alınamadığı için pencere bunları bucket'lardan okur
+        if other.count == 0:
+            return
+        remaining = self.count - other.count
+        if remaining <= 0:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            self.min = self.max = None
+            return
+        mean = (self.count * self.mean - other.count * other.mean) / remaining
+        delta = other.mean - mean
+        self.m2 = max(0.0, self.m2 - other.m2 - delta * delta * remaining * other.count / self.count)
+        self.mean = mean
+        self.count = remaining
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count > 1 else 0.0
+
+    def to_list(self) -> list:
+        return [self.count, self.mean, self.m2, self.min, self.max]
+
+    @classmethod
+    def from_list(cls, values: list) -> "RunningStats":
+        return cls(*values)
+
+
+class TDigest:
+    # Basit merging t-digest: centroid'ler [ortalama, ağırlık] olarak saklanır
+
+    def __init__(self, compression: float = 100.0):
+        self.compression = compression
+        self.centroids: List[List[float]] = []
+        self._buffer: List[List[float]] = []
+        self.count = 0.0
+
+    def add(self, x: float, weight: float = 1.0):
+        self._buffer.append([x, weight])
+        self.count += weight
+        if len(self._buffer) > self.compression * 5:
+            self._compress()
+
+    def merge(self, other: "TDigest"):
+        other._compress()
+        self._buffer.extend([c[0], c[1]] for c in other.centroids)
+        self.count += other.count
+        if len(self._buffer) > self.compression * 5:
+            self._compress()
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        points = sorted(self.centroids + self._buffer, key=lambda c: c[0])
+        self._buffer = []
+        total = sum(c[1] for c in points)
+        merged = [list(points[0])]
+        cumulative = 0.0
+        for mean, weight in points[1:]:
+            current = merged[-1]
+            q = (cumulative + current[1] / 2.0) / total
+            limit = max(1.0, 4.0 * total * q * (1.0 - q) / self.compression)
+            if current[1] + weight <= limit:
+                new_weight = current[1] + weight
+                current[0] += (mean - current[0]) * weight / new_weight
+                current[1] = new_weight
+            else:
+                cumulative += current[1]
+                merged.append([mean, weight])
+        self.centroids = merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        self._compress()
+        if not self.centroids:
+            return None
+        if len(self.centroids) == 1:
+            return self.centroids[0][0]
+        target = q * self.count
+        cumulative = 0.0
+        previous_mid, previous_mean = None, None
+        for mean, weight in self.centroids:
+            mid = cumulative + weight / 2.0
+            if target <= mid:
+                if previous_mid is None:
+                    return mean
+                ratio = (target - previous_mid) / (mid - previous_mid)
+                return previous_mean + ratio * (mean - previous_mean)
+            previous_mid, previous_mean = mid, mean
+            cumulative += weight
+        return self.centroids[-1][0]
+
+    def to_list(self) -> list:
+        self._compress()
+        return self.centroids
+
+    @classmethod
+    def from_list(cls, centroids: list, compression: float = 100.0) -> "TDigest":
+        digest = cls(compression)
+        digest.centroids = [list(c) for c in centroids]
+        digest.count = sum(c[1] for c in digest.centroids)
+        return digest
+
+
+class _Bucket:
+
+    def __init__(self, metrics: Iterable[str]):
+        self.stats = {m: RunningStats() for m in metrics}
+        self.digests = {m: TDigest() for m in metrics}
+        self.regions: Counter = Counter()
+        self.count = 0
+
+
+class _Window:
+
+    def __init__(self, span: int, bucket_count: int, metrics: Tuple[str, ...]):
+        self.span = span
+        self.bucket_count = bucket_count
+        self.bucket_size = span / bucket_count
+        self.metrics = metrics
+        self.buckets: Dict[int, _Bucket] = {}
+        self.totals = {m: RunningStats() for m in metrics}
+        self.regions: Counter = Counter()
+        self.count = 0
+        self._merged_digests: Optional[Dict[str, TDigest]] = None
+
+    def _oldest_index(self, now: float) -> int:
+        return int(now // self.bucket_size) - self.bucket_count + 1
+
+    def expire(self, now: float):
+        oldest = self._oldest_index(now)
+        for index in [i for i in self.buckets if i < oldest]:
+            bucket = self.buckets.pop(index)
+            for metric, stats in bucket.stats.items():
+                self.totals[metric].subtract(stats)
+            self.regions.subtract(bucket.regions)
+            self.regions += Counter()
+            self.count -= bucket.count
+            self._merged_digests = None
+
+    def add(self, epoch: float, values: Dict[str, float], region: Optional[str], now: float):
+        index = int(epoch // self.bucket_size)
+        if index < self._oldest_index(now):
+            return
+        bucket = self.buckets.get(index)
+        if bucket is None:
+            bucket = self.buckets[index] = _Bucket(self.metrics)
+        for metric, value in values.items():
+            bucket.stats[metric].add(value)
+            bucket.digests[metric].add(value)
+            self.totals[metric].add(value)
+        if region:
+            bucket.regions[region] += 1
+            self.regions[region] += 1
+        bucket.count += 1
+        self.count += 1
+        self._merged_digests = None
+
+    def summary(self) -> Dict[str, Any]:
+        if self._merged_digests is None:
+            merged = {m: TDigest() for m in self.metrics}
+            for bucket in self.buckets.values():
+                for metric, digest in bucket.digests.items():
+                    if digest.count:
+                        merged[metric].merge(digest)
+            self._merged_digests = merged
+
+        metrics = {}
+        for metric, total in self.totals.items():
+            if total.count == 0:
+                continue
+            mins = [b.stats[metric].min for b in self.buckets.values() if b.stats[metric].count]
+            maxs = [b.stats[metric].max for b in self.buckets.values() if b.stats[metric].count]
+            digest = self._merged_digests[metric]
+            metrics[metric] = {
+                'count': total.count,
+                'mean': round(total.mean, 3),
+                'variance': round(total.variance, 4),
+                'std': round(math.sqrt(total.variance), 4),
+                'min': min(mins),
+                'max': max(maxs),
+                **{f"p{int(q * 100)}": round(digest.quantile(q), 3) for q in QUANTILES}
+            }
+        return {
+            'count': self.count,
+            'metrics': metrics,
+            'regions': dict(self.regions)
+        }
+
+
+class StreamingStatsEngine:
+
+    def __init__(self, windows: Optional[Dict[str, Tuple[int, int]]] = None, state_file: Optional[Path] = None):
+        self.windows = windows or DEFAULT_WINDOWS
+        self.state_file = state_file or (veri_klasoru / STATS_STATE_FILE)
+        self._windows: Dict[str, Dict[str, _Window]] = {}
+        self._seen: Dict[str, Dict[tuple, float]] = {}
+        self.lock = threading.Lock()
+
+    def _windows_for(self, event_type: str) -> Dict[str, _Window]:
+        windows = self._windows.get(event_type)
+        if windows is None:
+            metrics = EVENT_TYPES[event_type][0]
+            windows = self._windows[event_type] = {
+                name: _Window(span, bucket_count, metrics)
+                for name, (span, bucket_count) in self.windows.items()
+            }
+            self._seen[event_type] = {}
+        return windows
+
+    def _expire(self, event_type: str, now: float):
+        for window in self._windows_for(event_type).values():
+            window.expire(now)
+        longest = max(span for span, _ in self.windows.values())
+        seen = self._seen[event_type]
+        for key in [k for k, epoch in seen.items() if epoch < now - longest]:
+            del seen[key]
+
+    def update(self, event_type: str, events: Iterable[Any], now: Optional[float] = None) -> int:
+        if event_type not in EVENT_TYPES:
+            return 0
+        metrics, time_field, key_fields = EVENT_TYPES[event_type]
+        now = now if now is not None else time.time()
+        added = 0
+
+        with self.lock:
+            windows = self._windows_for(event_type)
+            self._expire(event_type, now)
+            seen = self._seen[event_type]
+
+            for ev in events:
+                ev = ev.toDictionary() if hasattr(ev, 'toDictionary') else ev
+                epoch = parse_timestamp(ev.get(time_field))
+                if epoch is None:
+                    continue
+                key = tuple(ev.get(f) for f in key_fields)
+                if key in seen:
+                    continue
+                seen[key] = epoch
+
+                values = {}
+                for metric in metrics:
+                    value = ev.get(metric)
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        values[metric] = float(value)
+                if event_type == 'earthquake':
+                    region = classify_region(ev.get('location') or '')
+                else:
+                    region = ev.get('location')
+
+                for window in windows.values():
+                    window.add(epoch, values, region, now)
+                added += 1
+
+        return added
+
+    def snapshot(self, event_type: Optional[str] = None, now: Optional[float] = None) -> Dict[str, Any]:
+        now = now if now is not None else time.time()
+        with self.lock:
+            types = [event_type] if event_type else list(self._windows)
+            result = {}
+            for name in types:
+                if name not in self._windows:
+                    continue
+                self._expire(name, now)
+                result[name] = {w: window.summary() for w, window in self._windows[name].items()}
+        return result.get(event_type, {}) if event_type else result
+
+    def to_state(self) -> Dict[str, Any]:
+        snapshot = self.snapshot()
+        with self.lock:
+            types = {}
+            for event_type, windows in self._windows.items():
+                types[event_type] = {
+                    'seen': [[list(k), e] for k, e in self._seen[event_type].items()],
+                    'windows': {
+                        name: [
+                            {
+                                'index': index,
+                                'count': bucket.count,
+                                'stats': {m: s.to_list() for m, s in bucket.stats.items()},
+                                'digests': {m: d.to_list() for m, d in bucket.digests.items()},
+                                'regions': dict(bucket.regions)
+                            }
+                            for index, bucket in window.buckets.items()
+                        ]
+                        for name, window in windows.items()
+                    }
+                }
+        return {'types': types, 'snapshot': snapshot, 'updated_at': datetime.now().isoformat()}
+
+    def save_state(self):
+        state = self.to_state()
+        tmp_path = self.state_file.with_suffix('.tmp')
+        tmp_path.write_bytes(dumps(state))
+        os.replace(tmp_path, self.state_file)
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], state_file: Optional[Path] = None) -> "StreamingStatsEngine":
+        engine = cls(state_file=state_file)
+        for event_type, data in state.get('types', {}).items():
+            if event_type not in EVENT_TYPES:
+                continue
+            windows = engine._windows_for(event_type)
+            engine._seen[event_type] = {tuple(k): e for k, e in data.get('seen', [])}
+            for name, buckets in data.get('windows', {}).items():
+                window = windows.get(name)
+                if window is None:
+                    continue
+                for item in buckets:
+                    bucket = _Bucket(window.metrics)
+                    bucket.count = item['count']
+                    bucket.regions = Counter(item.get('regions', {}))
+                    for metric, values in item['stats'].items():
+                        bucket.stats[metric] = RunningStats.from_list(values)
+                        window.totals[metric].merge(bucket.stats[metric])
+                    for metric, centroids in item['digests'].items():
+                        bucket.digests[metric] = TDigest.from_list(centroids)
+                    window.buckets[item['index']] = bucket
+                    window.regions.update(bucket.regions)
+                    window.count += bucket.count
+        return engine
+
+    @classmethod
+    def load(cls, state_file: Optional[Path] = None) -> "StreamingStatsEngine":
+        state_file = state_file or (veri_klasoru / STATS_STATE_FILE)
+        state = load_stats_state(state_file)
+        if state:
+            try:
+                return cls.from_state(state, state_file=state_file)
+            except Exception as e:
+                log_message(f"İstatistik durumu yüklenemedi, sıfırdan başlanıyor: {e}", "WARNING")
+        return cls(state_file=state_file)
+
+
+def load_stats_state(state_file: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    state_file = state_file or (veri_klasoru / STATS_STATE_FILE)
+    if not state_file.exists():
+        return None
+    try:
+        return loads(state_file.read_bytes())
+    except Exception as e:
+        log_message(f"İstatistik dosyası okunamadı: {e}", "WARNING")
+        return None
@@ -0,0 +1,378 @@
+# Artımlı (streaming) deprem sürüsü takibi
+# EventPipeline her yeni deprem batch'inde add_earthquakes() çağırır. Açık kümeler
+# bellekte tutulur, max_days penceresinden çıkan depremler düşürülür ve
+# swarm_start / swarm_grow / swarm_end olayları üretilir.
+
+from __future__ import annotations
+import heapq
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .storage import log_message, veri_klasoru
+from .timeutils import event_epoch
+
+SWARM_STATE_FILE = "swarms.json"
+
+DISCLAIMER = 'Bu analiz istatistiksel verilere dayalı bir olasılık değerlendirmesidir; kesin bir tarih veya zaman bildirmez. Lütfen resmi kurumların (AFAD, USGS vb.) açıklamalarını takip edin.'
+
+KM_PER_DEGREE = 111.0
+MAX_RECENT_EVENTS = 50
+
+
+def haversine_distance(lat1, lon1, lat2, lon2):
+    R = 6371
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
+    c = 2 * math.asin(math.sqrt(a))
+    return R * c
+
+
+def swarm_risk(earthquake_count: int, avg_magnitude: float, time_span: int, min_count: int, max_days: int):
+    # SeismicRiskAnalyzer.detect_earthquake_swarms_from_data ile aynı puanlama
+    risk_score = min(100, int(
+        20 +
+        (earthquake_count - min_count) * 5 +
+        (avg_magnitude - 2.0) * 10 +
+        ((time_span / max_days) * 20 if max_days > 0 else 0)
+    ))
+
+    if risk_score >= 70:
+        risk_level = "YÜKSEK RİSKLİ"
+    elif risk_score >= 50:
+        risk_level = "ORTA-YÜKSEK RİSKLİ"
+    elif risk_score >= 30:
+        risk_level = "ORTA RİSKLİ"
+    else:
+        risk_level = "DÜŞÜK RİSKLİ"
+    return risk_score, risk_level
+
+
+def _event_key(eq: Dict[str, Any], epoch: float, lat: float, lon: float) -> tuple:
+    # Kaynak kimliği (USGS 'us7000abcd' gibi metin) varsa deprem onunla tanınır; büyüklük
+    # revizyonları aynı depremi yeni saymaz. Temizlenmiş batch'lerdeki sayısal 'id' batch içi
+    # sıra numarasıdır, kimlik olarak kullanılmaz. Anahtarlar heap'te karşılaştırılabilsin diye
+    # ilk eleman hep metindir.
+    event_id = eq.get('event_id') or eq.get('id')
+    if isinstance(event_id, str) and event_id:
+        return (event_id,)
+    return ('', round(epoch), round(lat, 4), round(lon, 4))
+
+
+class _Cluster:
+
+    def __init__(self, swarm_id: str, seed_lat: float, seed_lon: float, cell: Tuple[int, int]):
+        self.swarm_id = swarm_id
+        self.seed_lat = seed_lat
+        self.seed_lon = seed_lon
+        self.cell = cell
+        self.members: Dict[tuple, Dict[str, Any]] = {}
+        self.active = False
+
+    def __len__(self):
+        return len(self.members)
+
+
+class SwarmTracker:
+    # Kümeler seed depremin konumuna göre lat/lon grid hücrelerinde tutulur;
+    # yeni bir deprem sadece komşu hücrelerdeki kümelerle karşılaştırılır.
+    # Pencere dışına çıkan depremler zamana göre sıralı bir heap'ten düşürülür.
+
+    def __init__(self, min_count: int = 3, max_magnitude: float = 5.0, cluster_radius_km: float = 100.0,
+                 min_days: int = 0, max_days: int = 1, state_file: Optional[Path] = None):
+        self.min_count = min_count
+        self.max_magnitude = max_magnitude
+        self.cluster_radius_km = cluster_radius_km
+        self.min_days = min_days
+        self.max_days = max_days
+        self.state_file = state_file or (veri_klasoru / SWARM_STATE_FILE)
+
+        self._cell_deg = max(cluster_radius_km / KM_PER_DEGREE, 1e-6)
+        self._clusters: Dict[str, _Cluster] = {}
+        self._grid: Dict[Tuple[int, int], List[str]] = {}
+        self._expiry_heap: List[Tuple[float, tuple, str]] = []
+        self._seen: Dict[tuple, str] = {}
+        self._next_id = 1
+        self._recent_events: List[Dict[str, Any]] = []
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.lock = threading.RLock()
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            'min_count': self.min_count,
+            'max_magnitude': self.max_magnitude,
+            'cluster_radius_km': self.cluster_radius_km,
+            'min_days': self.min_days,
+            'max_days': self.max_days
+        }
+
+    def matches(self, min_count, max_magnitude, cluster_radius_km, min_days, max_days) -> bool:
+        return (self.min_count == min_count and self.max_magnitude == max_magnitude and
+                self.cluster_radius_km == cluster_radius_km and self.min_days == min_days and
+                self.max_days == max_days)
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        self._listeners.append(listener)
+
+    def _cell_of(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (int(math.floor(lat / self._cell_deg)), int(math.floor(lon / self._cell_deg)))
+
+    def _nearest_cluster(self, lat: float, lon: float) -> Optional[_Cluster]:
+        row, col = self._cell_of(lat, lon)
+        # Yüksek enlemlerde 1 derece boylam daha kısa, bu yüzden daha fazla sütun taranır
+        edge_lat = min(89.0, abs(lat) + self._cell_deg)
+        col_span = int(math.ceil(1.0 / max(math.cos(math.radians(edge_lat)), 0.01)))
+
+        best = None
+        best_distance = self.cluster_radius_km
+        for r in range(row - 1, row + 2):
+            for c in range(col - col_span, col + col_span + 1):
+                for swarm_id in self._grid.get((r, c), ()):
+                    cluster = self._clusters[swarm_id]
+                    distance = haversine_distance(cluster.seed_lat, cluster.seed_lon, lat, lon)
+                    if distance <= best_distance:
+                        best = cluster
+                        best_distance = distance
+        return best
+
+    def _new_cluster(self, lat: float, lon: float) -> _Cluster:
+        swarm_id = f"swarm_{self._next_id}"
+        self._next_id += 1
+        cell = self._cell_of(lat, lon)
+        cluster = _Cluster(swarm_id, lat, lon, cell)
+        self._clusters[swarm_id] = cluster
+        self._grid.setdefault(cell, []).append(swarm_id)
+        return cluster
+
+    def _drop_cluster(self, cluster: _Cluster):
+        self._clusters.pop(cluster.swarm_id, None)
+        ids = self._grid.get(cluster.cell)
+        if ids:
+            ids.remove(cluster.swarm_id)
+            if not ids:
+                del self._grid[cluster.cell]
+
+    def _emit(self, kind: str, cluster: _Cluster, emitted: List[Dict[str, Any]]):
+        members = cluster.members.values()
+        count = len(cluster)
+        event = {
+            'event': kind,
+            'swarm_id': cluster.swarm_id,
+            'earthquake_count': count,
+            'center_latitude': sum(eq['latitude'] for eq in members) / count if count else cluster.seed_lat,
+            'center_longitude': sum(eq['longitude'] for eq in members) / count if count else cluster.seed_lon,
+            'timestamp': datetime.now().isoformat()
+        }
+        emitted.append(event)
+        self._recent_events.append(event)
+        del self._recent_events[:-MAX_RECENT_EVENTS]
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                log_message(f"Swarm listener hatası: {e}", "WARNING")
+
+    def _update_activity(self, cluster: _Cluster, grew: bool, emitted: List[Dict[str, Any]]):
+        if len(cluster) >= self.min_count:
+            if not cluster.active:
+                cluster.active = True
+                self._emit('swarm_start', cluster, emitted)
+            elif grew:
+                self._emit('swarm_grow', cluster, emitted)
+        elif cluster.active:
+            cluster.active = False
+            self._emit('swarm_end', cluster, emitted)
+
+    def expire(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        emitted: List[Dict[str, Any]] = []
+        with self.lock:
+            self._expire(now if now is not None else time.time(), emitted)
+        return emitted
+
+    def _expire(self, now: float, emitted: List[Dict[str, Any]]):
+        cutoff = now - self.max_days * 86400
+        touched = {}
+        while self._expiry_heap and self._expiry_heap[0][0] < cutoff:
+            _, key, swarm_id = heapq.heappop(self._expiry_heap)
+            self._seen.pop(key, None)
+            cluster = self._clusters.get(swarm_id)
+            if cluster is None:
+                continue
+            cluster.members.pop(key, None)
+            touched[swarm_id] = cluster
+
+        for cluster in touched.values():
+            self._update_activity(cluster, False, emitted)
+            if not cluster.members:
+                self._drop_cluster(cluster)
+
+    def add_earthquakes(self, earthquakes: List[Any], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        now = now if now is not None else time.time()
+        emitted: List[Dict[str, Any]] = []
+
+        with self.lock:
+            self._expire(now, emitted)
+            cutoff = now - self.max_days * 86400
+
+            for eq in earthquakes:
+                eq = eq.toDictionary() if hasattr(eq, 'toDictionary') else eq
+                lat = eq.get('latitude')
+                lon = eq.get('longitude')
+                magnitude = eq.get('magnitude')
+                if lat is None or lon is None or magnitude is None:
+                    continue
+                if magnitude > self.max_magnitude:
+                    continue
+
+                epoch = event_epoch(eq)
+                if epoch is None or epoch > now:
+                    epoch = now
+                if epoch < cutoff:
+                    continue
+
+                # Aynı USGS feed'i her döngüde tekrar çekildiği için aynı depremi iki kez sayma
+                key = _event_key(eq, epoch, lat, lon)
+                if key in self._seen:
+                    continue
+
+                cluster = self._nearest_cluster(lat, lon)
+                if cluster is None:
+                    cluster = self._new_cluster(lat, lon)
+
+                cluster.members[key] = {
+                    'latitude': lat,
+                    'longitude': lon,
+                    'magnitude': magnitude,
+                    'timestamp': eq.get('timestamp') or datetime.fromtimestamp(epoch).isoformat(),
+                    'location': eq.get('location', 'Unknown'),
+                    'epoch': epoch
+                }
+                if len(key) == 1:
+                    cluster.members[key]['event_id'] = key[0]
+                self._seen[key] = cluster.swarm_id
+                heapq.heappush(self._expiry_heap, (epoch, key, cluster.swarm_id))
+                self._update_activity(cluster, True, emitted)
+
+        return emitted
+
+    def _describe(self, cluster: _Cluster) -> Dict[str, Any]:
+        members = list(cluster.members.values())
+        epochs = [eq['epoch'] for eq in members]
+        magnitudes = [eq['magnitude'] for eq in members]
+        first = datetime.fromtimestamp(min(epochs))
+        last = datetime.fromtimestamp(max(epochs))
+        time_span = (last - first).days
+        earthquake_count = len(members)
+        avg_magnitude = sum(magnitudes) / earthquake_count
+        risk_score, risk_level = swarm_risk(earthquake_count, avg_magnitude, time_span, self.min_count, self.max_days)
+
+        latest = sorted(members, key=lambda x: x['epoch'], reverse=True)[:10]
+        return {
+            'swarm_id': cluster.swarm_id,
+            'center_latitude': sum(eq['latitude'] for eq in members) / earthquake_count,
+            'center_longitude': sum(eq['longitude'] for eq in members) / earthquake_count,
+            'earthquake_count': earthquake_count,
+            'avg_magnitude': round(avg_magnitude, 2),
+            'max_magnitude': max(magnitudes),
+            'min_magnitude': min(magnitudes),
+            'time_span_days': time_span,
+            'cluster_radius_km': self.cluster_radius_km,
+            'risk_level': risk_level,
+            'risk_score': risk_score,
+            'risk_description': f"{earthquake_count} adet küçük deprem {time_span} gün içinde {self.cluster_radius_km} km yarıçapında tespit edildi. Bu bir deprem sürüsü (swarm) olabilir.",
+            'earthquakes': [{k: v for k, v in eq.items() if k != 'epoch'} for eq in latest],
+            'first_earthquake_date': first.isoformat(),
+            'last_earthquake_date': last.isoformat(),
+            'analysis_date': datetime.now().isoformat(),
+            'disclaimer': DISCLAIMER
+        }
+
+    def get_swarms(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            swarms = [self._describe(c) for c in self._clusters.values() if c.active]
+        swarms.sort(key=lambda x: x['risk_score'], reverse=True)
+        return swarms
+
+    def get_recent_events(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return list(self._recent_events)
+
+    def to_state(self) -> Dict[str, Any]:
+        with self.lock:
+            clusters = [
+                {
+                    'swarm_id': c.swarm_id,
+                    'seed_latitude': c.seed_lat,
+                    'seed_longitude': c.seed_lon,
+                    'active': c.active,
+                    'members': list(c.members.values())
+                }
+                for c in self._clusters.values()
+            ]
+            return {
+                'parameters': self.parameters,
+                'next_id': self._next_id,
+                'swarms': self.get_swarms(),
+                'clusters': clusters,
+                'recent_events': list(self._recent_events),
+                'updated_at': datetime.now().isoformat()
+            }
+
+    def save_state(self):
+        state = self.to_state()
+        tmp_path = self.state_file.with_suffix('.tmp')
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_file)
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], state_file: Optional[Path] = None) -> "SwarmTracker":
+        tracker = cls(state_file=state_file, **state.get('parameters', {}))
+        tracker._next_id = state.get('next_id', 1)
+        tracker._recent_events = state.get('recent_events', [])[-MAX_RECENT_EVENTS:]
+
+        for item in state.get('clusters', []):
+            lat, lon = item['seed_latitude'], item['seed_longitude']
+            cell = tracker._cell_of(lat, lon)
+            cluster = _Cluster(item['swarm_id'], lat, lon, cell)
+            cluster.active = item.get('active', False)
+            for eq in item.get('members', []):
+                key = _event_key(eq, eq['epoch'], eq['latitude'], eq['longitude'])
+                cluster.members[key] = eq
+                tracker._seen[key] = cluster.swarm_id
+                heapq.heappush(tracker._expiry_heap, (eq['epoch'], key, cluster.swarm_id))
+            if cluster.members:
+                tracker._clusters[cluster.swarm_id] = cluster
+                tracker._grid.setdefault(cell, []).append(cluster.swarm_id)
+        return tracker
+
+    @classmethod
+    def load(cls, state_file: Optional[Path] = None, **parameters) -> "SwarmTracker":
+        state_file = state_file or (veri_klasoru / SWARM_STATE_FILE)
+        state = load_swarm_state(state_file)
+        if state:
+            try:
+                tracker = cls.from_state(state, state_file=state_file)
+                if not parameters or tracker.matches(**{**tracker.parameters, **parameters}):
+                    return tracker
+            except Exception as e:
+                log_message(f"Swarm durumu yüklenemedi, sıfırdan başlanıyor: {e}", "WARNING")
+        return cls(state_file=state_file, **parameters)
+
+
+def load_swarm_state(state_file: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    state_file = state_file or (veri_klasoru / SWARM_STATE_FILE)
+    if not state_file.exists():
+        return None
+    try:
+        with state_file.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        log_message(f"Swarm durum dosyası okunamadı: {e}", "WARNING")
+        return None
@@ -0,0 +1,89 @@
+# Zaman damgası ayrıştırma (pipeline, analiz modülleri ve dashboard ortak kullanır)
+# Kaynaklar farklı biçimler üretir: ISO 8601 ('Z' ya da ofsetli), storage biçimi
+# '%Y-%m-%d %H:%M:%S', sel verisinin '%Y-%m-%d T%H:%M:%S' biçimi, yalnızca tarih, epoch saniye
+# ve datetime nesneleri. Hepsi epoch saniyeye (float, UTC tabanlı) çevrilir; ofsetsiz metinler
+# (naive ISO, yalnızca tarih) UTC kabul edilir, sonuç sunucunun saat dilimine bağlı değildir.
+#
+# Olaylar ingest sırasında bir kez EPOCH_FIELD alanını alır (modeller kurucuda hesaplar,
+# EventPipeline düz sözlükleri işlemeden önce damgalar); filtreler bu sayısal alanı karşılaştırır.
+# Alanı olmayan eski dosyalarda metin, önbellekli ayrıştırıcıdan geçer: aynı dosya her istekte
+# yeniden ayrıştırılmaz.
+
+from __future__ import annotations
+import math
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+EPOCH_FIELD = 'epoch'
+# Olay zamanı alan önceliği: EONET'te event_time gerçek olay zamanı, time güncelleme zamanı olabilir
+TIME_FIELDS = ('event_time', 'time', 'timestamp')
+PARSE_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_text(text: str) -> Optional[float]:
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        value = float(text)
+        return value if math.isfinite(value) else None
+    except ValueError:
+        pass
+    try:
+        parsed = datetime.fromisoformat(text.replace('Z', '+00:00').replace(' T', 'T'))
+    except ValueError:
+        # fromisoformat'ın okuyamadığı ISO türevleri (ör. 6'dan fazla kesir basamağı): yalnızca tarih
+        try:
+            parsed = datetime.strptime(text[:10], '%Y-%m-%d')
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Zaman değerini epoch saniyeye çevirir; okunamazsa None"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if math.isfinite(value) else None
+    if isinstance(value, str):
+        return _parse_text(value)
+    if hasattr(value, 'timestamp'):
+        try:
+            return value.timestamp()
+        except (TypeError, ValueError, OverflowError):
+            return None
+    return None
+
+
+def event_epoch(event: Mapping[str, Any], fields: Optional[Sequence[str]] = None) -> Optional[float]:
+    """Olayın epoch zamanı. fields verilmezse önce ingest'te yazılan EPOCH_FIELD, yoksa
+    TIME_FIELDS sırasıyla ilk okunabilen alan; verilirse yalnızca o alanlar"""
+    if fields is None:
+        epoch = event.get(EPOCH_FIELD)
+        if isinstance(epoch, (int, float)) and not isinstance(epoch, bool):
+            return float(epoch)
+        fields = TIME_FIELDS
+    for field in fields:
+        epoch = parse_timestamp(event.get(field))
+        if epoch is not None:
+            return epoch
+    return None
+
+
+def stamp_epochs(events: Iterable[Any]) -> None:
+    """Düz sözlük olaylara EPOCH_FIELD ekler (model nesneleri kurucuda hesaplar)"""
+    for event in events:
+        if isinstance(event, dict) and EPOCH_FIELD not in event:
+            epoch = event_epoch(event)
+            if epoch is not None:
+                event[EPOCH_FIELD] = epoch
+
+
+def to_datetime(epoch: Optional[float]) -> Optional[datetime]:
+    """Epoch -> yerel naive datetime (dashboard'un önceki karşılaştırma biçimi)"""
+    return datetime.fromtimestamp(epoch) if epoch is not None else None
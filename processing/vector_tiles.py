@@ -0,0 +1,218 @@
+# Mapbox Vector Tile (MVT 2.1) kodlayıcı ve disk tile önbelleği
+# Tile'lar processing/map_clustering.ClusterIndex'ten (zoom'a göre kümelenmiş uzamsal indeks)
+# üretilir; protobuf bağımlılığı olmadan yalnızca nokta geometrisi kodlanır.
+#
+# Önbellek: data/.cache/tiles/<katmanlar>/<z>/<x>/<y>/<veri sürümü>.pbf
+# Tüm worker'lar aynı dizini kullanır. Okunan tile'ın mtime'ı güncellenir; toplam boyut
+# TILE_CACHE_MAX_BYTES'ı aşınca en eski erişilenler silinir (LRU). Veri sürümü değişince aynı
+# z/x/y için eski sürüm yazma sırasında silinir.
+
+from __future__ import annotations
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from .storage import log_message, veri_klasoru
+from .shared_cache import CACHE_DIR
+
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+MAX_TILE_ZOOM = 22
+MVT_MIMETYPE = 'application/vnd.mapbox-vector-tile'
+TILE_CACHE_DIR = "tiles"
+TILE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Boyut tahmini bu kadar yazmada bir diskten yeniden hesaplanır (diğer worker'ların yazdıkları)
+TILE_CACHE_RESCAN_WRITES = 256
+
+GEOM_POINT = 1
+CMD_MOVE_TO = 1
+
+TileFeature = Tuple[int, int, int, Dict[str, Any]]
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _field(number: int, wire_type: int) -> bytes:
+    return _varint((number << 3) | wire_type)
+
+
+def _bytes_field(number: int, payload: bytes) -> bytes:
+    return _field(number, 2) + _varint(len(payload)) + payload
+
+
+def _varint_field(number: int, value: int) -> bytes:
+    return _field(number, 0) + _varint(value)
+
+
+def _packed(number: int, values: Iterable[int]) -> bytes:
+    return _bytes_field(number, b''.join(_varint(v) for v in values))
+
+
+def _encode_value(value) -> bytes:
+    # Tile.Value: 1 string, 3 double, 5 uint, 6 sint, 7 bool
+    if isinstance(value, bool):
+        return _varint_field(7, int(value))
+    if isinstance(value, int):
+        return _varint_field(5, value) if value >= 0 else _varint_field(6, _zigzag(value))
+    if isinstance(value, float):
+        return _field(3, 1) + struct.pack('<d', value)
+    return _bytes_field(1, str(value).encode('utf-8'))
+
+
+def flatten_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """MVT yalnızca skaler değer taşır: iç sözlükler key_subkey olarak açılır, skaler listeler
+    virgülle birleştirilir, diğerleri (ve None) atlanır"""
+    flat = {}
+    for key, value in properties.items():
+        if value is None:
+            continue
+        if isinstance(value, (bool, int, float, str)):
+            flat[key] = value
+        elif isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if isinstance(sub_value, (bool, int, float, str)):
+                    flat[f"{key}_{sub_key}"] = sub_value
+        elif isinstance(value, (list, tuple)) and all(isinstance(v, (int, float, str)) for v in value):
+            flat[key] = ','.join(str(v) for v in value)
+    return flat
+
+
+def encode_layer(name: str, features: List[TileFeature], extent: int = TILE_EXTENT) -> bytes:
+    keys: Dict[str, int] = {}
+    values: Dict[Tuple[type, Any], int] = {}
+    encoded_features = []
+    for tile_x, tile_y, feature_id, properties in features:
+        tags = []
+        for key, value in flatten_properties(properties).items():
+            key_index = keys.setdefault(key, len(keys))
+            value_index = values.setdefault((type(value), value), len(values))
+            tags.extend((key_index, value_index))
+        geometry = (CMD_MOVE_TO & 0x7) | (1 << 3), _zigzag(tile_x), _zigzag(tile_y)
+        encoded_features.append(_bytes_field(2, (
+            (_varint_field(1, feature_id) if feature_id is not None and feature_id >= 0 else b'') +
+            (_packed(2, tags) if tags else b'') +
+            _varint_field(3, GEOM_POINT) +
+            _packed(4, geometry))))
+
+    return (_varint_field(15, 2) +
+            _bytes_field(1, name.encode('utf-8')) +
+            b''.join(encoded_features) +
+            b''.join(_bytes_field(3, key.encode('utf-8')) for key in keys) +
+            b''.join(_bytes_field(4, _encode_value(value)) for (_, value) in values) +
+            _varint_field(5, extent))
+
+
+def encode_tile(layers: Dict[str, List[TileFeature]], extent: int = TILE_EXTENT) -> bytes:
+    """{katman adı: [(tile_x, tile_y, id, properties)]} -> MVT protobuf baytları (boş katmanlar atlanır)"""
+    return b''.join(_bytes_field(3, encode_layer(name, features, extent))
+                    for name, features in layers.items() if features)
+
+
+def valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= MAX_TILE_ZOOM and 0 <= x < (1 << z) and 0 <= y < (1 << z)
+
+
+class TileCache:
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = TILE_CACHE_MAX_BYTES):
+        self.directory = Path(directory) if directory else (veri_klasoru / CACHE_DIR / TILE_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._size: Optional[int] = None
+        self._writes = 0
+
+    def _path(self, name: str, z: int, x: int, y: int, version: str) -> Path:
+        return self.directory / name / str(z) / str(x) / str(y) / f"{version}.pbf"
+
+    def _files(self) -> List[Tuple[float, int, Path]]:
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for file_name in names:
+                if not file_name.endswith('.pbf'):
+                    continue
+                path = Path(root) / file_name
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+        return files
+
+    def _evict(self):
+        files = self._files()
+        total = sum(size for _, size, _ in files)
+        if total > self.max_bytes:
+            # En eski erişilenler, kapasitenin %90'ına inene kadar
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in sorted(files, key=lambda item: item[0]):
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                    total -= size
+                except OSError:
+                    pass
+        self._size = total
+
+    def _record_write(self, size: int):
+        with self.lock:
+            self._writes += 1
+            if self._size is None or self._writes % TILE_CACHE_RESCAN_WRITES == 0:
+                self._evict()
+            else:
+                self._size += size
+                if self._size > self.max_bytes:
+                    self._evict()
+
+    def get(self, name: str, z: int, x: int, y: int, version: str,
+            builder: Callable[[], bytes]) -> Tuple[bytes, bool]:
+        """(tile baytları, önbellekten mi) döndürür"""
+        path = self._path(name, z, x, y, version)
+        try:
+            data = path.read_bytes()
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return data, True
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            log_message(f"Tile önbelleği okunamadı ({path}): {e}", "WARNING")
+
+        data = builder()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            for stale in path.parent.glob("*.pbf"):
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+            self._record_write(len(data))
+        except OSError as e:
+            log_message(f"Tile önbelleğe yazılamadı ({path}): {e}", "WARNING")
+        return data, False
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            if self._size is None:
+                self._evict()
+            return {'bytes': self._size, 'max_bytes': self.max_bytes}
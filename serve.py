@@ -0,0 +1,146 @@
+"""
+SDEWS Dashboard - üretim sunucusu
+python serve.py [--workers N] [--threads T] [--server auto|gunicorn|waitress|werkzeug]
+"""
+
+# dashboard.py'nin kendi __main__ bloğu tek süreçli Werkzeug geliştirme sunucusudur (debug +
+# reloader). Burada uygulama worker'lar açılmadan önce bir kez yüklenir (preload) ve birden
+# fazla süreçte sunulur:
+#   gunicorn  - pre-fork worker'lar + gthread (Linux/macOS, kuruluysa)
+#   waitress  - tek süreç, çok thread (Windows dahil, kuruluysa)
+#   werkzeug  - yedek: ortak dinleme soketi üzerinde fork edilmiş, çok thread'li Werkzeug
+#               sunucuları (POSIX); fork yoksa tek süreç
+# Worker'lar işlenmiş veriyi data/.cache üzerinden paylaşır (processing/shared_cache.py).
+
+import argparse
+import os
+import signal
+import socket
+import sys
+
+DEFAULT_PORT = 5000
+DEFAULT_THREADS = 8
+SERVERS = ('auto', 'gunicorn', 'waitress', 'werkzeug')
+
+
+def default_workers():
+    return max(1, os.cpu_count() or 1)
+
+
+def run_gunicorn(app, host, port, workers, threads):
+    from gunicorn.app.base import BaseApplication
+
+    class DashboardApplication(BaseApplication):
+
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    DashboardApplication(app, {
+        'bind': f"{host}:{port}",
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread',
+        'preload_app': True,
+        'timeout': 120
+    }).run()
+
+
+def run_waitress(app, host, port, workers, threads):
+    from waitress import serve
+    # waitress tek süreçlidir; worker sayısı kadar thread grubu açılır
+    serve(app, host=host, port=port, threads=workers * threads)
+
+
+def run_werkzeug(app, host, port, workers, threads):
+    from werkzeug.serving import make_server
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(128)
+    sock.set_inheritable(True)
+
+    def serve_forever():
+        make_server(host, port, app, threaded=True, fd=sock.fileno()).serve_forever()
+
+    if workers <= 1 or not hasattr(os, 'fork'):
+        serve_forever()
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                serve_forever()
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def shutdown(signum, frame):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+    for child in children:
+        try:
+            os.waitpid(child, 0)
+        except ChildProcessError:
+            pass
+
+
+def pick_server(name):
+    if name != 'auto':
+        return name
+    candidates = ['waitress', 'gunicorn'] if os.name == 'nt' else ['gunicorn', 'waitress']
+    for candidate in candidates:
+        try:
+            __import__(candidate)
+            return candidate
+        except ImportError:
+            continue
+    return 'werkzeug'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the SDEWS dashboard in production mode")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", DEFAULT_PORT)))
+    parser.add_argument("--workers", type=int, default=default_workers(), help="worker processes (default: CPU count)")
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="threads per worker")
+    parser.add_argument("--server", choices=SERVERS, default="auto")
+    args = parser.parse_args(argv)
+
+    # Uygulama worker'lardan önce yüklenir: kurallar bir kez derlenir, bellek fork ile paylaşılır
+    from dashboard import app
+    from processing.storage import eski_dosyalari_temizle
+    try:
+        eski_dosyalari_temizle()
+    except Exception as e:
+        print(f"Temizleme hatası (devam ediliyor): {e}")
+
+    server = pick_server(args.server)
+    print(f"SDEWS dashboard: {server}, {args.workers} worker x {args.threads} thread, "
+          f"http://{args.host}:{args.port}", flush=True)
+    runners = {'gunicorn': run_gunicorn, 'waitress': run_waitress, 'werkzeug': run_werkzeug}
+    runners[server](app, args.host, args.port, max(1, args.workers), max(1, args.threads))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+WSGI giriş noktası
+gunicorn --preload -w 4 --threads 8 -k gthread wsgi:application
+waitress-serve --threads 32 wsgi:application
+"""
+
+from dashboard import app as application
+
+app = application